@@ -41,6 +41,12 @@ class EoxNelpConfig(AppConfig):
                         'dispatch_uid': 'block_completion_publisher_receviver',
                         'sender_path': 'completion.models.BlockCompletion',
                     },
+                    {
+                        'receiver_func_name': 'stats_block_completion_handler',
+                        'signal_path': 'django.db.models.signals.post_save',
+                        'dispatch_uid': 'stats_block_completion_handler_receiver',
+                        'sender_path': 'completion.models.BlockCompletion',
+                    },
                     {
                         'receiver_func_name': 'emit_initialized_course_event',
                         'signal_path': 'django.db.models.signals.post_save',
@@ -75,6 +81,23 @@ class EoxNelpConfig(AppConfig):
                         'dispatch_uid': 'update_payment_notifications_receiver',
                         'sender_path': 'common.djangoapps.student.models.CourseEnrollment',
                     },
+                    {
+                        'receiver_func_name': 'stats_enrollment_handler',
+                        'signal_path': 'django.db.models.signals.post_save',
+                        'dispatch_uid': 'stats_enrollment_handler_receiver',
+                        'sender_path': 'common.djangoapps.student.models.CourseEnrollment',
+                    },
+                    {
+                        'receiver_func_name': 'stats_signup_source_handler',
+                        'signal_path': 'django.db.models.signals.post_save',
+                        'dispatch_uid': 'stats_signup_source_handler_receiver',
+                        'sender_path': 'common.djangoapps.student.models.UserSignupSource',
+                    },
+                    {
+                        'receiver_func_name': 'stats_certificate_handler',
+                        'signal_path': 'openedx_events.learning.signals.CERTIFICATE_CREATED',
+                        'dispatch_uid': 'stats_certificate_handler_receiver',
+                    },
                     {
                         'receiver_func_name': 'include_tracker_context',
                         'signal_path': 'celery.signals.before_task_publish',
@@ -83,6 +106,26 @@ class EoxNelpConfig(AppConfig):
                         'receiver_func_name': 'update_async_tracker_context',
                         'signal_path': 'celery.signals.task_prerun',
                     },
+                    {
+                        'receiver_func_name': 'start_configuration_memo',
+                        'signal_path': 'django.core.signals.request_started',
+                        'dispatch_uid': 'start_configuration_memo_request_receiver',
+                    },
+                    {
+                        'receiver_func_name': 'clear_configuration_memo',
+                        'signal_path': 'django.core.signals.request_finished',
+                        'dispatch_uid': 'clear_configuration_memo_request_receiver',
+                    },
+                    {
+                        'receiver_func_name': 'start_configuration_memo',
+                        'signal_path': 'celery.signals.task_prerun',
+                        'dispatch_uid': 'start_configuration_memo_task_receiver',
+                    },
+                    {
+                        'receiver_func_name': 'clear_configuration_memo',
+                        'signal_path': 'celery.signals.task_postrun',
+                        'dispatch_uid': 'clear_configuration_memo_task_receiver',
+                    },
                     {
                         'receiver_func_name': 'emit_subsection_attempt_event',
                         'signal_path': 'lms.djangoapps.grades.signals.signals.PROBLEM_WEIGHTED_SCORE_CHANGED',
@@ -164,6 +207,16 @@ class EoxNelpCMSConfig(AppConfig):
                         'signal_path': 'xmodule.modulestore.django.COURSE_PUBLISHED',
                         'dispatch_uid': 'create_course_notifications_receiver',
                     },
+                    {
+                        'receiver_func_name': 'update_course_structure_summary',
+                        'signal_path': 'xmodule.modulestore.django.COURSE_PUBLISHED',
+                        'dispatch_uid': 'update_course_structure_summary_receiver',
+                    },
+                    {
+                        'receiver_func_name': 'stats_course_published_handler',
+                        'signal_path': 'xmodule.modulestore.django.COURSE_PUBLISHED',
+                        'dispatch_uid': 'stats_course_published_handler_receiver',
+                    },
                     {
                         'receiver_func_name': 'receive_course_created',
                         'signal_path': 'openedx_events.content_authoring.signals.COURSE_CREATED',
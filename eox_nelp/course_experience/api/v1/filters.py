@@ -1,8 +1,13 @@
 """Filters used for the experience views."""
 
-from django_filters.rest_framework import FilterSet
+from django_filters.rest_framework import BaseInFilter, CharFilter, FilterSet
 
-from eox_nelp.course_experience.models import FeedbackCourse
+from eox_nelp.course_experience.models import (
+    FeedbackCourse,
+    FeedbackCourseAggregate,
+    LikeDislikeCourseCount,
+    LikeDislikeUnitCount,
+)
 
 
 class FeedbackCourseFieldsFilter(FilterSet):
@@ -23,3 +28,54 @@ class FeedbackCourseFieldsFilter(FilterSet):
             "author__username",
             "id",
         ]
+
+
+class CharInFilter(BaseInFilter, CharFilter):
+    """Filter that accepts a comma separated list of values."""
+
+
+class FeedbackCourseAggregateFilter(FilterSet):
+    """Filter class that configure the course ids query param of the aggregates, e.g
+    `filter[course_id.in]=course-v1:edX+test+2023,course-v1:edX+test+2024`.
+
+    Args:
+        FilterSet: Ancestor related filterset from rest framework.
+    """
+    course_id__in = CharInFilter(field_name="course_id", lookup_expr="in")
+
+    class Meta:
+        """Meta configuration for the FeedbackCourseAggregate model."""
+        model = FeedbackCourseAggregate
+        fields = []
+
+
+class LikeDislikeUnitCountFilter(FilterSet):
+    """Filter class that configure the query params of the unit counters, the counters are
+    filtered by units, e.g `filter[item_id.in]=block-v1:...,block-v1:...`, or by course,
+    e.g `filter[course_id]=course-v1:edX+test+2023`.
+
+    Args:
+        FilterSet: Ancestor related filterset from rest framework.
+    """
+    item_id__in = CharInFilter(field_name="item_id", lookup_expr="in")
+    course_id = CharFilter(field_name="course_id")
+
+    class Meta:
+        """Meta configuration for the LikeDislikeUnitCount model."""
+        model = LikeDislikeUnitCount
+        fields = []
+
+
+class LikeDislikeCourseCountFilter(FilterSet):
+    """Filter class that configure the course ids query param of the course counters, e.g
+    `filter[course_id.in]=course-v1:edX+test+2023,course-v1:edX+test+2024`.
+
+    Args:
+        FilterSet: Ancestor related filterset from rest framework.
+    """
+    course_id__in = CharInFilter(field_name="course_id", lookup_expr="in")
+
+    class Meta:
+        """Meta configuration for the LikeDislikeCourseCount model."""
+        model = LikeDislikeCourseCount
+        fields = []
@@ -0,0 +1,94 @@
+"""Query planning for the experience views. The select_related and only() paths of a queryset are
+derived from the serializer fields, including the attributes mapping of the relations extra fields,
+so a list page loads the records and their relations in a constant number of queries.
+
+functions:
+    plan_queryset: Return the queryset with the select_related and only() paths of a serializer.
+    get_query_plan: Return the select_related and only() paths of a serializer.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+
+
+def plan_queryset(queryset, serializer_class):
+    """
+    Returns the queryset with the select_related and only() paths required by the serializer.
+
+    Args:
+        queryset<QuerySet>: Queryset of the serializer model.
+        serializer_class<ModelSerializer>: Serializer of the queryset records.
+
+    Return:
+        <QuerySet>: Planned queryset.
+    """
+    select_related, only = get_query_plan(serializer_class)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    return queryset.only(*only)
+
+
+def get_query_plan(serializer_class):
+    """
+    Returns the select_related and only() paths of a serializer. Every field source is a path and
+    the relations with get_extra_fields_mapping add a path for every attribute of the mapping.
+
+    Args:
+        serializer_class<ModelSerializer>: Serializer of the queryset records.
+
+    Return:
+        <tuple>: select_related paths and only() paths.
+    """
+    paths = []
+
+    for field in serializer_class().fields.values():
+        if field.source == "*" or field.write_only:
+            continue
+
+        source = field.source.replace(".", "__")
+        paths.append(source)
+        get_mapping = getattr(field, "get_extra_fields_mapping", None)
+
+        if get_mapping:
+            paths.extend(f"{source}__{attribute}" for attribute in get_mapping().values())
+
+    return _get_model_plan(serializer_class.Meta.model, tuple(paths))
+
+
+@lru_cache(maxsize=None)
+def _get_model_plan(model, paths):
+    """
+    Returns the select_related and only() paths of a model for the given attribute paths. The forward
+    and one-to-one relations are selected, every model field is added to only() and the attributes
+    that are not model fields, e.g properties, load all the fields of their model.
+    """
+    select_related = set()
+    only = {field.name for field in model._meta.concrete_fields}  # pylint: disable=protected-access
+
+    for path in paths:
+        current_model, prefix = model, []
+
+        for attribute in path.split("__"):
+            try:
+                field = current_model._meta.get_field(attribute)  # pylint: disable=protected-access
+            except FieldDoesNotExist:
+                only.update(
+                    "__".join([*prefix, model_field.name])
+                    for model_field in current_model._meta.concrete_fields  # pylint: disable=protected-access
+                )
+                break
+
+            if field.is_relation and (field.many_to_one or field.one_to_one):
+                prefix.append(attribute)
+                select_related.add("__".join(prefix))
+                current_model = field.related_model
+                continue
+
+            if not field.is_relation:
+                only.add("__".join([*prefix, attribute]))
+
+            break
+
+    return tuple(sorted(select_related)), tuple(sorted(only))
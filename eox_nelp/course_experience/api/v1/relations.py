@@ -16,8 +16,12 @@ class ExperienceResourceRelatedField(ResourceRelatedField):
         """ Include an additional kwargs parameter to manage the extra model fields to be shown.
         The value of the kwarg should be  a function with kwargs accepting value: (value=instance).
         get_extra_fields (function)
+        The optional get_extra_fields_mapping kwarg is a function that returns the attributes mapping
+        used by get_extra_fields, this allows the views to load the extra fields in the same query.
+        get_extra_fields_mapping (function)
         """
         self.get_extra_fields = kwargs.pop('get_extra_fields', None)
+        self.get_extra_fields_mapping = kwargs.pop('get_extra_fields_mapping', None)
         super().__init__(**kwargs)
 
     def to_representation(self, value):
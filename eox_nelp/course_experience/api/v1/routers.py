@@ -9,6 +9,8 @@ router.register("report/units", views.ReportUnitExperienceView, basename='report
 router.register("like/courses", views.LikeDislikeCourseExperienceView, basename='like-courses')
 router.register("report/courses", views.ReportCourseExperienceView, basename='report-courses')
 router.register("feedback/courses", views.FeedbackCourseExperienceView, basename='feedback-courses')
+router.register("like/counts/units", views.LikeDislikeUnitCountView, basename='like-counts-units')
+router.register("like/counts/courses", views.LikeDislikeCourseCountView, basename='like-counts-courses')
 
 # Public-routes
 router.register(
@@ -16,3 +18,8 @@ router.register(
     views.PublicFeedbackCourseExperienceView,
     basename='feedback-public-courses',
 )
+router.register(
+    "feedback/public/aggregates",
+    views.PublicFeedbackCourseAggregateView,
+    basename='feedback-public-aggregates',
+)
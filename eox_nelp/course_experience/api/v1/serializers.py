@@ -6,8 +6,11 @@ from rest_framework_json_api import serializers
 from eox_nelp.course_experience.api.v1.relations import ExperienceResourceRelatedField
 from eox_nelp.course_experience.models import (
     FeedbackCourse,
+    FeedbackCourseAggregate,
     LikeDislikeCourse,
+    LikeDislikeCourseCount,
     LikeDislikeUnit,
+    LikeDislikeUnitCount,
     ReportCourse,
     ReportUnit,
 )
@@ -24,6 +27,32 @@ USER_EXTRA_FIELD_MAPPING = {
 }
 
 
+def get_course_attributes_mapping():
+    """Function to retrieve the CourseOverview extra fields mapping.
+
+    Returns:
+        dict: COURSE_EXPERIENCE_SETTINGS value COURSE_OVERVIEW_EXTRA_FIELD_MAPPING or the default mapping.
+    """
+    return getattr(
+        settings,
+        "COURSE_EXPERIENCE_SETTINGS",
+        {},
+    ).get("COURSE_OVERVIEW_EXTRA_FIELD_MAPPING", COURSE_OVERVIEW_EXTRA_FIELD_MAPPING)
+
+
+def get_user_attributes_mapping():
+    """Function to retrieve the User extra fields mapping.
+
+    Returns:
+        dict: COURSE_EXPERIENCE_SETTINGS value USER_EXTRA_FIELD_MAPPING or the default mapping.
+    """
+    return getattr(
+        settings,
+        "COURSE_EXPERIENCE_SETTINGS",
+        {},
+    ).get("USER_EXTRA_FIELD_MAPPING", USER_EXTRA_FIELD_MAPPING)
+
+
 def get_course_extra_attributes(value=None):
     """Function to retrieve CourseOverview extra fields
 
@@ -33,13 +62,7 @@ def get_course_extra_attributes(value=None):
     Returns:
         dict: dict object too add course extra fields
     """
-    course_overview_mapping = getattr(
-        settings,
-        "COURSE_EXPERIENCE_SETTINGS",
-        {},
-    ).get("COURSE_OVERVIEW_EXTRA_FIELD_MAPPING", COURSE_OVERVIEW_EXTRA_FIELD_MAPPING)
-
-    return {"attributes": map_instance_attributes_to_dict(value, course_overview_mapping)}
+    return {"attributes": map_instance_attributes_to_dict(value, get_course_attributes_mapping())}
 
 
 def get_user_extra_attributes(value=None):
@@ -51,13 +74,7 @@ def get_user_extra_attributes(value=None):
     Returns:
         dict: dict object too add user extra fields
     """
-    user_mapping = getattr(
-        settings,
-        "COURSE_EXPERIENCE_SETTINGS",
-        {},
-    ).get("USER_EXTRA_FIELD_MAPPING", USER_EXTRA_FIELD_MAPPING)
-
-    return {"attributes": map_instance_attributes_to_dict(value, user_mapping)}
+    return {"attributes": map_instance_attributes_to_dict(value, get_user_attributes_mapping())}
 
 
 class ExperienceSerializer(serializers.ModelSerializer):
@@ -73,12 +90,20 @@ class ExperienceSerializer(serializers.ModelSerializer):
     course_id = ExperienceResourceRelatedField(
         queryset=CourseOverview.objects,
         get_extra_fields=get_course_extra_attributes,
+        get_extra_fields_mapping=get_course_attributes_mapping,
     )
     author = ExperienceResourceRelatedField(
         queryset=User.objects,
         get_extra_fields=get_user_extra_attributes,
+        get_extra_fields_mapping=get_user_attributes_mapping,
     )
 
+    def get_root_meta(self, resource, many):  # pylint: disable=unused-argument
+        """Adds the per-item results of a bulk upsert to the meta object of the response."""
+        bulk_results = self.context.get("bulk_results")
+
+        return {"results": bulk_results} if bulk_results else {}
+
 
 class LikeDislikeUnitExperienceSerializer(ExperienceSerializer):
     """Class to configure serializer for LikeDislikeUnitExperience.
@@ -90,7 +115,7 @@ class LikeDislikeUnitExperienceSerializer(ExperienceSerializer):
         """Class to configure serializer with  model LikeDislikeUnit"""
 
         model = LikeDislikeUnit
-        fields = "__all__"
+        exclude = ["org", "created_at", "updated_at"]
 
 
 class ReportUnitExperienceSerializer(ExperienceSerializer):
@@ -102,7 +127,7 @@ class ReportUnitExperienceSerializer(ExperienceSerializer):
     class Meta:
         """Class to configure serializer with  model ReportUnit"""
         model = ReportUnit
-        fields = "__all__"
+        exclude = ["org", "created_at", "updated_at"]
 
 
 class LikeDislikeCourseExperienceSerializer(ExperienceSerializer):
@@ -114,7 +139,7 @@ class LikeDislikeCourseExperienceSerializer(ExperienceSerializer):
     class Meta:
         """Class to configure serializer with  model LikeDislikeCourse"""
         model = LikeDislikeCourse
-        fields = "__all__"
+        exclude = ["org", "created_at", "updated_at"]
 
 
 class ReportCourseExperienceSerializer(ExperienceSerializer):
@@ -126,7 +151,7 @@ class ReportCourseExperienceSerializer(ExperienceSerializer):
     class Meta:
         """Class to configure serializer with  model ReportCourse"""
         model = ReportCourse
-        fields = "__all__"
+        exclude = ["org", "created_at", "updated_at"]
 
 
 class FeedbackCourseExperienceSerializer(ExperienceSerializer):
@@ -138,4 +163,52 @@ class FeedbackCourseExperienceSerializer(ExperienceSerializer):
     class Meta:
         """Class to configure serializer with  model ReportCourse"""
         model = FeedbackCourse
-        fields = "__all__"
+        exclude = ["org", "created_at", "updated_at"]
+
+
+class FeedbackCourseAggregateSerializer(serializers.ModelSerializer):
+    """Class to configure serializer for the course rating aggregates.
+
+    Ancestors:
+        serializer (serializers.ModelSerializer): the model serializer from json api
+    """
+    average_rating_content = serializers.FloatField(read_only=True)
+    average_rating_instructors = serializers.FloatField(read_only=True)
+    recommended_percentage = serializers.FloatField(read_only=True)
+    rating_content_histogram = serializers.DictField(read_only=True)
+
+    class Meta:
+        """Class to configure serializer with model FeedbackCourseAggregate"""
+        model = FeedbackCourseAggregate
+        fields = [
+            "course_id",
+            "feedbacks",
+            "average_rating_content",
+            "average_rating_instructors",
+            "recommended_percentage",
+            "rating_content_histogram",
+        ]
+
+
+class LikeDislikeUnitCountSerializer(serializers.ModelSerializer):
+    """Class to configure serializer for the like and dislike counters of the units.
+
+    Ancestors:
+        serializer (serializers.ModelSerializer): the model serializer from json api
+    """
+    class Meta:
+        """Class to configure serializer with model LikeDislikeUnitCount"""
+        model = LikeDislikeUnitCount
+        fields = ["item_id", "course_id", "likes", "dislikes"]
+
+
+class LikeDislikeCourseCountSerializer(serializers.ModelSerializer):
+    """Class to configure serializer for the like and dislike counters of the courses.
+
+    Ancestors:
+        serializer (serializers.ModelSerializer): the model serializer from json api
+    """
+    class Meta:
+        """Class to configure serializer with model LikeDislikeCourseCount"""
+        model = LikeDislikeCourseCount
+        fields = ["course_id", "likes", "dislikes"]
@@ -0,0 +1,57 @@
+"""This file contains all the test for the course_experience planning.py file.
+
+Classes:
+    GetQueryPlanTestCase: Tests cases for the get_query_plan function.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from eox_nelp.course_experience.api.v1.planning import get_query_plan, plan_queryset
+from eox_nelp.course_experience.api.v1.serializers import (
+    FeedbackCourseExperienceSerializer,
+    LikeDislikeUnitExperienceSerializer,
+)
+from eox_nelp.course_experience.models import FeedbackCourse
+
+User = get_user_model()
+
+
+class GetQueryPlanTestCase(TestCase):
+    """Tests cases for the get_query_plan function."""
+
+    @override_settings(COURSE_EXPERIENCE_SETTINGS={"USER_EXTRA_FIELD_MAPPING": {"name": "first_name"}})
+    def test_relations_are_selected(self):
+        """Test that the relations of the serializer are selected.
+
+        Expected behavior:
+            - author and course_id are selected.
+            - The model fields and the mapped author attributes are loaded.
+            - The author fields that are not mapped are not loaded.
+        """
+        select_related, only = get_query_plan(FeedbackCourseExperienceSerializer)
+
+        self.assertEqual(("author", "course_id"), select_related)
+        self.assertIn("feedback", only)
+        self.assertIn("author__first_name", only)
+        self.assertNotIn("author__email", only)
+
+    def test_unit_serializer(self):
+        """Test the plan of a serializer with a usage key field.
+
+        Expected behavior:
+            - The item_id is loaded and it's not selected.
+        """
+        select_related, only = get_query_plan(LikeDislikeUnitExperienceSerializer)
+
+        self.assertNotIn("item_id", select_related)
+        self.assertIn("item_id", only)
+
+    def test_plan_queryset(self):
+        """Test that the planned queryset selects the serializer relations.
+
+        Expected behavior:
+            - The queryset select_related contains author and course_id.
+        """
+        queryset = plan_queryset(FeedbackCourse.objects.all(), FeedbackCourseExperienceSerializer)
+
+        self.assertEqual({"author": {}, "course_id": {}}, queryset.query.select_related)
@@ -2,14 +2,23 @@
 Classes:
     LikeDislikeUnitExperienceTestCase: Test LikeDislikeUnitExperienceView.
 """
+from urllib.parse import quote
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from mock import patch
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from eox_nelp.course_experience.models import (
     FeedbackCourse,
+    FeedbackCourseAggregate,
     LikeDislikeCourse,
+    LikeDislikeCourseCount,
     LikeDislikeUnit,
+    LikeDislikeUnitCount,
     ReportCourse,
     ReportUnit,
 )
@@ -23,6 +32,8 @@ from .mixins_helpers import (
     UnitExperienceTestMixin,
 )
 
+User = get_user_model()
+
 
 class LikeDislikeUnitExperienceTestCase(UnitExperienceTestMixin, APITestCase):
     """ Test LikeDislikeUnitExperience view """
@@ -46,7 +57,7 @@ class LikeDislikeUnitExperienceTestCase(UnitExperienceTestMixin, APITestCase):
         Using self(LikeDislikeUnitExperienceTestCase).
         """
         super().setUp()
-        self.my_unit_like, _ = LikeDislikeUnit.objects.get_or_create(  # pylint: disable=no-member
+        self.my_unit_like, _ = LikeDislikeUnit.objects.get_or_create(
             item_id=BASE_ITEM_ID,
             course_id=self.my_course,
             author_id=self.user.id,
@@ -89,7 +100,7 @@ class ReportUnitExperienceTestCase(UnitExperienceTestMixin, APITestCase):
         Using self(ReportUnitExperienceTestCase).
         """
         super().setUp()
-        self.my_unit_report, _ = ReportUnit.objects.get_or_create(  # pylint: disable=no-member
+        self.my_unit_report, _ = ReportUnit.objects.get_or_create(
             item_id=BASE_ITEM_ID,
             course_id=self.my_course,
             author_id=self.user.id,
@@ -148,7 +159,7 @@ class LikeDislikeCourseExperienceTestCase(CourseExperienceTestMixin, APITestCase
         Using self(LikeDislikeCourseExperienceTestCase).
         """
         super().setUp()
-        self.my_course_like, _ = LikeDislikeCourse.objects.get_or_create(  # pylint: disable=no-member
+        self.my_course_like, _ = LikeDislikeCourse.objects.get_or_create(
             course_id=self.my_course,
             author_id=self.user.id,
             status=False,
@@ -190,7 +201,7 @@ class ReportCourseExperienceTestCase(CourseExperienceTestMixin, APITestCase):
         Using self(ReportCourseExperienceTestCase).
         """
         super().setUp()
-        self.my_course_report, _ = ReportCourse.objects.get_or_create(  # pylint: disable=no-member
+        self.my_course_report, _ = ReportCourse.objects.get_or_create(
             course_id=self.my_course,
             author_id=self.user.id,
             reason="Sexual content",
@@ -240,7 +251,7 @@ class FeedbackCourseExperienceTestCase(CourseExperienceTestMixin, APITestCase):
         Using self(FeedbackCourseExperienceTestCase).
         """
         super().setUp()
-        self.my_course_feedback, _ = FeedbackCourse.objects.get_or_create(  # pylint: disable=no-member
+        self.my_course_feedback, _ = FeedbackCourse.objects.get_or_create(
             course_id=self.my_course,
             author_id=self.user.id,
             feedback="legacy created feedback",
@@ -268,6 +279,250 @@ class FeedbackCourseExperienceTestCase(CourseExperienceTestMixin, APITestCase):
         }
 
 
+class LikeDislikeCountTestCase(APITestCase):
+    """Test LikeDislikeUnitCountView and LikeDislikeCourseCountView views"""
+
+    def setUp(self):
+        """Create the counters of units of different courses."""
+        self.user, _ = User.objects.get_or_create(username="count-viewer")
+        self.client.force_authenticate(self.user)
+        self.item_ids = [
+            "block-v1:org1+count+2023-t1+type@vertical+block@unit1",
+            "block-v1:org1+count+2023-t1+type@vertical+block@unit2",
+            "block-v1:org1+count+2023-t2+type@vertical+block@unit1",
+        ]
+
+        for index, item_id in enumerate(self.item_ids):
+            LikeDislikeUnitCount.increment(item_id, {"likes": index + 1, "dislikes": 1})
+
+        LikeDislikeCourseCount.increment("course-v1:org1+count+2023-t1", {"likes": 4})
+
+    def test_unit_counts_by_item_ids(self):
+        """
+        Test that the counters of the requested units are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - The counters of the requested units are returned.
+        """
+        item_ids = quote(",".join([self.item_ids[0], self.item_ids[2]]), safe="")
+        url_endpoint = reverse("course-experience-api:v1:like-counts-units-list") + f"?filter[item_id.in]={item_ids}"
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(self.item_ids[0], 1, 1), (self.item_ids[2], 3, 1)],
+            [
+                (element["attributes"]["item_id"], element["attributes"]["likes"], element["attributes"]["dislikes"])
+                for element in response.json()["data"]
+            ],
+        )
+
+    def test_unit_counts_by_course(self):
+        """
+        Test that the counters of every unit of a course are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - The counters of the course units are returned.
+        """
+        course_id = quote("course-v1:org1+count+2023-t1", safe="")
+        url_endpoint = reverse("course-experience-api:v1:like-counts-units-list") + f"?filter[course_id]={course_id}"
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.item_ids[:2], [element["attributes"]["item_id"] for element in response.json()["data"]])
+
+    def test_course_counts(self):
+        """
+        Test that the counters of the requested courses are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - The course counters are returned.
+        """
+        course_ids = quote("course-v1:org1+count+2023-t1,course-v1:org1+count+2023-t2", safe="")
+        url_endpoint = (
+            reverse("course-experience-api:v1:like-counts-courses-list") + f"?filter[course_id.in]={course_ids}"
+        )
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [{"course_id": "course-v1:org1+count+2023-t1", "likes": 4, "dislikes": 0}],
+            [element["attributes"] for element in response.json()["data"]],
+        )
+
+    def test_invalid_key(self):
+        """
+        Test that an invalid unit id returns a bad request.
+
+        Expected behavior:
+            - Status code 400.
+        """
+        url_endpoint = reverse("course-experience-api:v1:like-counts-units-list") + "?filter[item_id.in]=invalid"
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExperienceBulkTestCase(APITestCase):
+    """Test the bulk upsert action of the experience views"""
+
+    def setUp(self):
+        """Create the courses and a stored like of the user."""
+        self.user, _ = User.objects.get_or_create(username="bulk-user")
+        self.client.force_authenticate(self.user)
+        self.course_ids = ["course-v1:org1+bulk+2023-t1", "course-v1:org1+bulk+2023-t2"]
+        self.courses = [CourseOverview.objects.get_or_create(id=course_id)[0] for course_id in self.course_ids]
+        self.item_ids = [
+            "block-v1:org1+bulk+2023-t1+type@vertical+block@unit1",
+            "block-v1:org1+bulk+2023-t1+type@vertical+block@unit2",
+        ]
+        LikeDislikeUnit.objects.create(
+            item_id=self.item_ids[0],
+            course_id=self.courses[0],
+            author=self.user,
+            status=True,
+        )
+
+    def make_unit_like(self, item_id, like_status):
+        """Returns the data of a unit like in the create shape."""
+        return {
+            "item_id": item_id,
+            "status": like_status,
+            "course_id": {"type": "CourseOverview", "id": self.course_ids[0]},
+        }
+
+    def test_bulk_upsert_units(self):
+        """
+        Test that the stored experiences are updated and the missing ones are created.
+
+        Expected behavior:
+            - Status code 200.
+            - The experiences are returned in the request order with the per-item results.
+            - The stored like is updated and the new one is created.
+            - The unit counters include the new values.
+        """
+        url_endpoint = reverse("course-experience-api:v1:like-units-bulk")
+        data = [self.make_unit_like(self.item_ids[1], True), self.make_unit_like(self.item_ids[0], False)]
+
+        response = self.client.post(url_endpoint, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.item_ids[::-1], [element["attributes"]["item_id"] for element in response.json()["data"]])
+        self.assertEqual(
+            [(element["id"], created) for element, created in zip(response.json()["data"], [True, False])],
+            [(result["id"], result["created"]) for result in response.json()["meta"]["results"]],
+        )
+        self.assertEqual(
+            {self.item_ids[0]: False, self.item_ids[1]: True},
+            {
+                str(like.item_id): like.status
+                for like in LikeDislikeUnit.objects.filter(author=self.user)
+            },
+        )
+        self.assertEqual(
+            [(0, 1), (1, 0)],
+            [
+                (count.likes, count.dislikes)
+                for count in LikeDislikeUnitCount.objects.filter(  # pylint: disable=no-member
+                    item_id__in=self.item_ids,
+                ).order_by("item_id")
+            ],
+        )
+
+    def test_bulk_upsert_feedback(self):
+        """
+        Test that the course feedbacks are stored in bulk and added to the course aggregates.
+
+        Expected behavior:
+            - Status code 200.
+            - A feedback is created for every course with the request user as author.
+            - The aggregate of every course includes the public feedback.
+        """
+        url_endpoint = reverse("course-experience-api:v1:feedback-courses-bulk")
+        data = [
+            {
+                "rating_content": index + 3,
+                "public": True,
+                "course_id": {"type": "CourseOverview", "id": course_id},
+            }
+            for index, course_id in enumerate(self.course_ids)
+        ]
+
+        response = self.client.post(url_endpoint, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(2, FeedbackCourse.objects.filter(author=self.user).count())
+        self.assertEqual(
+            [(1, 3), (1, 4)],
+            [
+                (aggregate.feedbacks, aggregate.rating_content_total)
+                for aggregate in FeedbackCourseAggregate.objects.filter(  # pylint: disable=no-member
+                    course_id__in=self.course_ids,
+                ).order_by("course_id")
+            ],
+        )
+
+    def test_invalid_item(self):
+        """
+        Test that nothing is stored when an item is invalid.
+
+        Expected behavior:
+            - Status code 400.
+            - The stored like is not updated.
+            - The valid item is not created.
+        """
+        url_endpoint = reverse("course-experience-api:v1:like-units-bulk")
+        invalid_item = self.make_unit_like(self.item_ids[1], True)
+        invalid_item["course_id"] = "wrong-course"
+        data = [self.make_unit_like(self.item_ids[0], False), invalid_item]
+
+        response = self.client.post(url_endpoint, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [True],
+            [like.status for like in LikeDislikeUnit.objects.filter(author=self.user)],
+        )
+
+    def test_duplicated_item(self):
+        """
+        Test that the items of the same experience are rejected.
+
+        Expected behavior:
+            - Status code 400.
+            - The new experience is not created.
+        """
+        url_endpoint = reverse("course-experience-api:v1:like-units-bulk")
+        data = [self.make_unit_like(self.item_ids[1], True), self.make_unit_like(self.item_ids[1], False)]
+
+        response = self.client.post(url_endpoint, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(LikeDislikeUnit.objects.filter(item_id=self.item_ids[1]).exists())
+
+    def test_not_a_list(self):
+        """
+        Test that the request data must be a non empty list.
+
+        Expected behavior:
+            - Status code 400 for an object and an empty list.
+        """
+        url_endpoint = reverse("course-experience-api:v1:like-units-bulk")
+
+        object_response = self.client.post(url_endpoint, self.make_unit_like(self.item_ids[1], True), format="json")
+        empty_response = self.client.post(url_endpoint, [], format="json")
+
+        self.assertEqual(object_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(empty_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 # -------------------------------------------TEST PUBLIC VIEWS----------------------------------------------------------
 
 class FeedbackPublicCourseExperienceTestCase(FeedbackPublicExperienceTestMixin, APITestCase):
@@ -283,7 +538,7 @@ class FeedbackPublicCourseExperienceTestCase(FeedbackPublicExperienceTestMixin,
         Using self(FeedbackCourseExperienceTestCase).
         """
         super().setUp()
-        self.my_course_feedbacks = FeedbackCourse.objects.bulk_create(  # pylint: disable=no-member
+        self.my_course_feedbacks = FeedbackCourse.objects.bulk_create(
             [
                 FeedbackCourse(
                     course_id=course_overview_iter,
@@ -300,3 +555,139 @@ class FeedbackPublicCourseExperienceTestCase(FeedbackPublicExperienceTestMixin,
         )
 
         self.object_url_kwarg = {self.object_key: BASE_COURSE_ID}
+
+    def test_list_constant_queries(self):
+        """Test that the number of queries of a list page doesn't depend on the page size.
+
+        Expected behavior:
+            - Status code 200 for both pages.
+            - The same number of queries is executed for a page of one record and a page of many records.
+        """
+        self.client.force_authenticate(user=self.users[1])
+        url_endpoint = reverse(self.reverse_viewname_list)
+
+        with CaptureQueriesContext(connection) as single_page:
+            single_response = self.client.get(f"{url_endpoint}?page[size]=1")
+
+        with CaptureQueriesContext(connection) as full_page:
+            full_response = self.client.get(url_endpoint)
+
+        self.assertEqual(single_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(full_response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(full_response.json()["data"]), 1)
+        self.assertEqual(len(single_page.captured_queries), len(full_page.captured_queries))
+
+    def test_list_not_modified(self):
+        """Test that an anonymous request with the current ETag gets a not modified response.
+
+        Expected behavior:
+            - The first response has the ETag, Last-Modified, public Cache-Control and Vary headers.
+            - Status code 304 with an empty body for the request with the ETag.
+        """
+        self.client.force_authenticate(user=None)
+        url_endpoint = reverse(self.reverse_viewname_list)
+
+        response = self.client.get(url_endpoint)
+        not_modified_response = self.client.get(url_endpoint, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response.headers)
+        self.assertEqual("public, max-age=60", response.headers["Cache-Control"])
+        self.assertTrue({"Authorization", "Cookie"} <= set(response.headers["Vary"].split(", ")))
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], not_modified_response.headers["ETag"])
+        self.assertFalse(not_modified_response.content)
+
+    def test_list_modified(self):
+        """Test that the ETag changes when a feedback of the tenant is updated.
+
+        Expected behavior:
+            - Status code 200 for the request with the previous ETag.
+            - The new response has a different ETag.
+            - The authenticated response is private.
+        """
+        self.client.force_authenticate(user=self.users[1])
+        url_endpoint = reverse(self.reverse_viewname_list)
+        response = self.client.get(url_endpoint)
+        feedback = self.my_course_feedbacks[0]
+        feedback.feedback = "updated feedback"
+
+        feedback.save()
+        modified_response = self.client.get(url_endpoint, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], modified_response.headers["ETag"])
+        self.assertEqual({"private", "no-cache"}, set(modified_response.headers["Cache-Control"].split(", ")))
+
+
+class FeedbackPublicAggregateTestCase(APITestCase):
+    """Test PublicFeedbackCourseAggregateView view"""
+
+    reverse_viewname_list = "course-experience-api:v1:feedback-public-aggregates-list"
+
+    def setUp(self):
+        """Create the aggregates of courses of different orgs."""
+        patcher = patch("eox_nelp.course_experience.api.v1.views.configuration_helpers")
+        self.configuration_helpers_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.configuration_helpers_mock.get_current_site_orgs.return_value = ["ORG1"]
+        self.course_ids = [
+            "course-v1:org1+aggregate+2023-t1",
+            "course-v1:org1+aggregate+2023-t2",
+            "course-v1:org2+aggregate+2023-t1",
+        ]
+
+        for course_id in self.course_ids:
+            FeedbackCourseAggregate.increment(course_id, {
+                "feedbacks": 2,
+                "rating_content_count": 2,
+                "rating_content_total": 7,
+                "rating_content_3": 1,
+                "rating_content_4": 1,
+                "recommended_count": 1,
+                "not_recommended_count": 1,
+            })
+
+    def test_filter_by_course_ids(self):
+        """
+        Test that the aggregates of the requested courses are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - Only the requested courses of the tenant orgs are returned.
+            - The aggregate values are returned.
+        """
+        course_ids = quote(",".join(self.course_ids[1:]), safe="")
+        url_endpoint = reverse(self.reverse_viewname_list) + f"?filter[course_id.in]={course_ids}"
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(1, len(response.json()["data"]))
+        self.assertEqual(
+            {
+                "course_id": self.course_ids[1],
+                "feedbacks": 2,
+                "average_rating_content": 3.5,
+                "average_rating_instructors": None,
+                "recommended_percentage": 50.0,
+                "rating_content_histogram": {"0": 0, "1": 0, "2": 0, "3": 1, "4": 1, "5": 0},
+            },
+            response.json()["data"][0]["attributes"],
+        )
+
+    def test_list_tenant_aggregates(self):
+        """
+        Test that the aggregates of every course of the tenant orgs are returned without filters.
+
+        Expected behavior:
+            - Status code 200.
+            - The courses of the tenant orgs are returned.
+        """
+        response = self.client.get(reverse(self.reverse_viewname_list))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.course_ids[:2],
+            [element["attributes"]["course_id"] for element in response.json()["data"]],
+        )
@@ -5,25 +5,38 @@ Classes:
     - ExperienceView: Config of experience views
         - UnitExperienceView: config for unit-exp views
             - LikeDislikeUnitExperienceView: class-view(`/eox-nelp/api/experience/v1/like/units/`)
+              Every experience view has a bulk upsert action in `<path>/bulk/`,
+              e.g `/eox-nelp/api/experience/v1/like/units/bulk/`
             - ReportUnitExperienceView: class-view(`/eox-nelp/api/experience/v1/report/units/`)
         - CourseExperienceView: config for course-exp views
             - LikeDislikeCourseExperienceView: class-view(`/eox-nelp/api/experience/v1/like/courses/`)
             - ReportCourseExperienceView: class-view(`/eox-nelp/api/experience/v1/report/courses/`)
             - FeedbackCourseExperienceView: class-view(`/eox-nelp/api/experience/v1/feedback/courses/`)
+- ExperienceCountView: General config of the experience counters
+    - LikeDislikeUnitCountView: class-view(`/eox-nelp/api/experience/v1/like/counts/units/`)
+    - LikeDislikeCourseCountView: class-view(`/eox-nelp/api/experience/v1/like/counts/courses/`)
     - PublicBaseJsonAPIView: General config of rest json api
         - PublicFeedbackCourseExperienceView: class-view(`/eox-nelp/api/experience/v1/feedback/public/courses/`)
+        - PublicFeedbackCourseAggregateView: class-view(`/eox-nelp/api/experience/v1/feedback/public/aggregates/`)
 """
+import hashlib
+
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Count, Max
 from django.http import Http404
 from django.http.request import QueryDict
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
 from opaque_keys import InvalidKeyError
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework_json_api.django_filters import DjangoFilterBackend
 from rest_framework_json_api.filters import OrderingFilter, QueryParameterValidationFilter
 from rest_framework_json_api.metadata import JSONAPIMetadata
@@ -35,17 +48,29 @@ from rest_framework_json_api.views import ModelViewSet, ReadOnlyModelViewSet
 
 from eox_nelp.course_experience.models import (
     FeedbackCourse,
+    FeedbackCourseAggregate,
     LikeDislikeCourse,
+    LikeDislikeCourseCount,
     LikeDislikeUnit,
+    LikeDislikeUnitCount,
     ReportCourse,
     ReportUnit,
 )
 from eox_nelp.edxapp_wrapper.site_configuration import configuration_helpers
 
-from .filters import FeedbackCourseFieldsFilter
+from .filters import (
+    FeedbackCourseAggregateFilter,
+    FeedbackCourseFieldsFilter,
+    LikeDislikeCourseCountFilter,
+    LikeDislikeUnitCountFilter,
+)
+from .planning import plan_queryset
 from .serializers import (
+    FeedbackCourseAggregateSerializer,
     FeedbackCourseExperienceSerializer,
+    LikeDislikeCourseCountSerializer,
     LikeDislikeCourseExperienceSerializer,
+    LikeDislikeUnitCountSerializer,
     LikeDislikeUnitExperienceSerializer,
     ReportCourseExperienceSerializer,
     ReportUnitExperienceSerializer,
@@ -62,6 +87,8 @@ except ImportError:
 INVALID_KEY_ERROR = {
     "error": "bad opaque key(item_id or course_id) `InvalidKeyError`"
 }
+BULK_MAX_ITEMS = 100
+PUBLIC_CACHE_MAX_AGE = 60
 
 
 class BaseJsonAPIView(ModelViewSet):
@@ -101,12 +128,14 @@ class ExperienceView(BaseJsonAPIView):
         BaseJsonAPIView: Inherited for the rest json api config.
     """
     def get_queryset(self, *args, **kwargs):
-        """Filter the queryset before being used.
+        """Filter the queryset before being used, the relations used by the serializer are loaded in the same query.
 
         Returns:
             Queryset: queysyset using the super method, but filtered.
         """
-        return super().get_queryset(*args, **kwargs).filter(author_id=self.request.user.id).order_by('id')
+        experience_qs = super().get_queryset(*args, **kwargs).filter(author_id=self.request.user.id).order_by('id')
+
+        return plan_queryset(experience_qs, self.get_serializer_class())
 
     def get_object(self):
         try:
@@ -154,6 +183,82 @@ class ExperienceView(BaseJsonAPIView):
         except InvalidKeyError as exc:
             raise ValidationError(INVALID_KEY_ERROR) from exc
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    @audit_drf_api(
+        action="eox-nelp-course-experience-api-v1-experienceviewset:bulk",
+        data_filter=["username", "item_id", "course_id"],
+        method_name="eox_nelp_audited_experience_bulk",
+        save_all_parameters=True,
+    )
+    def bulk(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """Create or update a list of experiences of the request user in a single transaction.
+        The items are validated together, so if an item is invalid nothing is stored and the
+        errors are returned in the item position.
+
+        Args:
+            request: the request with the list of experiences, every item has the create shape.
+
+        Returns:
+            The stored experiences in the items order and the per-item results in the meta
+            object, e.g {"results": [{"id": "3", "created": true}]}.
+        """
+        if not isinstance(request.data, list) or not 0 < len(request.data) <= BULK_MAX_ITEMS:
+            raise ValidationError({"error": f"expected a list of 1 to {BULK_MAX_ITEMS} experiences"})
+
+        author = f'{{"type": "User", "id": "{request.user.id}"}}'
+        serializer = self.get_serializer(
+            data=[{**item, "author": author} if isinstance(item, dict) else item for item in request.data],
+            many=True,
+            # The stored experiences are updated, so the unique together validation doesn't apply.
+            validators=[],
+        )
+
+        try:
+            serializer.is_valid(raise_exception=True)
+        except InvalidKeyError as exc:
+            raise ValidationError(INVALID_KEY_ERROR) from exc
+
+        model = serializer.child.Meta.model
+        key_model_field = model._meta.get_field(self.lookup_field)  # pylint: disable=protected-access
+        keys = [
+            key_model_field.to_python(getattr(item[self.lookup_field], "pk", item[self.lookup_field]))
+            for item in serializer.validated_data
+        ]
+
+        if len(set(keys)) != len(keys):
+            raise ValidationError([
+                {self.lookup_field: ["The experience is duplicated in the request."]} if keys.count(key) > 1 else {}
+                for key in keys
+            ])
+
+        results = model.objects.bulk_upsert(
+            request.user,
+            self.lookup_field,
+            [
+                {name: value for name, value in item.items() if name != "author"}
+                for item in serializer.validated_data
+            ],
+        )
+        # The records are read again, since some databases don't return the primary keys of a bulk insert.
+        records = {
+            getattr(record, key_model_field.attname): record
+            for record in self.get_queryset().filter(**{f"{key_model_field.attname}__in": keys})
+        }
+        instances = [records[key] for key in keys]
+        response_serializer = self.get_serializer(
+            instances,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                "bulk_results": [
+                    {"id": str(instance.pk), "created": created}
+                    for instance, (_, created) in zip(instances, results)
+                ],
+            },
+        )
+
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
     def change_author_data_2_request_user(self, request):
         """Set the author object based in the request user.
 
@@ -327,7 +432,7 @@ class LikeDislikeUnitExperienceView(UnitExperienceView):
     }
     ```
     """
-    queryset = LikeDislikeUnit.objects.all()  # pylint: disable=no-member
+    queryset = LikeDislikeUnit.objects.all()
     serializer_class = LikeDislikeUnitExperienceSerializer
     resource_name = "LikeDislikeUnit"
 
@@ -461,7 +566,7 @@ class ReportUnitExperienceView(UnitExperienceView):
     }
     ```
     """
-    queryset = ReportUnit.objects.all()  # pylint: disable=no-member
+    queryset = ReportUnit.objects.all()
     serializer_class = ReportUnitExperienceSerializer
     resource_name = "ReportUnit"
 
@@ -594,7 +699,7 @@ class LikeDislikeCourseExperienceView(CourseExperienceView):
     }
     ```
     """
-    queryset = LikeDislikeCourse.objects.all()  # pylint: disable=no-member
+    queryset = LikeDislikeCourse.objects.all()
     serializer_class = LikeDislikeCourseExperienceSerializer
     resource_name = "LikeDislikeCourse"
 
@@ -726,7 +831,7 @@ class ReportCourseExperienceView(CourseExperienceView):
     }
     ```
     """
-    queryset = ReportCourse.objects.all()  # pylint: disable=no-member
+    queryset = ReportCourse.objects.all()
     serializer_class = ReportCourseExperienceSerializer
     resource_name = "ReportCourse"
 
@@ -876,11 +981,132 @@ class FeedbackCourseExperienceView(CourseExperienceView):
     }
     ```
     """
-    queryset = FeedbackCourse.objects.all()  # pylint: disable=no-member
+    queryset = FeedbackCourse.objects.all()
     serializer_class = FeedbackCourseExperienceSerializer
     resource_name = "FeedbackCourse"
 
 
+class ExperienceCountView(ReadOnlyModelViewSet):
+    """Class to configure the views that return the experience counters, the counters of many
+    objects are returned by a single query over the counters table.
+
+    Ancestors:
+        ReadOnlyModelViewSet : Django rest json api ReadOnlyModelViewSet
+    """
+    allowed_methods = ["GET"]
+    http_method_names = ['get']
+    authentication_classes = (JwtAuthentication, SessionAuthenticationAllowInactiveUser)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = JsonApiPageNumberPagination
+    renderer_classes = [JSONRenderer, BrowsableAPIRenderer] if getattr(settings, 'DEBUG', None) else [JSONRenderer]
+    filter_backends = [
+        QueryParameterValidationFilter,
+        DjangoFilterBackend,
+    ]
+
+    def get_queryset(self, *args, **kwargs):
+        """Returns the counters ordered by id for a stable pagination."""
+        return super().get_queryset(*args, **kwargs).order_by("id")
+
+    def get_object(self):
+        """Disallow the specific retrieve, the counters are filtered in the list endpoint."""
+        raise Http404
+
+    def list(self, request, *args, **kwargs):
+        try:
+            return super().list(request, *args, **kwargs)
+        except InvalidKeyError as exc:
+            raise ValidationError(INVALID_KEY_ERROR) from exc
+
+
+class LikeDislikeUnitCountView(ExperienceCountView):
+    """View that returns the like and dislike counters of the units.
+    Ancestors:
+        ExperienceCountView: Base for the experience counters views.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/experience/v1/like/counts/units/
+
+    #### Allowed to query param
+    - `filter[item_id.in]`: Comma separated unit ids.
+    - `filter[course_id]`: Course id, returns the counters of every unit of the course.
+
+    Query params are url encoded.eg item_id change `+`to `%2b`.
+
+    **GET Response Values**
+
+    ``` json
+        {
+            "links": {...},
+            "data": [
+                {
+                    "type": "LikeDislikeUnitCount",
+                    "id": "1",
+                    "attributes": {
+                        "item_id": "block-v1:edX+cd101+2023-t2+type@vertical+block@0b3a4f2f4b5f4a6a",
+                        "course_id": "course-v1:edX+cd101+2023-t2",
+                        "likes": 12,
+                        "dislikes": 3
+                    }
+                }
+            ],
+            "meta": {
+                "pagination": {
+                    "page": 1,
+                    "pages": 1,
+                    "count": 1
+                }
+            }
+        }
+    ```
+    """
+    queryset = LikeDislikeUnitCount.objects.all()  # pylint: disable=no-member
+    serializer_class = LikeDislikeUnitCountSerializer
+    resource_name = "LikeDislikeUnitCount"
+    filterset_class = LikeDislikeUnitCountFilter
+
+
+class LikeDislikeCourseCountView(ExperienceCountView):
+    """View that returns the like and dislike counters of the courses.
+    Ancestors:
+        ExperienceCountView: Base for the experience counters views.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/experience/v1/like/counts/courses/
+
+    #### Allowed to query param
+    - `filter[course_id.in]`: Comma separated course ids.
+
+    Query params are url encoded.eg course_id change `+`to `%2b`.
+
+    **GET Response Values**
+
+    ``` json
+        {
+            "links": {...},
+            "data": [
+                {
+                    "type": "LikeDislikeCourseCount",
+                    "id": "1",
+                    "attributes": {
+                        "course_id": "course-v1:edX+cd101+2023-t2",
+                        "likes": 40,
+                        "dislikes": 2
+                    }
+                }
+            ],
+            "meta": {...}
+        }
+    ```
+    """
+    queryset = LikeDislikeCourseCount.objects.all()  # pylint: disable=no-member
+    serializer_class = LikeDislikeCourseCountSerializer
+    resource_name = "LikeDislikeCourseCount"
+    filterset_class = LikeDislikeCourseCountFilter
+
+
 # -------------------------- ------------------------- PUBLIC VIEWS-----------------------------------------------------
 class PublicBaseJsonAPIView(ReadOnlyModelViewSet):
     """class to configure base json api parameter
@@ -900,13 +1126,14 @@ class PublicBaseJsonAPIView(ReadOnlyModelViewSet):
             Queryset filtered first by tenant org belowing the course org and then by staff or superuser permission
             for private records.
         """
-        experience_qs = ReadOnlyModelViewSet.get_queryset(self, *args, **kwargs)
+        experience_qs = plan_queryset(
+            ReadOnlyModelViewSet.get_queryset(self, *args, **kwargs),
+            self.get_serializer_class(),
+        )
 
         current_site_orgs = configuration_helpers.get_current_site_orgs()
-        org_filter = Q()  # Avoiding the `reduce()` for more readability, so a no-op filter starter is needed.
-        for org in current_site_orgs:
-            org_filter |= Q(course_id__org__iexact=org)
-        experience_qs = experience_qs.filter(org_filter)
+        # The org column is stored in lowercase, so the tenant orgs are matched by an indexed IN lookup.
+        experience_qs = experience_qs.filter(org__in=[org.lower() for org in current_site_orgs])
 
         if self.request.user.is_superuser or self.request.user.is_staff:
             return experience_qs.order_by('id')
@@ -944,6 +1171,9 @@ class PublicFeedbackCourseExperienceView(PublicBaseJsonAPIView, FeedbackCourseEx
 
     Query params are url encoded.eg course_id.id change `+`to `%2b`.
 
+    The responses have an `ETag` header, send it in the `If-None-Match` header to get
+    `304 Not Modified` while the tenant feedback doesn't change.
+
     **GET Response Values**
 
     ``` json
@@ -1045,3 +1275,125 @@ class PublicFeedbackCourseExperienceView(PublicBaseJsonAPIView, FeedbackCourseEx
     ```
     """
     filterset_class = FeedbackCourseFieldsFilter
+
+    def list(self, request, *args, **kwargs):
+        """Returns the feedback page or 304 Not Modified when the If-None-Match header has the current ETag.
+        The anonymous responses can be stored by shared caches for COURSE_EXPERIENCE_SETTINGS
+        PUBLIC_CACHE_MAX_AGE seconds, the authenticated ones are private and revalidated on every request.
+        Every response varies on the credentials, so a shared cache doesn't serve the anonymous page to
+        authenticated users.
+        """
+        etag, last_modified = self.get_list_validators()
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+
+        response.headers["ETag"] = etag
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=getattr(settings, "COURSE_EXPERIENCE_SETTINGS", {}).get(
+                    "PUBLIC_CACHE_MAX_AGE",
+                    PUBLIC_CACHE_MAX_AGE,
+                ),
+            )
+
+        return response
+
+    def get_list_validators(self):
+        """Returns the ETag and the last update time of the tenant feedback. The number of records and the
+        last update time are read from the org and updated_at index, and the ETag includes the request
+        URL and the private records visibility, since both change the returned page.
+
+        Returns:
+            tuple: Quoted ETag and the last update time, None if the tenant has no feedback.
+        """
+        orgs = sorted({org.lower() for org in configuration_helpers.get_current_site_orgs()})
+        validator = FeedbackCourse.objects.filter(org__in=orgs).aggregate(
+            count=Count("id"),
+            updated=Max("updated_at"),
+        )
+        show_private = self.request.user.is_superuser or self.request.user.is_staff
+        value = "|".join(
+            map(str, [orgs, show_private, self.request.build_absolute_uri(), validator["count"], validator["updated"]])
+        )
+
+        return f'"{hashlib.md5(value.encode("utf-8")).hexdigest()}"', validator["updated"]
+
+
+class PublicFeedbackCourseAggregateView(PublicBaseJsonAPIView):
+    """View that returns the rating aggregates of the public course feedback, the aggregates of many
+    courses are returned by a single query over the unique course_id index.
+    Ancestors:
+        PublicBaseJsonAPIView : Base for json api view configuration
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/experience/v1/feedback/public/aggregates/
+
+    #### Allowed to query param
+    - `filter[course_id.in]`: Comma separated course ids.
+
+    Query params are url encoded.eg course_id change `+`to `%2b`.
+
+    **GET Response Values**
+
+    ``` json
+        {
+            "links": {
+                "first": "http://lms.com/eox-nelp/api/experience/v1/feedback/public/aggregates/?page%5Bnumber%5D=1",
+                "last": "http://lms.com/eox-nelp/api/experience/v1/feedback/public/aggregates/?page%5Bnumber%5D=1",
+                "next": null,
+                "prev": null
+            },
+            "data": [
+                {
+                    "type": "FeedbackCourseAggregate",
+                    "id": "1",
+                    "attributes": {
+                        "course_id": "course-v1:edX+2323+232",
+                        "feedbacks": 4,
+                        "average_rating_content": 3.5,
+                        "average_rating_instructors": 4.0,
+                        "recommended_percentage": 75.0,
+                        "rating_content_histogram": {"0": 0, "1": 0, "2": 1, "3": 1, "4": 1, "5": 1}
+                    }
+                }
+            ],
+            "meta": {
+                "pagination": {
+                    "page": 1,
+                    "pages": 1,
+                    "count": 1
+                }
+            }
+        }
+    ```
+    """
+    queryset = FeedbackCourseAggregate.objects.all()  # pylint: disable=no-member
+    serializer_class = FeedbackCourseAggregateSerializer
+    resource_name = "FeedbackCourseAggregate"
+    pagination_class = JsonApiPageNumberPagination
+    renderer_classes = [JSONRenderer, BrowsableAPIRenderer] if getattr(settings, 'DEBUG', None) else [JSONRenderer]
+    filter_backends = [
+        QueryParameterValidationFilter,
+        DjangoFilterBackend,
+    ]
+    filterset_class = FeedbackCourseAggregateFilter
+
+    def get_queryset(self, *args, **kwargs):
+        """Returns the aggregates of the courses that belong to the tenant orgs."""
+        current_site_orgs = [org.lower() for org in configuration_helpers.get_current_site_orgs()]
+
+        return ReadOnlyModelViewSet.get_queryset(self, *args, **kwargs).filter(
+            org__in=current_site_orgs,
+        ).order_by("id")
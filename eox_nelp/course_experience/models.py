@@ -2,15 +2,25 @@
 Course experience models. This contains all the model related with the course user experience.
 
 Models:
+    LikeDislikeUnitCount: Store the like and dislike counters of a unit.
+    LikeDislikeCourseCount: Store the like and dislike counters of a course.
     LikeDislikeUnit: Store user decision(like or dislike) for specific unit.
     LikeDislikeCourse: Store user decision(like or dislike) for a course.
     ReportUnit: Store report reason about a specific unit.
     ReportCourse: Store report reason for a course.
+    FeedbackUnit: Store the feedback about a specific unit.
+    FeedbackCourse: Store the feedback about a course.
+    FeedbackCourseAggregate: Store the rating aggregates of the public feedback of a course.
 """
+from collections import Counter, defaultdict
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 from eventtracking import tracker
-from opaque_keys.edx.django.models import UsageKeyField
+from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from eox_nelp.edxapp_wrapper.course_overviews import CourseOverview
 from eox_nelp.utils import camel_to_snake
@@ -27,7 +37,307 @@ RATING_OPTIONS = [
 ]
 
 
-class BaseLikeDislike(models.Model):
+class BaseAggregate(models.Model):
+    """Base abstract model for the records that aggregate the experiences of an object, the values
+    are updated with F() expressions, so concurrent experiences don't overwrite each other.
+
+    attributes:
+        key_field<str>: Name of the unique field that identifies the aggregated object.
+    """
+    key_field = None
+
+    class Meta:
+        """Set model abstract"""
+        abstract = True
+
+    @classmethod
+    def get_defaults(cls, key):  # pylint: disable=unused-argument
+        """Returns the initial values of the aggregate record of the given key."""
+        return {}
+
+    @classmethod
+    def increment(cls, key, values):
+        """Adds the given values to the aggregate of an object, the record is created if it doesn't exist.
+
+        Args:
+            key<str>: Identifier of the aggregated object.
+            values<Dictionary>: Increment by field, the increment could be negative.
+        """
+        values = {field: value for field, value in values.items() if value}
+
+        if not key or not values:
+            return
+
+        cls.objects.get_or_create(defaults=cls.get_defaults(key), **{cls.key_field: key})  # pylint: disable=no-member
+        cls.objects.filter(**{cls.key_field: key}).update(  # pylint: disable=no-member
+            **{field: F(field) + value for field, value in values.items()}
+        )
+
+
+def get_course_org(course_id):
+    """Returns the lowercase org of a course, this is the normalized value used to filter the experiences by tenant.
+
+    Args:
+        course_id<CourseKey or str>: Course identifier.
+
+    Returns:
+        str: Lowercase course org, empty if there is no course.
+    """
+    if not course_id:
+        return ""
+
+    course_key = course_id if hasattr(course_id, "org") else CourseKey.from_string(str(course_id))
+
+    return course_key.org.lower()
+
+
+class ExperienceQuerySet(models.QuerySet):
+    """QuerySet of the experience records, the records created or updated in bulk get the org like the saved ones."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Sets the org of every record before the bulk insert."""
+        objs = list(objs)
+
+        for obj in objs:
+            obj.org = get_course_org(obj.course_id_id)
+
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Sets the org and the update time of every record before the bulk update."""
+        objs = list(objs)
+        now = timezone.now()
+
+        for obj in objs:
+            obj.org = get_course_org(obj.course_id_id)
+            obj.updated_at = now
+
+        return super().bulk_update(objs, {*fields, "org", "updated_at"}, *args, **kwargs)
+
+    def bulk_upsert(self, author, key_field, items):
+        """Creates or updates the experiences of an author in a single transaction. The stored record of
+        every key is updated with the item values and the missing records are created, then the
+        aggregates are incremented once by aggregated object. If a concurrent request creates one of
+        the missing records first, the transaction is rolled back and the items are upserted once
+        again, so that record is updated.
+
+        Args:
+            author<User>: Author of the experiences.
+            key_field<str>: Field that identifies an experience of the author, e.g item_id.
+            items<list>: Field values of every experience, the keys must be unique.
+
+        Returns:
+            list: Tuples of the experience and True if it was created, in the items order.
+        """
+        try:
+            return self._bulk_upsert(author, key_field, items)
+        except IntegrityError:
+            return self._bulk_upsert(author, key_field, items)
+
+    def _bulk_upsert(self, author, key_field, items):  # pylint: disable=too-many-locals
+        """Upserts the experiences in a transaction, see bulk_upsert."""
+        key_model_field = self.model._meta.get_field(key_field)  # pylint: disable=protected-access
+        aggregated = getattr(self.model, "aggregate_model", None)
+        objs = [self.model(author=author, **item) for item in items]
+        keys = [key_model_field.to_python(getattr(obj, key_model_field.attname)) for obj in objs]
+        results, contributions, update_fields = [], [], set()
+
+        with transaction.atomic(using=self.db):
+            stored = {
+                getattr(record, key_model_field.attname): record
+                for record in self.select_for_update().filter(
+                    author=author,
+                    **{f"{key_model_field.attname}__in": keys},
+                )
+            }
+
+            for obj, key, item in zip(objs, keys, items):
+                record = stored.get(key)
+                previous_contribution = None, {}
+
+                if record is None:
+                    record = obj
+                    results.append((record, True))
+                else:
+                    if aggregated:
+                        previous_contribution = record.get_aggregate_contribution()
+
+                    for name, value in item.items():
+                        setattr(record, name, value)
+
+                    update_fields.update(item)
+                    results.append((record, False))
+
+                if aggregated:
+                    # pylint: disable=protected-access
+                    record._aggregate_contribution = record.get_aggregate_contribution()
+                    contributions.append((previous_contribution, record._aggregate_contribution))
+
+            self.bulk_create([obj for obj, created in results if created])
+
+            if update_fields:
+                self.bulk_update([obj for obj, created in results if not created], update_fields)
+
+            if aggregated:
+                self.model.update_aggregates(contributions)
+
+        for obj, _ in results:
+            emit_event = getattr(obj, "emit_feedback_event", None)
+
+            if emit_event:
+                emit_event()
+
+        return results
+
+
+class BaseExperience(models.Model):
+    """Base abstract model for the experience records.
+
+    fields:
+        org<CharField>: Lowercase org of the course, populated on save and used to filter the records by tenant.
+        created_at<DateTimeField>: Creation time.
+        updated_at<DateTimeField>: Last update time, used to validate the cached listings.
+    """
+    org = models.CharField(max_length=255, blank=True, default="", db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ExperienceQuerySet.as_manager()
+
+    class Meta:
+        """Set model abstract"""
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Overrides save method in order to populate the org of the course."""
+        self.org = get_course_org(self.course_id_id)  # pylint: disable=no-member
+
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "org", "updated_at"}
+
+        super().save(*args, **kwargs)
+
+
+class BaseAggregatedExperience(BaseExperience):
+    """Base abstract model for the experience records that are added to an aggregate model, every
+    save or delete applies the difference between the stored and the current contribution.
+
+    attributes:
+        aggregate_model<BaseAggregate>: Model that keeps the aggregates, None if the experience is not aggregated.
+    """
+    aggregate_model = None
+    # Aggregate key and values of the stored experience, None if the stored values are unknown.
+    _aggregate_contribution = None
+
+    class Meta:
+        """Set model abstract"""
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keeps the aggregate contribution of the stored values, so a later save only applies the difference."""
+        instance = super().from_db(db, field_names, values)
+
+        if cls.aggregate_model and not instance.get_deferred_fields():
+            # pylint: disable=protected-access, no-member
+            instance._aggregate_contribution = instance.get_aggregate_contribution()
+
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Overrides save method in order to update the aggregates in the same transaction."""
+        if not self.aggregate_model:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            previous_contribution = self._get_previous_contribution()
+            super().save(*args, **kwargs)
+            self.update_aggregate(previous_contribution, self.get_aggregate_contribution())
+
+    def delete(self, *args, **kwargs):
+        """Overrides delete method in order to remove the experience from the aggregates."""
+        if not self.aggregate_model:
+            return super().delete(*args, **kwargs)
+
+        with transaction.atomic():
+            previous_contribution = self._get_previous_contribution()
+            result = super().delete(*args, **kwargs)
+            self.update_aggregate(previous_contribution, (None, {}))
+
+        return result
+
+    def get_aggregate_key(self):
+        """Returns the identifier of the aggregated object, by default the course id."""
+        course_id = self.course_id_id  # pylint: disable=no-member
+
+        return str(course_id) if course_id else None
+
+    def get_aggregate_contribution(self):
+        """Returns the aggregate key and the values that this experience adds to the aggregate.
+
+        Returns:
+            tuple: Aggregate key and the increment of every aggregate field.
+        """
+        return None, {}
+
+    def update_aggregate(self, previous_contribution, contribution):
+        """Applies the difference between the previous and the current contribution to the aggregates.
+
+        Args:
+            previous_contribution<tuple>: Aggregate key and values of the stored experience.
+            contribution<tuple>: Aggregate key and values of the current experience.
+        """
+        previous_key, previous_values = previous_contribution
+        key, values = contribution
+
+        if previous_key == key:
+            self.aggregate_model.increment(key, {
+                name: values.get(name, 0) - previous_values.get(name, 0)
+                for name in {*values, *previous_values}
+            })
+        else:
+            self.aggregate_model.increment(previous_key, {
+                name: -value for name, value in previous_values.items()
+            })
+            self.aggregate_model.increment(key, values)
+
+        self._aggregate_contribution = contribution
+
+    @classmethod
+    def update_aggregates(cls, contributions):
+        """Applies the difference between the previous and the current contribution of many experiences,
+        the differences are added by aggregate key, so every aggregated object is incremented once.
+
+        Args:
+            contributions<list>: Tuples of the previous and the current contribution of every experience.
+        """
+        increments = defaultdict(Counter)
+
+        for (previous_key, previous_values), (key, values) in contributions:
+            for name, value in previous_values.items():
+                increments[previous_key][name] -= value
+
+            for name, value in values.items():
+                increments[key][name] += value
+
+        for key, values in increments.items():
+            cls.aggregate_model.increment(key, values)
+
+    def _get_previous_contribution(self):
+        """Returns the contribution of the stored experience, a new experience doesn't contribute."""
+        if self._state.adding or not self.pk:
+            return None, {}
+
+        if self._aggregate_contribution is None:
+            stored = self.__class__.objects.filter(pk=self.pk).first()
+
+            return stored.get_aggregate_contribution() if stored else (None, {})
+
+        return self._aggregate_contribution
+
+
+class BaseLikeDislike(BaseAggregatedExperience):
     """Base abstract model for like and dislike records.
 
     fields:
@@ -43,8 +353,17 @@ class BaseLikeDislike(models.Model):
         """Set model abstract"""
         abstract = True
 
+    def get_aggregate_contribution(self):
+        """Returns the aggregate key and the like or dislike that this record adds to the counters."""
+        key = self.get_aggregate_key()
+
+        if self.status is None or not key:
+            return None, {}
 
-class BaseReport(models.Model):
+        return key, {"likes" if self.status else "dislikes": 1}
+
+
+class BaseReport(BaseExperience):
     """Base abstract model for reporting records.
 
     fields:
@@ -75,7 +394,7 @@ class BaseReport(models.Model):
         abstract = True
 
 
-class BaseFeedback(models.Model):
+class BaseFeedback(BaseAggregatedExperience):
     """Base abstract model for rating records.
 
     fields:
@@ -102,11 +421,33 @@ class BaseFeedback(models.Model):
 
         self.emit_feedback_event()
 
+    def get_aggregate_contribution(self):
+        """Returns the course and the aggregate values that this feedback adds to the course aggregate,
+        only the public feedback is aggregated.
+
+        Returns:
+            tuple: Course id and the increment of every aggregate field, e.g
+                ("course-v1:edX+test+2023", {"feedbacks": 1, "rating_content_count": 1, ...}).
+        """
+        course_id = self.get_aggregate_key()
+
+        if not self.public or not course_id:
+            return None, {}
+
+        values = {"feedbacks": 1}
+
+        if self.rating_content is not None:
+            values["rating_content_count"] = 1
+            values["rating_content_total"] = self.rating_content
+            values[f"rating_content_{self.rating_content}"] = 1
+
+        return course_id, values
+
     def emit_feedback_event(self):
         """Emit event base on the instance attributes."""
         class_name = camel_to_snake(self.__class__.__name__)
         event_name = f"nelc.eox_nelp.course_experience.{class_name}"
-        private_fields = {"id"}
+        private_fields = {"id", "org", "created_at", "updated_at"}
         event_data = {
             field.name: field.value_to_string(self)
             for field in self._meta.fields  # pylint: disable=no-member
@@ -116,6 +457,48 @@ class BaseFeedback(models.Model):
         tracker.emit(event_name, event_data)
 
 
+class BaseLikeDislikeCount(BaseAggregate):
+    """Base abstract model for the like and dislike counters.
+
+    fields:
+        likes<IntegerField>: Number of likes.
+        dislikes<IntegerField>: Number of dislikes.
+    """
+    likes = models.IntegerField(default=0)
+    dislikes = models.IntegerField(default=0)
+
+    class Meta:
+        """Set model abstract"""
+        abstract = True
+
+
+class LikeDislikeUnitCount(BaseLikeDislikeCount):
+    """Extends from BaseLikeDislikeCount, this model will store the counters of a specific unit.
+
+    fields:
+        item_id<UsageKeyField>: Unit identifier.
+        course_id<CourseKeyField>: Course of the unit, used to get the counters of every unit of a course.
+    """
+    item_id = UsageKeyField(max_length=255, unique=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    key_field = "item_id"
+
+    @classmethod
+    def get_defaults(cls, key):
+        """Returns the course of the unit."""
+        return {"course_id": UsageKey.from_string(key).course_key}
+
+
+class LikeDislikeCourseCount(BaseLikeDislikeCount):
+    """Extends from BaseLikeDislikeCount, this model will store the counters of a specific course.
+
+    fields:
+        course_id<CourseKeyField>: Course identifier.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    key_field = "course_id"
+
+
 class LikeDislikeUnit(BaseLikeDislike):
     """Extends from BaseLikeDislike, this model will store an opinion about a specific unit.
 
@@ -123,16 +506,23 @@ class LikeDislikeUnit(BaseLikeDislike):
         item_id<UsageKeyField>: Unit identifier.
     """
     item_id = UsageKeyField(max_length=255)
+    aggregate_model = LikeDislikeUnitCount
 
     class Meta:
         """Set constrain for author an item id"""
         unique_together = [["author", "item_id"]]
 
+    def get_aggregate_key(self):
+        """Returns the unit identifier."""
+        return str(self.item_id) if self.item_id else None
+
 
 class LikeDislikeCourse(BaseLikeDislike):
     """Extends from BaseLikeDislike, this model will store an opinion about a specific course
     and set constrains.
     """
+    aggregate_model = LikeDislikeCourseCount
+
     class Meta:
         """Set constrain for author an course id"""
         unique_together = [["author", "course_id"]]
@@ -173,6 +563,67 @@ class FeedbackUnit(BaseFeedback):
         unique_together = [["author", "item_id"]]
 
 
+class FeedbackCourseAggregate(BaseAggregate):
+    """Store the rating aggregates of the public feedback of a course, the values are updated by
+    FeedbackCourse.save with F() expressions, so concurrent feedbacks don't overwrite each other.
+
+    fields:
+        course_id<CourseKeyField>: Course identifier.
+        org<CharField>: Lowercase course organization, used to filter the aggregates of a tenant.
+        feedbacks<IntegerField>: Number of public feedbacks.
+        rating_content_count<IntegerField>: Number of feedbacks with rating_content.
+        rating_content_total<IntegerField>: Sum of rating_content.
+        rating_content_<0-5><IntegerField>: Number of feedbacks by rating_content value.
+        rating_instructors_count<IntegerField>: Number of feedbacks with rating_instructors.
+        rating_instructors_total<IntegerField>: Sum of rating_instructors.
+        recommended_count<IntegerField>: Number of feedbacks that recommend the course.
+        not_recommended_count<IntegerField>: Number of feedbacks that don't recommend the course.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    org = models.CharField(max_length=255, db_index=True)
+    feedbacks = models.IntegerField(default=0)
+    rating_content_count = models.IntegerField(default=0)
+    rating_content_total = models.IntegerField(default=0)
+    rating_content_0 = models.IntegerField(default=0)
+    rating_content_1 = models.IntegerField(default=0)
+    rating_content_2 = models.IntegerField(default=0)
+    rating_content_3 = models.IntegerField(default=0)
+    rating_content_4 = models.IntegerField(default=0)
+    rating_content_5 = models.IntegerField(default=0)
+    rating_instructors_count = models.IntegerField(default=0)
+    rating_instructors_total = models.IntegerField(default=0)
+    recommended_count = models.IntegerField(default=0)
+    not_recommended_count = models.IntegerField(default=0)
+    key_field = "course_id"
+
+    @classmethod
+    def get_defaults(cls, key):
+        """Returns the lowercase org of the course."""
+        return {"org": get_course_org(key)}
+
+    @property
+    def average_rating_content(self):
+        """Returns the average rating_content or None if there are no ratings."""
+        return self.rating_content_total / self.rating_content_count if self.rating_content_count else None
+
+    @property
+    def average_rating_instructors(self):
+        """Returns the average rating_instructors or None if there are no ratings."""
+        return self.rating_instructors_total / self.rating_instructors_count if self.rating_instructors_count else None
+
+    @property
+    def recommended_percentage(self):
+        """Returns the percentage of feedbacks that recommend the course or None if there are no answers."""
+        answers = self.recommended_count + self.not_recommended_count
+
+        return self.recommended_count * 100 / answers if answers else None
+
+    @property
+    def rating_content_histogram(self):
+        """Returns the number of feedbacks by rating_content value."""
+        return {str(value): getattr(self, f"rating_content_{value}") for value, _ in RATING_OPTIONS}
+
+
 class FeedbackCourse(BaseFeedback):
     """Extends from BaseFeedback, this model will store a report about a specific course
     and set constrains.
@@ -183,7 +634,28 @@ class FeedbackCourse(BaseFeedback):
     """
     rating_instructors = models.IntegerField(blank=True, null=True, choices=RATING_OPTIONS)
     recommended = models.BooleanField(null=True, default=True)
+    aggregate_model = FeedbackCourseAggregate
 
     class Meta:
-        """Set constrain for author an course id"""
+        """Set constrain for author an course id and the indexes of the public feedback pages by tenant."""
         unique_together = [["author", "course_id"]]
+        indexes = [
+            models.Index(fields=["org", "public", "id"], name="eox_nelp_fc_org_public_id"),
+            models.Index(fields=["org", "updated_at"], name="eox_nelp_fc_org_updated_at"),
+        ]
+
+    def get_aggregate_contribution(self):
+        """Adds the instructors rating and the recommendation to the base contribution."""
+        course_id, values = super().get_aggregate_contribution()
+
+        if not course_id:
+            return course_id, values
+
+        if self.rating_instructors is not None:
+            values["rating_instructors_count"] = 1
+            values["rating_instructors_total"] = self.rating_instructors
+
+        if self.recommended is not None:
+            values["recommended_count" if self.recommended else "not_recommended_count"] = 1
+
+        return course_id, values
@@ -3,13 +3,27 @@
 Classes:
     FeedbackCourseTestCase: Test FeedbackCourse model.
     FeedbackUnitTestCase: Test FeedbackUnit model.
+    FeedbackCourseAggregateTestCase: Test the FeedbackCourseAggregate updates.
+    LikeDislikeCountTestCase: Test the LikeDislikeUnitCount and LikeDislikeCourseCount updates.
+    ExperienceOrgTestCase: Test the org column of the experience models.
+    BulkUpsertConflictTestCase: Test the bulk_upsert retry when a concurrent request creates a record.
 """
 import unittest
 
 from django.contrib.auth import get_user_model
 from mock import patch
 
-from eox_nelp.course_experience.models import FeedbackCourse, FeedbackUnit
+from eox_nelp.course_experience.models import (
+    ExperienceQuerySet,
+    FeedbackCourse,
+    FeedbackCourseAggregate,
+    FeedbackUnit,
+    LikeDislikeCourse,
+    LikeDislikeCourseCount,
+    LikeDislikeUnit,
+    LikeDislikeUnitCount,
+    ReportCourse,
+)
 from eox_nelp.edxapp_wrapper.course_overviews import CourseOverview
 
 User = get_user_model()
@@ -84,3 +98,327 @@ class FeedbackUnitTestCase(BaseFeedbackTestCase, unittest.TestCase):
             "item_id": "block-v1:edX+cd1011+2024t1+type@vertical+block@base_item"
         }
         self.event_name = "nelc.eox_nelp.course_experience.feedback_unit"
+
+
+@patch("eox_nelp.course_experience.models.tracker")
+class FeedbackCourseAggregateTestCase(unittest.TestCase):
+    """Test class for the FeedbackCourseAggregate updates."""
+
+    def setUp(self):
+        """Setup common conditions for every test case"""
+        self.course, _ = CourseOverview.objects.get_or_create(id="course-v1:Test+Cx108+2024_T4")
+        self.other_course, _ = CourseOverview.objects.get_or_create(id="course-v1:Test+Cx109+2024_T4")
+        self.authors = [User.objects.get_or_create(username=f"aggregate-user-{index}")[0] for index in range(3)]
+
+    def tearDown(self):
+        """Remove the created feedback and aggregates."""
+        FeedbackCourse.objects.all().delete()
+        FeedbackCourseAggregate.objects.all().delete()  # pylint: disable=no-member
+
+    def get_aggregate(self, course):
+        """Returns the stored aggregate of the given course."""
+        return FeedbackCourseAggregate.objects.get(course_id=course.id)  # pylint: disable=no-member
+
+    def test_create_feedback(self, _):
+        """
+        Tests that the public feedback is added to the course aggregate.
+
+        Expected behavior:
+            - The aggregate values include the public feedback.
+            - The private feedback is not included.
+        """
+        for author, rating, public in zip(self.authors, (5, 2, 1), (True, True, False)):
+            FeedbackCourse.objects.create(
+                author=author,
+                course_id=self.course,
+                rating_content=rating,
+                rating_instructors=rating - 1,
+                recommended=rating > 3,
+                public=public,
+            )
+
+        aggregate = self.get_aggregate(self.course)
+        self.assertEqual("test", aggregate.org)
+        self.assertEqual(2, aggregate.feedbacks)
+        self.assertEqual(3.5, aggregate.average_rating_content)
+        self.assertEqual(2.5, aggregate.average_rating_instructors)
+        self.assertEqual(50, aggregate.recommended_percentage)
+        self.assertEqual(
+            {"0": 0, "1": 0, "2": 1, "3": 0, "4": 0, "5": 1},
+            aggregate.rating_content_histogram,
+        )
+
+    def test_update_feedback(self, _):
+        """
+        Tests that a rating change only applies the difference to the aggregate.
+
+        Expected behavior:
+            - The old rating is replaced by the new one.
+            - The number of feedbacks doesn't change.
+        """
+        FeedbackCourse.objects.create(
+            author=self.authors[0],
+            course_id=self.course,
+            rating_content=5,
+            rating_instructors=4,
+            public=True,
+        )
+        feedback = FeedbackCourse.objects.get(author=self.authors[0])
+
+        feedback.rating_content = 3
+        feedback.rating_instructors = None
+        feedback.recommended = False
+        feedback.save()
+
+        aggregate = self.get_aggregate(self.course)
+        self.assertEqual(1, aggregate.feedbacks)
+        self.assertEqual(3, aggregate.average_rating_content)
+        self.assertIsNone(aggregate.average_rating_instructors)
+        self.assertEqual(0, aggregate.recommended_percentage)
+        self.assertEqual(1, aggregate.rating_content_3)
+        self.assertEqual(0, aggregate.rating_content_5)
+
+    def test_change_visibility_and_course(self, _):
+        """
+        Tests that the feedback is moved between aggregates when the course or visibility change.
+
+        Expected behavior:
+            - The feedback is removed from the previous course.
+            - The private feedback is removed from the aggregate.
+        """
+        feedback = FeedbackCourse.objects.create(
+            author=self.authors[0],
+            course_id=self.course,
+            rating_content=4,
+            public=True,
+        )
+
+        feedback.course_id = self.other_course
+        feedback.save()
+
+        self.assertEqual(0, self.get_aggregate(self.course).feedbacks)
+        self.assertEqual(4, self.get_aggregate(self.other_course).average_rating_content)
+
+        feedback.public = False
+        feedback.save()
+
+        self.assertEqual(0, self.get_aggregate(self.other_course).feedbacks)
+
+    def test_delete_feedback(self, _):
+        """
+        Tests that a deleted feedback is removed from the aggregate.
+
+        Expected behavior:
+            - The aggregate doesn't include the feedback.
+        """
+        feedback = FeedbackCourse.objects.create(
+            author=self.authors[0],
+            course_id=self.course,
+            rating_content=4,
+            public=True,
+        )
+
+        feedback.delete()
+
+        aggregate = self.get_aggregate(self.course)
+        self.assertEqual(0, aggregate.feedbacks)
+        self.assertIsNone(aggregate.average_rating_content)
+
+
+class LikeDislikeCountTestCase(unittest.TestCase):
+    """Test class for the LikeDislikeUnitCount and LikeDislikeCourseCount updates."""
+
+    def setUp(self):
+        """Setup common conditions for every test case"""
+        self.course, _ = CourseOverview.objects.get_or_create(id="course-v1:test+Cx110+2024_T4")
+        self.item_id = "block-v1:test+Cx110+2024_T4+type@vertical+block@count_item"
+        self.authors = [User.objects.get_or_create(username=f"count-user-{index}")[0] for index in range(3)]
+
+    def tearDown(self):
+        """Remove the created records and counters."""
+        LikeDislikeUnit.objects.all().delete()
+        LikeDislikeCourse.objects.all().delete()
+        LikeDislikeUnitCount.objects.all().delete()  # pylint: disable=no-member
+        LikeDislikeCourseCount.objects.all().delete()  # pylint: disable=no-member
+
+    def test_unit_counters(self):
+        """
+        Tests that the unit counters follow the status changes of the records.
+
+        Expected behavior:
+            - The created likes and dislikes are counted.
+            - A status change moves the record between counters.
+            - A status without value is not counted.
+            - The counter is related to the unit course.
+        """
+        records = [
+            LikeDislikeUnit.objects.create(
+                author=author,
+                item_id=self.item_id,
+                course_id=self.course,
+                status=status,
+            )
+            for author, status in zip(self.authors, (True, True, False))
+        ]
+
+        records[0].status = False
+        records[0].save()
+        records[1].status = None
+        records[1].save()
+
+        count = LikeDislikeUnitCount.objects.get(item_id=self.item_id)  # pylint: disable=no-member
+        self.assertEqual((0, 2), (count.likes, count.dislikes))
+        self.assertEqual("course-v1:test+Cx110+2024_T4", str(count.course_id))
+
+    def test_course_counters(self):
+        """
+        Tests that the course counters are updated by the stored records.
+
+        Expected behavior:
+            - A loaded record only applies the difference of its status.
+            - A deleted record is removed from the counter.
+        """
+        for author, status in zip(self.authors, (True, False, True)):
+            LikeDislikeCourse.objects.create(
+                author=author,
+                course_id=self.course,
+                status=status,
+            )
+
+        record = LikeDislikeCourse.objects.get(author=self.authors[1])
+        record.status = True
+        record.save()
+        LikeDislikeCourse.objects.get(author=self.authors[0]).delete()
+
+        count = LikeDislikeCourseCount.objects.get(course_id=self.course.id)  # pylint: disable=no-member
+        self.assertEqual((2, 0), (count.likes, count.dislikes))
+
+
+class ExperienceOrgTestCase(unittest.TestCase):
+    """Test class for the org column of the experience models."""
+
+    def setUp(self):
+        """Setup common conditions for every test case"""
+        self.course, _ = CourseOverview.objects.get_or_create(id="course-v1:OrgTest+Cx111+2024_T4")
+        self.authors = [User.objects.get_or_create(username=f"org-user-{index}")[0] for index in range(2)]
+
+    def tearDown(self):
+        """Remove the created records."""
+        ReportCourse.objects.all().delete()
+
+    def test_org_on_save(self):
+        """
+        Tests that the lowercase course org is stored when a record is saved.
+
+        Expected behavior:
+            - The org is populated on create.
+            - The org is included in a partial save.
+        """
+        report = ReportCourse.objects.create(author=self.authors[0], course_id=self.course)
+        ReportCourse.objects.filter(id=report.id).update(org="")
+
+        report.reason = "IC"
+        report.save(update_fields=["reason"])
+
+        self.assertEqual("orgtest", ReportCourse.objects.get(id=report.id).org)
+
+    def test_org_on_bulk_create(self):
+        """
+        Tests that the org is stored for the records created in bulk.
+
+        Expected behavior:
+            - Every record has the course org.
+            - The record without course has an empty org.
+        """
+        ReportCourse.objects.bulk_create([
+            ReportCourse(author=self.authors[0], course_id=self.course),
+            ReportCourse(author=self.authors[1]),
+        ])
+
+        self.assertEqual(
+            ["orgtest", ""],
+            list(ReportCourse.objects.order_by("id").values_list("org", flat=True)),
+        )
+
+    def test_org_on_bulk_upsert(self):
+        """
+        Tests that the records created or updated by bulk_upsert have the course org.
+
+        Expected behavior:
+            - The stored record is updated and a record is created for the other course.
+            - Every record has the course org.
+        """
+        other_course, _ = CourseOverview.objects.get_or_create(id="course-v1:OtherOrg+Cx111+2024_T4")
+        ReportCourse.objects.create(author=self.authors[0], course_id=self.course)
+
+        results = ReportCourse.objects.bulk_upsert(
+            self.authors[0],
+            "course_id",
+            [{"course_id": self.course, "reason": "IC"}, {"course_id": other_course, "reason": "GV"}],
+        )
+
+        self.assertEqual([False, True], [created for _, created in results])
+        self.assertEqual(
+            [("orgtest", "IC"), ("otherorg", "GV")],
+            list(ReportCourse.objects.order_by("id").values_list("org", "reason")),
+        )
+
+
+class BulkUpsertConflictTestCase(unittest.TestCase):
+    """Test class for the bulk_upsert retry when a concurrent request creates a record."""
+
+    def setUp(self):
+        """Setup common conditions for every test case"""
+        self.course, _ = CourseOverview.objects.get_or_create(id="course-v1:test+Cx112+2024_T4")
+        self.author, _ = User.objects.get_or_create(username="bulk-conflict-user")
+        self.item_ids = [
+            "block-v1:test+Cx112+2024_T4+type@vertical+block@conflict_item",
+            "block-v1:test+Cx112+2024_T4+type@vertical+block@new_item",
+        ]
+
+    def tearDown(self):
+        """Remove the created records and counters."""
+        LikeDislikeUnit.objects.all().delete()
+        LikeDislikeUnitCount.objects.all().delete()  # pylint: disable=no-member
+
+    def test_concurrent_create(self):
+        """
+        Tests that a record created by a concurrent request after the stored records were read is
+        updated instead of failing the request.
+
+        Expected behavior:
+            - The first bulk insert fails and the items are upserted again.
+            - The concurrent record is updated and the other record is created.
+            - The counters include every record once.
+        """
+        # The concurrent request stores the record after the first read of the stored records.
+        LikeDislikeUnit.objects.create(author=self.author, item_id=self.item_ids[0], course_id=self.course, status=True)
+        stored_records = [LikeDislikeUnit.objects.none(), LikeDislikeUnit.objects.all()]
+
+        with patch.object(ExperienceQuerySet, "select_for_update", side_effect=stored_records) as select_mock:
+            results = LikeDislikeUnit.objects.bulk_upsert(
+                self.author,
+                "item_id",
+                [
+                    {"item_id": item_id, "course_id": self.course, "status": False}
+                    for item_id in self.item_ids
+                ],
+            )
+
+        self.assertEqual(2, select_mock.call_count)
+        self.assertEqual([False, True], [created for _, created in results])
+        self.assertEqual(
+            [False, False],
+            list(
+                LikeDislikeUnit.objects.filter(author=self.author).order_by("item_id").values_list("status", flat=True)
+            ),
+        )
+        self.assertEqual(
+            [(0, 1), (0, 1)],
+            [
+                (count.likes, count.dislikes)
+                for count in LikeDislikeUnitCount.objects.filter(  # pylint: disable=no-member
+                    item_id__in=self.item_ids,
+                ).order_by("item_id")
+            ],
+        )
@@ -0,0 +1,15 @@
+"""Backend for completion django app module.
+This file contains all the necessary completion dependencies from
+https://github.com/openedx/completion/tree/master/completion
+"""
+from completion.models import BlockCompletion  # pylint: disable=import-error
+
+
+def get_block_completion_model():
+    """Allow to get the BlockCompletion Model from
+    https://github.com/openedx/completion/blob/master/completion/models.py
+
+    Returns:
+        BlockCompletion Model.
+    """
+    return BlockCompletion
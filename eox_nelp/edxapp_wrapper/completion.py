@@ -0,0 +1,14 @@
+"""Wrapper completion module file.
+This contains all the required dependencies from completion.
+
+Attributes:
+    backend: Imported module by using the plugin settings.
+    BlockCompletion: Wrapper BlockCompletion model.
+"""
+from importlib import import_module
+
+from django.conf import settings
+
+backend = import_module(settings.EOX_NELP_COMPLETION_BACKEND)
+
+BlockCompletion = backend.get_block_completion_model()
@@ -3,15 +3,158 @@ Wrapper site_configuration app.
 
 This contains all the required dependencies from site_configuration
 
+The lookups get_current_site_orgs, get_value and get_value_for_org are memoized by unit of work,
+a request or a celery task, the memo is started and cleared by the receivers that are connected
+to the request_started, request_finished, task_prerun and task_postrun signals. Outside of a unit
+of work the lookups are not memoized.
+
 Attributes:
     backend:Imported site_configuration module by using the plugin settings.
     configuration_helpers: Wrapper helpers module.
 
+Functions:
+    start_memo: Start the memo of the current unit of work.
+    clear_memo: Clear the memo of the current unit of work.
+    memoized_lookups: Context manager that memoizes the lookups of the inner block.
+    get_memo_stats: Return the memo hits and misses of the current process.
+    reset_memo_stats: Remove the memo hits and misses of the current process.
 """
+import json
+import logging
+import threading
+from contextlib import contextmanager
 from importlib import import_module
 
+from crum import get_current_request
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
 backend = import_module(settings.EOX_NELP_SITE_CONFIGURATION)
+MEMOIZED_LOOKUPS = ("get_current_site_orgs", "get_value", "get_value_for_org")
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}
+
+
+class MemoizedConfigurationHelpers:
+    """Proxy of the configuration helpers module that memoizes the MEMOIZED_LOOKUPS functions,
+    every other attribute is returned from the helpers module.
+
+    Attributes:
+        helpers<module>: Configuration helpers module.
+    """
+
+    def __init__(self, helpers):
+        self.helpers = helpers
+
+    def __getattr__(self, name):
+        attribute = getattr(self.helpers, name)
+
+        return MemoizedLookup(name, attribute) if name in MEMOIZED_LOOKUPS else attribute
+
+
+class MemoizedLookup:
+    """Callable that returns the memoized result of a lookup, the memo key includes the current
+    site so the lookups of different tenants in the same unit of work are not mixed.
+    The attributes that are not defined are read and set on the wrapped function.
+
+    Attributes:
+        name<str>: Lookup name.
+        func<callable>: Wrapped lookup.
+    """
+
+    def __init__(self, name, func):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "func", func)
+
+    def __call__(self, *args, **kwargs):
+        memo = getattr(_local, "memo", None)
+
+        if memo is None:
+            return self.func(*args, **kwargs)
+
+        site = getattr(get_current_request(), "site", None)
+        key = (self.name, getattr(site, "domain", None), args, tuple(sorted(kwargs.items())))
+
+        try:
+            if key in memo:
+                _count(self.name, "hits")
+
+                return memo[key]
+        except TypeError:
+            # Unhashable arguments, e.g a list default value, are not memoized.
+            return self.func(*args, **kwargs)
+
+        _count(self.name, "misses")
+        memo[key] = self.func(*args, **kwargs)
+
+        return memo[key]
+
+    def __getattr__(self, name):
+        return getattr(self.func, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.func, name, value)
+
+
+def start_memo():
+    """Starts an empty memo for the current thread, this is the beginning of a unit of work."""
+    _local.memo = {}
+    _local.unit_stats = {"hits": 0, "misses": 0}
+
+
+def clear_memo():
+    """Removes the memo of the current thread and logs the lookups that were saved by it."""
+    unit_stats = getattr(_local, "unit_stats", None)
+    _local.memo = None
+    _local.unit_stats = None
+
+    if unit_stats and unit_stats["hits"]:
+        logger.debug("eox_nelp.site_configuration.memo %s", json.dumps(unit_stats))
+
+
+@contextmanager
+def memoized_lookups():
+    """Memoizes the configuration lookups of the inner block, if there is an active memo that is used."""
+    if getattr(_local, "memo", None) is not None:
+        yield
+        return
+
+    start_memo()
+
+    try:
+        yield
+    finally:
+        clear_memo()
+
+
+def get_memo_stats():
+    """
+    Returns the memo hits and misses of the current process.
+
+    Return:
+        <Dictionary>: Hits and misses by lookup, e.g {"get_value": {"hits": 12, "misses": 3}}.
+    """
+    with _lock:
+        return {name: dict(values) for name, values in _stats.items()}
+
+
+def reset_memo_stats():
+    """Removes the memo hits and misses of the current process."""
+    with _lock:
+        _stats.clear()
+
+
+def _count(name, result):
+    """Adds a memo hit or miss to the process and unit of work counters."""
+    with _lock:
+        values = _stats.setdefault(name, {"hits": 0, "misses": 0})
+        values[result] += 1
+
+    unit_stats = getattr(_local, "unit_stats", None)
+
+    if unit_stats is not None:
+        unit_stats[result] += 1
+
 
-configuration_helpers = backend.get_configuration_helpers()
+configuration_helpers = MemoizedConfigurationHelpers(backend.get_configuration_helpers())
@@ -0,0 +1,10 @@
+"""Test backend for completion app."""
+from mock import Mock
+
+
+def get_block_completion_model():
+    """Return test Model.
+    Returns:
+        Mock class.
+    """
+    return Mock()
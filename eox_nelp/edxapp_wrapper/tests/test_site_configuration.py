@@ -0,0 +1,131 @@
+"""This file contains all the test for the site_configuration.py file.
+
+Classes:
+    MemoizedConfigurationHelpersTestCase: Tests cases for the configuration_helpers memo.
+"""
+import unittest
+
+from crum import set_current_request
+from mock import Mock, patch
+
+from eox_nelp.edxapp_wrapper import site_configuration
+from eox_nelp.edxapp_wrapper.site_configuration import MemoizedConfigurationHelpers
+
+
+class MemoizedConfigurationHelpersTestCase(unittest.TestCase):
+    """Tests cases for the configuration_helpers memo."""
+
+    def setUp(self):
+        """Set the helpers mock and its proxy."""
+        self.helpers = Mock()
+        self.helpers.get_value.side_effect = lambda name, default=None: f"{name}-value"
+        self.configuration_helpers = MemoizedConfigurationHelpers(self.helpers)
+
+    def tearDown(self):
+        """Clear the memo, the current request and the process counters."""
+        site_configuration.clear_memo()
+        site_configuration.reset_memo_stats()
+        set_current_request(None)
+
+    def test_lookup_without_unit_of_work(self):
+        """Test that the lookups are not memoized out of a request or task.
+
+        Expected behavior:
+            - The helper is called every time.
+            - No memo values are counted.
+        """
+        self.configuration_helpers.get_value("PLATFORM_NAME")
+        self.configuration_helpers.get_value("PLATFORM_NAME")
+
+        self.assertEqual(2, self.helpers.get_value.call_count)
+        self.assertEqual({}, site_configuration.get_memo_stats())
+
+    def test_lookup_in_unit_of_work(self):
+        """Test that the lookups are resolved once by unit of work.
+
+        Expected behavior:
+            - The helper is called once by distinct arguments.
+            - The memoized value is returned.
+            - The hits and misses are counted.
+            - The memo is not used after the end of the unit of work.
+        """
+        site_configuration.start_memo()
+
+        results = [
+            self.configuration_helpers.get_value("PLATFORM_NAME"),
+            self.configuration_helpers.get_value("PLATFORM_NAME"),
+            self.configuration_helpers.get_value("PLATFORM_NAME", default="test"),
+            self.configuration_helpers.get_value("PLATFORM_NAME"),
+        ]
+        site_configuration.clear_memo()
+        self.configuration_helpers.get_value("PLATFORM_NAME")
+
+        self.assertEqual(["PLATFORM_NAME-value"] * 4, results)
+        self.assertEqual(3, self.helpers.get_value.call_count)
+        self.assertEqual({"get_value": {"hits": 2, "misses": 2}}, site_configuration.get_memo_stats())
+
+    def test_lookup_by_site(self):
+        """Test that the memo keeps the lookups of every site.
+
+        Expected behavior:
+            - The helper is called once by site.
+        """
+        with site_configuration.memoized_lookups():
+            for domain in ("lms.example.com", "other.example.com", "lms.example.com"):
+                set_current_request(Mock(site=Mock(domain=domain)))
+                self.configuration_helpers.get_current_site_orgs()
+
+        self.assertEqual(2, self.helpers.get_current_site_orgs.call_count)
+
+    def test_unhashable_arguments(self):
+        """Test that the lookups with unhashable arguments are not memoized.
+
+        Expected behavior:
+            - The helper is called every time.
+        """
+        with site_configuration.memoized_lookups():
+            self.configuration_helpers.get_value("extended_profile_fields", [])
+            self.configuration_helpers.get_value("extended_profile_fields", [])
+
+        self.assertEqual(2, self.helpers.get_value.call_count)
+
+    def test_not_memoized_attribute(self):
+        """Test that the attributes that are not lookups are returned from the helpers.
+
+        Expected behavior:
+            - The helpers attribute is returned.
+        """
+        self.assertEqual(
+            self.helpers.is_site_configuration_enabled,
+            self.configuration_helpers.is_site_configuration_enabled,
+        )
+
+    def test_lookup_mock_attributes(self):
+        """Test that the lookup attributes are read and set on the wrapped function.
+
+        Expected behavior:
+            - The return value is set on the helpers function.
+            - The call is asserted on the helpers function.
+        """
+        self.configuration_helpers.get_current_site_orgs.return_value = ["org1"]
+
+        result = self.configuration_helpers.get_current_site_orgs()
+
+        self.assertEqual(["org1"], result)
+        self.configuration_helpers.get_current_site_orgs.assert_called_once_with()
+
+    @patch("eox_nelp.edxapp_wrapper.site_configuration.logger")
+    def test_log_saved_lookups(self, logger_mock):
+        """Test that the saved lookups of a unit of work are logged when the memo is cleared.
+
+        Expected behavior:
+            - The number of hits and misses is logged.
+        """
+        with site_configuration.memoized_lookups():
+            self.configuration_helpers.get_value_for_org("org1", "PLATFORM_NAME")
+            self.configuration_helpers.get_value_for_org("org1", "PLATFORM_NAME")
+
+        logger_mock.debug.assert_called_once_with(
+            "eox_nelp.site_configuration.memo %s",
+            '{"hits": 1, "misses": 1}',
+        )
@@ -0,0 +1,60 @@
+"""
+Management command to export the course metrics of a tenant into a CSV or Parquet file.
+
+The file is stored with the default storage and its url is printed, the export can be
+enqueued as a celery task with the `--async` flag.
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from eox_nelp.stats.exports import CSV_FORMAT, EXPORT_FORMATS
+from eox_nelp.stats.tasks import export_courses_stats
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Exports the course metrics of a tenant.
+
+    Examples:
+        # Write a csv file
+        python manage.py lms export_stats_metrics --tenant lms.example.com
+
+        # Enqueue a parquet export
+        python manage.py lms export_stats_metrics --tenant lms.example.com --format parquet --async
+    """
+
+    help = "Export the course metrics of a tenant into a CSV or Parquet file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=str,
+            required=True,
+            help="Domain of the tenant to export",
+        )
+        parser.add_argument(
+            "--format",
+            type=str,
+            choices=EXPORT_FORMATS,
+            default=CSV_FORMAT,
+            help="Format of the exported file",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            help="Enqueue the export as a celery task",
+        )
+
+    def handle(self, *args, **options):
+        if options["async"]:
+            export_courses_stats.delay(options["tenant"], options["format"])
+            logger.info("Queued the stats export of %s", options["tenant"])
+
+            return
+
+        export = export_courses_stats(options["tenant"], options["format"])
+
+        self.stdout.write(f"Exported {export['total_courses']} courses to {export['url']}")
@@ -0,0 +1,63 @@
+"""This file contains test cases for the Nelp command `export_stats_metrics`.
+
+TestCases:
+- ExportStatsMetricsCommandTestCase
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+
+class ExportStatsMetricsCommandTestCase(TestCase):
+    """Test `export_stats_metrics` management command."""
+
+    @patch("eox_nelp.management.commands.export_stats_metrics.export_courses_stats")
+    def test_run_export(self, mock_task):
+        """
+        Test command runs the export in the current process.
+
+        Expected behavior:
+        - The task is called once with the tenant and the default format.
+        - The url of the file is printed.
+        """
+        mock_task.return_value = {"total_courses": 3, "url": "https://storage.com/file.csv"}
+        output = StringIO()
+
+        call_command("export_stats_metrics", "--tenant", "tenant.com", stdout=output)
+
+        mock_task.assert_called_once_with("tenant.com", "csv")
+        self.assertIn("https://storage.com/file.csv", output.getvalue())
+
+    @patch("eox_nelp.management.commands.export_stats_metrics.export_courses_stats")
+    def test_run_async_export(self, mock_task):
+        """
+        Test command enqueues the export with the --async flag.
+
+        Expected behavior:
+        - The task is enqueued with the tenant and format.
+        - The task is not called in the current process.
+        """
+        call_command("export_stats_metrics", "--tenant", "tenant.com", "--format", "parquet", "--async")
+
+        mock_task.delay.assert_called_once_with("tenant.com", "parquet")
+        mock_task.assert_not_called()
+
+    def test_invalid_format(self):
+        """
+        Test command rejects an unknown format.
+
+        Expected behavior:
+        - CommandError is raised.
+        """
+        self.assertRaises(
+            CommandError,
+            call_command,
+            "export_stats_metrics",
+            "--tenant",
+            "tenant.com",
+            "--format",
+            "xlsx",
+        )
@@ -0,0 +1,92 @@
+"""This file contains test cases for the Nelp command `warm_stats_cache`.
+
+TestCases:
+- WarmStatsCacheCommandTestCase
+"""
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from eox_nelp.management.commands.warm_stats_cache import warm_tenant
+
+
+class WarmStatsCacheCommandTestCase(TestCase):
+    """Test `warm_stats_cache` management command."""
+
+    def setUp(self):
+        """Patch the tenants routes and the warm task."""
+        tenants_patcher = patch("eox_nelp.management.commands.warm_stats_cache.get_tenants_orgs")
+        task_patcher = patch("eox_nelp.management.commands.warm_stats_cache.warm_tenant_stats_cache")
+        self.tenants_mock = tenants_patcher.start()
+        self.task_mock = task_patcher.start()
+        self.addCleanup(tenants_patcher.stop)
+        self.addCleanup(task_patcher.stop)
+        self.tenants_mock.return_value = {"tenant.com": ["org1"], "other.com": ["org2"]}
+
+    def test_run_all_tenants(self):
+        """
+        Test command warms every route tenant in the current process.
+
+        Expected behavior:
+        - The task is called once for each tenant.
+        """
+        call_command("warm_stats_cache")
+
+        self.assertEqual(["tenant.com", "other.com"], [call.args[0] for call in self.task_mock.call_args_list])
+
+    def test_run_single_tenant(self):
+        """
+        Test command warms just the tenants of the --tenant argument.
+
+        Expected behavior:
+        - The task is called once with the given tenant.
+        - The routes are not read.
+        """
+        call_command("warm_stats_cache", "--tenant", "tenant.com")
+
+        self.task_mock.assert_called_once_with("tenant.com")
+        self.tenants_mock.assert_not_called()
+
+    @patch("eox_nelp.management.commands.warm_stats_cache.run_in_process_pool")
+    def test_run_parallel(self, mock_pool):
+        """
+        Test command uses the process pool with the --workers argument.
+
+        Expected behavior:
+        - The pool is limited by the number of tenants.
+        """
+        mock_pool.return_value = [None, None]
+
+        call_command("warm_stats_cache", "--workers", "4")
+
+        mock_pool.assert_called_once_with(warm_tenant, ["tenant.com", "other.com"], max_workers=2)
+
+    def test_run_async(self):
+        """
+        Test command enqueues a task by tenant with the --async flag.
+
+        Expected behavior:
+        - The task is enqueued for each tenant.
+        - The task is not called in the current process.
+        """
+        call_command("warm_stats_cache", "--async")
+
+        self.assertEqual(2, self.task_mock.delay.call_count)
+        self.task_mock.assert_not_called()
+
+    def test_failed_tenant(self):
+        """
+        Test command continues with the next tenants when a tenant fails.
+
+        Expected behavior:
+        - Every tenant is processed.
+        - CommandError is raised with the failed tenant.
+        """
+        self.task_mock.side_effect = [Exception("Error"), True]
+
+        with self.assertRaisesRegex(CommandError, "tenant.com"):
+            call_command("warm_stats_cache")
+
+        self.assertEqual(2, self.task_mock.call_count)
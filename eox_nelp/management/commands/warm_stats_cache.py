@@ -0,0 +1,86 @@
+"""
+Management command to pre-calculate the cached stats of every eox-tenant route.
+
+The tenants are processed in parallel by a bounded pool of processes, every process loads the
+settings of a single tenant. This can be scheduled with cron, a tenant that is already being
+warmed by another run is skipped. Use the `--async` flag to enqueue a celery task by tenant.
+"""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eox_nelp.stats.tasks import warm_tenant_stats_cache
+from eox_nelp.stats.utils import get_tenants_orgs, run_in_process_pool
+
+logger = logging.getLogger(__name__)
+
+
+def warm_tenant(tenant):
+    """Warms the stats cache of a tenant and returns the tenant if it failed, None otherwise."""
+    try:
+        warm_tenant_stats_cache(tenant)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception("The stats cache of %s couldn't be warmed.", tenant)
+
+        return tenant
+
+    return None
+
+
+class Command(BaseCommand):
+    """
+    Pre-calculates get_cached_courses, get_courses_metrics, get_learners_metric and
+    get_instructors_metric for every tenant.
+
+    Examples:
+        # Warm all the tenants, four at a time
+        python manage.py lms warm_stats_cache --workers 4
+
+        # Warm a single tenant
+        python manage.py lms warm_stats_cache --tenant lms.example.com
+
+        # Enqueue a celery task by tenant
+        python manage.py lms warm_stats_cache --async
+    """
+
+    help = "Pre-calculate the cached stats of every tenant"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=str,
+            action="append",
+            help="Domain of a tenant to warm, it can be repeated. Default all the eox-tenant routes",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Max number of tenants processed in parallel",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            help="Enqueue a celery task by tenant",
+        )
+
+    def handle(self, *args, **options):
+        tenants = options["tenant"] or list(get_tenants_orgs())
+        workers = min(max(options["workers"], 1), len(tenants))
+        logger.info("Warming the stats cache of %s tenants.", len(tenants))
+
+        if options["async"]:
+            for tenant in tenants:
+                warm_tenant_stats_cache.delay(tenant)
+
+            return
+
+        if workers > 1:
+            results = run_in_process_pool(warm_tenant, tenants, max_workers=workers)
+        else:
+            results = [warm_tenant(tenant) for tenant in tenants]
+
+        failed_tenants = [tenant for tenant in results if tenant]
+
+        if failed_tenants:
+            raise CommandError(f"The stats cache of {', '.join(failed_tenants)} couldn't be warmed")
@@ -0,0 +1,27 @@
+# Generated by Django 4.0.10 on 2026-10-17 10:12
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0016_data_update_sc_to_ic_report_reason'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStructureSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255, unique=True)),
+                ('display_name', models.CharField(blank=True, default='', max_length=255)),
+                ('sections', models.PositiveIntegerField(default=0)),
+                ('sub_sections', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('block_types', models.JSONField(default=dict)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.0.10 on 2026-10-17 11:03
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0017_coursestructuresummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStatsSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255, unique=True)),
+                ('learners', models.PositiveIntegerField(default=0)),
+                ('instructors', models.PositiveIntegerField(default=0)),
+                ('certificates', models.JSONField(default=dict)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TenantStatsSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant', models.CharField(max_length=255, unique=True)),
+                ('orgs', models.JSONField(default=list)),
+                ('learners', models.PositiveIntegerField(default=0)),
+                ('instructors', models.PositiveIntegerField(default=0)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
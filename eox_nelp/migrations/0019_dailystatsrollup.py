@@ -0,0 +1,29 @@
+# Generated by Django 4.0.10 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0018_stats_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStatsRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant', models.CharField(max_length=255)),
+                ('course_id', models.CharField(blank=True, default='', max_length=255)),
+                ('date', models.DateField(db_index=True)),
+                ('new_enrollments', models.PositiveIntegerField(default=0)),
+                ('active_learners', models.PositiveIntegerField(default=0)),
+                ('certificates', models.JSONField(default=dict)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('tenant', 'course_id', 'date')},
+            },
+        ),
+    ]
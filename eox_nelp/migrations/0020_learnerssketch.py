@@ -0,0 +1,22 @@
+# Generated by Django 4.0.10 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0019_dailystatsrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearnersSketch',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=300, unique=True)),
+                ('registers', models.BinaryField()),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
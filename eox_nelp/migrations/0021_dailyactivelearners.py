@@ -0,0 +1,27 @@
+# Generated by Django 4.0.10 on 2026-10-17 15:20
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0020_learnerssketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActiveLearners',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('date', models.DateField(db_index=True)),
+                ('users', models.BinaryField()),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('course_id', 'date')},
+            },
+        ),
+    ]
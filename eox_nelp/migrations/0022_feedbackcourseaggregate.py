@@ -0,0 +1,64 @@
+# Generated by Django 4.0.10 on 2026-10-17 16:05
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+import opaque_keys.edx.django.models
+from opaque_keys.edx.keys import CourseKey
+
+
+def backfill_aggregates(apps, schema_editor):
+    """Creates the aggregates of the stored public course feedback."""
+    FeedbackCourse = apps.get_model('eox_nelp', 'FeedbackCourse')
+    FeedbackCourseAggregate = apps.get_model('eox_nelp', 'FeedbackCourseAggregate')
+    db_alias = schema_editor.connection.alias
+    rows = FeedbackCourse.objects.using(db_alias).filter(public=True, course_id__isnull=False).values('course_id').annotate(
+        feedbacks=Count('id'),
+        rating_content_count=Count('rating_content'),
+        rating_content_total=Coalesce(Sum('rating_content'), 0),
+        rating_instructors_count=Count('rating_instructors'),
+        rating_instructors_total=Coalesce(Sum('rating_instructors'), 0),
+        recommended_count=Count('id', filter=Q(recommended=True)),
+        not_recommended_count=Count('id', filter=Q(recommended=False)),
+        **{f'rating_content_{value}': Count('id', filter=Q(rating_content=value)) for value in range(6)},
+    ).order_by()
+
+    FeedbackCourseAggregate.objects.using(db_alias).bulk_create(
+        [
+            FeedbackCourseAggregate(org=CourseKey.from_string(str(row['course_id'])).org.lower(), **row)
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0021_dailyactivelearners'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackCourseAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255, unique=True)),
+                ('org', models.CharField(db_index=True, max_length=255)),
+                ('feedbacks', models.IntegerField(default=0)),
+                ('rating_content_count', models.IntegerField(default=0)),
+                ('rating_content_total', models.IntegerField(default=0)),
+                ('rating_content_0', models.IntegerField(default=0)),
+                ('rating_content_1', models.IntegerField(default=0)),
+                ('rating_content_2', models.IntegerField(default=0)),
+                ('rating_content_3', models.IntegerField(default=0)),
+                ('rating_content_4', models.IntegerField(default=0)),
+                ('rating_content_5', models.IntegerField(default=0)),
+                ('rating_instructors_count', models.IntegerField(default=0)),
+                ('rating_instructors_total', models.IntegerField(default=0)),
+                ('recommended_count', models.IntegerField(default=0)),
+                ('not_recommended_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.0.10 on 2026-10-17 17:10
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import opaque_keys.edx.django.models
+
+
+def backfill_counts(apps, schema_editor):
+    """Creates the like and dislike counters of the stored records."""
+    db_alias = schema_editor.connection.alias
+
+    for model_name, count_model_name, key_field, key_filter in (
+        ('LikeDislikeUnit', 'LikeDislikeUnitCount', 'item_id', {}),
+        ('LikeDislikeCourse', 'LikeDislikeCourseCount', 'course_id', {'course_id__isnull': False}),
+    ):
+        model = apps.get_model('eox_nelp', model_name)
+        count_model = apps.get_model('eox_nelp', count_model_name)
+        rows = model.objects.using(db_alias).filter(status__isnull=False, **key_filter).values(key_field).annotate(
+            likes=Count('id', filter=Q(status=True)),
+            dislikes=Count('id', filter=Q(status=False)),
+        ).order_by()
+        counts = []
+
+        for row in rows:
+            if key_field == 'item_id':
+                row['course_id'] = row['item_id'].course_key
+
+            counts.append(count_model(**row))
+
+        count_model.objects.using(db_alias).bulk_create(counts, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0022_feedbackcourseaggregate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LikeDislikeCourseCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.IntegerField(default=0)),
+                ('dislikes', models.IntegerField(default=0)),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LikeDislikeUnitCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.IntegerField(default=0)),
+                ('dislikes', models.IntegerField(default=0)),
+                ('item_id', opaque_keys.edx.django.models.UsageKeyField(max_length=255, unique=True)),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(db_index=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.0.10 on 2026-10-17 18:02
+
+from django.db import migrations, models
+
+EXPERIENCE_MODELS = [
+    'FeedbackCourse',
+    'FeedbackUnit',
+    'LikeDislikeCourse',
+    'LikeDislikeUnit',
+    'ReportCourse',
+    'ReportUnit',
+]
+
+
+def backfill_org(apps, schema_editor):
+    """
+    Set the lowercase course org of the stored experience records, the records are updated by course.
+    """
+    db_alias = schema_editor.connection.alias
+
+    for model_name in EXPERIENCE_MODELS:
+        model = apps.get_model('eox_nelp', model_name)
+        course_ids = model.objects.using(db_alias).filter(
+            course_id__isnull=False,
+        ).values_list('course_id', flat=True).distinct().order_by()
+
+        for course_id in course_ids:
+            model.objects.using(db_alias).filter(course_id=course_id).update(org=course_id.org.lower())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0023_likedislikecounts'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=model_name.lower(),
+                name='org',
+                field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+            )
+            for model_name in EXPERIENCE_MODELS
+        ],
+        migrations.AddIndex(
+            model_name='feedbackcourse',
+            index=models.Index(fields=['org', 'public', 'id'], name='eox_nelp_fc_org_public_id'),
+        ),
+        migrations.RunPython(backfill_org, migrations.RunPython.noop),
+    ]
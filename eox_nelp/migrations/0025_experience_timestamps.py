@@ -0,0 +1,44 @@
+# Generated by Django 4.0.10 on 2026-10-17 21:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+EXPERIENCE_MODELS = [
+    'FeedbackCourse',
+    'FeedbackUnit',
+    'LikeDislikeCourse',
+    'LikeDislikeUnit',
+    'ReportCourse',
+    'ReportUnit',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eox_nelp', '0024_experience_org'),
+    ]
+
+    operations = [
+        *[
+            operation
+            for model_name in EXPERIENCE_MODELS
+            for operation in (
+                migrations.AddField(
+                    model_name=model_name.lower(),
+                    name='created_at',
+                    field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+                    preserve_default=False,
+                ),
+                migrations.AddField(
+                    model_name=model_name.lower(),
+                    name='updated_at',
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            )
+        ],
+        migrations.AddIndex(
+            model_name='feedbackcourse',
+            index=models.Index(fields=['org', 'updated_at'], name='eox_nelp_fc_org_updated_at'),
+        ),
+    ]
@@ -6,25 +6,37 @@ Functions:
     block_completion_progress_publisher: it will publish the user progress based on post_save signal.
     course_grade_changed_progress_publisher: it will publish the user progress based on COURSE_GRADE_CHANGED signal.
     create_course_notifications: this will create upcoming notifications based on the sub-section due dates.
+    update_course_structure_summary: this will update the course structure summary used by the stats.
+    stats_enrollment_handler: Updates the course stats when a learner is enrolled.
+    stats_signup_source_handler: Updates the site learners sketch when a signup source is created.
+    stats_block_completion_handler: Updates the course active learners when a block is completed.
+    stats_certificate_handler: Updates the course stats when a certificate is created.
+    stats_course_published_handler: Updates the course stats when a course is published.
     certificate_publisher: Publish the user certificate data to the NELC certificates service.
     include_tracker_context: Append tracker context to async task data.
     update_async_tracker_context: Update tracker context based on the task data.
+    start_configuration_memo: Starts the site configuration memo of a request or task.
+    clear_configuration_memo: Clears the site configuration memo of a request or task.
     emit_subsection_attempt_event: Emits an event when a graded subsection has been attempted.
     mt_course_completion_handler: Updates mt training stage based on completion events.
     mt_course_passed_handler: Updates mt training stage based on COURSE_GRADE_NOW_PASSED signal.
     mt_course_failed_handler: Updates mt training stage based on COURSE_GRADE_NOW_FAILED signal.
 """
 import logging
+from functools import partial
 
 from crum import get_current_user
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from eox_core.edxapp_wrapper.grades import get_course_grade_factory
 from eox_core.edxapp_wrapper.users import get_user_signup_source
 from eox_tenant.tenant_wise.proxies import TenantSiteConfigProxy
 from eventtracking import tracker
 from openedx_events.learning.data import CertificateData, CourseData, UserData, UserPersonalData
 
+from eox_nelp.edxapp_wrapper import site_configuration
 from eox_nelp.external_certificates.tasks import create_external_certificate
 from eox_nelp.notifications.tasks import create_course_notifications as create_course_notifications_task
 from eox_nelp.payment_notifications.models import PaymentNotification
@@ -37,6 +49,12 @@ from eox_nelp.signals.tasks import (
     update_mt_training_stage,
 )
 from eox_nelp.signals.utils import _generate_external_certificate_data, get_completed_and_graded
+from eox_nelp.stats import sketches
+from eox_nelp.stats.activity import is_active_learner_marked
+from eox_nelp.stats.cache import invalidate_course_stats
+from eox_nelp.stats.snapshots import increment_course_learners, schedule_tenant_snapshot_refresh
+from eox_nelp.stats.tasks import refresh_course_stats_snapshot, update_active_learners
+from eox_nelp.stats.tasks import update_course_structure_summary as update_course_structure_summary_task
 
 User = get_user_model()
 UserSignupSource = get_user_signup_source()
@@ -112,6 +130,97 @@ def create_course_notifications(course_key, **kwargs):  # pylint: disable=unused
     create_course_notifications_task.delay(course_id=str(course_key))
 
 
+def update_course_structure_summary(course_key, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the course_published signal, that belong to
+    the class SignalHandler from xmodule, and this will recalculate the course structure
+    summary that the stats use instead of loading the course from the modulestore.
+
+    Args:
+        course_key<CourseLocator>: Opaque keys locator used to identify a course.
+    """
+    update_course_structure_summary_task.delay(course_id=str(course_key))
+
+
+def stats_enrollment_handler(instance, created=False, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the CourseEnrollment post_save signal, adds the new learner
+    to the course stats snapshot, schedules the refresh of the tenant snapshot and invalidates the
+    cached stats of the course and its tenant.
+    Updates of existing enrollments don't change the number of learners, since a user has a
+    single enrollment by course. The learner is added to the course sketch if the approximate
+    learners mode is enabled.
+
+    Args:
+        instance<CourseEnrollment>: This an instance of the model CourseEnrollment.
+        created<bool>: True if a new record was created.
+    """
+    if not created or instance.user.is_staff or instance.user.is_superuser:
+        return
+
+    increment_course_learners(instance.course_id)
+    schedule_tenant_snapshot_refresh(instance.course_id)
+    invalidate_course_stats(instance.course_id)
+
+    if sketches.is_enabled():
+        sketches.add_course_learner(instance.course_id, instance.user.id)
+
+
+def stats_signup_source_handler(instance, created=False, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the UserSignupSource post_save signal, adds the new learner
+    to the site sketch if the approximate learners mode is enabled.
+
+    Args:
+        instance<UserSignupSource>: This an instance of the model UserSignupSource.
+        created<bool>: True if a new record was created.
+    """
+    if not created or not sketches.is_enabled() or instance.user.is_staff or instance.user.is_superuser:
+        return
+
+    sketches.add_site_learner(instance.site, instance.user.id)
+
+
+def stats_block_completion_handler(instance, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the BlockCompletion post_save signal, adds the learner to the
+    active learners bitmap of the course for the current day. The bitmap is updated by a task that
+    is enqueued after the completion is committed, until the task marks the learner as recorded for
+    the course and day. The staff users are skipped by the task, so the User isn't loaded here.
+
+    Args:
+        instance<BlockCompletion>: Instance of BlockCompletion model.
+    """
+    day = timezone.now().date()
+
+    if is_active_learner_marked(instance.context_key, instance.user_id, day):
+        return
+
+    transaction.on_commit(
+        partial(update_active_learners.delay, str(instance.context_key), instance.user_id, day.isoformat())
+    )
+
+
+def stats_certificate_handler(certificate, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the CERTIFICATE_CREATED signal, invalidates the cached stats
+    of the course and its tenant, and recalculates the course stats snapshot, in order to include
+    the new certificate in the certificates metric.
+
+    Args:
+        certificate<CertificateData>: This an instance of the class defined in this link
+            https://github.com/eduNEXT/openedx-events/blob/main/openedx_events/learning/data.py#L100
+    """
+    invalidate_course_stats(certificate.course.course_key)
+    refresh_course_stats_snapshot.delay(course_id=str(certificate.course.course_key))
+
+
+def stats_course_published_handler(course_key, **kwargs):  # pylint: disable=unused-argument
+    """This receiver is connected to the course_published signal, invalidates the cached stats
+    of the course and its tenant, and recalculates the course stats snapshot.
+
+    Args:
+        course_key<CourseLocator>: Opaque keys locator used to identify a course.
+    """
+    invalidate_course_stats(course_key)
+    refresh_course_stats_snapshot.delay(course_id=str(course_key))
+
+
 def certificate_publisher(certificate, metadata, **kwargs):  # pylint: disable=unused-argument
     """
     Receiver that is connected to the CERTIFICATE_CREATED signal from 'openedx_events.learning.signals'.
@@ -322,6 +431,28 @@ def update_async_tracker_context(sender, *args, **kwargs):  # pylint: disable=un
     current_tracker.enter_context("asynchronous_context", tracker_context)
 
 
+def start_configuration_memo(*args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receiver that starts the memo of the site configuration lookups, so every lookup is resolved
+    once by request or task. Dispatched when a request starts and before a task is executed.
+    See:
+       https://docs.djangoproject.com/en/4.2/ref/signals/#request-started
+       https://celery.readthedocs.io/en/latest/userguide/signals.html#task-prerun
+    """
+    site_configuration.start_memo()
+
+
+def clear_configuration_memo(*args, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receiver that clears the memo of the site configuration lookups. Dispatched when a request
+    finishes and after a task is executed.
+    See:
+       https://docs.djangoproject.com/en/4.2/ref/signals/#request-finished
+       https://celery.readthedocs.io/en/latest/userguide/signals.html#task-postrun
+    """
+    site_configuration.clear_memo()
+
+
 def emit_subsection_attempt_event(usage_id, user_id, *args, **kwargs):  # pylint: disable=unused-argument
     """This emits  the 'nelc.eox_nelp.grades.subsection.submitted' event
     when a graded subsection has been attempted.
@@ -1,18 +1,25 @@
+# pylint: disable=too-many-lines
 """This file contains all the test for receivers.py file.
 Classes:
     CourseGradeChangedProgressPublisherTestCase: Test course_grade_changed_progress_publisher receiver.
     BlockcompletionProgressPublisherTestCase: Test block_completion_progress_publisher receiver.
     IncludeTrackerContextTestCase: Test include_tracker_context receiver.
     UpdateAsyncTrackerContextTestCase: Test update_async_tracker_context receiver.
+    ConfigurationMemoTestCase: Test start_configuration_memo and clear_configuration_memo receivers.
     EmitSubsectionAttemptEventTestCase: Test emit_subsection_attempt_event receiver.
     MtCourseCompletionHandlerTestCase: Test mt_course_completion_handler receiver.
     MtCoursePassesHandlerTestCase: Test mt_course_passed_handler receiver.
     MtCourseFailedHandlerTestCase: Test mt_course_failed_handler receiver.
+    UpdateCourseStructureSummaryTestCase: Test update_course_structure_summary receiver.
+    StatsEnrollmentHandlerTestCase: Test stats_enrollment_handler receiver.
+    StatsSignupSourceHandlerTestCase: Test stats_signup_source_handler receiver.
+    StatsBlockCompletionHandlerTestCase: Test stats_block_completion_handler receiver.
+    StatsSnapshotRefreshHandlersTestCase: Test stats_certificate_handler and stats_course_published_handler receivers.
 """
 import unittest
 
 from custom_reg_form.models import ExtraInfo
-from ddt import ddt
+from ddt import data, ddt, unpack
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.utils import timezone
@@ -28,6 +35,7 @@ from eox_nelp.signals import receivers
 from eox_nelp.signals.receivers import (
     block_completion_progress_publisher,
     certificate_publisher,
+    clear_configuration_memo,
     course_grade_changed_progress_publisher,
     create_usersignupsource_by_enrollment,
     emit_initialized_course_event,
@@ -40,7 +48,14 @@ from eox_nelp.signals.receivers import (
     pearson_vue_course_completion_handler,
     pearson_vue_course_passed_handler,
     receive_course_created,
+    start_configuration_memo,
+    stats_block_completion_handler,
+    stats_certificate_handler,
+    stats_course_published_handler,
+    stats_enrollment_handler,
+    stats_signup_source_handler,
     update_async_tracker_context,
+    update_course_structure_summary,
 )
 from eox_nelp.tests.utils import set_key_values
 
@@ -567,6 +582,32 @@ class UpdateAsyncTrackerContextTestCase(unittest.TestCase):
         tracker.exit_context("asynchronous_context")
 
 
+class ConfigurationMemoTestCase(unittest.TestCase):
+    """Test class for start_configuration_memo and clear_configuration_memo receivers."""
+
+    @patch("eox_nelp.signals.receivers.site_configuration")
+    def test_start_memo(self, site_configuration_mock):
+        """Test that the memo is started when a request or task starts.
+
+        Expected behavior:
+            - start_memo is called once.
+        """
+        start_configuration_memo(sender=Mock())
+
+        site_configuration_mock.start_memo.assert_called_once_with()
+
+    @patch("eox_nelp.signals.receivers.site_configuration")
+    def test_clear_memo(self, site_configuration_mock):
+        """Test that the memo is cleared when a request or task finishes.
+
+        Expected behavior:
+            - clear_memo is called once.
+        """
+        clear_configuration_memo(sender=Mock())
+
+        site_configuration_mock.clear_memo.assert_called_once_with()
+
+
 class EmitSubsectionAttemptEventTestCase(unittest.TestCase):
     """Test class for emit_subsection_attempt_event method."""
 
@@ -896,3 +937,213 @@ class ReceiveCoursePublishTestCase(unittest.TestCase):
             args=[user.id, course_id],
             countdown=5,
         )
+
+
+class UpdateCourseStructureSummaryTestCase(unittest.TestCase):
+    """Test class for update_course_structure_summary function."""
+
+    @patch("eox_nelp.signals.receivers.update_course_structure_summary_task")
+    def test_call_async_task(self, task_mock):
+        """Test that the async task is called with the right parameters
+
+        Expected behavior:
+            - delay method is called with the right values.
+        """
+        course_id = "course-v1:test+Cx105+2022_T4"
+
+        update_course_structure_summary(CourseKey.from_string(course_id))
+
+        task_mock.delay.assert_called_once_with(course_id=course_id)
+
+
+@ddt
+class StatsEnrollmentHandlerTestCase(unittest.TestCase):
+    """Test class for stats_enrollment_handler function."""
+
+    @patch("eox_nelp.signals.receivers.schedule_tenant_snapshot_refresh")
+    @patch("eox_nelp.signals.receivers.invalidate_course_stats")
+    @patch("eox_nelp.signals.receivers.increment_course_learners")
+    def test_new_enrollment(self, increment_mock, invalidate_mock, schedule_mock):
+        """Test that a new learner enrollment increments the course snapshot.
+
+        Expected behavior:
+            - increment_course_learners is called with the course key.
+            - schedule_tenant_snapshot_refresh is called with the course key.
+            - invalidate_course_stats is called with the course key.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+        instance = Mock(course_id=course_key, user=Mock(is_staff=False, is_superuser=False))
+
+        stats_enrollment_handler(instance, created=True)
+
+        increment_mock.assert_called_once_with(course_key)
+        schedule_mock.assert_called_once_with(course_key)
+        invalidate_mock.assert_called_once_with(course_key)
+
+    @patch("eox_nelp.signals.receivers.schedule_tenant_snapshot_refresh")
+    @patch("eox_nelp.signals.receivers.invalidate_course_stats")
+    @patch("eox_nelp.signals.receivers.increment_course_learners")
+    @data(
+        (False, False, False),
+        (True, True, False),
+        (True, False, True),
+    )
+    @unpack
+    def test_skip_increment(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self, created, is_staff, is_superuser, increment_mock, invalidate_mock, schedule_mock
+    ):
+        """Test that updates and staff enrollments don't change the snapshot.
+
+        Expected behavior:
+            - increment_course_learners is not called.
+            - invalidate_course_stats is not called.
+        """
+        instance = Mock(user=Mock(is_staff=is_staff, is_superuser=is_superuser))
+
+        stats_enrollment_handler(instance, created=created)
+
+        increment_mock.assert_not_called()
+        schedule_mock.assert_not_called()
+        invalidate_mock.assert_not_called()
+
+    @patch("eox_nelp.signals.receivers.schedule_tenant_snapshot_refresh", Mock())
+    @patch("eox_nelp.signals.receivers.sketches")
+    @patch("eox_nelp.signals.receivers.invalidate_course_stats")
+    @patch("eox_nelp.signals.receivers.increment_course_learners")
+    def test_approximate_mode(self, increment_mock, invalidate_mock, sketches_mock):
+        """Test that the learner is added to the course sketch when the approximate mode is enabled.
+
+        Expected behavior:
+            - increment_course_learners is called with the course key.
+            - invalidate_course_stats is called with the course key.
+            - add_course_learner is called with the course key and the user id.
+        """
+        sketches_mock.is_enabled.return_value = True
+        course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+        instance = Mock(course_id=course_key, user=Mock(id=7, is_staff=False, is_superuser=False))
+
+        stats_enrollment_handler(instance, created=True)
+
+        increment_mock.assert_called_once_with(course_key)
+        invalidate_mock.assert_called_once_with(course_key)
+        sketches_mock.add_course_learner.assert_called_once_with(course_key, 7)
+
+
+@ddt
+class StatsSignupSourceHandlerTestCase(unittest.TestCase):
+    """Test class for stats_signup_source_handler function."""
+
+    @patch("eox_nelp.signals.receivers.sketches")
+    def test_new_signup_source(self, sketches_mock):
+        """Test that a new signup source adds the learner to the site sketch.
+
+        Expected behavior:
+            - add_site_learner is called with the site and the user id.
+        """
+        sketches_mock.is_enabled.return_value = True
+        instance = Mock(site="lms.example.com", user=Mock(id=7, is_staff=False, is_superuser=False))
+
+        stats_signup_source_handler(instance, created=True)
+
+        sketches_mock.add_site_learner.assert_called_once_with("lms.example.com", 7)
+
+    @patch("eox_nelp.signals.receivers.sketches")
+    @data(
+        (True, False, False, False),
+        (False, True, False, False),
+        (True, True, True, False),
+        (True, True, False, True),
+    )
+    @unpack
+    def test_skip_sketch(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self, enabled, created, is_staff, is_superuser, sketches_mock
+    ):
+        """Test that the sketch is not updated if the mode is disabled, the record is updated
+        or the user is staff.
+
+        Expected behavior:
+            - add_site_learner is not called.
+        """
+        sketches_mock.is_enabled.return_value = enabled
+        instance = Mock(site="lms.example.com", user=Mock(is_staff=is_staff, is_superuser=is_superuser))
+
+        stats_signup_source_handler(instance, created=created)
+
+        sketches_mock.add_site_learner.assert_not_called()
+
+
+class StatsBlockCompletionHandlerTestCase(unittest.TestCase):
+    """Test class for stats_block_completion_handler function."""
+
+    @patch("eox_nelp.signals.receivers.update_active_learners")
+    @patch("eox_nelp.signals.receivers.is_active_learner_marked")
+    def test_record_active_learner(self, marked_mock, task_mock):
+        """Test that a task records the learner as active in the completion course.
+
+        Expected behavior:
+            - is_active_learner_marked is called with the course key, the user id and today.
+            - update_active_learners is enqueued with the course id, the user id and today.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+        instance = Mock(context_key=course_key, user_id=7)
+        marked_mock.return_value = False
+        today = timezone.now().date()
+
+        stats_block_completion_handler(instance, created=False)
+
+        marked_mock.assert_called_once_with(course_key, 7, today)
+        task_mock.delay.assert_called_once_with(str(course_key), 7, today.isoformat())
+
+    @patch("eox_nelp.signals.receivers.update_active_learners")
+    @patch("eox_nelp.signals.receivers.is_active_learner_marked")
+    def test_skip_marked_learner(self, marked_mock, task_mock):
+        """Test that a learner that was already recorded today is not enqueued again.
+
+        Expected behavior:
+            - update_active_learners is not enqueued.
+        """
+        instance = Mock(user_id=7)
+        marked_mock.return_value = True
+
+        stats_block_completion_handler(instance, created=False)
+
+        task_mock.delay.assert_not_called()
+
+
+class StatsSnapshotRefreshHandlersTestCase(unittest.TestCase):
+    """Test class for stats_certificate_handler and stats_course_published_handler functions."""
+
+    course_id = "course-v1:test+Cx105+2022_T4"
+
+    @patch("eox_nelp.signals.receivers.invalidate_course_stats")
+    @patch("eox_nelp.signals.receivers.refresh_course_stats_snapshot")
+    def test_certificate_handler(self, task_mock, invalidate_mock):
+        """Test that the snapshot refresh task is called with the certificate course.
+
+        Expected behavior:
+            - delay method is called with the right values.
+            - invalidate_course_stats is called with the course key.
+        """
+        course_key = CourseKey.from_string(self.course_id)
+        certificate = Mock(course=Mock(course_key=course_key))
+
+        stats_certificate_handler(certificate, metadata=Mock())
+
+        task_mock.delay.assert_called_once_with(course_id=self.course_id)
+        invalidate_mock.assert_called_once_with(course_key)
+
+    @patch("eox_nelp.signals.receivers.invalidate_course_stats")
+    @patch("eox_nelp.signals.receivers.refresh_course_stats_snapshot")
+    def test_course_published_handler(self, task_mock, invalidate_mock):
+        """Test that the snapshot refresh task is called with the published course.
+
+        Expected behavior:
+            - delay method is called with the right values.
+            - invalidate_course_stats is called with the course key.
+        """
+        course_key = CourseKey.from_string(self.course_id)
+
+        stats_course_published_handler(course_key)
+
+        task_mock.delay.assert_called_once_with(course_id=self.course_id)
+        invalidate_mock.assert_called_once_with(course_key)
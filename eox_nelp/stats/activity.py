@@ -0,0 +1,253 @@
+"""eox-nelp stats activity file.
+
+This module keeps a daily bitmap of the active learners of every course, a learner is active if
+a block of the course was completed during the day. The bitmaps are split in containers of 2^16
+user ids like roaring bitmaps, so sparse ids don't allocate the full range, and they are stored
+compressed with zlib. The active learners of multiple days or courses are calculated by OR and
+AND operations over the stored bitmaps instead of scanning the BlockCompletion table.
+
+classes:
+    ActivityBitmap: Compressed set of user ids.
+
+functions:
+    is_active_learner_marked: Return if a learner was already recorded in a course and day.
+    mark_active_learner: Mark a learner as recorded in a course and day.
+    record_active_learner: Add a learner to the bitmap of a course and day.
+    get_active_learners: Return the union of the bitmaps of some courses in a range of days.
+    get_active_learners_metric: Return the daily, weekly and monthly active learners of some courses.
+    get_courses_overlap: Return the number of learners that were active in two groups of courses.
+"""
+import struct
+import zlib
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from eox_nelp.stats.models import DailyActiveLearners
+
+CONTAINER_BITS = 16
+# Every container is stored as the high bits of its user ids and the size of its bitmap.
+CONTAINER_HEADER = struct.Struct("<IH")
+ACTIVE_WINDOWS = {"dau": 1, "wau": 7, "mau": 30}
+ACTIVE_MARK_TIMEOUT = 60 * 60 * 24
+
+
+class ActivityBitmap:
+    """Set of user ids stored as bitmap containers, every container is an int whose bits are the
+    low 16 bits of the ids that share the same high bits.
+
+    Attributes:
+        containers<Dictionary>: Bitmap by the high bits of the user ids.
+    """
+
+    def __init__(self, containers=None):
+        self.containers = containers or {}
+
+    def add(self, user_id):
+        """Adds a user id to the set.
+
+        Args:
+            user_id<int>: User id.
+
+        Return:
+            bool: True if the id was not in the set.
+        """
+        high, low = divmod(user_id, 1 << CONTAINER_BITS)
+        container = self.containers.get(high, 0)
+
+        if container >> low & 1:
+            return False
+
+        self.containers[high] = container | 1 << low
+
+        return True
+
+    def __contains__(self, user_id):
+        high, low = divmod(user_id, 1 << CONTAINER_BITS)
+
+        return bool(self.containers.get(high, 0) >> low & 1)
+
+    def __len__(self):
+        return sum(container.bit_count() for container in self.containers.values())
+
+    def __or__(self, other):
+        containers = dict(self.containers)
+
+        for high, container in other.containers.items():
+            containers[high] = containers.get(high, 0) | container
+
+        return ActivityBitmap(containers)
+
+    def __and__(self, other):
+        containers = {
+            high: container & other.containers[high]
+            for high, container in self.containers.items()
+            if high in other.containers
+        }
+
+        return ActivityBitmap({high: container for high, container in containers.items() if container})
+
+    def to_bytes(self):
+        """Returns the compressed representation of the set."""
+        data = b"".join(
+            CONTAINER_HEADER.pack(high, (container.bit_length() + 7) // 8)
+            + container.to_bytes((container.bit_length() + 7) // 8, "little")
+            for high, container in sorted(self.containers.items())
+        )
+
+        return zlib.compress(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Returns the set of a compressed representation returned by to_bytes."""
+        data = zlib.decompress(data)
+        containers = {}
+        offset = 0
+
+        while offset < len(data):
+            high, size = CONTAINER_HEADER.unpack_from(data, offset)
+            offset += CONTAINER_HEADER.size
+            containers[high] = int.from_bytes(data[offset:offset + size], "little")
+            offset += size
+
+        return cls(containers)
+
+
+def is_active_learner_marked(course_key, user_id, day):
+    """
+    Returns if a learner was already recorded as active in a course during a day, so the learner is
+    recorded once by course and day instead of once by completed block.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+        user_id<int>: Learner id.
+        day<date>: Day of the activity.
+
+    Return:
+        bool: True if the learner was marked by mark_active_learner.
+    """
+    return bool(cache.get(_get_mark_key(course_key, user_id, day)))
+
+
+def mark_active_learner(course_key, user_id, day):
+    """
+    Marks a learner as recorded in a course during a day with a cache key. This is called by the
+    update_active_learners task once the learner is recorded, so a rolled back completion or a
+    failed task don't block the later completions of the day.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+        user_id<int>: Learner id.
+        day<date>: Day of the activity.
+    """
+    cache.set(_get_mark_key(course_key, user_id, day), True, timeout=ACTIVE_MARK_TIMEOUT)
+
+
+def record_active_learner(course_key, user_id, day):
+    """
+    Adds a learner to the active learners bitmap of a course. The bitmap record is locked while it's
+    updated, so this runs in the update_active_learners task and not in the BlockCompletion save path.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+        user_id<int>: Learner id.
+        day<date>: Day of the activity.
+    """
+    with transaction.atomic():
+        record, _ = DailyActiveLearners.objects.select_for_update().get_or_create(  # pylint: disable=no-member
+            course_id=course_key,
+            date=day,
+            defaults={"users": ActivityBitmap().to_bytes()},
+        )
+        bitmap = ActivityBitmap.from_bytes(record.users)
+
+        if bitmap.add(user_id):
+            record.users = bitmap.to_bytes()
+            record.save(update_fields=["users", "modified"])
+
+
+def get_active_learners(course_keys, days, end=None):
+    """
+    Returns the learners that were active in any of the given courses during the last days.
+
+    Args:
+        course_keys<list[opaque-key]>: Course identifiers.
+        days<int>: Number of days of the range, including the end day.
+        end<date>: Last day of the range, default today(UTC).
+
+    Return:
+        <ActivityBitmap>: Union of the daily bitmaps.
+    """
+    return _union(_get_daily_bitmaps(course_keys, days, end).values())
+
+
+def get_active_learners_metric(course_keys, end=None):
+    """
+    Returns the daily, weekly and monthly active learners of the given courses, the bitmaps of the
+    last 30 days are read by a single query and combined by day.
+
+    Args:
+        course_keys<list[opaque-key]>: Course identifiers.
+        end<date>: Last day of the ranges, default today(UTC).
+
+    Return:
+        <Dictionary>: Number of learners by window, e.g {"dau": 5, "wau": 20, "mau": 48}.
+    """
+    end = end or timezone.now().date()
+    bitmaps = _get_daily_bitmaps(course_keys, max(ACTIVE_WINDOWS.values()), end)
+
+    return {
+        name: len(_union(bitmap for (_, day), bitmap in bitmaps.items() if (end - day).days < days))
+        for name, days in ACTIVE_WINDOWS.items()
+    }
+
+
+def get_courses_overlap(course_keys, other_course_keys, days=30, end=None):
+    """
+    Returns the number of learners that were active in both groups of courses during the last days.
+
+    Args:
+        course_keys<list[opaque-key]>: First group of course identifiers.
+        other_course_keys<list[opaque-key]>: Second group of course identifiers.
+        days<int>: Number of days of the range, including the end day.
+        end<date>: Last day of the range, default today(UTC).
+
+    Return:
+        <Dictionary>: Active learners of every group and of both.
+    """
+    bitmaps = _get_daily_bitmaps([*course_keys, *other_course_keys], days, end)
+    course_ids = {str(course_key) for course_key in course_keys}
+    other_course_ids = {str(course_key) for course_key in other_course_keys}
+    learners = _union(bitmap for (course_id, _), bitmap in bitmaps.items() if course_id in course_ids)
+    other_learners = _union(bitmap for (course_id, _), bitmap in bitmaps.items() if course_id in other_course_ids)
+
+    return {"learners": len(learners), "other_learners": len(other_learners), "both": len(learners & other_learners)}
+
+
+def _get_daily_bitmaps(course_keys, days, end=None):
+    """Returns the stored bitmaps of the courses in the range by course id string and day."""
+    end = end or timezone.now().date()
+    records = DailyActiveLearners.objects.filter(  # pylint: disable=no-member
+        course_id__in=course_keys,
+        date__gt=end - timedelta(days=days),
+        date__lte=end,
+    ).values_list("course_id", "date", "users")
+
+    return {(str(course_id), day): ActivityBitmap.from_bytes(users) for course_id, day, users in records}
+
+
+def _get_mark_key(course_key, user_id, day):
+    """Returns the cache key that marks a learner as recorded in a course and day."""
+    return f"eox_nelp.stats.active.{course_key}.{day}.{user_id}"
+
+
+def _union(bitmaps):
+    """Returns the union of the given bitmaps."""
+    result = ActivityBitmap()
+
+    for bitmap in bitmaps:
+        result = result | bitmap
+
+    return result
@@ -0,0 +1,98 @@
+"""Stats API v1 pagination file.
+
+classes:
+    CourseStatsCursorPagination: Cursor pagination over a list of course keys.
+"""
+from base64 import b64decode, urlsafe_b64encode
+from bisect import bisect_right
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CourseStatsCursorPagination(BasePagination):  # pylint: disable=abstract-method
+    """Cursor pagination for the course stats. The courses are sorted by id and the cursor is the
+    encoded id of the last course of the previous page, so the pages are stable when courses are
+    added or removed between requests.
+
+    The pagination is enabled only if the page_size query param is present, that keeps the
+    original response of the endpoint for the current clients.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def __init__(self):
+        self.request = None
+        self.count = 0
+        self.next_cursor = None
+
+    def is_enabled(self, request):
+        """Returns True if the request contains the page_size query param."""
+        return self.page_size_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns the course keys of the requested page.
+
+        Args:
+            queryset<list[opaque-key]>: Course keys to paginate.
+            request<Request>: Current request.
+
+        Return:
+            list[<opaque-key>]: Course keys of the page.
+        """
+        self.request = request
+        self.count = len(queryset)
+        course_keys = sorted(queryset, key=str)
+        course_ids = [str(course_key) for course_key in course_keys]
+        start = 0
+        cursor = request.query_params.get(self.cursor_query_param)
+
+        if cursor:
+            start = bisect_right(course_ids, self.decode_cursor(cursor))
+
+        page = course_keys[start:start + self.get_page_size(request)]
+
+        if start + len(page) < len(course_keys):
+            self.next_cursor = self.encode_cursor(str(page[-1]))
+
+        return page
+
+    def get_paginated_response(self, data):
+        """Returns the response with the same keys of the not paginated response plus next."""
+        return Response({
+            "total_courses": self.count,
+            "next": self.get_next_link(),
+            "metrics": data,
+        })
+
+    def get_next_link(self):
+        """Returns the url of the next page or None if this is the last page."""
+        if not self.next_cursor:
+            return None
+
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_page_size(self, request):
+        """Returns the requested page size, limited by max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.max_page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(course_id):
+        """Returns the cursor of the given course id."""
+        return urlsafe_b64encode(course_id.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns the course id of the given cursor."""
+        try:
+            return b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+        except (TypeError, ValueError) as exc:
+            raise NotFound("Invalid cursor") from exc
@@ -0,0 +1,15 @@
+"""
+Stats API v1 permissions
+"""
+from rest_framework.permissions import IsAuthenticated
+
+
+class IsSuperUser(IsAuthenticated):
+    """
+    Allows the access only to superusers, this is used by the views that return the data of
+    every tenant.
+    """
+
+    def has_permission(self, request, view):
+        """Return True if the user is an authenticated superuser."""
+        return bool(super().has_permission(request, view) and request.user.is_superuser)
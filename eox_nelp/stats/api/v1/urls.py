@@ -4,12 +4,29 @@ Course API URLs
 from django.conf import settings
 from django.urls import path, re_path
 
-from eox_nelp.stats.api.v1.views import GeneralCourseStatsView, GeneralTenantStatsView
+from eox_nelp.stats.api.v1.views import (
+    ActiveLearnersStatsView,
+    CourseCompletionStatsView,
+    CrossTenantStatsView,
+    GeneralCourseStatsView,
+    GeneralTenantStatsView,
+    StatsDiagnosticsView,
+    TenantStatsTimeSeriesView,
+)
 
 app_name = "eox_nelp"  # pylint: disable=invalid-name
 
 urlpatterns = [
     path('tenant/', GeneralTenantStatsView.as_view(), name="general-stats"),
+    path('tenant/timeseries/', TenantStatsTimeSeriesView.as_view(), name="tenant-timeseries"),
+    path('tenant/active-learners/', ActiveLearnersStatsView.as_view(), name="active-learners"),
+    path('tenants/', CrossTenantStatsView.as_view(), name="cross-tenant-stats"),
     path('courses/', GeneralCourseStatsView.as_view(), name="courses-stats"),
+    path('diagnostics/', StatsDiagnosticsView.as_view(), name="diagnostics"),
+    re_path(
+        rf'^courses/{settings.COURSE_ID_PATTERN}/completion/$',
+        CourseCompletionStatsView.as_view(),
+        name="course-completion-stats",
+    ),
     re_path(rf'^courses/{settings.COURSE_ID_PATTERN}', GeneralCourseStatsView.as_view(), name="course-stats"),
 ]
@@ -1,20 +1,141 @@
 """Stats API v1 view file.
 
 views:
+    StatsAPIView: Base view of the stats, every request is measured by the stats instrumentation.
     GeneralTenantStatsView: View that handles the general tenant stats.
     GeneralTenantCoursesView: View that handles the general courses stats.
+    TenantStatsTimeSeriesView: View that handles the daily tenant stats.
+    CourseCompletionStatsView: View that handles the completion rates of a course outline.
+    ActiveLearnersStatsView: View that handles the daily, weekly and monthly active learners.
+    CrossTenantStatsView: Superuser view that handles the general stats of every tenant.
+    StatsDiagnosticsView: Staff view that returns the stats instrumentation values.
+
+functions:
+    get_requested_fields: Return the course metric fields of the fields query param.
+    stream_courses_metrics: Generator that yields the course metrics as NDJSON lines.
+    get_requested_date_range: Return the start and end dates of the query params.
 """
+import json
+from datetime import date, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
+from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from eox_nelp.stats import metrics
+from eox_nelp.edxapp_wrapper import site_configuration
+from eox_nelp.stats import activity, instrumentation, metrics, rollups
+from eox_nelp.stats.api.v1.pagination import CourseStatsCursorPagination
+from eox_nelp.stats.api.v1.permissions import IsSuperUser
+from eox_nelp.stats.backends import get_metrics_backend, get_stored_tenant_stats, get_tenant_stats
+from eox_nelp.stats.metrics import COURSE_METRIC_FIELDS
+from eox_nelp.stats.tasks import warm_tenant_stats_cache
+from eox_nelp.stats.utils import get_tenants_orgs
 
 User = get_user_model()
+DEFAULT_TIME_SERIES_DAYS = 30
+MAX_TIME_SERIES_DAYS = 366
+TENANT_STATS_TOTAL_FIELDS = ("learners", "courses", "instructors")
+
+
+def get_requested_fields(request):
+    """Returns the course metric fields of the comma separated fields query param.
+
+    Args:
+        request<Request>: Current request.
+
+    Return:
+        list[str]: Requested fields, an empty list means all the fields.
+
+    Raises:
+        ValidationError: If a field is not a course metric field.
+    """
+    fields = [field.strip() for field in request.query_params.get("fields", "").split(",") if field.strip()]
+    invalid_fields = [field for field in fields if field not in COURSE_METRIC_FIELDS]
+
+    if invalid_fields:
+        raise ValidationError({"fields": f"Invalid fields: {', '.join(invalid_fields)}"})
+
+    return fields
+
+
+def stream_courses_metrics(backend, course_keys, fields):
+    """Yields the metrics of the given courses as NDJSON lines. The metrics are calculated by
+    chunks of STATS_STREAM_CHUNK_SIZE courses, default 100, so the memory doesn't depend on
+    the number of courses.
+
+    Args:
+        backend<module>: Module returned by get_metrics_backend.
+        course_keys<list[opaque-key]>: Course identifiers.
+        fields<list[str]>: Course metric fields to include, empty means all.
+
+    Yield:
+        str: JSON representation of a course metrics plus a line break.
+    """
+    chunk_size = getattr(settings, "STATS_SETTINGS", {}).get("STATS_STREAM_CHUNK_SIZE", 100)
+
+    for index in range(0, len(course_keys), chunk_size):
+        for metric in backend.build_courses_metrics(course_keys[index:index + chunk_size], fields):
+            yield f"{json.dumps(metric)}\n"
+
+
+def get_requested_date_range(request):
+    """Returns the dates of the start and end query params, in ISO format. By default the range
+    ends yesterday and contains DEFAULT_TIME_SERIES_DAYS days.
+
+    Args:
+        request<Request>: Current request.
+
+    Return:
+        tuple(<date>, <date>): Start and end dates, both included.
+
+    Raises:
+        ValidationError: If a date is invalid or the range is longer than MAX_TIME_SERIES_DAYS.
+    """
+    dates = {}
+
+    for param, default in (
+        ("end", timezone.now().date() - timedelta(days=1)),
+        ("start", None),
+    ):
+        value = request.query_params.get(param)
+
+        try:
+            dates[param] = date.fromisoformat(value) if value else default
+        except ValueError as exc:
+            raise ValidationError({param: "Invalid date, the expected format is YYYY-MM-DD."}) from exc
+
+    start = dates["start"] or dates["end"] - timedelta(days=DEFAULT_TIME_SERIES_DAYS - 1)
+    end = dates["end"]
 
+    if start > end:
+        raise ValidationError({"start": "The start date must be before the end date."})
 
-class GeneralTenantStatsView(APIView):
+    if (end - start).days >= MAX_TIME_SERIES_DAYS:
+        raise ValidationError({"start": f"The range can't be longer than {MAX_TIME_SERIES_DAYS} days."})
+
+    return start, end
+
+
+class StatsAPIView(APIView):
+    """Base view of the stats API, the time, queries, modulestore calls and nested cache results
+    of every request are measured by the stats instrumentation with the view and method name,
+    e.g GeneralTenantStatsView.get.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with instrumentation.measure(f"{self.__class__.__name__}.{request.method.lower()}"):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class GeneralTenantStatsView(StatsAPIView):
     """Class view. Handle general tenant stats.
 
     ## Usage
@@ -25,6 +146,9 @@ class GeneralTenantStatsView(APIView):
     [" problem", "video", "discussion"]
     ```
 
+    If the STATS_SETTINGS value USE_STATS_SNAPSHOTS is true, the values are read from the
+    stats snapshot tables instead of being calculated from the LMS tables.
+
     ### **GET** /eox-nelp/api/stats/v1/tenant/
 
     **GET Response Values**
@@ -51,29 +175,10 @@ class GeneralTenantStatsView(APIView):
 
     def get(self, request):
         """Return general tenant stats."""
-        tenant = request.site.domain
-        courses = metrics.get_courses_metrics(tenant)
-        components = {}
-        certificates = {}
-        for metric in courses.get("metrics", []):
-            course_components = metric.get("components", {})
-            certificates_components = metric.get("certificates", {}).get("total", {})
-
-            for key, value in course_components.items():
-                components[key] = components.get(key, 0) + value
-            for key, value in certificates_components.items():
-                certificates[key] = certificates.get(key, 0) + value
-
-        return Response({
-            "learners": metrics.get_learners_metric(tenant),
-            "courses": courses.get("total_courses", 0),
-            "instructors": metrics.get_instructors_metric(tenant),
-            "components": components,
-            "certificates": certificates,
-        })
+        return Response(get_tenant_stats(request.site.domain))
 
 
-class GeneralCourseStatsView(APIView):
+class GeneralCourseStatsView(StatsAPIView):
     """Class view that returns a list of course stats or a specific course stats.
 
     ## Usage
@@ -129,6 +234,23 @@ class GeneralCourseStatsView(APIView):
     }
     ```
 
+    The list accepts the following query params:
+
+    - fields: Comma separated metrics to include, e.g `?fields=id,name,learners`. The skipped
+      metrics are not calculated, so this allows to avoid expensive values like certificates.
+    - page_size and cursor: Enable the cursor pagination, the courses are sorted by id and the
+      response contains the `next` url, e.g `?page_size=20`. The max page size is 100.
+    - stream: If this is `true`, the courses are returned as a NDJSON stream, one course by line.
+
+    **GET Paginated Response Values**
+    ``` json
+    {
+        "total_courses": 40,
+        "next": "http://lms.example.com/eox-nelp/api/stats/v1/courses/?page_size=20&cursor=Y291cnNlLXYx...",
+        "metrics": [...]
+    }
+    ```
+
     ### **GET** /eox-nelp/api/stats/v1/courses/course-v1:potato+CS102+2023/
 
     **GET Response Values**
@@ -171,17 +293,380 @@ class GeneralCourseStatsView(APIView):
     ```
     """
 
+    pagination_class = CourseStatsCursorPagination
+
     def get(self, request, course_id=None):
         """Return general course stats."""
         tenant = request.site.domain
+        backend = get_metrics_backend()
+        fields = get_requested_fields(request)
 
         if course_id:
-            courses = metrics.get_cached_courses(tenant)
-            course = courses.filter(id=course_id).first()
+            course = metrics.get_cached_course(tenant, course_id)
 
             if not course:
                 raise Http404
 
-            return Response(metrics.get_course_metrics(course.id))
+            course_metrics = backend.get_course_metrics(course.id)
+
+            return Response({key: value for key, value in course_metrics.items() if not fields or key in fields})
+
+        paginator = self.pagination_class()
+        stream = request.query_params.get("stream", "").lower() == "true"
+
+        if not fields and not stream and not paginator.is_enabled(request):
+            return Response(backend.get_courses_metrics(tenant))
+
+        course_keys = [course.id for course in metrics.get_cached_courses(tenant)]
+
+        if stream:
+            return StreamingHttpResponse(
+                stream_courses_metrics(backend, course_keys, fields),
+                content_type="application/x-ndjson",
+            )
+
+        if paginator.is_enabled(request):
+            page = paginator.paginate_queryset(course_keys, request, view=self)
+
+            return paginator.get_paginated_response(backend.build_courses_metrics(page, fields))
+
+        return Response({
+            "total_courses": len(course_keys),
+            "metrics": backend.build_courses_metrics(course_keys, fields),
+        })
+
+
+class TenantStatsTimeSeriesView(StatsAPIView):
+    """Class view that returns the daily stats of the tenant or one of its courses. The values
+    are read from the daily rollups, that are stored by the update_daily_stats_rollups task, so
+    the days that haven't been processed are not included.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/stats/v1/tenant/timeseries/
+
+    The endpoint accepts the following query params:
+
+    - start and end: Dates of the range in ISO format, both included, e.g `?start=2023-05-01&end=2023-05-31`.
+      By default the range contains the last 30 days, and it can't be longer than 366 days.
+    - course_id: Return the values of a course instead of the tenant totals.
+
+    **GET Response Values**
+    ``` json
+    {
+        "start": "2023-05-01",
+        "end": "2023-05-31",
+        "course_id": null,
+        "series": [
+            {
+                "date": "2023-05-01",
+                "new_enrollments": 12,
+                "active_learners": 40,
+                "certificates": {
+                    "downloadable": 3,
+                    "notpassing": 1
+                }
+            },
+            ...
+        ]
+    }
+    ```
+    """
+
+    def get(self, request):
+        """Return the daily stats of the requested range."""
+        start, end = get_requested_date_range(request)
+        course_id = request.query_params.get("course_id", "")
+
+        return Response({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "course_id": course_id or None,
+            "series": rollups.get_daily_stats(request.site.domain, start, end, course_id),
+        })
+
+
+class CourseCompletionStatsView(StatsAPIView):
+    """Class view that returns how many learners completed the sections and subsections of a course,
+    a learner completed a section or subsection if the learner completed all its components. The
+    completion rate is the average rate of its components. The value is cached by course for a few
+    minutes, see get_course_completion_metric, and invalidated when the course is published.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/stats/v1/courses/course-v1:potato+CS102+2023/completion/
+
+    **GET Response Values**
+    ``` json
+    {
+        "id": "course-v1:potato+CS102+2023",
+        "learners": 40,
+        "sections": [
+            {
+                "id": "block-v1:potato+CS102+2023+type@chapter+block@a1b2",
+                "display_name": "Introduction",
+                "components": 12,
+                "completed_learners": 21,
+                "completion_rate": 0.65,
+                "sub_sections": [
+                    {
+                        "id": "block-v1:potato+CS102+2023+type@sequential+block@c3d4",
+                        "display_name": "Welcome",
+                        "components": 4,
+                        "completed_learners": 35,
+                        "completion_rate": 0.9
+                    },
+                    ...
+                ]
+            },
+            ...
+        ]
+    }
+    ```
+    """
+
+    def get(self, request, course_id):
+        """Return the completed learners and the completion rates of the course."""
+        course = metrics.get_cached_course(request.site.domain, course_id)
+
+        if not course:
+            raise Http404
+
+        return Response(metrics.get_course_completion_metric(course.id))
+
+
+class ActiveLearnersStatsView(StatsAPIView):
+    """Class view that returns the active learners of the tenant or one of its courses, a learner
+    is active if a block was completed during the day. The values are calculated from the daily
+    bitmaps of active learners, that are updated by the BlockCompletion post_save receiver.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/stats/v1/tenant/active-learners/
+
+    The endpoint accepts the following query params:
+
+    - course_id: Return the values of a course instead of the tenant courses.
+    - overlap_course_id: Include the learners that were active in both courses during the last 30 days,
+      requires the course_id param.
+
+    **GET Response Values**
+    ``` json
+    {
+        "course_id": "course-v1:potato+CS102+2023",
+        "dau": 5,
+        "wau": 20,
+        "mau": 48,
+        "overlap": {
+            "course_id": "course-v1:potato+CS103+2023",
+            "learners": 48,
+            "other_learners": 30,
+            "both": 12
+        }
+    }
+    ```
+    """
+
+    def get(self, request):
+        """Return the active learners."""
+        tenant = request.site.domain
+        course_keys = {}
+
+        for param in ("course_id", "overlap_course_id"):
+            course_id = request.query_params.get(param)
+
+            if not course_id:
+                continue
+
+            course = metrics.get_cached_course(tenant, course_id)
+
+            if not course:
+                raise ValidationError({param: f"The course {course_id} doesn't exist."})
+
+            course_keys[param] = [course.id]
+
+        if "overlap_course_id" in course_keys and "course_id" not in course_keys:
+            raise ValidationError({"course_id": "The course_id param is required to calculate the overlap."})
+
+        selected_keys = course_keys.get("course_id") or [course.id for course in metrics.get_cached_courses(tenant)]
+        data = {
+            "course_id": request.query_params.get("course_id"),
+            **activity.get_active_learners_metric(selected_keys),
+        }
+
+        if "overlap_course_id" in course_keys:
+            data["overlap"] = {
+                "course_id": request.query_params["overlap_course_id"],
+                **activity.get_courses_overlap(selected_keys, course_keys["overlap_course_id"]),
+            }
+
+        return Response(data)
+
+
+class CrossTenantStatsView(StatsAPIView):
+    """Superuser view that returns the general stats of every eox-tenant route in a single request.
+    The tenant settings are process wide, so the request doesn't calculate any tenant, it only
+    reads the stats stored by the warm_tenant_stats_cache task, that runs in the tenant context.
+    A tenant without stored stats is returned as pending and its task is enqueued, the stored
+    stats are refreshed periodically by the warm_stats_caches task.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/stats/v1/tenants/
+
+    The endpoint accepts the following query params:
+
+    - tenants: Comma separated domains to include, e.g `?tenants=lms.example.com,lms.test.com`.
+      By default all the tenants are included.
+
+    **GET Response Values**
+    ``` json
+    {
+        "tenants": [
+            {
+                "tenant": "lms.example.com",
+                "learners": 1,
+                "courses": 3,
+                "instructors": 2,
+                "components": {
+                    "html": 133,
+                    "problem": 49
+                },
+                "certificates": {
+                    "downloadable": 5,
+                    "notpassing": 4
+                }
+            },
+            {
+                "tenant": "lms.broken.com",
+                "error": "..."
+            },
+            {
+                "tenant": "lms.new.com",
+                "pending": true
+            }
+        ],
+        "totals": {
+            "tenants": 1,
+            "learners": 1,
+            "courses": 3,
+            "instructors": 2,
+            "components": {...},
+            "certificates": {...}
+        }
+    }
+    ```
+
+    The totals are the sum of the tenants without errors or pending stats, so a user that belongs
+    to multiple tenants is counted once by tenant.
+    """
+    authentication_classes = (JwtAuthentication, SessionAuthenticationAllowInactiveUser)
+    permission_classes = (IsSuperUser,)
+
+    def get(self, request):
+        """Return the stats of every tenant and the totals."""
+        tenants = sorted(get_tenants_orgs())
+        requested_tenants = [
+            tenant.strip() for tenant in request.query_params.get("tenants", "").split(",") if tenant.strip()
+        ]
+        invalid_tenants = [tenant for tenant in requested_tenants if tenant not in tenants]
+
+        if invalid_tenants:
+            raise ValidationError({"tenants": f"Invalid tenants: {', '.join(invalid_tenants)}"})
+
+        if requested_tenants:
+            tenants = [tenant for tenant in tenants if tenant in requested_tenants]
+
+        stored_stats = get_stored_tenant_stats(tenants)
+        rows = []
+
+        for tenant in tenants:
+            if tenant in stored_stats:
+                rows.append(stored_stats[tenant])
+            else:
+                warm_tenant_stats_cache.delay(tenant)
+                rows.append({"tenant": tenant, "pending": True})
+
+        totals = {
+            "tenants": 0,
+            **{field: 0 for field in TENANT_STATS_TOTAL_FIELDS},
+            "components": {},
+            "certificates": {},
+        }
+
+        for row in rows:
+            if "error" in row or row.get("pending"):
+                continue
+
+            totals["tenants"] += 1
+
+            for field in TENANT_STATS_TOTAL_FIELDS:
+                totals[field] += row[field]
+
+            for field in ("components", "certificates"):
+                for key, value in row[field].items():
+                    totals[field][key] = totals[field].get(key, 0) + value
+
+        return Response({"tenants": rows, "totals": totals})
+
+
+class StatsDiagnosticsView(APIView):
+    """Staff view that returns the stats instrumentation values of the process that handles
+    the request, the STATS_SETTINGS value STATS_INSTRUMENTATION must be true in order to record them.
+
+    ## Usage
+
+    ### **GET** /eox-nelp/api/stats/v1/diagnostics/
+
+    **GET Response Values**
+    ``` json
+    {
+        "pid": 2543,
+        "enabled": true,
+        "functions": {
+            "get_courses_metrics": {
+                "calls": 12,
+                "cache_hits": 11,
+                "cache_misses": 1,
+                "queries": 48,
+                "modulestore_calls": 3,
+                "total_time": 2.41,
+                "max_time": 2.2,
+                "avg_time": 0.2
+            },
+            "GeneralTenantStatsView.get": {...},
+            ...
+        },
+        "configuration_memo": {
+            "get_current_site_orgs": {
+                "hits": 30,
+                "misses": 4
+            },
+            ...
+        }
+    }
+    ```
+
+    The configuration_memo values are the site configuration lookups that were resolved by the
+    request or task memo(hits) and by the site configuration helpers(misses).
+
+    ### **DELETE** /eox-nelp/api/stats/v1/diagnostics/
+
+    Removes the values of the process that handles the request.
+    """
+    authentication_classes = (JwtAuthentication, SessionAuthenticationAllowInactiveUser)
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):  # pylint: disable=unused-argument
+        """Return the instrumentation values."""
+        return Response({
+            **instrumentation.get_diagnostics(),
+            "configuration_memo": site_configuration.get_memo_stats(),
+        })
+
+    def delete(self, request):  # pylint: disable=unused-argument
+        """Remove the instrumentation values."""
+        instrumentation.reset_diagnostics()
+        site_configuration.reset_memo_stats()
 
-        return Response(metrics.get_courses_metrics(tenant))
+        return Response(status=status.HTTP_204_NO_CONTENT)
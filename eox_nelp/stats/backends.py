@@ -0,0 +1,110 @@
+"""eox-nelp stats backends file.
+
+The stats metrics can be calculated from the LMS tables or read from the snapshot tables, both
+modules expose the same functions, so the views, the exports and the tasks select one of them here.
+The general stats of every tenant are stored by the warm_tenant_stats_cache task, so the cross
+tenant stats only read them.
+
+functions:
+    get_metrics_backend: Return the module that provides the stats metrics.
+    get_tenant_stats: Return the general stats of a tenant.
+    store_tenant_stats: Calculate and store the general stats of a tenant.
+    get_stored_tenant_stats: Return the stored general stats of multiple tenants.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from eox_nelp.stats import metrics, snapshots
+
+logger = logging.getLogger(__name__)
+TENANT_STATS_KEY = "eox_nelp.stats.tenant_stats.{}"
+
+
+def get_metrics_backend():
+    """Returns the module that provides the stats metrics. If the STATS_SETTINGS value
+    USE_STATS_SNAPSHOTS is true, the metrics are read from the snapshot tables, otherwise
+    they are calculated from the LMS tables.
+
+    Return:
+        <module>: eox_nelp.stats.snapshots or eox_nelp.stats.metrics.
+    """
+    if getattr(settings, "STATS_SETTINGS", {}).get("USE_STATS_SNAPSHOTS", False):
+        return snapshots
+
+    return metrics
+
+
+def get_tenant_stats(tenant):
+    """Returns the general stats of a tenant, the components and certificates are the totals of
+    the tenant courses. This depends on the current site configuration, so it must run inside
+    the tenant request or the tenant_context manager.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+
+    Return:
+        <Dictionary>: learners, courses, instructors, components and certificates of the tenant.
+    """
+    backend = get_metrics_backend()
+    courses = backend.get_courses_metrics(tenant)
+    components = {}
+    certificates = {}
+    for metric in courses.get("metrics", []):
+        course_components = metric.get("components", {})
+        certificates_components = metric.get("certificates", {}).get("total", {})
+
+        for key, value in course_components.items():
+            components[key] = components.get(key, 0) + value
+        for key, value in certificates_components.items():
+            certificates[key] = certificates.get(key, 0) + value
+
+    return {
+        "learners": backend.get_learners_metric(tenant),
+        "courses": courses.get("total_courses", 0),
+        "instructors": backend.get_instructors_metric(tenant),
+        "components": components,
+        "certificates": certificates,
+    }
+
+
+def store_tenant_stats(tenant):
+    """Calculates the general stats of a tenant and stores them in cache for the STATS_SETTINGS
+    value STATS_TIMEOUT, default 3600. This must run inside the tenant_context manager, and the
+    errors are stored instead of raised, so a single tenant doesn't break the stats of the others.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+
+    Return:
+        <Dictionary>: The tenant domain plus its stats or the error message.
+    """
+    try:
+        tenant_stats = {"tenant": tenant, **get_tenant_stats(tenant)}
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("The stats of %s couldn't be calculated.", tenant)
+        tenant_stats = {"tenant": tenant, "error": str(exc)}
+
+    timeout = getattr(settings, "STATS_SETTINGS", {}).get("STATS_TIMEOUT", 3600)
+    cache.set(TENANT_STATS_KEY.format(tenant), tenant_stats, timeout=timeout)
+
+    return tenant_stats
+
+
+def get_stored_tenant_stats(tenants):
+    """Returns the general stats stored by store_tenant_stats, with a single cache call.
+
+    Args:
+        tenants<list[str]>: Tenant domains.
+
+    Return:
+        <Dictionary>: Stats by tenant domain, the tenants without stored stats are not included.
+    """
+    values = cache.get_many([TENANT_STATS_KEY.format(tenant) for tenant in tenants])
+
+    return {
+        tenant: values[TENANT_STATS_KEY.format(tenant)]
+        for tenant in tenants
+        if TENANT_STATS_KEY.format(tenant) in values
+    }
@@ -0,0 +1,175 @@
+"""Stats cache helpers.
+
+The stats cache keys include a generation counter by tenant or course, so bumping a counter
+invalidates every key of that tenant or course without deleting them.
+
+The values are stored pickled and compressed with zlib, so the repeated dictionary keys, e.g
+block types and certificate modes, take a few bytes. Values bigger than the chunk size are split
+across multiple keys, so they don't exceed the item size limit of the cache backend, e.g 1 MB
+for memcached.
+
+functions:
+    store_value: Store a value in its compact form, split in chunks if it's big.
+    load_value: Return a value stored by store_value.
+    get_cache_key: Return a versioned and hashed key for a stats function call.
+    get_generation: Return the current generation of a tenant or course.
+    bump_generation: Invalidate the stats of a tenant or course.
+    invalidate_course_stats: Invalidate the stats of a course and its tenant.
+"""
+import hashlib
+import logging
+import pickle
+import time
+import zlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from eox_tenant.tenant_wise.proxies import TenantSiteConfigProxy
+
+logger = logging.getLogger(__name__)
+TENANT_SCOPE = "tenant"
+COURSE_SCOPE = "course"
+# Stored under the main key when the value is split, the chunks are stored in the keys <key>.<index>.
+ChunkedValue = namedtuple("ChunkedValue", ["chunks", "digest"])
+DEFAULT_CHUNK_SIZE = 900 * 1024
+
+
+def get_cache_key(name, args, scope=None):
+    """
+    Returns the cache key of a stats function call. The key contains the STATS_CACHE_VERSION
+    setting, the generation of the first argument(if the function has a scope) and a hash of
+    the arguments, so it has a fixed length.
+
+    Args:
+        name<str>: Function name.
+        args<tuple>: Positional arguments of the call.
+        scope<str>: TENANT_SCOPE or COURSE_SCOPE if the first argument identifies a tenant or course.
+
+    Return:
+        <str>: Cache key.
+    """
+    version = getattr(settings, "STATS_SETTINGS", {}).get("STATS_CACHE_VERSION", 1)
+    generation = get_generation(scope, args[0]) if scope and args else 0
+    digest = hashlib.md5("-".join(map(str, args)).encode("utf-8")).hexdigest()
+
+    return f"eox_nelp.stats.v{version}.{name}.{generation}.{digest}"
+
+
+def get_generation(scope, identifier):
+    """
+    Returns the generation of a tenant or course. Missing counters start with the current
+    timestamp, so an evicted counter never matches the generation of old keys.
+
+    Args:
+        scope<str>: TENANT_SCOPE or COURSE_SCOPE.
+        identifier<str>: Tenant domain or course id.
+
+    Return:
+        <int>: Current generation.
+    """
+    key = _get_generation_key(scope, identifier)
+    generation = cache.get(key)
+
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def bump_generation(scope, identifier):
+    """
+    Increments the generation of a tenant or course, that invalidates all its stats keys.
+
+    Args:
+        scope<str>: TENANT_SCOPE or COURSE_SCOPE.
+        identifier<str>: Tenant domain or course id.
+    """
+    key = _get_generation_key(scope, identifier)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate_course_stats(course_key):
+    """
+    Invalidates the stats of a course and the stats of the tenant associated with the course org,
+    the tenant is found by the SITE_NAME value of the org configuration.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+    """
+    bump_generation(COURSE_SCOPE, course_key)
+    site_name = TenantSiteConfigProxy.get_value_for_org(course_key.org, "SITE_NAME")
+
+    if not site_name:
+        logger.info("The org %s has not SITE_NAME configured, the tenant stats won't be invalidated.", course_key.org)
+        return
+
+    bump_generation(TENANT_SCOPE, site_name)
+
+
+def store_value(key, value, timeout):
+    """
+    Stores the value pickled and compressed. If the compressed data is bigger than the STATS_SETTINGS
+    value STATS_CACHE_CHUNK_SIZE, default 900 KB, the data is split in chunks and the main key
+    stores a ChunkedValue with the number of chunks and their digest.
+
+    Args:
+        key<str>: Cache key.
+        value<object>: Picklable value.
+        timeout<int>: Time in seconds that the value is kept in cache.
+    """
+    chunk_size = getattr(settings, "STATS_SETTINGS", {}).get("STATS_CACHE_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    if len(data) <= chunk_size:
+        cache.set(key, data, timeout=timeout)
+        return
+
+    chunks = {
+        f"{key}.{index}": data[offset:offset + chunk_size]
+        for index, offset in enumerate(range(0, len(data), chunk_size))
+    }
+    cache.set_many(chunks, timeout=timeout)
+    cache.set(key, ChunkedValue(len(chunks), hashlib.md5(data).hexdigest()), timeout=timeout)
+
+
+def load_value(key):
+    """
+    Returns the value stored by store_value, the chunks are read by a single get_many call. Values
+    that were stored with cache.set are returned as they are.
+
+    Args:
+        key<str>: Cache key.
+
+    Return:
+        <object>: Stored value, None if the value or any of its chunks is missing.
+    """
+    stored = cache.get(key)
+
+    if isinstance(stored, ChunkedValue):
+        chunk_keys = [f"{key}.{index}" for index in range(stored.chunks)]
+        chunks = cache.get_many(chunk_keys)
+        data = b"".join(chunks.get(chunk_key, b"") for chunk_key in chunk_keys)
+
+        if len(chunks) != stored.chunks or hashlib.md5(data).hexdigest() != stored.digest:
+            logger.info("The stats cache value %s is incomplete, it will be calculated again.", key)
+            return None
+
+        stored = data
+
+    if isinstance(stored, bytes):
+        return pickle.loads(zlib.decompress(stored))
+
+    return stored
+
+
+def _get_generation_key(scope, identifier):
+    """Returns the cache key that stores the generation counter."""
+    digest = hashlib.md5(str(identifier).encode("utf-8")).hexdigest()
+
+    return f"eox_nelp.stats.generation.{scope}.{digest}"
@@ -2,36 +2,269 @@
 
 decorators:
     cache_method: Cache the result of the inner method.
+
+functions:
+    serialize_refresh_args: Return the arguments in the format of the refresh_stats_cache task.
+    deserialize_refresh_args: Return the arguments received by the refresh_stats_cache task.
 """
+import time
+import uuid
+from collections import namedtuple
+from functools import partial
+from importlib import import_module
+
+from crum import get_current_request
 from django.conf import settings
 from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from eox_nelp.stats import instrumentation
+from eox_nelp.stats.cache import get_cache_key, load_value, store_value
 
+# Every result is stored inside this wrapper, so falsy results like 0 or {} are served from cache too.
+CachedValue = namedtuple("CachedValue", ["value", "stale_at"])
+ASYNC_REFRESH_ARG_TYPES = (str, int, float, bool, type(None))
+# Opaque keys are sent to the refresh task as strings and parsed back by the class of their type.
+ASYNC_REFRESH_KEY_TYPES = {"course_key": CourseKey, "usage_key": UsageKey}
 
-def cache_method(func):
+
+def cache_method(func=None, scope=None, timeout=None):
     """
-    Cache the function result to improve the response time.
+    Cache the function result to improve the response time. The cache key includes the generation
+    of the tenant or course that the first argument identifies(see the scope argument), so the
+    cached values are invalidated by the stats signal receivers instead of waiting the timeout.
+    The behavior is controlled by the following STATS_SETTINGS values:
+
+    - STATS_TIMEOUT<int>: Time in seconds that a value is kept in cache, default 3600. Since scoped
+      values are invalidated by events, this can be raised to days.
+    - STATS_SOFT_TIMEOUT<int>: Time in seconds after which a cached value is considered stale. Stale
+      values are returned while a celery task recalculates them, default None(disabled). This should
+      be lower than STATS_TIMEOUT.
+    - STATS_SINGLE_FLIGHT<bool>: If this is true, a cache lock allows just one process to calculate
+      a missing value while the others wait for it, default False.
+    - STATS_LOCK_TIMEOUT<int>: Max time in seconds that a lock is held, default 60.
+    - STATS_LOCK_WAIT<int>: Max time in seconds that a process waits for the lock owner result, default 10.
+    - STATS_CACHE_VERSION<int>: Version included in every key, increase it to invalidate all the
+      stats values, default 1.
+    - STATS_CACHE_CHUNK_SIZE<int>: Max size in bytes of a cache item, bigger values are split in
+      multiple keys, default 900 KB. See eox_nelp.stats.cache.store_value.
+
+    Every call is measured by the stats instrumentation, see eox_nelp.stats.instrumentation.
 
     Args:
         func<function>: Target function to be cached.
+        scope<str>: TENANT_SCOPE or COURSE_SCOPE if the first argument is a tenant domain or a course key,
+            default None(the value is invalidated only by timeout).
+        timeout<int>: Time in seconds that the value is kept in cache, for values that are not invalidated
+            by the scope events, default None(the STATS_TIMEOUT value).
 
     Return:
         <funtion>: Wrapper function.
     """
+    if func is None:
+        return partial(cache_method, scope=scope, timeout=timeout)
+
+    def get_key(*args):
+        return get_cache_key(func.__name__, args, scope=scope)
+
+    def refresh(*args, lock_token=None, **kwargs):
+        """Calculates and stores the value. The lock of the key is released just if lock_token
+        is the token of its owner, so a caller that doesn't own the lock doesn't release it."""
+        return _refresh(func, get_key(*args), args, kwargs, timeout, lock_token)
+
     def wrapper(*args, **kwargs):
-        key = f"{func.__name__}.{'-'.join(map(str, args))}.STATS_CACHE_KEY"
-        result = cache.get(key)
+        with instrumentation.measure(func.__name__) as measurement:
+            measurement.cache_hit = True
+
+            return _lookup(func, get_key(*args), args, kwargs, timeout)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    wrapper.refresh = refresh
+    wrapper.get_cache_key = get_key
+
+    return wrapper
+
+
+def serialize_refresh_args(args):
+    """
+    Returns the arguments in the format of the refresh_stats_cache task, the course and usage keys
+    are sent as {"key_type": "course_key", "key": "course-v1:edX+213+2121"}.
+
+    Args:
+        args<tuple>: Positional arguments of a cache_method decorated function.
 
-        if result:
-            return result
+    Return:
+        <list>: Serialized arguments or None if an argument can't be sent to the task.
+    """
+    serialized_args = []
 
-        result = func(*args, **kwargs)
+    for arg in args:
+        if isinstance(arg, ASYNC_REFRESH_ARG_TYPES):
+            serialized_args.append(arg)
+            continue
 
-        cache.set(
-            key,
-            result,
-            timeout=getattr(settings, "STATS_SETTINGS", {}).get("STATS_TIMEOUT", 3600),
+        key_type = next(
+            (name for name, key_class in ASYNC_REFRESH_KEY_TYPES.items() if isinstance(arg, key_class)),
+            None,
         )
 
+        if key_type is None:
+            return None
+
+        serialized_args.append({"key_type": key_type, "key": str(arg)})
+
+    return serialized_args
+
+
+def deserialize_refresh_args(args):
+    """
+    Returns the arguments received by the refresh_stats_cache task, the serialized keys are parsed.
+
+    Args:
+        args<list>: Arguments returned by serialize_refresh_args.
+
+    Return:
+        <list>: Positional arguments of the cache_method decorated function.
+    """
+    return [
+        ASYNC_REFRESH_KEY_TYPES[arg["key_type"]].from_string(arg["key"]) if isinstance(arg, dict) else arg
+        for arg in args
+    ]
+
+
+def _get_stats_settings():
+    """Returns the STATS_SETTINGS value."""
+    return getattr(settings, "STATS_SETTINGS", {})
+
+
+def _lookup(func, key, args, kwargs, timeout):
+    """Returns the cached value, the stale value while it's refreshed or the calculated value."""
+    cached = load_value(key)
+
+    if not isinstance(cached, CachedValue):
+        return _get_missing_value(func, key, args, kwargs, timeout)
+
+    if not cached.stale_at or cached.stale_at > time.time():
+        return cached.value
+
+    return _get_stale_value(func, key, cached, args, kwargs, timeout)
+
+
+def _get_missing_value(func, key, args, kwargs, timeout):
+    """Calculates a value that is not cached, in single flight mode just the lock owner calculates
+    it while the other processes wait for the stored value."""
+    if not _get_stats_settings().get("STATS_SINGLE_FLIGHT", False):
+        result = _compute(func, args, kwargs)
+        _store(key, result, timeout)
+
         return result
 
-    return wrapper
+    lock_token = _acquire_lock(key)
+
+    if lock_token:
+        return _refresh(func, key, args, kwargs, timeout, lock_token)
+
+    cached = _wait_for_value(key)
+
+    return cached.value if cached else _compute(func, args, kwargs)
+
+
+def _get_stale_value(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    func, key, cached, args, kwargs, timeout,
+):
+    """Returns the stale value while the refresh_stats_cache task recalculates it, the value is
+    refreshed inline if the arguments can't be sent to the task. The task receives the lock token,
+    so it releases the lock once the value is stored."""
+    lock_token = _acquire_lock(key)
+
+    if not lock_token:
+        # Another process is already refreshing the value.
+        return cached.value
+
+    serialized_args = serialize_refresh_args(args)
+
+    if serialized_args is None or kwargs:
+        return _refresh(func, key, args, kwargs, timeout, lock_token)
+
+    _enqueue_refresh(func, serialized_args, lock_token)
+
+    return cached.value
+
+
+def _compute(func, args, kwargs):
+    """Calls the function, the current measurement is marked as a cache miss."""
+    instrumentation.record_cache_miss()
+
+    return func(*args, **kwargs)
+
+
+def _store(key, result, timeout=None):
+    """Stores the result wrapped in a CachedValue with its soft expiration time, by default the
+    value is kept the STATS_TIMEOUT value."""
+    stats_settings = _get_stats_settings()
+    soft_timeout = stats_settings.get("STATS_SOFT_TIMEOUT")
+    store_value(
+        key,
+        CachedValue(result, time.time() + soft_timeout if soft_timeout else None),
+        timeout=timeout or stats_settings.get("STATS_TIMEOUT", 3600),
+    )
+
+
+def _refresh(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    func, key, args, kwargs, timeout, lock_token=None,
+):
+    """Calculates and stores the value, then releases the lock of the key if lock_token is the
+    token of its owner."""
+    try:
+        result = _compute(func, args, kwargs)
+        _store(key, result, timeout)
+    finally:
+        _release_lock(key, lock_token)
+
+    return result
+
+
+def _acquire_lock(key):
+    """Returns the token of the lock of the key if it was acquired by the current process, otherwise None."""
+    lock_token = uuid.uuid4().hex
+
+    if cache.add(f"{key}.LOCK", lock_token, timeout=_get_stats_settings().get("STATS_LOCK_TIMEOUT", 60)):
+        return lock_token
+
+    return None
+
+
+def _release_lock(key, lock_token):
+    """Deletes the lock of the key if it's still owned by the given token, the locks of other owners
+    are kept until they are released or expire."""
+    if lock_token and cache.get(f"{key}.LOCK") == lock_token:
+        cache.delete(f"{key}.LOCK")
+
+
+def _wait_for_value(key):
+    """Waits until the lock owner stores the value, returns None if the wait time is exceeded."""
+    deadline = time.time() + _get_stats_settings().get("STATS_LOCK_WAIT", 10)
+
+    while time.time() < deadline:
+        time.sleep(0.1)
+        cached = load_value(key)
+
+        if isinstance(cached, CachedValue):
+            return cached
+
+    return None
+
+
+def _enqueue_refresh(func, args, lock_token):
+    """Calls the refresh_stats_cache task, the current site domain is sent in order to
+    calculate the value with the same tenant context, and the lock token in order to release
+    the lock of the key."""
+    site = getattr(get_current_request(), "site", None)
+    # The tasks module is imported here since it depends on the modules that use this decorator.
+    import_module("eox_nelp.stats.tasks").refresh_stats_cache.delay(
+        function_path=f"{func.__module__}.{func.__name__}",
+        args=list(args),
+        tenant=getattr(site, "domain", None),
+        lock_token=lock_token,
+    )
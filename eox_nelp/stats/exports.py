@@ -0,0 +1,167 @@
+"""eox-nelp stats exports file.
+
+This module writes the course metrics of a tenant into a file, with the components and
+certificates breakdowns flattened as columns, e.g components.html or certificates.total.downloadable.
+The metrics are calculated and written by chunks, so the memory doesn't depend on the number
+of courses. The resulting file is stored with the default storage.
+
+functions:
+    export_courses_metrics: Write the course metrics of the current tenant and store the file.
+    get_export_columns: Return the columns of the export.
+    flatten_course_metrics: Return a course metrics as a single level dictionary.
+"""
+import csv
+import os
+from tempfile import NamedTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from eox_core.edxapp_wrapper.certificates import get_generated_certificate
+
+from eox_nelp.stats.backends import get_metrics_backend
+from eox_nelp.stats.metrics import get_cached_courses
+
+try:
+    import pyarrow
+    from pyarrow import parquet
+except ImportError:
+    pyarrow = None
+    parquet = None
+
+GeneratedCertificate = get_generated_certificate()
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+EXPORT_FORMATS = (CSV_FORMAT, PARQUET_FORMAT)
+BASE_COLUMNS = ("id", "name", "learners", "instructors", "sections", "sub_sections", "units")
+STRING_COLUMNS = ("id", "name")
+
+
+def export_courses_metrics(tenant, file_format=CSV_FORMAT):
+    """
+    Writes the metrics of the tenant courses into a temporary file, chunk by chunk, and stores it
+    with the default storage. This depends on the current site configuration, so it must run
+    inside a tenant request or the tenant_context manager. The following STATS_SETTINGS values
+    are used:
+
+    - STATS_EXPORT_CHUNK_SIZE<int>: Number of courses calculated and written at once, default 100.
+    - STATS_EXPORT_PATH<str>: Storage directory of the exports, default stats_exports.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+        file_format<str>: One of EXPORT_FORMATS, default csv.
+
+    Return:
+        <Dictionary>: Storage path, url and number of courses of the export.
+
+    Raises:
+        ValueError: If the format is not supported or pyarrow is not installed for parquet.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid export format {file_format}, the options are {', '.join(EXPORT_FORMATS)}")
+
+    if file_format == PARQUET_FORMAT and not pyarrow:
+        raise ValueError("The parquet format requires the pyarrow package, install eox-nelp[parquet]")
+
+    stats_settings = getattr(settings, "STATS_SETTINGS", {})
+    chunk_size = stats_settings.get("STATS_EXPORT_CHUNK_SIZE", 100)
+    course_keys = [course.id for course in get_cached_courses(tenant)]
+    columns = get_export_columns(course_keys)
+    backend = get_metrics_backend()
+    chunks = (
+        [
+            flatten_course_metrics(metric, columns)
+            for metric in backend.build_courses_metrics(course_keys[index:index + chunk_size])
+        ]
+        for index in range(0, len(course_keys), chunk_size)
+    )
+    file_name = os.path.join(
+        stats_settings.get("STATS_EXPORT_PATH", "stats_exports"),
+        tenant,
+        f"courses-metrics-{timezone.now():%Y%m%d%H%M%S}.{file_format}",
+    )
+
+    with NamedTemporaryFile(suffix=f".{file_format}") as temporary_file:
+        if file_format == CSV_FORMAT:
+            _write_csv(temporary_file.name, columns, chunks)
+        else:
+            _write_parquet(temporary_file.name, columns, chunks)
+
+        temporary_file.seek(0)
+        path = default_storage.save(file_name, File(temporary_file))
+
+    return {"path": path, "url": default_storage.url(path), "total_courses": len(course_keys)}
+
+
+def get_export_columns(course_keys):
+    """
+    Returns the columns of the export, the components columns depend on the API_XBLOCK_TYPES
+    setting and the certificates columns on the statuses of the given courses certificates.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+
+    Return:
+        list[str]: Column names.
+    """
+    allowed_block_types = getattr(settings, "STATS_SETTINGS", {}).get("API_XBLOCK_TYPES", [])
+    cert_statuses = sorted(
+        GeneratedCertificate.objects.filter(
+            course_id__in=course_keys,
+        ).values_list("status", flat=True).distinct().order_by()
+    )
+    cert_modes = [*dict(GeneratedCertificate.MODES).values(), "total"]
+
+    return [
+        *BASE_COLUMNS,
+        *[f"components.{block_type}" for block_type in allowed_block_types],
+        *[f"certificates.{mode}.{cert_status}" for mode in cert_modes for cert_status in cert_statuses],
+    ]
+
+
+def flatten_course_metrics(metric, columns):
+    """
+    Returns the course metrics as a single level dictionary, the nested keys are joined by dots
+    and the missing values are 0.
+
+    Args:
+        metric<Dictionary>: Course metrics, same structure that get_course_metrics returns.
+        columns<list[str]>: Column names returned by get_export_columns.
+
+    Return:
+        <Dictionary>: Value of every column.
+    """
+    row = {}
+
+    for column in columns:
+        value = metric
+
+        for key in column.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+
+        row[column] = value if value is not None else ("" if column in STRING_COLUMNS else 0)
+
+    return row
+
+
+def _write_csv(path, columns, chunks):
+    """Writes the rows of every chunk in a csv file."""
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=columns)
+        writer.writeheader()
+
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def _write_parquet(path, columns, chunks):
+    """Writes the rows of every chunk as a row group of a parquet file."""
+    schema = pyarrow.schema([
+        (column, pyarrow.string() if column in STRING_COLUMNS else pyarrow.int64())
+        for column in columns
+    ])
+
+    with parquet.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
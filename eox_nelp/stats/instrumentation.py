@@ -0,0 +1,174 @@
+"""eox-nelp stats instrumentation file.
+
+This module measures the stats hot path, every cache_method decorated function and stats view
+call records its time, database queries, modulestore calls and cache result. The measurements
+are aggregated by function in the current process and logged as JSON lines, e.g
+
+    eox_nelp.stats.instrumentation {"name": "get_courses_metrics", "tenant": "lms.example.com", ...}
+
+The instrumentation is disabled by default, set the STATS_SETTINGS value STATS_INSTRUMENTATION
+to true in order to enable it.
+
+functions:
+    measure: Context manager that measures a block of code.
+    record_cache_miss: Mark the current measurement as a cache miss.
+    record_modulestore_call: Add a modulestore call to the current measurements.
+    get_diagnostics: Return the aggregated measurements of the current process.
+    reset_diagnostics: Remove the aggregated measurements of the current process.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from crum import get_current_request
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+_local = threading.local()
+_lock = threading.Lock()
+_aggregates = {}
+
+
+class Measurement:
+    """Values of a single measured call, the counters include the nested calls.
+
+    Attributes:
+        name<str>: Function or view name.
+        queries<int>: Number of database queries.
+        modulestore_calls<int>: Number of courses loaded from the modulestore.
+        cache_hit<bool>: True if the value was read from cache, None for the calls that don't use cache.
+        duration<float>: Time in seconds.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+        self.modulestore_calls = 0
+        self.cache_hit = None
+        self.duration = 0.0
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def count_query(self, execute, sql, params, many, context):
+        """Database execute wrapper that counts the queries of the measurement."""
+        self.queries += 1
+
+        return execute(sql, params, many, context)
+
+
+def is_enabled():
+    """Returns True if the STATS_SETTINGS value STATS_INSTRUMENTATION is true."""
+    return getattr(settings, "STATS_SETTINGS", {}).get("STATS_INSTRUMENTATION", False)
+
+
+@contextmanager
+def measure(name):
+    """
+    Measures the time, queries, modulestore calls and cache result of the inner block, then the
+    values are aggregated and logged. The queries are counted on the connections of the current
+    thread, so the work of a thread pool is not included.
+
+    Args:
+        name<str>: Function or view name.
+
+    Yield:
+        Measurement: Values of the current call.
+    """
+    measurement = Measurement(name)
+
+    if not is_enabled():
+        yield measurement
+        return
+
+    stack = _get_stack()
+    stack.append(measurement)
+    start = time.perf_counter()
+
+    try:
+        with ExitStack() as exit_stack:
+            for connection in connections.all():
+                exit_stack.enter_context(connection.execute_wrapper(measurement.count_query))
+
+            yield measurement
+    finally:
+        measurement.duration = time.perf_counter() - start
+        stack.pop()
+        _record(measurement)
+
+
+def record_cache_miss():
+    """Marks the innermost measurement as a cache miss, this is called when a cached function is calculated."""
+    stack = _get_stack()
+
+    if stack:
+        stack[-1].cache_hit = False
+
+
+def record_modulestore_call():
+    """Adds a modulestore call to every active measurement of the current thread."""
+    for measurement in _get_stack():
+        measurement.modulestore_calls += 1
+
+
+def get_diagnostics():
+    """
+    Returns the aggregated measurements of the current process.
+
+    Return:
+        <Dictionary>: Process id, instrumentation status and the values of every function.
+    """
+    with _lock:
+        functions = {name: dict(values) for name, values in _aggregates.items()}
+
+    for values in functions.values():
+        values["avg_time"] = values["total_time"] / values["calls"]
+
+    return {"pid": os.getpid(), "enabled": is_enabled(), "functions": functions}
+
+
+def reset_diagnostics():
+    """Removes the aggregated measurements of the current process."""
+    with _lock:
+        _aggregates.clear()
+
+
+def _get_stack():
+    """Returns the active measurements of the current thread."""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+
+    return _local.stack
+
+
+def _record(measurement):
+    """Adds the measurement to the process aggregates and logs it as a JSON line."""
+    with _lock:
+        values = _aggregates.setdefault(measurement.name, {
+            "calls": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "queries": 0,
+            "modulestore_calls": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        })
+        values["calls"] += 1
+        values["cache_hits"] += measurement.cache_hit is True
+        values["cache_misses"] += measurement.cache_hit is False
+        values["queries"] += measurement.queries
+        values["modulestore_calls"] += measurement.modulestore_calls
+        values["total_time"] += measurement.duration
+        values["max_time"] = max(values["max_time"], measurement.duration)
+
+    site = getattr(get_current_request(), "site", None)
+    logger.info("eox_nelp.stats.instrumentation %s", json.dumps({
+        "name": measurement.name,
+        "tenant": getattr(site, "domain", None),
+        "duration_ms": round(measurement.duration * 1000, 2),
+        "queries": measurement.queries,
+        "modulestore_calls": measurement.modulestore_calls,
+        "cache_hit": measurement.cache_hit,
+    }))
@@ -2,97 +2,160 @@
 
 functions:
     get_cached_courses: Return visible courses.
+    get_cached_course: Return a visible course by id.
     get_course_metrics: Return the metric for the given course_key.
     get_learners_metric: Return number of learners, for the visible courses.
     get_instructors_metric: Return number of instructors, for the visible courses.
     get_courses_metrics: Return metrics for the visible courses.
+    build_courses_metrics: Return the metrics of the given courses, optionally limited to some fields.
+    assemble_courses_metrics: Add the structure metrics to pre-computed course values.
     get_course_certificates_metric: Return a dict metric representin the certificates of a course.
+    get_courses_certificates_metric: Return the certificates metric of multiple courses in a single query.
+    get_courses_learners_metric: Return the learners of multiple courses in a single query.
+    get_courses_instructors_metric: Return the instructors of multiple courses in a single query.
+    count_learners: Return the number of learners of a site and its courses.
+    count_instructors: Return the number of instructors of the given orgs.
+    get_course_completion_metric: Return the completion rates of the sections and subsections of a course.
 """
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
 from crum import get_current_request
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from eox_core.edxapp_wrapper.certificates import get_generated_certificate
 from eox_core.edxapp_wrapper.users import get_user_signup_source
 
 from eox_nelp.edxapp_wrapper.branding import get_visible_courses
+from eox_nelp.edxapp_wrapper.completion import BlockCompletion
 from eox_nelp.edxapp_wrapper.modulestore import modulestore
 from eox_nelp.edxapp_wrapper.site_configuration import configuration_helpers
 from eox_nelp.edxapp_wrapper.student import CourseAccessRole, CourseEnrollment
+from eox_nelp.stats import sketches
+from eox_nelp.stats.cache import COURSE_SCOPE, TENANT_SCOPE
 from eox_nelp.stats.decorators import cache_method
+from eox_nelp.stats.instrumentation import record_modulestore_call
+from eox_nelp.stats.models import CourseStructureSummary
+from eox_nelp.stats.utils import run_in_thread_pool
 
 GeneratedCertificate = get_generated_certificate()
 UserSignupSource = get_user_signup_source()
+COURSE_METRIC_FIELDS = (
+    "id",
+    "name",
+    "learners",
+    "instructors",
+    "sections",
+    "sub_sections",
+    "units",
+    "components",
+    "certificates",
+)
+STRUCTURE_METRIC_FIELDS = {"name", "sections", "sub_sections", "units", "components"}
+# Compact course record stored by get_cached_courses, the id is the course key.
+CachedCourse = namedtuple("CachedCourse", ["id", "display_name"])
+DEFAULT_LEARNERS_MODE = "default"
+EXACT_LEARNERS_MODE = "exact"
+# The completions don't bump the course generation, so the completion metric has a short timeout.
+COMPLETION_CACHE_TIMEOUT = 300
+
+
+@cache_method(scope=TENANT_SCOPE)
+def get_cached_courses(tenant):  # pylint: disable=unused-argument
+    """
+    Returns the visible courses as a compact index, a tuple of CachedCourse sorted by course id.
+    This is cached instead of the get_visible_courses result, so the cached value doesn't contain
+    the CourseOverview records and the counts or lookups don't query the database.
 
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
 
-@cache_method
-def get_cached_courses(tenant):  # pylint: disable=unused-argument
+    Return:
+        tuple[<CachedCourse>]: Id and display name of every visible course.
+    """
+    return tuple(sorted(
+        (CachedCourse(course.id, course.display_name) for course in get_visible_courses()),
+        key=_get_course_sort_key,
+    ))
+
+
+def get_cached_course(tenant, course_id):
     """
-    Returns the visible courses. This method is just a wrapper of get_visible_courses that
-    allows to cache the result.
+    Returns the visible course with the given id, the cached index is sorted so the course is
+    found by a binary search.
 
     Args:
         tenant<str>: String tenant identifier(site.domain)
+        course_id<str>: Course identifier string.
 
     Return:
-        list[<CourseOverview>]: List of CourseOverview records.
+        <CachedCourse>: Id and display name of the course, None if the course is not visible.
     """
-    return get_visible_courses()
+    courses = get_cached_courses(tenant)
+    index = bisect_left(courses, str(course_id), key=_get_course_sort_key)
+
+    if index < len(courses) and str(courses[index].id) == str(course_id):
+        return courses[index]
 
+    return None
 
-@cache_method
-def get_course_metrics(course_key):
+
+@cache_method(scope=COURSE_SCOPE)
+def get_course_metrics(course_key, learners=None, instructors=None, certificates=None):
     """
-    This allows to get the course stats metrics based on the course key.
+    This allows to get the course stats metrics based on the course key. The learners,
+    instructors and certificates values can be pre-computed for multiple courses, in order
+    to avoid a query by course.
 
     Args:
         course_key<opaque-key>: Course identifier.
+        learners<int>: Pre-computed learners metric, if this is not provided the value will be
+            calculated for the course.
+        instructors<int>: Pre-computed instructors metric, if this is not provided the value will be
+            calculated for the course.
+        certificates<Dictionary>: Pre-computed certificates metric, if this is not provided
+            the value will be calculated by get_course_certificates_metric.
 
     Return:
         <Dictionary>: Contains the course's metrics.
     """
     stats_settings = getattr(settings, "STATS_SETTINGS", {})
-    course = modulestore().get_course(course_key)
-    chapters = course.get_children()
+    summary = CourseStructureSummary.objects.filter(course_id=course_key).first()  # pylint: disable=no-member
 
-    sequentials = []
+    if not summary:
+        # The course has not been published since the summary table exists, so this fills it once.
+        summary = CourseStructureSummary.update_from_modulestore(course_key)
 
-    for chapter in chapters:
-        sequentials += chapter.get_children()
+    components = summary.get_components(stats_settings.get("API_XBLOCK_TYPES", []))
 
-    verticals = []
+    if instructors is None:
+        instructors = CourseAccessRole.objects.filter(course_id=course_key).values('user').distinct().count()
 
-    for sequential in sequentials:
-        verticals += sequential.get_children()
+    if learners is None:
+        learners = CourseEnrollment.objects.filter(
+            course=course_key,
+            user__is_staff=False,
+            user__is_superuser=False
+        ).values('user').distinct().count()
 
-    allowed_block_types = stats_settings.get("API_XBLOCK_TYPES", [])
-    components = {key: 0 for key in allowed_block_types}
-
-    for vertical in verticals:
-        for component in vertical.children:
-            if component.block_type in allowed_block_types:
-                components[component.block_type] = components.get(component.block_type, 0) + 1
-
-    instructors = CourseAccessRole.objects.filter(course_id=course_key).values('user').distinct().count()
-    learners = CourseEnrollment.objects.filter(
-        course=course_key,
-        user__is_staff=False,
-        user__is_superuser=False
-    ).values('user').distinct().count()
-    certificates = get_course_certificates_metric(course_key)
+    if certificates is None:
+        certificates = get_course_certificates_metric(course_key)
 
     return {
         "id": str(course_key),
-        "name": course.display_name,
+        "name": summary.display_name,
         "learners": learners,
         "instructors": instructors,
-        "sections": len(chapters),
-        "sub_sections": len(sequentials),
-        "units": len(verticals),
+        "sections": summary.sections,
+        "sub_sections": summary.sub_sections,
+        "units": summary.units,
         "components": components,
         "certificates": certificates,
     }
 
 
-@cache_method
+@cache_method(scope=TENANT_SCOPE)
 def get_learners_metric(tenant):
     """
     Returns the total of learners based on CourseEnrollments records.
@@ -104,25 +167,12 @@ def get_learners_metric(tenant):
         <int>: Total of learners.
     """
     request = get_current_request()
-    tenant_courses = get_cached_courses(tenant)
+    course_keys = [course.id for course in get_cached_courses(tenant)]
 
-    users_from_signup_source = UserSignupSource.objects.filter(
-        site=str(request.site),
-        user__is_staff=False,
-        user__is_superuser=False,
-    ).values_list("user", flat=True).distinct()
-    total_enrollments = CourseEnrollment.objects.filter(
-        course__in=tenant_courses,
-        user__is_staff=False,
-        user__is_superuser=False,
-    ).exclude(
-        user__in=users_from_signup_source,
-    ).values('user').distinct().count()
-
-    return total_enrollments + users_from_signup_source.count()
+    return count_learners(str(request.site), course_keys)
 
 
-@cache_method
+@cache_method(scope=TENANT_SCOPE)
 def get_instructors_metric(tenant):  # pylint: disable=unused-argument
     """
     Returns the total of instructors based on the accessible orgs, and the CourseAccessRole records.
@@ -135,13 +185,21 @@ def get_instructors_metric(tenant):  # pylint: disable=unused-argument
     """
     current_site_orgs = configuration_helpers.get_current_site_orgs()
 
-    return CourseAccessRole.objects.filter(org__in=current_site_orgs).values('user').distinct().count()
+    return count_instructors(current_site_orgs)
 
 
-@cache_method
+@cache_method(scope=TENANT_SCOPE)
 def get_courses_metrics(tenant):
     """
-    Returns the total of courses and its metrics.
+    Returns the total of courses and its metrics. The learners, instructors and certificates
+    of all the courses are calculated by a grouped query by table. The rest of the course metrics
+    can be calculated in parallel, that is controlled by the following STATS_SETTINGS values:
+
+    - STATS_PARALLEL_WORKERS<int>: Max number of threads that calculate course metrics, values
+      lower than 2 disable the parallel mode, default 0.
+    - STATS_PARALLEL_DEADLINE<float>: Max time in seconds that the thread pool is awaited, after that
+      the pending courses are cancelled and TimeoutError is raised, so an incomplete value is not
+      cached, default 30.
 
     Args:
         tenant<str>: String tenant identifier(site.domain)
@@ -150,9 +208,99 @@ def get_courses_metrics(tenant):
         <Dictionary>: Contains the courses' metrics.
     """
     courses = get_cached_courses(tenant)
-    metrics = [get_course_metrics(course.id) for course in courses]
+    course_keys = [course.id for course in courses]
+    learners = get_courses_learners_metric(course_keys)
+    instructors = get_courses_instructors_metric(course_keys)
+    certificates = get_courses_certificates_metric(course_keys)
+    stats_settings = getattr(settings, "STATS_SETTINGS", {})
+    workers = stats_settings.get("STATS_PARALLEL_WORKERS", 0)
+
+    def course_metrics(course_key):
+        return get_course_metrics(
+            course_key,
+            learners=learners.get(str(course_key), 0),
+            instructors=instructors.get(str(course_key), 0),
+            certificates=certificates.get(str(course_key)),
+        )
+
+    if workers > 1 and len(course_keys) > 1:
+        metrics = run_in_thread_pool(
+            course_metrics,
+            course_keys,
+            max_workers=min(workers, len(course_keys)),
+            deadline=stats_settings.get("STATS_PARALLEL_DEADLINE", 30),
+        )
+    else:
+        metrics = [course_metrics(course_key) for course_key in course_keys]
+
+    return {"total_courses": len(courses), "metrics": metrics}
+
+
+def build_courses_metrics(course_keys, fields=None):
+    """
+    Returns the metrics of the given courses without caching them. Every metric is calculated
+    by a single query for all the courses, and the metrics that are not in fields are not
+    calculated, e.g. the certificates query is skipped if certificates is not requested.
 
-    return {"total_courses": courses.count(), "metrics": metrics}
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+        fields<list[str]>: Keys of COURSE_METRIC_FIELDS to include, default all.
+
+    Return:
+        list[<Dictionary>]: Metrics of every course, same structure that get_course_metrics returns.
+    """
+    fields = [field for field in COURSE_METRIC_FIELDS if not fields or field in fields]
+    learners = get_courses_learners_metric(course_keys) if "learners" in fields else {}
+    instructors = get_courses_instructors_metric(course_keys) if "instructors" in fields else {}
+    certificates = get_courses_certificates_metric(course_keys) if "certificates" in fields else {}
+    values = {
+        str(course_key): {
+            "learners": learners.get(str(course_key), 0),
+            "instructors": instructors.get(str(course_key), 0),
+            "certificates": certificates.get(str(course_key), {}),
+        }
+        for course_key in course_keys
+    }
+
+    return assemble_courses_metrics(course_keys, fields, values)
+
+
+def assemble_courses_metrics(course_keys, fields, values):
+    """
+    Returns the metrics of the given courses by adding the structure metrics to the given values.
+    The structure summaries are read by a single query, and only if a structure field is requested.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+        fields<list[str]>: Keys of COURSE_METRIC_FIELDS to include.
+        values<Dictionary>: learners, instructors and certificates values by course id string.
+
+    Return:
+        list[<Dictionary>]: Metrics of every course, limited to the given fields.
+    """
+    allowed_block_types = getattr(settings, "STATS_SETTINGS", {}).get("API_XBLOCK_TYPES", [])
+    include_structure = bool(STRUCTURE_METRIC_FIELDS.intersection(fields))
+    summaries = {}
+
+    if include_structure:
+        summaries = {
+            str(summary.course_id): summary
+            for summary in CourseStructureSummary.objects.filter(course_id__in=course_keys)  # pylint: disable=no-member
+        }
+
+    metrics = []
+
+    for course_key in course_keys:
+        course_id = str(course_key)
+        metric = {"id": course_id, **values[course_id]}
+
+        if include_structure:
+            summary = summaries.get(course_id) or CourseStructureSummary.update_from_modulestore(course_key)
+            metric.update(summary.get_metrics(allowed_block_types))
+
+        metrics.append({field: metric[field] for field in fields})
+
+    return metrics
 
 
 def get_course_certificates_metric(course_key):
@@ -180,25 +328,234 @@ def get_course_certificates_metric(course_key):
                 "total": 0
         }
     """
-    certificates = {}
-    course_certificates_qs = GeneratedCertificate.objects.filter(
-        course_id=course_key,
-    )
-    cert_statuses = [cert["status"] for cert in course_certificates_qs.values("status").distinct()]
-
-    for mode in GeneratedCertificate.MODES:
-        db_mode = mode[0]
-        human_mode = mode[1]
-        certificates[human_mode] = {
-            cert_status: course_certificates_qs.filter(
-                mode=db_mode,
-                status=cert_status,
-            ).values("user").distinct().count()
+    return get_courses_certificates_metric([course_key]).get(str(course_key))
+
+
+def get_courses_certificates_metric(course_keys):
+    """
+    Returns the certificates metric of multiple courses. All the values are calculated by a
+    single query grouped by course, mode and status, so the cost doesn't depend on the number
+    of courses, modes or statuses.
+
+    Since GeneratedCertificate is unique by user and course, the total of every status is the
+    sum of all the modes.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+
+    Return:
+        <Dictionary>: Certificates metric of every course, the keys are the course ids as strings and
+        the values have the same structure that get_course_certificates_metric returns.
+    """
+    human_modes = dict(GeneratedCertificate.MODES)
+    grouped_certificates = {str(course_key): {} for course_key in course_keys}
+    rows = GeneratedCertificate.objects.filter(
+        course_id__in=course_keys,
+    ).values("course_id", "mode", "status").annotate(count=Count("user", distinct=True)).order_by()
+
+    for row in rows:
+        course_certificates = grouped_certificates.setdefault(str(row["course_id"]), {})
+        course_certificates[(row["mode"], row["status"])] = row["count"]
+
+    metrics = {}
+
+    for course_id, course_certificates in grouped_certificates.items():
+        cert_statuses = sorted({cert_status for _, cert_status in course_certificates})
+        certificates = {
+            human_mode: {
+                cert_status: course_certificates.get((db_mode, cert_status), 0)
+                for cert_status in cert_statuses
+            }
+            for db_mode, human_mode in human_modes.items()
+        }
+        certificates["total"] = {
+            cert_status: sum(
+                count for (_, status), count in course_certificates.items() if status == cert_status
+            )
             for cert_status in cert_statuses
         }
-    certificates["total"] = {
-        cert_status: course_certificates_qs.filter(status=cert_status).values("user").distinct().count()
-        for cert_status in cert_statuses
+        metrics[course_id] = certificates
+
+    return metrics
+
+
+def get_courses_learners_metric(course_keys):
+    """
+    Returns the number of learners of multiple courses by a single query grouped by course.
+    Staff and superusers are excluded.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+
+    Return:
+        <Dictionary>: Learners by course id string, courses without learners are not included.
+    """
+    return {
+        str(row["course"]): row["count"]
+        for row in CourseEnrollment.objects.filter(
+            course__in=course_keys,
+            user__is_staff=False,
+            user__is_superuser=False,
+        ).values("course").annotate(count=Count("user", distinct=True)).order_by()
+    }
+
+
+def get_courses_instructors_metric(course_keys):
+    """
+    Returns the number of instructors of multiple courses by a single query grouped by course.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+
+    Return:
+        <Dictionary>: Instructors by course id string, courses without instructors are not included.
+    """
+    return {
+        str(row["course_id"]): row["count"]
+        for row in CourseAccessRole.objects.filter(
+            course_id__in=course_keys,
+        ).values("course_id").annotate(count=Count("user", distinct=True)).order_by()
     }
 
-    return certificates
+
+def count_learners(site, courses):
+    """
+    Returns the number of learners of a site, that is the users with a signup source for the site
+    plus the users enrolled in the site courses. Staff and superusers are excluded. The STATS_SETTINGS
+    value STATS_LEARNERS_MODE sets how the value is calculated:
+
+    - default: A distinct count of the enrollments that excludes the signup source users, plus the
+      distinct count of the signup source users.
+    - exact: A single distinct count of the users that belong to any of both sources.
+    - approximate: A HyperLogLog estimation, see eox_nelp.stats.sketches.
+
+    Args:
+        site<str>: Site domain used by the UserSignupSource records.
+        courses<list>: Courses or course keys of the site.
+
+    Return:
+        <int>: Total of learners.
+    """
+    learners_mode = getattr(settings, "STATS_SETTINGS", {}).get("STATS_LEARNERS_MODE", DEFAULT_LEARNERS_MODE)
+
+    if learners_mode == sketches.APPROXIMATE_LEARNERS_MODE:
+        return sketches.estimate_learners(site, [getattr(course, "id", course) for course in courses])
+
+    if learners_mode == EXACT_LEARNERS_MODE:
+        return get_user_model().objects.filter(
+            Q(id__in=UserSignupSource.objects.filter(site=site).values("user"))
+            | Q(id__in=CourseEnrollment.objects.filter(course__in=courses).values("user")),
+            is_staff=False,
+            is_superuser=False,
+        ).count()
+
+    users_from_signup_source = UserSignupSource.objects.filter(
+        site=site,
+        user__is_staff=False,
+        user__is_superuser=False,
+    ).values_list("user", flat=True).distinct()
+    total_enrollments = CourseEnrollment.objects.filter(
+        course__in=courses,
+        user__is_staff=False,
+        user__is_superuser=False,
+    ).exclude(
+        user__in=users_from_signup_source,
+    ).values('user').distinct().count()
+
+    return total_enrollments + users_from_signup_source.count()
+
+
+def count_instructors(orgs):
+    """
+    Returns the number of users with a CourseAccessRole record in the given orgs.
+
+    Args:
+        orgs<list[str]>: List of organizations.
+
+    Return:
+        <int>: Total of instructors.
+    """
+    return CourseAccessRole.objects.filter(org__in=orgs).values('user').distinct().count()
+
+
+@cache_method(scope=COURSE_SCOPE, timeout=COMPLETION_CACHE_TIMEOUT)
+def get_course_completion_metric(course_key):
+    """
+    Returns how many enrolled learners have completed every section and subsection of a course,
+    a learner completed a section or subsection if the learner completed all its components. The
+    completed components of every learner are read by a single query over BlockCompletion and
+    mapped onto the course outline, that is loaded once from the modulestore. The completion rate
+    is the average fraction of the learners that completed every component, so partial progress
+    is visible too.
+
+    The completions don't invalidate the cached stats, so the value is cached by course for
+    COMPLETION_CACHE_TIMEOUT seconds instead of the STATS_TIMEOUT value, and it's invalidated
+    when the course is published.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+
+    Return:
+        <Dictionary>: Enrolled learners and the outline with the completed learners and the completion
+        rate of every section and subsection.
+    """
+    learners = get_courses_learners_metric([course_key]).get(str(course_key), 0)
+    learner_blocks = {}
+
+    for user_id, block_key in BlockCompletion.objects.filter(
+        context_key=course_key,
+        completion__gte=1.0,
+        user__is_staff=False,
+        user__is_superuser=False,
+    ).values_list("user", "block_key").iterator():
+        learner_blocks.setdefault(user_id, set()).add(str(block_key))
+
+    block_learners = Counter(block for blocks in learner_blocks.values() for block in blocks)
+
+    def completion(blocks):
+        """Returns the number of components, the learners that completed all of them and the
+        average completion rate of the given components."""
+        block_ids = {str(block) for block in blocks}
+
+        if not block_ids or not learners:
+            return {"components": len(blocks), "completed_learners": 0, "completion_rate": 0.0}
+
+        completed = sum(min(block_learners.get(str(block), 0), learners) for block in blocks)
+        completed_learners = sum(1 for completed_blocks in learner_blocks.values() if block_ids <= completed_blocks)
+
+        return {
+            "components": len(blocks),
+            "completed_learners": min(completed_learners, learners),
+            "completion_rate": round(completed / (len(blocks) * learners), 4),
+        }
+
+    record_modulestore_call()
+    course = modulestore().get_course(course_key)
+    sections = []
+
+    for chapter in course.get_children():
+        sub_sections = []
+        section_blocks = []
+
+        for sequential in chapter.get_children():
+            blocks = [block for vertical in sequential.get_children() for block in vertical.children]
+            section_blocks += blocks
+            sub_sections.append({
+                "id": str(sequential.location),
+                "display_name": sequential.display_name,
+                **completion(blocks),
+            })
+
+        sections.append({
+            "id": str(chapter.location),
+            "display_name": chapter.display_name,
+            **completion(section_blocks),
+            "sub_sections": sub_sections,
+        })
+
+    return {"id": str(course_key), "learners": learners, "sections": sections}
+
+
+def _get_course_sort_key(course):
+    """Returns the string id of a CachedCourse, used to sort and search the cached courses."""
+    return str(course.id)
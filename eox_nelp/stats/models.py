@@ -0,0 +1,226 @@
+"""Stats models. This contains all the models that store pre-computed stats data.
+
+Models:
+    CourseStructureSummary: Store the structure counts of a course, calculated at publish time.
+    CourseStatsSnapshot: Store the learners, instructors and certificates metrics of a course.
+    TenantStatsSnapshot: Store the learners and instructors metrics of a tenant.
+    DailyStatsRollup: Store the daily activity of a tenant or a course.
+    LearnersSketch: Store the HyperLogLog sketch of the learners of a course or site.
+    DailyActiveLearners: Store the bitmap of the learners that were active in a course during a day.
+"""
+from django.db import models
+from opaque_keys.edx.django.models import CourseKeyField
+
+from eox_nelp.edxapp_wrapper.modulestore import modulestore
+from eox_nelp.stats.instrumentation import record_modulestore_call
+
+
+class CourseStructureSummary(models.Model):
+    """Django model that stores the structure of a course, this is updated every time that
+    the course is published, so the stats don't have to load the course from the modulestore.
+
+    Fields:
+        course_id<CourseKeyField>: Course identifier.
+        display_name<CharField>: Course display name.
+        sections<PositiveIntegerField>: Number of chapters.
+        sub_sections<PositiveIntegerField>: Number of sequentials.
+        units<PositiveIntegerField>: Number of verticals.
+        block_types<JSONField>: Histogram of the unit children block types, e.g {"html": 5, "problem": 2}.
+        modified<DateTimeField>: Last time that the summary was updated.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    display_name = models.CharField(max_length=255, blank=True, default="")
+    sections = models.PositiveIntegerField(default=0)
+    sub_sections = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    block_types = models.JSONField(default=dict)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Structure summary of {self.course_id}"
+
+    def get_components(self, allowed_block_types):
+        """Returns the number of components of every allowed block type.
+
+        Args:
+            allowed_block_types<list[str]>: List of block types, e.g ["html", "problem"].
+
+        Return:
+            <Dictionary>: Number of components by block type.
+        """
+        return {
+            block_type: self.block_types.get(block_type, 0)  # pylint: disable=no-member
+            for block_type in allowed_block_types
+        }
+
+    def get_metrics(self, allowed_block_types):
+        """Returns the structure metrics of the course, with the same keys of the course stats.
+
+        Args:
+            allowed_block_types<list[str]>: List of block types, e.g ["html", "problem"].
+
+        Return:
+            <Dictionary>: name, sections, sub_sections, units and components values.
+        """
+        return {
+            "name": self.display_name,
+            "sections": self.sections,
+            "sub_sections": self.sub_sections,
+            "units": self.units,
+            "components": self.get_components(allowed_block_types),
+        }
+
+    @classmethod
+    def update_from_modulestore(cls, course_key):
+        """Walks the course tree, chapter -> sequential -> vertical -> children, and stores its summary.
+
+        Args:
+            course_key<opaque-key>: Course identifier.
+
+        Return:
+            CourseStructureSummary: The updated instance.
+        """
+        record_modulestore_call()
+        course = modulestore().get_course(course_key)
+        chapters = course.get_children()
+        sequentials = []
+
+        for chapter in chapters:
+            sequentials += chapter.get_children()
+
+        verticals = []
+
+        for sequential in sequentials:
+            verticals += sequential.get_children()
+
+        block_types = {}
+
+        for vertical in verticals:
+            for component in vertical.children:
+                block_types[component.block_type] = block_types.get(component.block_type, 0) + 1
+
+        summary, _ = cls.objects.update_or_create(  # pylint: disable=no-member
+            course_id=course_key,
+            defaults={
+                "display_name": course.display_name,
+                "sections": len(chapters),
+                "sub_sections": len(sequentials),
+                "units": len(verticals),
+                "block_types": block_types,
+            },
+        )
+
+        return summary
+
+
+class CourseStatsSnapshot(models.Model):
+    """Django model that stores the enrollment based metrics of a course. The values are maintained
+    by signals receivers and corrected periodically by the reconcile_stats_snapshots task.
+
+    Fields:
+        course_id<CourseKeyField>: Course identifier.
+        learners<PositiveIntegerField>: Number of enrolled users that are not staff or superusers.
+        instructors<PositiveIntegerField>: Number of users with a course access role.
+        certificates<JSONField>: Certificates metric, same structure that get_course_certificates_metric returns.
+        modified<DateTimeField>: Last time that the snapshot was updated.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    learners = models.PositiveIntegerField(default=0)
+    instructors = models.PositiveIntegerField(default=0)
+    certificates = models.JSONField(default=dict)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats snapshot of {self.course_id}"
+
+
+class TenantStatsSnapshot(models.Model):
+    """Django model that stores the tenant wide metrics that can't be calculated by adding
+    the course snapshots, since a user can be enrolled in multiple courses.
+
+    Fields:
+        tenant<CharField>: Tenant identifier(site.domain).
+        orgs<JSONField>: Organizations of the tenant, used to reconcile the values outside a request.
+        learners<PositiveIntegerField>: Number of learners of the tenant.
+        instructors<PositiveIntegerField>: Number of instructors of the tenant.
+        modified<DateTimeField>: Last time that the snapshot was updated.
+    """
+    tenant = models.CharField(max_length=255, unique=True)
+    orgs = models.JSONField(default=list)
+    learners = models.PositiveIntegerField(default=0)
+    instructors = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats snapshot of {self.tenant}"
+
+
+class DailyStatsRollup(models.Model):
+    """Django model that stores the activity of a single day, by tenant and course. The records
+    are created by the build_daily_stats_rollups task, so the time-series are read without
+    touching the LMS tables. The records with an empty course_id contain the tenant totals.
+
+    Fields:
+        tenant<CharField>: Tenant identifier(site.domain).
+        course_id<CharField>: Course identifier string, empty for the tenant totals.
+        date<DateField>: Day of the activity.
+        new_enrollments<PositiveIntegerField>: Number of learners enrolled during the day.
+        active_learners<PositiveIntegerField>: Number of learners that completed a block during the day.
+        certificates<JSONField>: Certificates created during the day by status, e.g {"downloadable": 3}.
+        modified<DateTimeField>: Last time that the rollup was updated.
+    """
+    tenant = models.CharField(max_length=255)
+    course_id = models.CharField(max_length=255, blank=True, default="")
+    date = models.DateField(db_index=True)
+    new_enrollments = models.PositiveIntegerField(default=0)
+    active_learners = models.PositiveIntegerField(default=0)
+    certificates = models.JSONField(default=dict)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Set model constrains, the tenant, course and date combination must be unique."""
+        unique_together = [["tenant", "course_id", "date"]]
+
+    def __str__(self):
+        return f"Daily stats of {self.tenant} {self.course_id} {self.date}"
+
+
+class LearnersSketch(models.Model):
+    """Django model that stores a HyperLogLog sketch of the learners of a course or a site, the
+    sketches are merged in order to estimate the distinct learners of a tenant, see eox_nelp.stats.sketches.
+
+    Fields:
+        key<CharField>: Sketch identifier, e.g course:course-v1:org+course+run or site:lms.example.com.
+        registers<BinaryField>: HyperLogLog registers.
+        modified<DateTimeField>: Last time that the sketch was updated.
+    """
+    key = models.CharField(max_length=300, unique=True)
+    registers = models.BinaryField()
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Learners sketch of {self.key}"
+
+
+class DailyActiveLearners(models.Model):
+    """Django model that stores the learners that completed a block of a course during a day, as a
+    compressed bitmap of user ids, see eox_nelp.stats.activity. The records are updated by the
+    update_active_learners task, that the BlockCompletion post_save receiver enqueues.
+
+    Fields:
+        course_id<CourseKeyField>: Course identifier.
+        date<DateField>: Day of the activity(UTC).
+        users<BinaryField>: Serialized ActivityBitmap of the active user ids.
+        modified<DateTimeField>: Last time that the bitmap was updated.
+    """
+    course_id = CourseKeyField(max_length=255)
+    date = models.DateField(db_index=True)
+    users = models.BinaryField()
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Set model constrains, the course and date combination must be unique."""
+        unique_together = [["course_id", "date"]]
+
+    def __str__(self):
+        return f"Active learners of {self.course_id} {self.date}"
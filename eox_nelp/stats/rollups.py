@@ -0,0 +1,182 @@
+"""eox-nelp stats rollups file.
+
+This module builds and reads the daily activity of tenants and courses. The rollups are built
+once per day, so the time-series don't depend on the size of the LMS tables. Every column
+relies on a single query of the day:
+
+- new_enrollments: CourseEnrollment filtered by the indexed created field.
+- active_learners: the DailyActiveLearners bitmaps of the day, filtered by the indexed date field,
+  see eox_nelp.stats.activity. The days before the bitmaps were recorded have no active learners.
+- certificates: GeneratedCertificate filtered by the courses of the tenants and the created_date
+  field, that is not indexed, so the rows of those courses are read.
+
+classes:
+    DailyRollups: Rollups of a day by tenant and course.
+
+functions:
+    build_daily_stats_rollups: Calculate and store the rollups of a single day.
+    add_enrollments: Add the new enrollments to the rollups.
+    add_active_learners: Add the active learners of the stored bitmaps to the rollups.
+    add_certificates: Add the generated certificates to the rollups.
+    write_rollups: Replace the stored rollups of a day.
+    get_daily_stats: Return the stored rollups of a tenant or course in a date range.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+
+from django.db import transaction
+from django.db.models import Count
+from eox_core.edxapp_wrapper.certificates import get_generated_certificate
+
+from eox_nelp.edxapp_wrapper.course_overviews import CourseOverview
+from eox_nelp.edxapp_wrapper.student import CourseEnrollment
+from eox_nelp.stats.activity import ActivityBitmap
+from eox_nelp.stats.models import DailyActiveLearners, DailyStatsRollup
+from eox_nelp.stats.utils import get_tenants_orgs
+
+GeneratedCertificate = get_generated_certificate()
+ROLLUP_FIELDS = ("date", "new_enrollments", "active_learners", "certificates")
+
+
+def build_daily_stats_rollups(day):
+    """
+    Calculates the activity of the given day and replaces its rollups, so the function can be
+    called multiple times for the same day. Every source is read by a single query filtered by
+    the day and grouped by course, the courses are assigned to the tenants by organization.
+
+    Args:
+        day<date>: Day to process.
+
+    Return:
+        list[DailyStatsRollup]: The stored records, including a tenant total by tenant.
+    """
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    end = start + timedelta(days=1)
+    rollups = DailyRollups(day)
+
+    add_enrollments(rollups, start, end)
+    add_active_learners(rollups)
+    add_certificates(rollups, start, end)
+
+    return write_rollups(day, rollups)
+
+
+class DailyRollups:
+    """Rollups of a day by tenant and course, the courses are assigned to the tenants by organization.
+
+    Attributes:
+        day<date>: Day of the rollups.
+        org_tenants<Dictionary>: Tenants by organization.
+        records<Dictionary>: Rollups by (tenant, course_id), the tenant totals have an empty course_id.
+    """
+
+    def __init__(self, day):
+        self.day = day
+        self.org_tenants = defaultdict(list)
+
+        for tenant, orgs in get_tenants_orgs().items():
+            for org in orgs:
+                self.org_tenants[org].append(tenant)
+
+        self.records = {
+            (tenant, ""): self._new_rollup(tenant, "")
+            for tenants in self.org_tenants.values()
+            for tenant in tenants
+        }
+
+    def course_rollups(self, course_key):
+        """Returns the course and tenant rollups of every tenant that contains the course."""
+        course_id = str(course_key)
+
+        for tenant in self.org_tenants.get(getattr(course_key, "org", None), []):
+            if (tenant, course_id) not in self.records:
+                self.records[(tenant, course_id)] = self._new_rollup(tenant, course_id)
+
+            yield self.records[(tenant, course_id)], self.records[(tenant, "")]
+
+    def _new_rollup(self, tenant, course_id):
+        """Returns an empty rollup of the day."""
+        return DailyStatsRollup(tenant=tenant, course_id=course_id, date=self.day, certificates={})
+
+
+def add_enrollments(rollups, start, end):
+    """Adds the learners that were enrolled between start and end to the course and tenant rollups."""
+    for row in CourseEnrollment.objects.filter(
+        created__gte=start,
+        created__lt=end,
+        user__is_staff=False,
+        user__is_superuser=False,
+    ).values("course").annotate(count=Count("user", distinct=True)).order_by():
+        for course_rollup, tenant_rollup in rollups.course_rollups(row["course"]):
+            course_rollup.new_enrollments += row["count"]
+            tenant_rollup.new_enrollments += row["count"]
+
+
+def add_active_learners(rollups):
+    """Adds the learners of the active learners bitmaps of the day, a learner is counted once by tenant.
+    The bitmaps are updated by the update_active_learners task and don't include staff users."""
+    tenant_active_users = defaultdict(ActivityBitmap)
+
+    for course_id, users in DailyActiveLearners.objects.filter(  # pylint: disable=no-member
+        date=rollups.day,
+    ).values_list("course_id", "users").iterator():
+        bitmap = ActivityBitmap.from_bytes(users)
+
+        for course_rollup, tenant_rollup in rollups.course_rollups(course_id):
+            course_rollup.active_learners = len(bitmap)
+            tenant_active_users[tenant_rollup.tenant] = tenant_active_users[tenant_rollup.tenant] | bitmap
+
+    for tenant, bitmap in tenant_active_users.items():
+        rollups.records[(tenant, "")].active_learners = len(bitmap)
+
+
+def add_certificates(rollups, start, end):
+    """Adds the certificates of the tenants courses created between start and end by status."""
+    for row in GeneratedCertificate.objects.filter(
+        course_id__in=CourseOverview.objects.filter(org__in=rollups.org_tenants).values_list("id", flat=True),
+        created_date__gte=start,
+        created_date__lt=end,
+    ).values("course_id", "status").annotate(count=Count("id")).order_by():
+        for course_rollup, tenant_rollup in rollups.course_rollups(row["course_id"]):
+            for rollup in (course_rollup, tenant_rollup):
+                rollup.certificates[row["status"]] = rollup.certificates.get(row["status"], 0) + row["count"]
+
+
+def write_rollups(day, rollups):
+    """Replaces the stored rollups of the day in a single transaction.
+
+    Return:
+        list[DailyStatsRollup]: The stored records.
+    """
+    with transaction.atomic():
+        DailyStatsRollup.objects.filter(date=day).delete()  # pylint: disable=no-member
+        records = DailyStatsRollup.objects.bulk_create(  # pylint: disable=no-member
+            rollups.records.values(),
+            batch_size=500,
+        )
+
+    return records
+
+
+def get_daily_stats(tenant, start, end, course_id=""):
+    """
+    Returns the stored rollups of a tenant, or one of its courses, between two dates. The days
+    without a record are not included.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+        start<date>: First day of the range.
+        end<date>: Last day of the range, included.
+        course_id<str>: Course identifier string, default the tenant totals.
+
+    Return:
+        list[<Dictionary>]: date, new_enrollments, active_learners and certificates of every day.
+    """
+    rows = DailyStatsRollup.objects.filter(  # pylint: disable=no-member
+        tenant=tenant,
+        course_id=course_id,
+        date__gte=start,
+        date__lte=end,
+    ).order_by("date").values(*ROLLUP_FIELDS)
+
+    return [{**row, "date": row["date"].isoformat()} for row in rows]
@@ -0,0 +1,244 @@
+"""eox-nelp stats sketches file.
+
+This module keeps a HyperLogLog sketch of the learners of every course and site, so the
+distinct learners of a tenant can be estimated by merging a few kilobytes by course instead
+of scanning the enrollments. The sketches are updated by celery tasks that the stats signal
+receivers enqueue when the STATS_SETTINGS value STATS_LEARNERS_MODE is approximate. A missing
+sketch is built from the LMS tables by a task too, the estimations merge the stored sketches
+meanwhile.
+
+classes:
+    HyperLogLog: Cardinality estimator with 2^PRECISION registers.
+
+functions:
+    is_enabled: Return True if the learners are estimated with the sketches.
+    add_course_learner: Enqueue the addition of a learner to the sketch of a course.
+    add_site_learner: Enqueue the addition of a learner to the sketch of a site.
+    estimate_learners: Return the estimated distinct learners of a site and its courses.
+    add_learner: Add a learner to a stored sketch.
+    build_sketch: Build a sketch from the LMS tables and store it.
+"""
+import hashlib
+import math
+from functools import partial
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from eox_core.edxapp_wrapper.users import get_user_signup_source
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.edxapp_wrapper.student import CourseEnrollment
+from eox_nelp.stats.cache import TENANT_SCOPE, bump_generation, invalidate_course_stats
+from eox_nelp.stats.models import LearnersSketch
+
+UserSignupSource = get_user_signup_source()
+APPROXIMATE_LEARNERS_MODE = "approximate"
+# 4096 registers of one byte, the standard error is 1.04 / sqrt(4096), around 1.6%.
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+HASH_BITS = 64
+# A missing sketch is enqueued once in this time, in seconds, while its build task runs.
+BUILD_LOCK_TIMEOUT = 600
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimator, every register stores the max rank of the hashes
+    that are assigned to it. Two sketches are merged by taking the max of every register.
+
+    Attributes:
+        registers<bytearray>: Max rank by register.
+    """
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers else bytearray(REGISTERS)
+
+    def add(self, value):
+        """Adds a value to the sketch.
+
+        Args:
+            value<object>: Value to count, e.g a user id.
+
+        Return:
+            bool: True if the registers were changed.
+        """
+        hashed = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        index = hashed >> (HASH_BITS - PRECISION)
+        remaining = hashed & ((1 << (HASH_BITS - PRECISION)) - 1)
+        rank = HASH_BITS - PRECISION - remaining.bit_length() + 1
+
+        if rank <= self.registers[index]:
+            return False
+
+        self.registers[index] = rank
+
+        return True
+
+    def merge(self, other):
+        """Adds the values of other sketch to this one.
+
+        Args:
+            other<HyperLogLog>: Sketch to merge.
+
+        Return:
+            HyperLogLog: This sketch.
+        """
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+        return self
+
+    def count(self):
+        """Returns the estimated number of distinct values, small cardinalities are corrected
+        by linear counting."""
+        alpha = 0.7213 / (1 + 1.079 / REGISTERS)
+        estimate = alpha * REGISTERS ** 2 / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+
+        if zeros and estimate <= 2.5 * REGISTERS:
+            return round(REGISTERS * math.log(REGISTERS / zeros))
+
+        return round(estimate)
+
+
+def is_enabled():
+    """Returns True if the STATS_SETTINGS value STATS_LEARNERS_MODE is approximate."""
+    return getattr(settings, "STATS_SETTINGS", {}).get("STATS_LEARNERS_MODE") == APPROXIMATE_LEARNERS_MODE
+
+
+def add_course_learner(course_key, user_id):
+    """
+    Adds a learner to the sketch of a course, the update_learners_sketch task updates the stored
+    sketch once the current transaction is committed, so the sketch row is not locked by the
+    enrollment request.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+        user_id<int>: Learner id.
+    """
+    _enqueue_learner(_get_course_sketch_key(course_key), user_id)
+
+
+def add_site_learner(site, user_id):
+    """
+    Adds a learner to the sketch of a site, that contains the users with a signup source for the site.
+    The update_learners_sketch task updates the stored sketch once the current transaction is committed.
+
+    Args:
+        site<str>: Site domain used by the UserSignupSource records.
+        user_id<int>: Learner id.
+    """
+    _enqueue_learner(_get_site_sketch_key(site), user_id)
+
+
+def estimate_learners(site, course_keys):
+    """
+    Returns the estimated number of distinct learners of a site, that is the union of the users
+    with a signup source for the site and the users enrolled in the site courses. The sketches
+    are read by a single query, the missing ones are built by the build_learners_sketch task, so
+    the result only merges the stored sketches until the builds finish and invalidate the stats.
+
+    Args:
+        site<str>: Site domain used by the UserSignupSource records.
+        course_keys<list[opaque-key]>: Course identifiers of the site.
+
+    Return:
+        <int>: Estimated total of learners.
+    """
+    sketch_keys = [_get_site_sketch_key(site), *[_get_course_sketch_key(course_key) for course_key in course_keys]]
+    stored_registers = dict(
+        LearnersSketch.objects.filter(key__in=sketch_keys).values_list("key", "registers")  # pylint: disable=no-member
+    )
+    merged_sketch = HyperLogLog()
+
+    for sketch_key in sketch_keys:
+        if sketch_key in stored_registers:
+            merged_sketch.merge(HyperLogLog(stored_registers[sketch_key]))
+        elif cache.add(f"eox_nelp.stats.sketches.{sketch_key}.BUILD", True, timeout=BUILD_LOCK_TIMEOUT):
+            _get_tasks().build_learners_sketch.delay(sketch_key)
+
+    return merged_sketch.count()
+
+
+def add_learner(sketch_key, user_id):
+    """
+    Adds the learner to the stored sketch, the record is locked during the update. If the sketch
+    doesn't exist, it's built from the LMS tables, that already contain the learner. This runs in
+    the update_learners_sketch task.
+
+    Args:
+        sketch_key<str>: Key of the course or site sketch.
+        user_id<int>: Learner id.
+    """
+    with transaction.atomic():
+        sketch = LearnersSketch.objects.select_for_update().filter(key=sketch_key).first()  # pylint: disable=no-member
+
+        if not sketch:
+            build_sketch(sketch_key)
+            return
+
+        hyperloglog = HyperLogLog(sketch.registers)
+
+        if hyperloglog.add(user_id):
+            sketch.registers = bytes(hyperloglog.registers)
+            sketch.save(update_fields=["registers", "modified"])
+
+
+def build_sketch(sketch_key):
+    """
+    Builds the sketch of the given key from the enrollments or signup sources and stores it, then
+    invalidates the cached stats of the course or site, that were estimated without the sketch.
+    This runs in the build_learners_sketch and update_learners_sketch tasks.
+
+    Args:
+        sketch_key<str>: Key of the course or site sketch.
+
+    Return:
+        HyperLogLog: The stored sketch.
+    """
+    kind, identifier = sketch_key.split(":", 1)
+
+    if kind == "site":
+        users = UserSignupSource.objects.filter(site=identifier)
+    else:
+        users = CourseEnrollment.objects.filter(course=identifier)
+
+    hyperloglog = HyperLogLog()
+
+    for user_id in users.filter(
+        user__is_staff=False,
+        user__is_superuser=False,
+    ).values_list("user", flat=True).distinct().iterator():
+        hyperloglog.add(user_id)
+
+    LearnersSketch.objects.update_or_create(  # pylint: disable=no-member
+        key=sketch_key,
+        defaults={"registers": bytes(hyperloglog.registers)},
+    )
+
+    if kind == "site":
+        bump_generation(TENANT_SCOPE, identifier)
+    else:
+        invalidate_course_stats(CourseKey.from_string(identifier))
+
+    return hyperloglog
+
+
+def _enqueue_learner(sketch_key, user_id):
+    """Calls the update_learners_sketch task once the current transaction is committed."""
+    transaction.on_commit(partial(_get_tasks().update_learners_sketch.delay, sketch_key, user_id))
+
+
+def _get_tasks():
+    """Returns the stats tasks module, it's imported here since it depends on this module."""
+    return import_module("eox_nelp.stats.tasks")
+
+
+def _get_course_sketch_key(course_key):
+    """Returns the sketch key of a course."""
+    return f"course:{course_key}"
+
+
+def _get_site_sketch_key(site):
+    """Returns the sketch key of a site."""
+    return f"site:{site}"
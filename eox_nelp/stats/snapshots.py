@@ -0,0 +1,227 @@
+"""eox-nelp stats snapshots file.
+
+This module exposes the same metrics that eox_nelp.stats.metrics does, but the values are read
+from the snapshot tables, so the cost of a request doesn't depend on the enrollments volume.
+The snapshots are maintained by signal receivers and the reconcile_stats_snapshots task, a new
+enrollment increments its course snapshot and schedules the refresh of the tenant snapshot.
+
+functions:
+    get_course_metrics: Return the metric for the given course_key.
+    get_courses_metrics: Return metrics for the visible courses.
+    get_learners_metric: Return number of learners of the tenant.
+    get_instructors_metric: Return number of instructors of the tenant.
+    build_courses_metrics: Return the metrics of the given courses, optionally limited to some fields.
+    refresh_course_stats_snapshots: Recalculate the snapshots of the given courses.
+    refresh_tenant_stats_snapshot: Recalculate the snapshot of the given tenant.
+    increment_course_learners: Add a learner to the snapshot of a course.
+    schedule_tenant_snapshot_refresh: Enqueue the refresh of the tenant snapshot of a course org.
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from eox_nelp.edxapp_wrapper.course_overviews import CourseOverview
+from eox_nelp.edxapp_wrapper.site_configuration import configuration_helpers
+from eox_nelp.stats.metrics import (
+    COURSE_METRIC_FIELDS,
+    assemble_courses_metrics,
+    count_instructors,
+    count_learners,
+    get_cached_courses,
+    get_courses_certificates_metric,
+    get_courses_instructors_metric,
+    get_courses_learners_metric,
+)
+from eox_nelp.stats.models import CourseStatsSnapshot, TenantStatsSnapshot
+
+
+def get_course_metrics(course_key):
+    """
+    Returns the course stats metrics based on the course snapshot and structure summary.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+
+    Return:
+        <Dictionary>: Contains the course's metrics.
+    """
+    return build_courses_metrics([course_key])[0]
+
+
+def get_courses_metrics(tenant):
+    """
+    Returns the total of courses and its metrics.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+
+    Return:
+        <Dictionary>: Contains the courses' metrics.
+    """
+    courses = get_cached_courses(tenant)
+    metrics = build_courses_metrics([course.id for course in courses])
+
+    return {"total_courses": len(metrics), "metrics": metrics}
+
+
+def get_learners_metric(tenant):
+    """
+    Returns the total of learners stored in the tenant snapshot.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+
+    Return:
+        <int>: Total of learners.
+    """
+    return _get_tenant_snapshot(tenant).learners
+
+
+def get_instructors_metric(tenant):
+    """
+    Returns the total of instructors stored in the tenant snapshot.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+
+    Return:
+        <int>: Total of instructors.
+    """
+    return _get_tenant_snapshot(tenant).instructors
+
+
+def build_courses_metrics(course_keys, fields=None):
+    """
+    Builds the metrics of the given courses by reading the snapshot and summary tables, missing
+    records are calculated once. The summary table is not read if no structure field is requested.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+        fields<list[str]>: Keys of COURSE_METRIC_FIELDS to include, default all.
+
+    Return:
+        list[<Dictionary>]: Metrics of every course, same structure that get_course_metrics returns.
+    """
+    fields = [field for field in COURSE_METRIC_FIELDS if not fields or field in fields]
+    snapshots = {
+        str(snapshot.course_id): snapshot
+        for snapshot in CourseStatsSnapshot.objects.filter(course_id__in=course_keys)  # pylint: disable=no-member
+    }
+    missing_snapshots = [course_key for course_key in course_keys if str(course_key) not in snapshots]
+
+    if missing_snapshots:
+        snapshots.update(refresh_course_stats_snapshots(missing_snapshots))
+
+    values = {
+        course_id: {
+            "learners": snapshot.learners,
+            "instructors": snapshot.instructors,
+            "certificates": snapshot.certificates,
+        }
+        for course_id, snapshot in snapshots.items()
+    }
+
+    return assemble_courses_metrics(course_keys, fields, values)
+
+
+def refresh_course_stats_snapshots(course_keys):
+    """
+    Recalculates the snapshots of the given courses, every metric is calculated by a single
+    grouped query for all the courses.
+
+    Args:
+        course_keys<list[opaque-key]>: List of course identifiers.
+
+    Return:
+        <Dictionary>: The updated CourseStatsSnapshot records by course id string.
+    """
+    learners = get_courses_learners_metric(course_keys)
+    instructors = get_courses_instructors_metric(course_keys)
+    certificates = get_courses_certificates_metric(course_keys)
+    snapshots = {}
+
+    for course_key in course_keys:
+        course_id = str(course_key)
+        snapshots[course_id], _ = CourseStatsSnapshot.objects.update_or_create(  # pylint: disable=no-member
+            course_id=course_key,
+            defaults={
+                "learners": learners.get(course_id, 0),
+                "instructors": instructors.get(course_id, 0),
+                "certificates": certificates.get(course_id, {}),
+            },
+        )
+
+    return snapshots
+
+
+def refresh_tenant_stats_snapshot(tenant, orgs):
+    """
+    Recalculates the snapshot of a tenant. This doesn't depend on the current request, so
+    it can be used by async tasks.
+
+    Args:
+        tenant<str>: String tenant identifier(site.domain)
+        orgs<list[str]>: Organizations of the tenant.
+
+    Return:
+        TenantStatsSnapshot: The updated instance.
+    """
+    orgs = list(orgs)
+    course_keys = CourseOverview.objects.filter(org__in=orgs).values_list("id", flat=True)
+    snapshot, _ = TenantStatsSnapshot.objects.update_or_create(  # pylint: disable=no-member
+        tenant=tenant,
+        defaults={
+            "orgs": orgs,
+            "learners": count_learners(tenant, course_keys),
+            "instructors": count_instructors(orgs),
+        },
+    )
+
+    return snapshot
+
+
+def increment_course_learners(course_key):
+    """
+    Adds a learner to the snapshot of a course by an atomic update. If the snapshot doesn't
+    exist nothing happens, since the snapshot will be calculated from scratch on its first read.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+    """
+    CourseStatsSnapshot.objects.filter(  # pylint: disable=no-member
+        course_id=course_key,
+    ).update(learners=F("learners") + 1)
+
+
+def schedule_tenant_snapshot_refresh(course_key):
+    """
+    Enqueues the refresh_org_tenant_stats_snapshot task for the org of a course, so the tenant
+    learners follow the course snapshots between the reconcile runs. The task runs after the
+    STATS_SETTINGS value STATS_TENANT_SNAPSHOT_DELAY, default 60 seconds, and it's enqueued once by
+    org in that time, so a burst of enrollments is counted by a single refresh.
+
+    Args:
+        course_key<opaque-key>: Course identifier.
+    """
+    delay = getattr(settings, "STATS_SETTINGS", {}).get("STATS_TENANT_SNAPSHOT_DELAY", 60)
+
+    if not cache.add(f"eox_nelp.stats.tenant_snapshot.{course_key.org}.REFRESH", True, timeout=delay):
+        return
+
+    # The tasks module is imported here since it depends on this module.
+    import_module("eox_nelp.stats.tasks").refresh_org_tenant_stats_snapshot.apply_async(
+        args=[course_key.org],
+        countdown=delay,
+    )
+
+
+def _get_tenant_snapshot(tenant):
+    """Returns the snapshot of the tenant, this is created with the current site orgs if it doesn't exist."""
+    snapshot = TenantStatsSnapshot.objects.filter(tenant=tenant).first()  # pylint: disable=no-member
+
+    if not snapshot:
+        snapshot = refresh_tenant_stats_snapshot(tenant, configuration_helpers.get_current_site_orgs())
+
+    return snapshot
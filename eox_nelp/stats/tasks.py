@@ -0,0 +1,274 @@
+"""Stats tasks. Contains all the async tasks that pre-compute stats data.
+
+tasks:
+    update_course_structure_summary: Updates the CourseStructureSummary record of a course.
+    refresh_course_stats_snapshot: Updates the CourseStatsSnapshot record of a course.
+    refresh_org_tenant_stats_snapshot: Updates the TenantStatsSnapshot record of an org tenant.
+    reconcile_stats_snapshots: Recalculates all the existing stats snapshots.
+    refresh_stats_cache: Recalculates the cached value of a cache_method decorated function.
+    update_daily_stats_rollups: Stores the daily activity rollups of the previous day.
+    update_active_learners: Adds a learner to the active learners bitmap of a course.
+    update_learners_sketch: Adds a learner to a course or site learners sketch.
+    build_learners_sketch: Builds a missing course or site learners sketch.
+    export_courses_stats: Writes the course metrics of a tenant into a downloadable file.
+    warm_tenant_stats_cache: Recalculates the cached stats of a tenant.
+    warm_stats_caches: Enqueues the warm_tenant_stats_cache task for every tenant.
+"""
+import logging
+from contextlib import nullcontext
+from datetime import date, timedelta
+from importlib import import_module
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from eox_tenant.tenant_wise.proxies import TenantSiteConfigProxy
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.stats import metrics, sketches
+from eox_nelp.stats.activity import mark_active_learner, record_active_learner
+from eox_nelp.stats.backends import store_tenant_stats
+from eox_nelp.stats.decorators import deserialize_refresh_args
+from eox_nelp.stats.exports import CSV_FORMAT, export_courses_metrics
+from eox_nelp.stats.models import CourseStatsSnapshot, CourseStructureSummary, TenantStatsSnapshot
+from eox_nelp.stats.rollups import build_daily_stats_rollups
+from eox_nelp.stats.snapshots import refresh_course_stats_snapshots, refresh_tenant_stats_snapshot
+from eox_nelp.stats.utils import get_tenants_orgs, tenant_context
+
+logger = logging.getLogger(__name__)
+RECONCILE_BATCH_SIZE = 500
+# The courses are the first one since the other metrics are calculated from them.
+WARMED_STATS_FUNCTIONS = (
+    metrics.get_cached_courses,
+    metrics.get_courses_metrics,
+    metrics.get_learners_metric,
+    metrics.get_instructors_metric,
+)
+
+
+@shared_task
+def update_course_structure_summary(course_id):
+    """Recalculates the structure summary of a course based on the modulestore data.
+
+    Args:
+        course_id (str): Unique course identifier.
+    """
+    summary = CourseStructureSummary.update_from_modulestore(CourseKey.from_string(course_id))
+
+    logger.info(
+        "The structure summary of the course %s has been updated: sections=%s, sub_sections=%s, units=%s",
+        course_id,
+        summary.sections,
+        summary.sub_sections,
+        summary.units,
+    )
+
+
+@shared_task
+def refresh_course_stats_snapshot(course_id):
+    """Recalculates the stats snapshot of a course.
+
+    Args:
+        course_id (str): Unique course identifier.
+    """
+    refresh_course_stats_snapshots([CourseKey.from_string(course_id)])
+
+    logger.info("The stats snapshot of the course %s has been updated.", course_id)
+
+
+@shared_task
+def refresh_org_tenant_stats_snapshot(org):
+    """Recalculates the stats snapshot of the tenant of an org, the tenant is found by the SITE_NAME
+    value of the org configuration. A missing snapshot is not created, since it's calculated from
+    scratch on its first read.
+
+    Args:
+        org (str): Organization of the tenant.
+    """
+    tenant = TenantSiteConfigProxy.get_value_for_org(org, "SITE_NAME")
+    snapshot = TenantStatsSnapshot.objects.filter(tenant=tenant).first()  # pylint: disable=no-member
+
+    if not snapshot:
+        logger.info("The org %s has not a tenant stats snapshot, it won't be refreshed.", org)
+        return
+
+    refresh_tenant_stats_snapshot(tenant, snapshot.orgs)
+
+    logger.info("The stats snapshot of the tenant %s has been updated.", tenant)
+
+
+@shared_task
+def reconcile_stats_snapshots():
+    """Recalculates every existing course and tenant snapshot in order to correct any drift
+    of the values maintained by the signal receivers. This is meant to run periodically,
+    e.g by adding it to the CELERY_BEAT_SCHEDULE setting.
+    """
+    course_keys = list(
+        CourseStatsSnapshot.objects.values_list("course_id", flat=True)  # pylint: disable=no-member
+    )
+
+    for index in range(0, len(course_keys), RECONCILE_BATCH_SIZE):
+        refresh_course_stats_snapshots(course_keys[index:index + RECONCILE_BATCH_SIZE])
+
+    tenant_snapshots = TenantStatsSnapshot.objects.values_list("tenant", "orgs")  # pylint: disable=no-member
+
+    for tenant, orgs in tenant_snapshots:
+        refresh_tenant_stats_snapshot(tenant, orgs)
+
+    logger.info(
+        "Stats snapshots reconciled: %s courses and %s tenants.",
+        len(course_keys),
+        len(tenant_snapshots),
+    )
+
+
+@shared_task
+def refresh_stats_cache(function_path, args, tenant=None, lock_token=None):
+    """Recalculates the cached value of a cache_method decorated function, this is called when
+    a stale value has been served.
+
+    Args:
+        function_path (str): Decorated function path, e.g eox_nelp.stats.metrics.get_courses_metrics.
+        args (list): Positional arguments of the function, serialized by serialize_refresh_args.
+        tenant (str): Domain of the site that requested the value, the function runs in its context.
+        lock_token (str): Token of the lock acquired by the process that served the stale value.
+    """
+    module_path, function_name = function_path.rsplit(".", 1)
+    cached_function = getattr(import_module(module_path), function_name)
+
+    with tenant_context(tenant) if tenant else nullcontext():
+        cached_function.refresh(*deserialize_refresh_args(args), lock_token=lock_token)
+
+    logger.info("The cached value of %s with args %s has been refreshed.", function_path, args)
+
+
+@shared_task
+def update_daily_stats_rollups(day=None):
+    """Stores the activity rollups of a single day, by default the previous day, so every run
+    only reads the records of that day. This is meant to run nightly, e.g by adding it to the
+    CELERY_BEAT_SCHEDULE setting.
+
+    Args:
+        day (str): Day to process in ISO format, e.g 2023-05-28, default yesterday(UTC).
+    """
+    day = date.fromisoformat(day) if day else timezone.now().date() - timedelta(days=1)
+    rollups = build_daily_stats_rollups(day)
+
+    logger.info("The daily stats rollups of %s have been updated: %s records.", day, len(rollups))
+
+
+@shared_task
+def update_active_learners(course_id, user_id, day):
+    """Adds a learner to the active learners bitmap of a course and day, this is enqueued by the
+    BlockCompletion post_save receiver once the transaction is committed. Staff users are not
+    recorded, and the learner is marked after the bitmap is updated, so the receiver doesn't
+    enqueue the learner again during the day.
+
+    Args:
+        course_id (str): Unique course identifier.
+        user_id (int): Learner id.
+        day (str): Day of the activity in ISO format, e.g 2023-05-28.
+    """
+    course_key = CourseKey.from_string(course_id)
+    day = date.fromisoformat(day)
+
+    if get_user_model().objects.filter(id=user_id, is_staff=False, is_superuser=False).exists():
+        record_active_learner(course_key, user_id, day)
+
+    mark_active_learner(course_key, user_id, day)
+
+
+@shared_task
+def update_learners_sketch(sketch_key, user_id):
+    """Adds a learner to a course or site learners sketch, this is enqueued by the enrollment and
+    signup source receivers once the transaction is committed.
+
+    Args:
+        sketch_key (str): Key of the course or site sketch.
+        user_id (int): Learner id.
+    """
+    sketches.add_learner(sketch_key, user_id)
+
+
+@shared_task
+def build_learners_sketch(sketch_key):
+    """Builds a missing course or site learners sketch from the LMS tables, this is enqueued by
+    the learners estimation, so the scan doesn't run in the request.
+
+    Args:
+        sketch_key (str): Key of the course or site sketch.
+    """
+    sketches.build_sketch(sketch_key)
+
+    logger.info("The learners sketch %s has been built.", sketch_key)
+
+
+@shared_task
+def export_courses_stats(tenant, file_format=CSV_FORMAT):
+    """Writes the course metrics of a tenant into a CSV or Parquet file, that is stored with the
+    default storage, so the export doesn't run in the request-response cycle.
+
+    Args:
+        tenant (str): Domain of the tenant, the metrics are calculated in its context.
+        file_format (str): csv or parquet.
+
+    Returns:
+        dict: Storage path, url and number of courses of the export.
+    """
+    with tenant_context(tenant):
+        export = export_courses_metrics(tenant, file_format)
+
+    logger.info("The course stats of %s have been exported to %s.", tenant, export["path"])
+
+    return export
+
+
+@shared_task
+def warm_tenant_stats_cache(tenant):
+    """Recalculates and stores the cached stats of a tenant, so the next request doesn't find
+    an expired value, then stores the general stats that the cross tenant stats read. A cache lock
+    skips the tenant if another process is already warming it, the lock timeout is the
+    STATS_SETTINGS value STATS_WARMUP_LOCK_TIMEOUT, default 600.
+
+    Args:
+        tenant (str): Domain of the tenant, the metrics are calculated in its context.
+
+    Returns:
+        bool: True if the cache was warmed, False if it was skipped.
+    """
+    lock_key = f"eox_nelp.stats.warmup.{tenant}.LOCK"
+    lock_timeout = getattr(settings, "STATS_SETTINGS", {}).get("STATS_WARMUP_LOCK_TIMEOUT", 600)
+
+    if not cache.add(lock_key, True, timeout=lock_timeout):
+        logger.info("The stats cache of %s is already being warmed.", tenant)
+
+        return False
+
+    try:
+        with tenant_context(tenant):
+            for cached_function in WARMED_STATS_FUNCTIONS:
+                cached_function.refresh(tenant)
+
+            store_tenant_stats(tenant)
+    finally:
+        cache.delete(lock_key)
+
+    logger.info("The stats cache of %s has been warmed.", tenant)
+
+    return True
+
+
+@shared_task
+def warm_stats_caches():
+    """Enqueues the warm_tenant_stats_cache task for every eox-tenant route, the number of
+    tenants processed in parallel is bounded by the celery workers. This is meant to run
+    periodically, e.g by adding it to the CELERY_BEAT_SCHEDULE setting.
+    """
+    tenants = list(get_tenants_orgs())
+
+    for tenant in tenants:
+        warm_tenant_stats_cache.delay(tenant)
+
+    logger.info("The stats cache warming of %s tenants has been enqueued.", len(tenants))
@@ -3,8 +3,17 @@
 Classes:
     GeneralTenantStatsViewTestCase: Tests cases for GeneralTenantStatsView.
     GeneralCourseStatsViewTestCase: Tests cases for GeneralCourseStatsView.
+    TenantStatsTimeSeriesViewTestCase: Tests cases for TenantStatsTimeSeriesView.
+    CourseCompletionStatsViewTestCase: Tests cases for CourseCompletionStatsView.
+    ActiveLearnersStatsViewTestCase: Tests cases for ActiveLearnersStatsView.
+    StatsDiagnosticsViewTestCase: Tests cases for StatsDiagnosticsView.
+    CrossTenantStatsViewTestCase: Tests cases for CrossTenantStatsView.
 """
+import json
+from datetime import date, datetime, timezone
+
 from ddt import data, ddt
+from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.test import override_settings
 from django.urls import reverse
@@ -13,6 +22,10 @@ from opaque_keys.edx.keys import CourseKey
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from eox_nelp.stats import instrumentation
+
+User = get_user_model()
+
 
 @ddt
 class GeneralTenantStatsViewTestCase(APITestCase):
@@ -25,7 +38,7 @@ class GeneralTenantStatsViewTestCase(APITestCase):
         Site.objects.get_or_create(domain="testserver")
 
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
-    @patch("eox_nelp.stats.api.v1.views.metrics")
+    @patch("eox_nelp.stats.backends.metrics")
     def test_default(self, mock_metrics):
         """
         Test a get request, this will verify the standard view behavior by checking the call of the metrics functions.
@@ -55,7 +68,7 @@ class GeneralTenantStatsViewTestCase(APITestCase):
         MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"],
         STATS_SETTINGS={"API_XBLOCK_TYPES": ["html", "problem", "video"]},
     )
-    @patch("eox_nelp.stats.api.v1.views.metrics")
+    @patch("eox_nelp.stats.backends.metrics")
     def test_total_components(self, mock_metrics):
         """
         Test that the view will calculate the total of components based on the metrics values
@@ -91,7 +104,7 @@ class GeneralTenantStatsViewTestCase(APITestCase):
     @override_settings(
         MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"],
     )
-    @patch("eox_nelp.stats.api.v1.views.metrics")
+    @patch("eox_nelp.stats.backends.metrics")
     def test_total_certificates(self, mock_metrics):
         """
         Test that the view will calculate the total of certificates based on the metrics values
@@ -138,6 +151,34 @@ class GeneralTenantStatsViewTestCase(APITestCase):
         self.assertEqual(expected_certificates, response.data["certificates"])
         mock_metrics.get_courses_metrics.assert_called_once_with("testserver")
 
+    @override_settings(
+        MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"],
+        STATS_SETTINGS={"USE_STATS_SNAPSHOTS": True},
+    )
+    @patch("eox_nelp.stats.backends.metrics")
+    @patch("eox_nelp.stats.backends.snapshots")
+    def test_snapshots_backend(self, mock_snapshots, mock_metrics):
+        """
+        Test that the values are read from the snapshots module when USE_STATS_SNAPSHOTS is true.
+
+        Expected behavior:
+            - Status code 200.
+            - Learners and instructors are the snapshots values.
+            - The metrics module was not used.
+        """
+        mock_snapshots.get_learners_metric.return_value = 12
+        mock_snapshots.get_instructors_metric.return_value = 3
+        mock_snapshots.get_courses_metrics.return_value = {"total_courses": 0, "metrics": []}
+        url_endpoint = reverse("stats-api:v1:general-stats")
+
+        response = self.client.get(url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(12, response.data["learners"])
+        self.assertEqual(3, response.data["instructors"])
+        mock_snapshots.get_courses_metrics.assert_called_once_with("testserver")
+        mock_metrics.get_courses_metrics.assert_not_called()
+
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
     @data("post", "put", "patch", "delete")
     def test_invalid_method(self, method):
@@ -166,7 +207,7 @@ class GeneralCourseStatsViewTestCase(APITestCase):
         Site.objects.get_or_create(domain="testserver")
 
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
-    @patch("eox_nelp.stats.api.v1.views.metrics")
+    @patch("eox_nelp.stats.backends.metrics")
     def test_get_list(self, mock_metrics):
         """
         Test a get request, this will verify the standard view behavior by checking the call of the metrics functions.
@@ -192,25 +233,23 @@ class GeneralCourseStatsViewTestCase(APITestCase):
         mock_metrics.get_courses_metrics.assert_called_once_with("testserver")
 
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
     @patch("eox_nelp.stats.api.v1.views.metrics")
-    def test_get_detail(self, mock_metrics):
+    def test_get_detail(self, mock_metrics, mock_get_backend):
         """
         Test that a single course stats is returned.
 
         Expected behavior:
             - Status code 200.
             - response data is the same as the get_course_metrics result
-            - get_cached_courses is called with the right parameter.
-            - filter is called with the right parameter.
-            - first is called once.
+            - get_cached_course is called with the right parameters.
             - get_course_metrics is called with the right parameter.
         """
+        mock_get_backend.return_value = mock_metrics
         course_id = "course-v1:potato+CS102+2023"
-        courses_mock = Mock()
         course_mock = Mock()
         course_mock.id = CourseKey.from_string(course_id)
-        courses_mock.filter.return_value.first.return_value = course_mock
-        mock_metrics.get_cached_courses.return_value = courses_mock
+        mock_metrics.get_cached_course.return_value = course_mock
         mock_metrics.get_course_metrics.return_value = {
             "id": course_id,
             "name": "PROCEDURAL SEDATION AND ANALGESIA COURSE",
@@ -235,37 +274,31 @@ class GeneralCourseStatsViewTestCase(APITestCase):
 
         self.assertEqual(status.HTTP_200_OK, response.status_code)
         self.assertEqual(mock_metrics.get_course_metrics.return_value, response.data)
-        mock_metrics.get_cached_courses.assert_called_once_with("testserver")
-        courses_mock.filter.assert_called_once_with(id=course_id)
-        courses_mock.filter.return_value.first.assert_called_once()
+        mock_metrics.get_cached_course.assert_called_once_with("testserver", course_id)
         mock_metrics.get_course_metrics.assert_called_once_with(course_mock.id)
 
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
     @patch("eox_nelp.stats.api.v1.views.metrics")
-    def test_get_not_found(self, mock_metrics):
+    def test_get_not_found(self, mock_metrics, mock_get_backend):
         """
         Test that a single course stats is returned.
 
         Expected behavior:
             - Status code 200.
             - response data is the same as the get_course_metrics result
-            - get_cached_courses is called with the right parameter.
-            - filter is called with the right parameter.
-            - first is called once.
+            - get_cached_course is called with the right parameters.
             - get_course_metrics is not called.
         """
+        mock_get_backend.return_value = mock_metrics
         course_id = "course-v1:potato+CS102+2023"
-        courses_mock = Mock()
-        courses_mock.filter.return_value.first.return_value = None
-        mock_metrics.get_cached_courses.return_value = courses_mock
+        mock_metrics.get_cached_course.return_value = None
         url_endpoint = reverse("stats-api:v1:course-stats", args=[course_id])
 
         response = self.client.get(url_endpoint)
 
         self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
-        mock_metrics.get_cached_courses.assert_called_once_with("testserver")
-        courses_mock.filter.assert_called_once_with(id=course_id)
-        courses_mock.filter.return_value.first.assert_called_once()
+        mock_metrics.get_cached_course.assert_called_once_with("testserver", course_id)
         mock_metrics.get_course_metrics.assert_not_called()
 
     @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
@@ -283,3 +316,577 @@ class GeneralCourseStatsViewTestCase(APITestCase):
         response = request(url_endpoint)
 
         self.assertEqual(status.HTTP_405_METHOD_NOT_ALLOWED, response.status_code)
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_list_fields(self, mock_metrics, mock_get_backend):
+        """
+        Test that the fields query param limits the calculated metrics.
+
+        Expected behavior:
+            - Status code 200.
+            - build_courses_metrics is called with the requested fields.
+            - get_courses_metrics is not called.
+        """
+        mock_get_backend.return_value = mock_metrics
+        course_key = CourseKey.from_string("course-v1:potato+CS102+2023")
+        mock_metrics.get_cached_courses.return_value = [Mock(id=course_key)]
+        mock_metrics.build_courses_metrics.return_value = [{"id": str(course_key), "learners": 4}]
+        url_endpoint = reverse("stats-api:v1:courses-stats")
+
+        response = self.client.get(url_endpoint, {"fields": "id,learners"})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({"total_courses": 1, "metrics": [{"id": str(course_key), "learners": 4}]}, response.data)
+        mock_metrics.build_courses_metrics.assert_called_once_with([course_key], ["id", "learners"])
+        mock_metrics.get_courses_metrics.assert_not_called()
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    def test_get_list_invalid_fields(self):
+        """
+        Test that unknown fields are rejected.
+
+        Expected behavior:
+            - Status code 400.
+        """
+        url_endpoint = reverse("stats-api:v1:courses-stats")
+
+        response = self.client.get(url_endpoint, {"fields": "id,password"})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_list_pagination(self, mock_metrics, mock_get_backend):
+        """
+        Test that the courses are paginated by cursor when page_size is present.
+
+        Expected behavior:
+            - Status code 200.
+            - The first page contains the first sorted courses and the next url.
+            - The next url returns the remaining course and no next url.
+        """
+        mock_get_backend.return_value = mock_metrics
+        course_keys = [
+            CourseKey.from_string("course-v1:potato+CS103+2023"),
+            CourseKey.from_string("course-v1:potato+CS101+2023"),
+            CourseKey.from_string("course-v1:potato+CS102+2023"),
+        ]
+        mock_metrics.get_cached_courses.return_value = [Mock(id=course_key) for course_key in course_keys]
+        mock_metrics.build_courses_metrics.side_effect = lambda keys, fields: [{"id": str(key)} for key in keys]
+        url_endpoint = reverse("stats-api:v1:courses-stats")
+
+        response = self.client.get(url_endpoint, {"page_size": 2})
+        next_response = self.client.get(response.data["next"])
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(3, response.data["total_courses"])
+        self.assertEqual(
+            [{"id": str(course_keys[1])}, {"id": str(course_keys[2])}],
+            response.data["metrics"],
+        )
+        self.assertEqual([{"id": str(course_keys[0])}], next_response.data["metrics"])
+        self.assertIsNone(next_response.data["next"])
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    def test_get_list_invalid_cursor(self):
+        """
+        Test that an invalid cursor returns a not found response.
+
+        Expected behavior:
+            - Status code 404.
+        """
+        url_endpoint = reverse("stats-api:v1:courses-stats")
+
+        with patch("eox_nelp.stats.api.v1.views.metrics") as mock_metrics:
+            mock_metrics.get_cached_courses.return_value = []
+            response = self.client.get(url_endpoint, {"page_size": 2, "cursor": "%%%"})
+
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    @override_settings(
+        MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"],
+        STATS_SETTINGS={"STATS_STREAM_CHUNK_SIZE": 1},
+    )
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_list_stream(self, mock_metrics, mock_get_backend):
+        """
+        Test that the stream mode returns a course by line calculated by chunks.
+
+        Expected behavior:
+            - Status code 200.
+            - Content type is application/x-ndjson.
+            - Every line is a course metrics JSON.
+            - build_courses_metrics is called once by chunk.
+        """
+        mock_get_backend.return_value = mock_metrics
+        course_keys = [
+            CourseKey.from_string("course-v1:potato+CS101+2023"),
+            CourseKey.from_string("course-v1:potato+CS102+2023"),
+        ]
+        mock_metrics.get_cached_courses.return_value = [Mock(id=course_key) for course_key in course_keys]
+        mock_metrics.build_courses_metrics.side_effect = lambda keys, fields: [{"id": str(key)} for key in keys]
+        url_endpoint = reverse("stats-api:v1:courses-stats")
+
+        response = self.client.get(url_endpoint, {"stream": "true"})
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual("application/x-ndjson", response["Content-Type"])
+        self.assertEqual([{"id": str(course_key)} for course_key in course_keys], [json.loads(line) for line in lines])
+        self.assertEqual(2, mock_metrics.build_courses_metrics.call_count)
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.get_metrics_backend")
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_detail_fields(self, mock_metrics, mock_get_backend):
+        """
+        Test that the fields query param limits the keys of a single course stats.
+
+        Expected behavior:
+            - Status code 200.
+            - Response data just contains the requested fields.
+        """
+        mock_get_backend.return_value = mock_metrics
+        course_id = "course-v1:potato+CS102+2023"
+        mock_metrics.get_cached_course.return_value = Mock(id=CourseKey.from_string(course_id))
+        mock_metrics.get_course_metrics.return_value = {"id": course_id, "name": "Potato", "learners": 3}
+        url_endpoint = reverse("stats-api:v1:course-stats", args=[course_id])
+
+        response = self.client.get(url_endpoint, {"fields": "id,learners"})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({"id": course_id, "learners": 3}, response.data)
+
+
+@ddt
+class TenantStatsTimeSeriesViewTestCase(APITestCase):
+    """ Test TenantStatsTimeSeriesView."""
+
+    def setUp(self):
+        """
+        Create site since the view use the request.site attribute to determine the current domain.
+        """
+        Site.objects.get_or_create(domain="testserver")
+        self.url_endpoint = reverse("stats-api:v1:tenant-timeseries")
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.rollups")
+    def test_get_range(self, mock_rollups):
+        """
+        Test that the rollups of the requested range and course are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - get_daily_stats is called with the tenant, dates and course.
+            - Response data contains the series.
+        """
+        series = [{"date": "2023-05-02", "new_enrollments": 2, "active_learners": 4, "certificates": {}}]
+        mock_rollups.get_daily_stats.return_value = series
+
+        response = self.client.get(
+            self.url_endpoint,
+            {"start": "2023-05-01", "end": "2023-05-31", "course_id": "course-v1:potato+CS102+2023"},
+        )
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        mock_rollups.get_daily_stats.assert_called_once_with(
+            "testserver",
+            date(2023, 5, 1),
+            date(2023, 5, 31),
+            "course-v1:potato+CS102+2023",
+        )
+        self.assertEqual(
+            {"start": "2023-05-01", "end": "2023-05-31", "course_id": "course-v1:potato+CS102+2023", "series": series},
+            response.data,
+        )
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.timezone")
+    @patch("eox_nelp.stats.api.v1.views.rollups")
+    def test_default_range(self, mock_rollups, mock_timezone):
+        """
+        Test that the last 30 days of the tenant are returned by default.
+
+        Expected behavior:
+            - Status code 200.
+            - get_daily_stats is called with the default range and the tenant totals.
+        """
+        mock_timezone.now.return_value = datetime(2023, 5, 31, 10, tzinfo=timezone.utc)
+        mock_rollups.get_daily_stats.return_value = []
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        mock_rollups.get_daily_stats.assert_called_once_with("testserver", date(2023, 5, 1), date(2023, 5, 30), "")
+        self.assertIsNone(response.data["course_id"])
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @data(
+        {"start": "not-a-date"},
+        {"start": "2023-05-10", "end": "2023-05-01"},
+        {"start": "2022-01-01", "end": "2023-05-01"},
+    )
+    def test_invalid_range(self, params):
+        """
+        Test that an invalid date range is rejected.
+
+        Expected behavior:
+            - Status code 400.
+        """
+        response = self.client.get(self.url_endpoint, params)
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+
+class StatsDiagnosticsViewTestCase(APITestCase):
+    """ Test StatsDiagnosticsView."""
+
+    def setUp(self):
+        """
+        Create site since the stats views use the request.site attribute, and a staff user.
+        """
+        Site.objects.get_or_create(domain="testserver")
+        self.url_endpoint = reverse("stats-api:v1:diagnostics")
+        self.staff_user, _ = User.objects.get_or_create(username="stats-staff", is_staff=True)
+
+    def tearDown(self):
+        """Remove the recorded values."""
+        instrumentation.reset_diagnostics()
+
+    @override_settings(
+        MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"],
+        STATS_SETTINGS={"STATS_INSTRUMENTATION": True},
+    )
+    @patch("eox_nelp.stats.api.v1.views.rollups")
+    def test_get_diagnostics(self, mock_rollups):
+        """
+        Test that the measured stats views are returned to staff users.
+
+        Expected behavior:
+            - Status code 200.
+            - The stats view request has been recorded.
+        """
+        mock_rollups.get_daily_stats.return_value = []
+        self.client.get(reverse("stats-api:v1:tenant-timeseries"))
+        self.client.force_authenticate(self.staff_user)
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertTrue(response.data["enabled"])
+        self.assertEqual(1, response.data["functions"]["TenantStatsTimeSeriesView.get"]["calls"])
+
+    def test_reset_diagnostics(self):
+        """
+        Test that the recorded values are removed with a delete request.
+
+        Expected behavior:
+            - Status code 204.
+            - There are no recorded values.
+        """
+        with override_settings(STATS_SETTINGS={"STATS_INSTRUMENTATION": True}):
+            with instrumentation.measure("test_block"):
+                pass
+
+        self.client.force_authenticate(self.staff_user)
+
+        response = self.client.delete(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+        self.assertEqual({}, instrumentation.get_diagnostics()["functions"])
+
+    def test_not_staff_user(self):
+        """
+        Test that the diagnostics are not returned to users that are not staff.
+
+        Expected behavior:
+            - Status code 403.
+        """
+        user, _ = User.objects.get_or_create(username="stats-learner")
+        self.client.force_authenticate(user)
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+
+
+class CrossTenantStatsViewTestCase(APITestCase):
+    """ Test CrossTenantStatsView."""
+
+    def setUp(self):
+        """
+        Create site since the stats views use the request.site attribute, a superuser and
+        patch the tenants, the stored stats and the warm task.
+        """
+        Site.objects.get_or_create(domain="testserver")
+        self.url_endpoint = reverse("stats-api:v1:cross-tenant-stats")
+        self.superuser, _ = User.objects.get_or_create(username="stats-superuser", is_superuser=True)
+        tenants_patcher = patch("eox_nelp.stats.api.v1.views.get_tenants_orgs")
+        self.get_tenants_orgs_mock = tenants_patcher.start()
+        self.addCleanup(tenants_patcher.stop)
+        stored_patcher = patch("eox_nelp.stats.api.v1.views.get_stored_tenant_stats")
+        self.get_stored_tenant_stats_mock = stored_patcher.start()
+        self.addCleanup(stored_patcher.stop)
+        warm_patcher = patch("eox_nelp.stats.api.v1.views.warm_tenant_stats_cache")
+        self.warm_tenant_stats_cache_mock = warm_patcher.start()
+        self.addCleanup(warm_patcher.stop)
+        self.get_tenants_orgs_mock.return_value = {
+            "lms.b.com": ["b"],
+            "lms.a.com": ["a"],
+            "lms.c.com": ["c"],
+            "lms.d.com": ["d"],
+        }
+        self.get_stored_tenant_stats_mock.return_value = {
+            "lms.a.com": {
+                "tenant": "lms.a.com",
+                "learners": 5,
+                "courses": 2,
+                "instructors": 1,
+                "components": {"html": 10, "problem": 3},
+                "certificates": {"downloadable": 4},
+            },
+            "lms.b.com": {
+                "tenant": "lms.b.com",
+                "learners": 7,
+                "courses": 1,
+                "instructors": 2,
+                "components": {"html": 1},
+                "certificates": {"downloadable": 1, "notpassing": 2},
+            },
+            "lms.c.com": {"tenant": "lms.c.com", "error": "Broken tenant"},
+        }
+
+    def test_get_all_tenants(self):
+        """
+        Test that the stored stats of every tenant are returned and summed.
+
+        Expected behavior:
+            - Status code 200.
+            - get_stored_tenant_stats is called with the sorted tenants.
+            - The tenant without stored stats is pending and its warm task is enqueued.
+            - The totals skip the tenants with errors or pending stats.
+        """
+        self.client.force_authenticate(self.superuser)
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.get_stored_tenant_stats_mock.assert_called_once_with(
+            ["lms.a.com", "lms.b.com", "lms.c.com", "lms.d.com"],
+        )
+        self.warm_tenant_stats_cache_mock.delay.assert_called_once_with("lms.d.com")
+        self.assertEqual(
+            [
+                *self.get_stored_tenant_stats_mock.return_value.values(),
+                {"tenant": "lms.d.com", "pending": True},
+            ],
+            response.data["tenants"],
+        )
+        self.assertEqual(
+            {
+                "tenants": 2,
+                "learners": 12,
+                "courses": 3,
+                "instructors": 3,
+                "components": {"html": 11, "problem": 3},
+                "certificates": {"downloadable": 5, "notpassing": 2},
+            },
+            response.data["totals"],
+        )
+
+    def test_get_requested_tenants(self):
+        """
+        Test that the tenants query param limits the returned tenants.
+
+        Expected behavior:
+            - Status code 200.
+            - get_stored_tenant_stats is called with the requested tenants.
+            - No task is enqueued.
+        """
+        self.client.force_authenticate(self.superuser)
+
+        response = self.client.get(self.url_endpoint, {"tenants": "lms.c.com, lms.a.com"})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.get_stored_tenant_stats_mock.assert_called_once_with(["lms.a.com", "lms.c.com"])
+        self.warm_tenant_stats_cache_mock.delay.assert_not_called()
+        self.assertEqual(["lms.a.com", "lms.c.com"], [row["tenant"] for row in response.data["tenants"]])
+
+    def test_get_invalid_tenants(self):
+        """
+        Test that unknown tenants are rejected.
+
+        Expected behavior:
+            - Status code 400.
+            - get_stored_tenant_stats is not called.
+        """
+        self.client.force_authenticate(self.superuser)
+
+        response = self.client.get(self.url_endpoint, {"tenants": "lms.a.com,lms.unknown.com"})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.get_stored_tenant_stats_mock.assert_not_called()
+
+    def test_not_superuser(self):
+        """
+        Test that the stats are not returned to users that are not superusers, including staff.
+
+        Expected behavior:
+            - Status code 403.
+        """
+        user, _ = User.objects.get_or_create(username="stats-staff-only", is_staff=True)
+        self.client.force_authenticate(user)
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+        self.get_stored_tenant_stats_mock.assert_not_called()
+
+
+class CourseCompletionStatsViewTestCase(APITestCase):
+    """ Test CourseCompletionStatsView."""
+
+    def setUp(self):
+        """
+        Create site since the view use the request.site attribute to determine the current domain.
+        """
+        Site.objects.get_or_create(domain="testserver")
+        self.course_id = "course-v1:potato+CS102+2023"
+        self.url_endpoint = reverse("stats-api:v1:course-completion-stats", args=[self.course_id])
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_completion(self, mock_metrics):
+        """
+        Test that the completion rates of a visible course are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - Response data is the get_course_completion_metric result.
+            - get_course_completion_metric is called with the course key.
+        """
+        course_key = CourseKey.from_string(self.course_id)
+        mock_metrics.get_cached_course.return_value = Mock(id=course_key)
+        mock_metrics.get_course_completion_metric.return_value = {
+            "id": self.course_id,
+            "learners": 4,
+            "sections": [],
+        }
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(mock_metrics.get_course_completion_metric.return_value, response.data)
+        mock_metrics.get_cached_course.assert_called_once_with("testserver", self.course_id)
+        mock_metrics.get_course_completion_metric.assert_called_once_with(course_key)
+
+    @override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+    @patch("eox_nelp.stats.api.v1.views.metrics")
+    def test_get_not_found(self, mock_metrics):
+        """
+        Test that the completion rates of a course out of the tenant are not returned.
+
+        Expected behavior:
+            - Status code 404.
+            - get_course_completion_metric is not called.
+        """
+        mock_metrics.get_cached_course.return_value = None
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+        mock_metrics.get_course_completion_metric.assert_not_called()
+
+
+@override_settings(MIDDLEWARE=["eox_tenant.middleware.CurrentSiteMiddleware"])
+@patch("eox_nelp.stats.api.v1.views.activity")
+@patch("eox_nelp.stats.api.v1.views.metrics")
+class ActiveLearnersStatsViewTestCase(APITestCase):
+    """ Test ActiveLearnersStatsView."""
+
+    def setUp(self):
+        """
+        Create site since the view use the request.site attribute to determine the current domain.
+        """
+        Site.objects.get_or_create(domain="testserver")
+        self.url_endpoint = reverse("stats-api:v1:active-learners")
+        self.course_keys = [
+            CourseKey.from_string("course-v1:potato+CS101+2023"),
+            CourseKey.from_string("course-v1:potato+CS102+2023"),
+        ]
+
+    def test_tenant_active_learners(self, mock_metrics, mock_activity):
+        """
+        Test that the active learners of every tenant course are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - get_active_learners_metric is called with the tenant course keys.
+        """
+        mock_metrics.get_cached_courses.return_value = tuple(Mock(id=course_key) for course_key in self.course_keys)
+        mock_activity.get_active_learners_metric.return_value = {"dau": 1, "wau": 2, "mau": 3}
+
+        response = self.client.get(self.url_endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({"course_id": None, "dau": 1, "wau": 2, "mau": 3}, response.data)
+        mock_activity.get_active_learners_metric.assert_called_once_with(self.course_keys)
+
+    def test_course_overlap(self, mock_metrics, mock_activity):
+        """
+        Test that the active learners of a course and the overlap with other course are returned.
+
+        Expected behavior:
+            - Status code 200.
+            - get_active_learners_metric is called with the course key.
+            - get_courses_overlap is called with both course keys.
+        """
+        mock_metrics.get_cached_course.side_effect = lambda tenant, course_id: Mock(id=CourseKey.from_string(course_id))
+        mock_activity.get_active_learners_metric.return_value = {"dau": 1, "wau": 2, "mau": 3}
+        mock_activity.get_courses_overlap.return_value = {"learners": 3, "other_learners": 4, "both": 2}
+
+        response = self.client.get(
+            self.url_endpoint,
+            {"course_id": str(self.course_keys[0]), "overlap_course_id": str(self.course_keys[1])},
+        )
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(
+            {"course_id": str(self.course_keys[1]), "learners": 3, "other_learners": 4, "both": 2},
+            response.data["overlap"],
+        )
+        mock_activity.get_active_learners_metric.assert_called_once_with([self.course_keys[0]])
+        mock_activity.get_courses_overlap.assert_called_once_with([self.course_keys[0]], [self.course_keys[1]])
+
+    def test_invalid_course(self, mock_metrics, mock_activity):
+        """
+        Test that a course out of the tenant is rejected.
+
+        Expected behavior:
+            - Status code 400.
+            - get_active_learners_metric is not called.
+        """
+        mock_metrics.get_cached_course.return_value = None
+
+        response = self.client.get(self.url_endpoint, {"course_id": str(self.course_keys[0])})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        mock_activity.get_active_learners_metric.assert_not_called()
+
+    def test_overlap_without_course(self, mock_metrics, mock_activity):
+        """
+        Test that the overlap requires the course_id param.
+
+        Expected behavior:
+            - Status code 400.
+        """
+        mock_metrics.get_cached_course.return_value = Mock(id=self.course_keys[1])
+
+        response = self.client.get(self.url_endpoint, {"overlap_course_id": str(self.course_keys[1])})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        mock_activity.get_active_learners_metric.assert_not_called()
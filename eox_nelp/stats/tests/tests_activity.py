@@ -0,0 +1,181 @@
+"""This file contains all the test for the stats activity.py file.
+
+Classes:
+    ActivityBitmapTestCase: Tests cases for the ActivityBitmap class.
+    RecordActiveLearnerTestCase: Tests cases for record_active_learner function.
+    ActiveLearnersMetricTestCase: Tests cases for the active learners and overlap functions.
+"""
+import unittest
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.stats import activity
+from eox_nelp.stats.activity import ActivityBitmap
+from eox_nelp.stats.models import DailyActiveLearners
+
+
+class ActivityBitmapTestCase(unittest.TestCase):
+    """Tests cases for the ActivityBitmap class."""
+
+    def test_add(self):
+        """Test that the ids are added once, including ids of different containers.
+
+        Expected behavior:
+            - add returns False for a repeated id.
+            - The length is the number of distinct ids.
+            - Every added id is contained.
+        """
+        bitmap = ActivityBitmap()
+        user_ids = [1, 2, 65535, 65536, 5000000]
+
+        results = [bitmap.add(user_id) for user_id in user_ids]
+
+        self.assertEqual([True] * 5, results)
+        self.assertFalse(bitmap.add(65536))
+        self.assertEqual(5, len(bitmap))
+        self.assertTrue(all(user_id in bitmap for user_id in user_ids))
+        self.assertNotIn(3, bitmap)
+        self.assertEqual({0, 1, 76}, set(bitmap.containers))
+
+    def test_operations(self):
+        """Test the union and intersection of two bitmaps.
+
+        Expected behavior:
+            - The union contains the ids of both bitmaps.
+            - The intersection contains the shared ids and drops the empty containers.
+        """
+        first, second = ActivityBitmap(), ActivityBitmap()
+
+        for user_id in (1, 2, 70000):
+            first.add(user_id)
+
+        for user_id in (2, 3, 140000):
+            second.add(user_id)
+
+        self.assertEqual(5, len(first | second))
+        self.assertEqual({2}, {user_id for user_id in (1, 2, 3, 70000, 140000) if user_id in first & second})
+        self.assertEqual([0], list((first & second).containers))
+
+    def test_serialization(self):
+        """Test that a bitmap is restored from its compressed representation.
+
+        Expected behavior:
+            - The restored containers are equal to the original.
+            - An empty bitmap is restored as empty.
+        """
+        bitmap = ActivityBitmap()
+
+        for user_id in range(0, 300000, 7):
+            bitmap.add(user_id)
+
+        self.assertEqual(bitmap.containers, ActivityBitmap.from_bytes(bitmap.to_bytes()).containers)
+        self.assertEqual(0, len(ActivityBitmap.from_bytes(ActivityBitmap().to_bytes())))
+
+
+class RecordActiveLearnerTestCase(unittest.TestCase):
+    """Tests cases for record_active_learner, mark_active_learner and is_active_learner_marked functions."""
+
+    def setUp(self):
+        """Set the course and day."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx140+2023_T1")
+        self.day = date(2023, 5, 28)
+
+    def tearDown(self):
+        """Remove the stored bitmaps and clean cache."""
+        DailyActiveLearners.objects.all().delete()  # pylint: disable=no-member
+        cache.clear()
+
+    def test_record_learners(self):
+        """Test that the learners are added to the bitmap of the course and day.
+
+        Expected behavior:
+            - A single record is stored.
+            - The bitmap contains every learner once.
+        """
+        for user_id in (4, 9, 4):
+            activity.record_active_learner(self.course_key, user_id, self.day)
+
+        record = DailyActiveLearners.objects.get(course_id=self.course_key, date=self.day)  # pylint: disable=no-member
+        bitmap = ActivityBitmap.from_bytes(record.users)
+        self.assertEqual(2, len(bitmap))
+        self.assertIn(9, bitmap)
+
+    def test_mark_learner(self):
+        """Test that a learner is marked by course and day.
+
+        Expected behavior:
+            - The learner is not marked before mark_active_learner is called.
+            - The learner is marked for the same course and day.
+            - The learner is not marked for other day.
+        """
+        self.assertFalse(activity.is_active_learner_marked(self.course_key, 4, self.day))
+
+        activity.mark_active_learner(self.course_key, 4, self.day)
+
+        self.assertTrue(activity.is_active_learner_marked(self.course_key, 4, self.day))
+        self.assertFalse(activity.is_active_learner_marked(self.course_key, 4, date(2023, 5, 29)))
+
+
+class ActiveLearnersMetricTestCase(unittest.TestCase):
+    """Tests cases for the active learners and overlap functions."""
+
+    def setUp(self):
+        """Store the bitmaps of two courses in different days."""
+        self.end = date(2023, 5, 28)
+        self.course_key = CourseKey.from_string("course-v1:test+Cx141+2023_T1")
+        self.course_key_2 = CourseKey.from_string("course-v1:test+Cx142+2023_T1")
+
+        for course_key, days_ago, user_ids in (
+            (self.course_key, 0, [1, 2]),
+            (self.course_key_2, 0, [2, 3]),
+            (self.course_key, 3, [4]),
+            (self.course_key_2, 10, [5, 1]),
+            (self.course_key, 40, [6]),
+        ):
+            bitmap = ActivityBitmap()
+
+            for user_id in user_ids:
+                bitmap.add(user_id)
+
+            DailyActiveLearners.objects.create(  # pylint: disable=no-member
+                course_id=course_key,
+                date=self.end - timedelta(days=days_ago),
+                users=bitmap.to_bytes(),
+            )
+
+    def tearDown(self):
+        """Remove the stored bitmaps."""
+        DailyActiveLearners.objects.all().delete()  # pylint: disable=no-member
+
+    def test_active_learners_metric(self):
+        """Test the daily, weekly and monthly active learners of multiple courses.
+
+        Expected behavior:
+            - The learners are counted once across courses and days.
+            - The days out of the monthly window are not included.
+        """
+        result = activity.get_active_learners_metric([self.course_key, self.course_key_2], self.end)
+
+        self.assertEqual({"dau": 3, "wau": 4, "mau": 5}, result)
+
+    def test_active_learners(self):
+        """Test the active learners of a course in a range of days.
+
+        Expected behavior:
+            - The result is the union of the course bitmaps in the range.
+        """
+        result = activity.get_active_learners([self.course_key], 7, self.end)
+
+        self.assertEqual({1, 2, 4}, {user_id for user_id in range(10) if user_id in result})
+
+    def test_courses_overlap(self):
+        """Test the learners that were active in two courses.
+
+        Expected behavior:
+            - The result contains the learners of every course and the shared ones.
+        """
+        result = activity.get_courses_overlap([self.course_key], [self.course_key_2], 30, self.end)
+
+        self.assertEqual({"learners": 3, "other_learners": 4, "both": 2}, result)
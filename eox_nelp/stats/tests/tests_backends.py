@@ -0,0 +1,77 @@
+"""This file contains all the test for the stats backends.py file.
+
+Classes:
+    StoreTenantStatsTestCase: Tests cases for store_tenant_stats function.
+    GetStoredTenantStatsTestCase: Tests cases for get_stored_tenant_stats function.
+"""
+import unittest
+
+from django.core.cache import cache
+from django.test import override_settings
+from mock import patch
+
+from eox_nelp.stats.backends import get_stored_tenant_stats, store_tenant_stats
+
+
+class StoreTenantStatsTestCase(unittest.TestCase):
+    """Tests cases for store_tenant_stats function."""
+
+    def tearDown(self):
+        """Clean cache."""
+        cache.clear()
+
+    @override_settings(STATS_SETTINGS={"STATS_TIMEOUT": 60})
+    @patch("eox_nelp.stats.backends.cache")
+    @patch("eox_nelp.stats.backends.get_tenant_stats")
+    def test_store_stats(self, get_tenant_stats_mock, cache_mock):
+        """Test that the tenant stats are stored with the stats timeout.
+
+        Expected behavior:
+            - The result contains the tenant and its stats.
+            - The result is stored with the STATS_TIMEOUT value.
+        """
+        get_tenant_stats_mock.return_value = {"learners": 3}
+
+        result = store_tenant_stats("lms.a.com")
+
+        self.assertEqual({"tenant": "lms.a.com", "learners": 3}, result)
+        get_tenant_stats_mock.assert_called_once_with("lms.a.com")
+        cache_mock.set.assert_called_once_with("eox_nelp.stats.tenant_stats.lms.a.com", result, timeout=60)
+
+    @patch("eox_nelp.stats.backends.get_tenant_stats")
+    def test_store_error(self, get_tenant_stats_mock):
+        """Test that an error is stored instead of raised.
+
+        Expected behavior:
+            - The result contains the tenant and the error message.
+            - The error is returned by get_stored_tenant_stats.
+        """
+        get_tenant_stats_mock.side_effect = Exception("Broken tenant")
+
+        result = store_tenant_stats("lms.a.com")
+
+        self.assertEqual({"tenant": "lms.a.com", "error": "Broken tenant"}, result)
+        self.assertEqual({"lms.a.com": result}, get_stored_tenant_stats(["lms.a.com"]))
+
+
+class GetStoredTenantStatsTestCase(unittest.TestCase):
+    """Tests cases for get_stored_tenant_stats function."""
+
+    def tearDown(self):
+        """Clean cache."""
+        cache.clear()
+
+    @patch("eox_nelp.stats.backends.get_tenant_stats")
+    def test_missing_tenants(self, get_tenant_stats_mock):
+        """Test that only the tenants with stored stats are returned.
+
+        Expected behavior:
+            - The stored tenant is returned with its stats.
+            - The tenant without stored stats is not included.
+        """
+        get_tenant_stats_mock.return_value = {"learners": 3}
+        store_tenant_stats("lms.a.com")
+
+        result = get_stored_tenant_stats(["lms.a.com", "lms.b.com"])
+
+        self.assertEqual({"lms.a.com": {"tenant": "lms.a.com", "learners": 3}}, result)
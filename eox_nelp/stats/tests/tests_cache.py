@@ -0,0 +1,238 @@
+"""This file contains all the test for the stats cache.py file.
+
+Classes:
+    GetCacheKeyTestCase: Tests cases for get_cache_key function.
+    GenerationTestCase: Tests cases for get_generation and bump_generation functions.
+    InvalidateCourseStatsTestCase: Tests cases for invalidate_course_stats function.
+    StoreValueTestCase: Tests cases for store_value and load_value functions.
+"""
+import unittest
+import zlib
+
+from django.core.cache import cache
+from django.test import override_settings
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.stats.cache import (
+    COURSE_SCOPE,
+    TENANT_SCOPE,
+    _get_generation_key,
+    bump_generation,
+    get_cache_key,
+    get_generation,
+    invalidate_course_stats,
+    load_value,
+    store_value,
+)
+
+
+class GetCacheKeyTestCase(unittest.TestCase):
+    """Tests cases for get_cache_key function."""
+
+    def tearDown(self):
+        """Clear cache after every test to keep standard conditions"""
+        cache.clear()
+
+    def test_key_format(self):
+        """Test that the key has a fixed length and doesn't contain the arguments.
+
+        Expected behavior:
+            - The key starts with the namespace, version and function name.
+            - Long arguments don't change the key length.
+        """
+        short_key = get_cache_key("get_learners_metric", ("lms.example.com",))
+        long_key = get_cache_key("get_learners_metric", ("lms.example.com" * 50,))
+
+        self.assertTrue(short_key.startswith("eox_nelp.stats.v1.get_learners_metric.0."))
+        self.assertEqual(len(short_key), len(long_key))
+
+    @override_settings(STATS_SETTINGS={"STATS_CACHE_VERSION": 2})
+    def test_version(self):
+        """Test that the version setting is included in the key.
+
+        Expected behavior:
+            - The key contains the configured version.
+        """
+        key = get_cache_key("get_learners_metric", ("lms.example.com",))
+
+        self.assertTrue(key.startswith("eox_nelp.stats.v2."))
+
+    def test_scoped_key(self):
+        """Test that the generation of the first argument is included in the key.
+
+        Expected behavior:
+            - The key contains the tenant generation.
+        """
+        generation = get_generation(TENANT_SCOPE, "lms.example.com")
+
+        key = get_cache_key("get_learners_metric", ("lms.example.com",), scope=TENANT_SCOPE)
+
+        self.assertIn(f".{generation}.", key)
+
+
+class GenerationTestCase(unittest.TestCase):
+    """Tests cases for get_generation and bump_generation functions."""
+
+    def tearDown(self):
+        """Clear cache after every test to keep standard conditions"""
+        cache.clear()
+
+    def test_stable_generation(self):
+        """Test that the generation doesn't change between calls.
+
+        Expected behavior:
+            - Both calls return the same value.
+        """
+        self.assertEqual(get_generation(COURSE_SCOPE, "course"), get_generation(COURSE_SCOPE, "course"))
+
+    def test_bump_generation(self):
+        """Test that bump_generation increments the current generation.
+
+        Expected behavior:
+            - The new generation is the previous plus one.
+        """
+        generation = get_generation(COURSE_SCOPE, "course")
+
+        bump_generation(COURSE_SCOPE, "course")
+
+        self.assertEqual(generation + 1, get_generation(COURSE_SCOPE, "course"))
+
+    def test_bump_missing_generation(self):
+        """Test that bumping a missing counter creates it.
+
+        Expected behavior:
+            - The generation exists after the call.
+        """
+        bump_generation(TENANT_SCOPE, "lms.example.com")
+
+        self.assertIsNotNone(cache.get(_get_generation_key(TENANT_SCOPE, "lms.example.com")))
+
+
+class InvalidateCourseStatsTestCase(unittest.TestCase):
+    """Tests cases for invalidate_course_stats function."""
+
+    course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+
+    @patch("eox_nelp.stats.cache.TenantSiteConfigProxy")
+    @patch("eox_nelp.stats.cache.bump_generation")
+    def test_invalidate_course_and_tenant(self, bump_generation_mock, proxy_mock):
+        """Test that the course and the org tenant generations are bumped.
+
+        Expected behavior:
+            - The SITE_NAME of the course org is requested.
+            - bump_generation is called for the course and the tenant.
+        """
+        proxy_mock.get_value_for_org.return_value = "lms.example.com"
+
+        invalidate_course_stats(self.course_key)
+
+        proxy_mock.get_value_for_org.assert_called_once_with("test", "SITE_NAME")
+        bump_generation_mock.assert_any_call(COURSE_SCOPE, self.course_key)
+        bump_generation_mock.assert_any_call(TENANT_SCOPE, "lms.example.com")
+
+    @patch("eox_nelp.stats.cache.TenantSiteConfigProxy")
+    @patch("eox_nelp.stats.cache.bump_generation")
+    def test_missing_site_name(self, bump_generation_mock, proxy_mock):
+        """Test that only the course generation is bumped when the org has no tenant.
+
+        Expected behavior:
+            - bump_generation is called once with the course scope.
+        """
+        proxy_mock.get_value_for_org.return_value = None
+
+        invalidate_course_stats(self.course_key)
+
+        bump_generation_mock.assert_called_once_with(COURSE_SCOPE, self.course_key)
+
+
+class StoreValueTestCase(unittest.TestCase):
+    """Tests cases for store_value and load_value functions."""
+
+    def setUp(self):
+        """Set a value with repeated keys, like the course metrics."""
+        self.value = {
+            "total_courses": 200,
+            "metrics": [
+                {
+                    "id": f"course-v1:test+Cx{index}+2023_T1",
+                    "components": {"html": index, "problem": 2, "video": 0},
+                    "certificates": {"honor": {"downloadable": index}, "total": {"downloadable": index}},
+                }
+                for index in range(200)
+            ],
+        }
+
+    def tearDown(self):
+        """Clear cache after every test to keep standard conditions"""
+        cache.clear()
+
+    def test_compressed_value(self):
+        """Test that a small value is stored compressed under a single key.
+
+        Expected behavior:
+            - The stored item is compressed bytes.
+            - The loaded value is equal to the original.
+            - The dictionary keys are shared by the loaded items.
+        """
+        store_value("stats-key", self.value, timeout=60)
+
+        loaded = load_value("stats-key")
+
+        self.assertIsInstance(zlib.decompress(cache.get("stats-key")), bytes)
+        self.assertEqual(self.value, loaded)
+        first_keys, second_keys = [list(metric["components"]) for metric in loaded["metrics"][:2]]
+        self.assertIs(first_keys[0], second_keys[0])
+
+    @override_settings(STATS_SETTINGS={"STATS_CACHE_CHUNK_SIZE": 512})
+    def test_chunked_value(self):
+        """Test that a value bigger than the chunk size is split in multiple keys.
+
+        Expected behavior:
+            - The main key stores the number of chunks.
+            - Every chunk is stored and is not bigger than the chunk size.
+            - The loaded value is equal to the original.
+        """
+        store_value("stats-key", self.value, timeout=60)
+
+        chunked = cache.get("stats-key")
+        chunks = [cache.get(f"stats-key.{index}") for index in range(chunked.chunks)]
+        self.assertGreater(chunked.chunks, 1)
+        self.assertTrue(all(chunk and len(chunk) <= 512 for chunk in chunks))
+        self.assertEqual(self.value, load_value("stats-key"))
+
+    @override_settings(STATS_SETTINGS={"STATS_CACHE_CHUNK_SIZE": 512})
+    def test_missing_chunk(self):
+        """Test that a value with an evicted chunk is not returned.
+
+        Expected behavior:
+            - The result is None.
+        """
+        store_value("stats-key", self.value, timeout=60)
+        cache.delete("stats-key.1")
+
+        self.assertIsNone(load_value("stats-key"))
+
+    @override_settings(STATS_SETTINGS={"STATS_CACHE_CHUNK_SIZE": 512})
+    def test_mixed_chunks(self):
+        """Test that the chunks of a different write are not mixed with the current value.
+
+        Expected behavior:
+            - The result is None.
+        """
+        store_value("stats-key", self.value, timeout=60)
+        cache.set("stats-key.0", b"other-write")
+
+        self.assertIsNone(load_value("stats-key"))
+
+    def test_missing_and_raw_values(self):
+        """Test the values that were not stored by store_value.
+
+        Expected behavior:
+            - A missing key returns None.
+            - A value stored with cache.set is returned as it is.
+        """
+        cache.set("raw-key", {"raw": True})
+
+        self.assertIsNone(load_value("missing-key"))
+        self.assertEqual({"raw": True}, load_value("raw-key"))
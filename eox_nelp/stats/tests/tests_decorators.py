@@ -2,13 +2,31 @@
 
 Classes:
     TestCacheMethod: Tests cases for cache_method decorator.
+    TestCacheMethodStaleWhileRevalidate: Tests cases for the cache_method soft timeout.
+    TestCacheMethodSingleFlight: Tests cases for the cache_method single flight mode.
 """
+import time
 import unittest
 
 from django.core.cache import cache
-from mock import Mock
+from django.test import override_settings
+from mock import ANY, Mock, patch
+from opaque_keys.edx.keys import CourseKey
 
-from eox_nelp.stats.decorators import cache_method
+from eox_nelp.stats.cache import TENANT_SCOPE, bump_generation, get_cache_key, load_value
+from eox_nelp.stats.decorators import CachedValue, cache_method, deserialize_refresh_args, serialize_refresh_args
+
+KEY = get_cache_key("test_function", ("I do nothing",))
+
+
+def get_test_function(return_value=None):
+    """Returns a mock that can be decorated by cache_method."""
+    test_function = Mock()
+    test_function.__name__ = "test_function"
+    test_function.__module__ = "eox_nelp.stats.tests.tests_decorators"
+    test_function.return_value = return_value
+
+    return test_function
 
 
 class TestCacheMethod(unittest.TestCase):
@@ -26,9 +44,7 @@ class TestCacheMethod(unittest.TestCase):
             - Test function was called with the right parameter.
             - Cache was set
         """
-        test_function = Mock()
-        test_function.__name__ = "test_function"
-        test_function.return_value = {"test": True}
+        test_function = get_test_function({"test": True})
         arg = "I do nothing"
 
         wrapper = cache_method(test_function)
@@ -36,7 +52,7 @@ class TestCacheMethod(unittest.TestCase):
 
         self.assertTrue(result["test"])
         test_function.assert_called_once_with(arg)
-        self.assertTrue(cache.get("test_function.I do nothing.STATS_CACHE_KEY"))
+        self.assertEqual({"test": True}, load_value(KEY).value)
 
     def test_cache_found(self):
         """Test when the cached response is found.
@@ -46,9 +62,8 @@ class TestCacheMethod(unittest.TestCase):
             - Test function was not called again.
         """
         expected_value = {"cache_found": True}
-        cache.set("test_function.I do nothing.STATS_CACHE_KEY", expected_value)
-        test_function = Mock()
-        test_function.__name__ = "test_function"
+        cache.set(KEY, CachedValue(expected_value, None))
+        test_function = get_test_function()
         arg = "I do nothing"
 
         wrapper = cache_method(test_function)
@@ -56,3 +71,241 @@ class TestCacheMethod(unittest.TestCase):
 
         self.assertTrue(result["cache_found"])
         test_function.assert_not_called()
+
+    def test_falsy_cache_found(self):
+        """Test that falsy results are served from cache.
+
+        Expected behavior:
+            - Result is the cached value.
+            - Test function was not called.
+        """
+        cache.set(KEY, CachedValue(0, None))
+        test_function = get_test_function(5)
+
+        result = cache_method(test_function)("I do nothing")
+
+        self.assertEqual(0, result)
+        test_function.assert_not_called()
+
+    def test_legacy_value(self):
+        """Test that values that are not wrapped in CachedValue are ignored.
+
+        Expected behavior:
+            - Test function was called.
+            - Result is the new value.
+        """
+        cache.set(KEY, {"legacy": True})
+        test_function = get_test_function({"legacy": False})
+
+        result = cache_method(test_function)("I do nothing")
+
+        self.assertEqual({"legacy": False}, result)
+        test_function.assert_called_once_with("I do nothing")
+
+    def test_scoped_key_invalidation(self):
+        """Test that a scoped value is calculated again after its generation is bumped.
+
+        Expected behavior:
+            - The key changes after bump_generation is called.
+            - Test function was called twice.
+        """
+        test_function = get_test_function(5)
+        wrapper = cache_method(scope=TENANT_SCOPE)(test_function)
+
+        wrapper("lms.example.com")
+        first_key = wrapper.get_cache_key("lms.example.com")
+        bump_generation(TENANT_SCOPE, "lms.example.com")
+        wrapper("lms.example.com")
+
+        self.assertNotEqual(first_key, wrapper.get_cache_key("lms.example.com"))
+        self.assertEqual(2, test_function.call_count)
+
+    @patch("eox_nelp.stats.decorators.store_value")
+    def test_custom_timeout(self, store_value_mock):
+        """Test that the timeout argument overrides the STATS_TIMEOUT setting.
+
+        Expected behavior:
+            - The value was stored with the given timeout.
+        """
+        test_function = get_test_function(5)
+
+        cache_method(timeout=300)(test_function)("I do nothing")
+
+        store_value_mock.assert_called_once()
+        self.assertEqual(300, store_value_mock.call_args.kwargs["timeout"])
+
+
+class TestCacheMethodStaleWhileRevalidate(unittest.TestCase):
+    """Tests cases for the cache_method soft timeout."""
+
+    def tearDown(self):
+        """Clear cache after every test to keep standard conditions"""
+        cache.clear()
+
+    @override_settings(STATS_SETTINGS={"STATS_SOFT_TIMEOUT": 60})
+    def test_soft_expiration_is_set(self):
+        """Test that the stored value has a soft expiration time.
+
+        Expected behavior:
+            - stale_at is in the future.
+        """
+        cache_method(get_test_function(1))("I do nothing")
+
+        self.assertGreater(load_value(KEY).stale_at, time.time())
+
+    @override_settings(STATS_SETTINGS={"STATS_SOFT_TIMEOUT": 60})
+    @patch("eox_nelp.stats.tasks.refresh_stats_cache")
+    def test_stale_value(self, refresh_task_mock):
+        """Test that a stale value is returned while the refresh task is called.
+
+        Expected behavior:
+            - Result is the stale value.
+            - Test function was not called.
+            - The refresh task was called once, even with concurrent calls.
+            - The refresh task received the token of the lock.
+        """
+        cache.set(KEY, CachedValue("stale", time.time() - 1))
+        test_function = get_test_function("fresh")
+        wrapper = cache_method(test_function)
+
+        result = wrapper("I do nothing")
+        second_result = wrapper("I do nothing")
+
+        self.assertEqual("stale", result)
+        self.assertEqual("stale", second_result)
+        test_function.assert_not_called()
+        refresh_task_mock.delay.assert_called_once_with(
+            function_path="eox_nelp.stats.tests.tests_decorators.test_function",
+            args=["I do nothing"],
+            tenant=None,
+            lock_token=cache.get(f"{KEY}.LOCK"),
+        )
+
+    @override_settings(STATS_SETTINGS={"STATS_SOFT_TIMEOUT": 60})
+    @patch("eox_nelp.stats.tasks.refresh_stats_cache")
+    def test_stale_value_with_course_key(self, refresh_task_mock):
+        """Test that a course key argument is sent to the refresh task as a string.
+
+        Expected behavior:
+            - Result is the stale value.
+            - Test function was not called.
+            - The refresh task was called with the serialized course key.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+        cache.set(get_cache_key("test_function", (course_key,)), CachedValue("stale", time.time() - 1))
+        test_function = get_test_function("fresh")
+
+        result = cache_method(test_function)(course_key)
+
+        self.assertEqual("stale", result)
+        test_function.assert_not_called()
+        refresh_task_mock.delay.assert_called_once_with(
+            function_path="eox_nelp.stats.tests.tests_decorators.test_function",
+            args=[{"key_type": "course_key", "key": "course-v1:test+Cx105+2022_T4"}],
+            tenant=None,
+            lock_token=ANY,
+        )
+
+    def test_refresh_args_serialization(self):
+        """Test that the serialized arguments are parsed back.
+
+        Expected behavior:
+            - The deserialized arguments are equal to the original ones.
+            - Unsupported arguments are not serialized.
+        """
+        args = (CourseKey.from_string("course-v1:test+Cx105+2022_T4"), "tenant.com", 3)
+
+        self.assertEqual(list(args), deserialize_refresh_args(serialize_refresh_args(args)))
+        self.assertIsNone(serialize_refresh_args(([1, 2],)))
+
+    @override_settings(STATS_SETTINGS={"STATS_SOFT_TIMEOUT": 60})
+    def test_refresh(self):
+        """Test that the refresh method stores the new value and releases the lock of the given token.
+
+        Expected behavior:
+            - Result is the new value.
+            - The cache has the new value.
+            - The lock was removed.
+        """
+        cache.set(f"{KEY}.LOCK", "owner-token")
+        wrapper = cache_method(get_test_function("fresh"))
+
+        result = wrapper.refresh("I do nothing", lock_token="owner-token")
+
+        self.assertEqual("fresh", result)
+        self.assertEqual("fresh", load_value(KEY).value)
+        self.assertIsNone(cache.get(f"{KEY}.LOCK"))
+
+    @override_settings(STATS_SETTINGS={"STATS_SOFT_TIMEOUT": 60})
+    def test_refresh_without_lock_token(self):
+        """Test that the refresh method doesn't release the lock of other owner.
+
+        Expected behavior:
+            - The cache has the new value.
+            - The lock of the owner is kept.
+        """
+        cache.set(f"{KEY}.LOCK", "owner-token")
+        wrapper = cache_method(get_test_function("fresh"))
+
+        wrapper.refresh("I do nothing")
+        wrapper.refresh("I do nothing", lock_token="other-token")
+
+        self.assertEqual("fresh", load_value(KEY).value)
+        self.assertEqual("owner-token", cache.get(f"{KEY}.LOCK"))
+
+
+class TestCacheMethodSingleFlight(unittest.TestCase):
+    """Tests cases for the cache_method single flight mode."""
+
+    def tearDown(self):
+        """Clear cache after every test to keep standard conditions"""
+        cache.clear()
+
+    @override_settings(STATS_SETTINGS={"STATS_SINGLE_FLIGHT": True})
+    def test_lock_owner(self):
+        """Test that the process that gets the lock calculates the value.
+
+        Expected behavior:
+            - Test function was called.
+            - The lock was released.
+        """
+        test_function = get_test_function(3)
+
+        result = cache_method(test_function)("I do nothing")
+
+        self.assertEqual(3, result)
+        test_function.assert_called_once_with("I do nothing")
+        self.assertIsNone(cache.get(f"{KEY}.LOCK"))
+
+    @override_settings(STATS_SETTINGS={"STATS_SINGLE_FLIGHT": True})
+    @patch("eox_nelp.stats.decorators.time.sleep")
+    def test_wait_for_lock_owner(self, sleep_mock):
+        """Test that a process waits for the value when the lock is taken.
+
+        Expected behavior:
+            - Result is the value stored by the lock owner.
+            - Test function was not called.
+        """
+        cache.set(f"{KEY}.LOCK", True)
+        test_function = get_test_function(3)
+        sleep_mock.side_effect = lambda _: cache.set(KEY, CachedValue(7, None))
+
+        result = cache_method(test_function)("I do nothing")
+
+        self.assertEqual(7, result)
+        test_function.assert_not_called()
+
+    @override_settings(STATS_SETTINGS={"STATS_SINGLE_FLIGHT": True, "STATS_LOCK_WAIT": 0})
+    def test_wait_timeout(self):
+        """Test that the value is calculated when the lock owner takes too long.
+
+        Expected behavior:
+            - Test function was called.
+        """
+        cache.set(f"{KEY}.LOCK", True)
+        test_function = get_test_function(3)
+
+        result = cache_method(test_function)("I do nothing")
+
+        self.assertEqual(3, result)
+        test_function.assert_called_once_with("I do nothing")
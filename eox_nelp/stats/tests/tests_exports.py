@@ -0,0 +1,174 @@
+"""This file contains all the test for the stats exports.py file.
+
+Classes:
+    ExportCoursesMetricsTestCase: Tests cases for export_courses_metrics function.
+    GetExportColumnsTestCase: Tests cases for get_export_columns function.
+    FlattenCourseMetricsTestCase: Tests cases for flatten_course_metrics function.
+"""
+import csv
+import io
+import unittest
+
+from django.test import override_settings
+from mock import Mock, patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.stats import exports
+
+
+class ExportCoursesMetricsTestCase(unittest.TestCase):
+    """Tests cases for export_courses_metrics function."""
+
+    def setUp(self):
+        """Patch the courses, columns, metrics backend and storage of the export."""
+        self.course_keys = [CourseKey.from_string(f"course-v1:test+Cx13{index}+2023_T1") for index in range(3)]
+        self.stored_files = {}
+
+        def save(name, content):
+            self.stored_files[name] = content.read()
+            return name
+
+        self.courses_mock = self.start_patch("get_cached_courses")
+        self.columns_mock = self.start_patch("get_export_columns")
+        self.backend_mock = self.start_patch("get_metrics_backend")
+        self.storage_mock = self.start_patch("default_storage")
+        self.courses_mock.return_value = tuple(Mock(id=course_key) for course_key in self.course_keys)
+        self.columns_mock.return_value = ["id", "learners", "certificates.total.downloadable"]
+        self.backend_mock.return_value.build_courses_metrics.side_effect = lambda course_keys: [
+            {"id": str(course_key), "learners": 2, "certificates": {"total": {"downloadable": 1}}}
+            for course_key in course_keys
+        ]
+        self.storage_mock.save.side_effect = save
+        self.storage_mock.url.side_effect = lambda path: f"https://storage.com/{path}"
+
+    def start_patch(self, target):
+        """Patches the given attribute of the exports module until the end of the test."""
+        patcher = patch(f"eox_nelp.stats.exports.{target}")
+        self.addCleanup(patcher.stop)
+
+        return patcher.start()
+
+    @override_settings(STATS_SETTINGS={"STATS_EXPORT_CHUNK_SIZE": 2, "STATS_EXPORT_PATH": "exports"})
+    def test_csv_export(self):
+        """Test that the metrics are written by chunks into a stored csv file.
+
+        Expected behavior:
+            - The metrics are calculated by chunks in the cached courses order.
+            - The file contains the header and a flattened row by course.
+            - The result contains the storage path and url.
+        """
+        result = exports.export_courses_metrics("tenant.com")
+
+        self.assertEqual(
+            [[self.course_keys[0], self.course_keys[1]], [self.course_keys[2]]],
+            [call.args[0] for call in self.backend_mock.return_value.build_courses_metrics.call_args_list],
+        )
+        path = result["path"]
+        self.assertTrue(path.startswith("exports/tenant.com/courses-metrics-"))
+        self.assertTrue(path.endswith(".csv"))
+        self.assertEqual(f"https://storage.com/{path}", result["url"])
+        self.assertEqual(3, result["total_courses"])
+        rows = list(csv.reader(io.StringIO(self.stored_files[path].decode("utf-8"))))
+        self.assertEqual(["id", "learners", "certificates.total.downloadable"], rows[0])
+        self.assertEqual([[str(course_key), "2", "1"] for course_key in self.course_keys], rows[1:])
+
+    @unittest.skipIf(exports.pyarrow is None, "pyarrow is not installed")
+    def test_parquet_export(self):
+        """Test that the metrics are written into a stored parquet file.
+
+        Expected behavior:
+            - The file contains a record by course.
+        """
+        result = exports.export_courses_metrics("tenant.com", exports.PARQUET_FORMAT)
+
+        table = exports.parquet.read_table(exports.pyarrow.BufferReader(self.stored_files[result["path"]]))
+        self.assertEqual([str(course_key) for course_key in self.course_keys], table.column("id").to_pylist())
+
+    @patch("eox_nelp.stats.exports.pyarrow", None)
+    def test_parquet_without_pyarrow(self):
+        """Test that the parquet format is rejected if pyarrow is not installed.
+
+        Expected behavior:
+            - ValueError is raised.
+            - Nothing was stored.
+        """
+        self.assertRaises(ValueError, exports.export_courses_metrics, "tenant.com", exports.PARQUET_FORMAT)
+        self.storage_mock.save.assert_not_called()
+
+    def test_invalid_format(self):
+        """Test that an unknown format is rejected.
+
+        Expected behavior:
+            - ValueError is raised.
+        """
+        self.assertRaises(ValueError, exports.export_courses_metrics, "tenant.com", "xlsx")
+
+
+class GetExportColumnsTestCase(unittest.TestCase):
+    """Tests cases for get_export_columns function."""
+
+    @override_settings(STATS_SETTINGS={"API_XBLOCK_TYPES": ["html", "problem"]})
+    @patch("eox_nelp.stats.exports.GeneratedCertificate")
+    def test_columns(self, certificate_mock):
+        """Test that the components and certificates columns are added.
+
+        Expected behavior:
+            - Base columns are the first ones.
+            - There is a column by block type.
+            - There is a column by certificate mode and status, including the total.
+        """
+        certificate_mock.MODES = (("verified", "verified"), ("no-id-professional", "no-id-professional"))
+        statuses = certificate_mock.objects.filter.return_value.values_list.return_value.distinct.return_value
+        statuses.order_by.return_value = ["notpassing", "downloadable"]
+
+        result = exports.get_export_columns([])
+
+        self.assertEqual(
+            [
+                *exports.BASE_COLUMNS,
+                "components.html",
+                "components.problem",
+                "certificates.verified.downloadable",
+                "certificates.verified.notpassing",
+                "certificates.no-id-professional.downloadable",
+                "certificates.no-id-professional.notpassing",
+                "certificates.total.downloadable",
+                "certificates.total.notpassing",
+            ],
+            result,
+        )
+
+
+class FlattenCourseMetricsTestCase(unittest.TestCase):
+    """Tests cases for flatten_course_metrics function."""
+
+    def test_flatten(self):
+        """Test that the nested values are returned by column.
+
+        Expected behavior:
+            - Nested values are found by the dotted column.
+            - Missing numeric values are 0 and missing string values are empty.
+        """
+        metric = {
+            "id": "course-v1:test+Cx140+2023_T1",
+            "learners": 5,
+            "components": {"html": 3},
+            "certificates": {"total": {"downloadable": 2}},
+        }
+
+        result = exports.flatten_course_metrics(
+            metric,
+            ["id", "name", "learners", "components.html", "components.video", "certificates.total.downloadable"],
+        )
+
+        self.assertEqual(
+            {
+                "id": "course-v1:test+Cx140+2023_T1",
+                "name": "",
+                "learners": 5,
+                "components.html": 3,
+                "components.video": 0,
+                "certificates.total.downloadable": 2,
+            },
+            result,
+        )
@@ -0,0 +1,111 @@
+"""This file contains all the test for the stats instrumentation.py file.
+
+Classes:
+    MeasureTestCase: Tests cases for measure context manager.
+    CacheMethodInstrumentationTestCase: Tests cases for the cache_method measurements.
+"""
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from mock import Mock
+
+from eox_nelp.stats import instrumentation
+from eox_nelp.stats.decorators import cache_method
+
+User = get_user_model()
+
+
+class MeasureTestCase(unittest.TestCase):
+    """Tests cases for measure context manager."""
+
+    def tearDown(self):
+        """Remove the recorded values."""
+        instrumentation.reset_diagnostics()
+
+    @override_settings(STATS_SETTINGS={"STATS_INSTRUMENTATION": True})
+    def test_measure(self):
+        """Test that the queries, modulestore calls and time of the block are recorded.
+
+        Expected behavior:
+            - The measurement contains the block values.
+            - The values are aggregated by name.
+            - A JSON line is logged.
+        """
+        with self.assertLogs(instrumentation.logger, level="INFO") as logs:
+            with instrumentation.measure("test_block") as measurement:
+                User.objects.count()
+                User.objects.exists()
+                instrumentation.record_modulestore_call()
+
+        self.assertEqual(2, measurement.queries)
+        self.assertEqual(1, measurement.modulestore_calls)
+        self.assertIsNone(measurement.cache_hit)
+        values = instrumentation.get_diagnostics()["functions"]["test_block"]
+        self.assertEqual(1, values["calls"])
+        self.assertEqual(2, values["queries"])
+        self.assertEqual(0, values["cache_hits"] + values["cache_misses"])
+        self.assertEqual(values["total_time"], values["avg_time"])
+        self.assertIn('"name": "test_block"', logs.output[0])
+
+    @override_settings(STATS_SETTINGS={"STATS_INSTRUMENTATION": True})
+    def test_nested_measure(self):
+        """Test that the outer measurement includes the values of the inner one.
+
+        Expected behavior:
+            - Both measurements contain the modulestore call and query.
+            - Every name has been aggregated.
+        """
+        with self.assertLogs(instrumentation.logger, level="INFO"):
+            with instrumentation.measure("outer") as outer:
+                with instrumentation.measure("inner") as inner:
+                    User.objects.count()
+                    instrumentation.record_modulestore_call()
+
+        self.assertEqual((1, 1), (outer.queries, outer.modulestore_calls))
+        self.assertEqual((1, 1), (inner.queries, inner.modulestore_calls))
+        self.assertEqual({"outer", "inner"}, set(instrumentation.get_diagnostics()["functions"]))
+
+    def test_disabled(self):
+        """Test that nothing is recorded if the instrumentation is disabled.
+
+        Expected behavior:
+            - The measurement is empty.
+            - There are no aggregated values.
+        """
+        with instrumentation.measure("test_block") as measurement:
+            User.objects.count()
+
+        self.assertEqual(0, measurement.queries)
+        self.assertEqual({}, instrumentation.get_diagnostics()["functions"])
+        self.assertFalse(instrumentation.get_diagnostics()["enabled"])
+
+
+class CacheMethodInstrumentationTestCase(unittest.TestCase):
+    """Tests cases for the cache_method measurements."""
+
+    def tearDown(self):
+        """Clear cache and the recorded values."""
+        cache.clear()
+        instrumentation.reset_diagnostics()
+
+    @override_settings(STATS_SETTINGS={"STATS_INSTRUMENTATION": True})
+    def test_cache_hits_and_misses(self):
+        """Test that the calculated values are misses and the cached ones are hits.
+
+        Expected behavior:
+            - The first call is a miss and the second one is a hit.
+        """
+        test_function = Mock(return_value=5)
+        test_function.__name__ = "instrumented_function"
+        wrapper = cache_method(test_function)
+
+        with self.assertLogs(instrumentation.logger, level="INFO"):
+            wrapper("tenant.com")
+            wrapper("tenant.com")
+
+        values = instrumentation.get_diagnostics()["functions"]["instrumented_function"]
+        self.assertEqual(2, values["calls"])
+        self.assertEqual(1, values["cache_misses"])
+        self.assertEqual(1, values["cache_hits"])
@@ -1,36 +1,57 @@
+# pylint: disable=too-many-lines
 """This file contains all the test for the stats metrics.py file.
 
 Classes:
     TestGetCachedCourses: Tests cases for get_cached_courses function.
+    TestGetCachedCourse: Tests cases for get_cached_course function.
     TestGetInstructorsMetric: Tests cases for get_instructors_metric function.
     TestGetLearnersMetric: Tests cases for get_learners_metric function.
+    TestCountLearnersModes: Tests cases for the exact and approximate modes of count_learners.
     TestGetCoursesMetrics: Tests cases for get_courses_metrics function.
     TestGetCourseMetrics: Tests cases for get_course_metrics function.
+    TestGetCoursesCertificatesMetric: Tests cases for get_courses_certificates_metric function.
+    TestGetCoursesGroupedMetrics: Tests cases for get_courses_learners_metric and get_courses_instructors_metric.
+    TestBuildCoursesMetrics: Tests cases for build_courses_metrics function.
+    TestGetCourseCompletionMetric: Tests cases for get_course_completion_metric function.
 """
 import unittest
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from eox_core.edxapp_wrapper.certificates import get_generated_certificate
-from mock import MagicMock, Mock, patch
+from eox_core.edxapp_wrapper.users import get_user_signup_source
+from mock import Mock, patch
 from opaque_keys.edx.keys import CourseKey
 
 from eox_nelp.edxapp_wrapper.branding import get_visible_courses
+from eox_nelp.edxapp_wrapper.completion import BlockCompletion
 from eox_nelp.edxapp_wrapper.modulestore import modulestore
 from eox_nelp.edxapp_wrapper.site_configuration import configuration_helpers
 from eox_nelp.edxapp_wrapper.student import CourseAccessRole, CourseEnrollment
 from eox_nelp.stats.metrics import (
+    CachedCourse,
+    build_courses_metrics,
+    count_learners,
+    get_cached_course,
     get_cached_courses,
+    get_course_completion_metric,
     get_course_metrics,
+    get_courses_certificates_metric,
+    get_courses_instructors_metric,
+    get_courses_learners_metric,
     get_courses_metrics,
     get_instructors_metric,
     get_learners_metric,
 )
+from eox_nelp.stats.models import CourseStructureSummary
 from eox_nelp.tests.utils import generate_list_mock_data
 
 User = get_user_model()
 GeneratedCertificate = get_generated_certificate()
+UserSignupSource = get_user_signup_source()
 
 
 class TestGetCachedCourses(unittest.TestCase):
@@ -38,6 +59,7 @@ class TestGetCachedCourses(unittest.TestCase):
 
     def tearDown(self):
         """Clean cache after every test since the method uses a decorator that caches every result."""
+        get_visible_courses.reset_mock()
         cache.clear()
 
     def test_get_visible_courses_call(self):
@@ -49,12 +71,74 @@ class TestGetCachedCourses(unittest.TestCase):
             - Test function was not called again.
         """
         tenant = "http://test.com"
-        get_visible_courses.return_value = {"test": True}
+        get_visible_courses.return_value = []
 
         get_cached_courses(tenant)
 
         get_visible_courses.assert_called_once_with()
 
+    def test_compact_index(self):
+        """Test that the visible courses are cached as a tuple of CachedCourse sorted by id.
+
+        Expected behavior:
+            - Result contains the id and display name of every course.
+            - The courses are sorted by id.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx108+2022_T4")
+        course_key_2 = CourseKey.from_string("course-v1:test+Cx107+2022_T4")
+        get_visible_courses.return_value = [
+            Mock(id=course_key, display_name="Course 108"),
+            Mock(id=course_key_2, display_name="Course 107"),
+        ]
+
+        courses = get_cached_courses("http://test.com")
+
+        self.assertEqual(
+            (CachedCourse(course_key_2, "Course 107"), CachedCourse(course_key, "Course 108")),
+            courses,
+        )
+
+
+class TestGetCachedCourse(unittest.TestCase):
+    """Tests cases for get_cached_course function."""
+
+    def setUp(self):
+        """Patch get_cached_courses with a sorted index."""
+        self.course_keys = [
+            CourseKey.from_string(f"course-v1:test+Cx10{index}+2022_T4") for index in range(5)
+        ]
+        patcher = patch("eox_nelp.stats.metrics.get_cached_courses")
+        self.get_cached_courses_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.get_cached_courses_mock.return_value = tuple(
+            CachedCourse(course_key, f"Course {index}") for index, course_key in enumerate(self.course_keys)
+        )
+
+    def test_visible_course(self):
+        """Test that a visible course is found by its id string.
+
+        Expected behavior:
+            - Result is the cached course.
+            - get_cached_courses was called with the tenant.
+        """
+        course = get_cached_course("http://test.com", str(self.course_keys[3]))
+
+        self.assertEqual(CachedCourse(self.course_keys[3], "Course 3"), course)
+        self.get_cached_courses_mock.assert_called_once_with("http://test.com")
+
+    def test_not_visible_course(self):
+        """Test that None is returned for a course that is not in the index.
+
+        Expected behavior:
+            - Result is None for courses before, between and after the cached ones.
+        """
+        for course_id in (
+            "course-v1:aaa+Cx100+2022_T4",
+            "course-v1:test+Cx102+2022_T5",
+            "course-v1:zzz+Cx100+2022_T4",
+        ):
+            self.assertIsNone(get_cached_course("http://test.com", course_id))
+
 
 class TestGetInstructorsMetric(unittest.TestCase):
     """Tests cases for get_instructors_metric function."""
@@ -120,7 +204,7 @@ class TestGetLearnersMetric(unittest.TestCase):
         values_result = exclude_result.values.return_value
         distinct_result = values_result.distinct.return_value
         distinct_result.count.return_value = 5874
-        get_cached_courses_mock.return_value = ["course1", "course2", "course3"]
+        get_cached_courses_mock.return_value = (Mock(id="course1"), Mock(id="course2"), Mock(id="course3"))
 
         learners = get_learners_metric(tenant)
 
@@ -137,6 +221,71 @@ class TestGetLearnersMetric(unittest.TestCase):
         get_cached_courses_mock.assert_called_once_with(tenant)
 
 
+class TestCountLearnersModes(unittest.TestCase):
+    """Tests cases for the exact and approximate modes of count_learners."""
+
+    def setUp(self):
+        """Create signup source and enrolled users, the enrollments are represented by a real
+        users subquery since the CourseEnrollment test model is a mock."""
+        self.site = "lms.example.com"
+        signup_user, self.both_user, staff_user, other_site_user = [
+            User.objects.create(username=f"count-learners-{index}", is_staff=index == 2)
+            for index in range(4)
+        ]
+        self.enrolled_user = User.objects.create(username="count-learners-enrolled")
+        UserSignupSource.objects.create(user=signup_user, site=self.site)
+        UserSignupSource.objects.create(user=self.both_user, site=self.site)
+        UserSignupSource.objects.create(user=staff_user, site=self.site)
+        UserSignupSource.objects.create(user=other_site_user, site="other.example.com")
+        patcher = patch("eox_nelp.stats.metrics.CourseEnrollment")
+        self.course_enrollment_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.course_enrollment_mock.objects.filter.return_value.values.return_value = User.objects.filter(
+            id__in=[self.enrolled_user.id, self.both_user.id],
+        ).values("id")
+
+    def tearDown(self):
+        """Remove the created records."""
+        UserSignupSource.objects.all().delete()
+        User.objects.filter(username__startswith="count-learners-").delete()
+
+    @override_settings(STATS_SETTINGS={"STATS_LEARNERS_MODE": "exact"})
+    def test_exact_mode(self):
+        """Test that the exact mode counts the union of both sources in a single query.
+
+        Expected behavior:
+            - The result is the number of distinct non staff users of both sources.
+            - A single query is executed.
+            - The enrollments are filtered by the given courses.
+        """
+        courses = ["course1", "course2"]
+
+        with CaptureQueriesContext(connection) as queries:
+            learners = count_learners(self.site, courses)
+
+        self.assertEqual(3, learners)
+        self.assertEqual(1, len(queries))
+        self.course_enrollment_mock.objects.filter.assert_called_once_with(course__in=courses)
+
+    @override_settings(STATS_SETTINGS={"STATS_LEARNERS_MODE": "approximate"})
+    @patch("eox_nelp.stats.metrics.sketches.estimate_learners")
+    def test_approximate_mode(self, estimate_learners_mock):
+        """Test that the approximate mode returns the estimation of the sketches.
+
+        Expected behavior:
+            - estimate_learners is called with the site and the course keys.
+            - The result is the estimated value.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx105+2022_T4")
+        estimate_learners_mock.return_value = 154
+
+        learners = count_learners(self.site, [Mock(id=course_key), "course-v1:test+Cx106+2022_T4"])
+
+        self.assertEqual(154, learners)
+        estimate_learners_mock.assert_called_once_with(self.site, [course_key, "course-v1:test+Cx106+2022_T4"])
+        self.course_enrollment_mock.objects.filter.assert_not_called()
+
+
 class TestGetCoursesMetrics(unittest.TestCase):
     """Tests cases for get_courses_metrics function."""
 
@@ -144,9 +293,19 @@ class TestGetCoursesMetrics(unittest.TestCase):
         """Clean cache after every test since the method uses a decorator that caches every result."""
         cache.clear()
 
+    @patch("eox_nelp.stats.metrics.get_courses_instructors_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_learners_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_certificates_metric")
     @patch("eox_nelp.stats.metrics.get_cached_courses")
     @patch("eox_nelp.stats.metrics.get_course_metrics")
-    def test_get_courses_metrics(self, get_course_metrics_mock, get_cached_courses_mock):
+    def test_get_courses_metrics(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        get_course_metrics_mock,
+        get_cached_courses_mock,
+        get_courses_certificates_metric_mock,
+        get_courses_learners_metric_mock,
+        get_courses_instructors_metric_mock,
+    ):
         """The method get_courses_metrics just calls get_course_metrics multiple times, based on
         the available courses, So this test just verifies that the method get_course_metrics is called
         for every result of get_cached_courses.
@@ -157,17 +316,12 @@ class TestGetCoursesMetrics(unittest.TestCase):
             - get_cached_courses was called once.
             - get_course_metrics_mock was called multiple times.
             - the time that get_course_metrics_mock was called is the same number of courses.
+            - get_courses_certificates_metric was called once.
+            - get_courses_learners_metric was called once.
+            - get_courses_instructors_metric was called once.
         """
         tenant = "http://test.com"
-        courses = MagicMock()
-        courses.__iter__.return_value = iter([
-            Mock(),
-            Mock(),
-            Mock(),
-            Mock(),
-        ])
-        courses.count.return_value = 4
-        get_cached_courses_mock.return_value = courses
+        get_cached_courses_mock.return_value = (Mock(), Mock(), Mock(), Mock())
         get_course_metrics_mock.return_value = {
             "name": "test-course"
         }
@@ -179,6 +333,76 @@ class TestGetCoursesMetrics(unittest.TestCase):
         get_cached_courses_mock.assert_called_once_with(tenant)
         get_course_metrics_mock.assert_called()
         self.assertEqual(4, get_course_metrics_mock.call_count)
+        get_courses_certificates_metric_mock.assert_called_once()
+        get_courses_learners_metric_mock.assert_called_once()
+        get_courses_instructors_metric_mock.assert_called_once()
+
+    @patch("eox_nelp.stats.metrics.get_courses_instructors_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_learners_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_certificates_metric")
+    @patch("eox_nelp.stats.metrics.get_cached_courses")
+    @patch("eox_nelp.stats.metrics.get_course_metrics")
+    def test_pre_computed_values(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        get_course_metrics_mock,
+        get_cached_courses_mock,
+        get_courses_certificates_metric_mock,
+        get_courses_learners_metric_mock,
+        get_courses_instructors_metric_mock,
+    ):
+        """Test that the grouped values are passed to get_course_metrics.
+
+        Expected behavior:
+            - get_course_metrics was called with the values of every course.
+            - Courses without grouped values get zero learners and instructors.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx108+2022_T4")
+        course_key_2 = CourseKey.from_string("course-v1:test+Cx109+2022_T4")
+        get_course_metrics_mock.return_value = {}
+        get_cached_courses_mock.return_value = (Mock(id=course_key), Mock(id=course_key_2))
+        get_courses_learners_metric_mock.return_value = {str(course_key): 10}
+        get_courses_instructors_metric_mock.return_value = {str(course_key): 2}
+        get_courses_certificates_metric_mock.return_value = {str(course_key): {}, str(course_key_2): {}}
+
+        get_courses_metrics("http://test.com")
+
+        get_courses_learners_metric_mock.assert_called_once_with([course_key, course_key_2])
+        get_courses_instructors_metric_mock.assert_called_once_with([course_key, course_key_2])
+        get_course_metrics_mock.assert_any_call(course_key, learners=10, instructors=2, certificates={})
+        get_course_metrics_mock.assert_any_call(course_key_2, learners=0, instructors=0, certificates={})
+
+    @override_settings(STATS_SETTINGS={"STATS_PARALLEL_WORKERS": 8, "STATS_PARALLEL_DEADLINE": 5})
+    @patch("eox_nelp.stats.metrics.run_in_thread_pool")
+    @patch("eox_nelp.stats.metrics.get_courses_instructors_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_learners_metric")
+    @patch("eox_nelp.stats.metrics.get_courses_certificates_metric")
+    @patch("eox_nelp.stats.metrics.get_cached_courses")
+    def test_parallel_mode(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        get_cached_courses_mock,
+        get_courses_certificates_metric_mock,  # pylint: disable=unused-argument
+        get_courses_learners_metric_mock,  # pylint: disable=unused-argument
+        get_courses_instructors_metric_mock,  # pylint: disable=unused-argument
+        run_in_thread_pool_mock,
+    ):
+        """Test that the course metrics are calculated in a thread pool when the parallel mode is enabled.
+
+        Expected behavior:
+            - run_in_thread_pool was called with the course keys.
+            - The workers are limited by the number of courses.
+            - The deadline is the configured value.
+            - The metrics are the thread pool result.
+        """
+        course_keys = ["course-v1:test+Cx110+2022_T4", "course-v1:test+Cx111+2022_T4"]
+        get_cached_courses_mock.return_value = tuple(Mock(id=course_key) for course_key in course_keys)
+        run_in_thread_pool_mock.return_value = [{}, {}]
+
+        metrics = get_courses_metrics("http://test.com")
+
+        self.assertEqual([{}, {}], metrics["metrics"])
+        _, pool_args, pool_kwargs = run_in_thread_pool_mock.mock_calls[0]
+        self.assertEqual(course_keys, pool_args[1])
+        self.assertEqual({"max_workers": 2, "deadline": 5}, pool_kwargs)
 
 
 class TestGetCourseMetrics(unittest.TestCase):
@@ -304,6 +528,7 @@ class TestGetCourseMetrics(unittest.TestCase):
         CourseAccessRole.reset_mock()
         CourseEnrollment.reset_mock()
         modulestore.reset_mock()
+        CourseStructureSummary.objects.all().delete()  # pylint: disable=no-member
         cache.clear()
 
     def test_get_right_id(self):
@@ -463,3 +688,346 @@ class TestGetCourseMetrics(unittest.TestCase):
         course = get_course_metrics(self.course_key)
 
         self.assertEqual(expected_components, course["components"])
+
+
+class TestGetCourseMetricsFromSummary(unittest.TestCase):
+    """Tests cases for get_course_metrics function when the course structure summary exists."""
+
+    def setUp(self):
+        """Create the structure summary of the course."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx107+2022_T4")
+        CourseStructureSummary.objects.create(  # pylint: disable=no-member
+            course_id=self.course_key,
+            display_name="Summary course",
+            sections=2,
+            sub_sections=4,
+            units=8,
+            block_types={"html": 10, "problem": 3, "lti": 1},
+        )
+
+    def tearDown(self):
+        """Clean cache, summaries and restarts mocks."""
+        CourseStructureSummary.objects.all().delete()  # pylint: disable=no-member
+        CourseAccessRole.reset_mock()
+        CourseEnrollment.reset_mock()
+        modulestore.reset_mock()
+        cache.clear()
+
+    @override_settings(STATS_SETTINGS={"API_XBLOCK_TYPES": ["html", "problem", "video"]})
+    def test_read_summary(self):
+        """Test that the structure values are taken from the summary table.
+
+        Expected behavior:
+            - The course was not loaded from the modulestore.
+            - Structure values are the expected.
+            - Components just contains the allowed block types.
+        """
+        course = get_course_metrics(self.course_key, certificates={})
+
+        modulestore.return_value.get_course.assert_not_called()
+        self.assertEqual("Summary course", course["name"])
+        self.assertEqual(2, course["sections"])
+        self.assertEqual(4, course["sub_sections"])
+        self.assertEqual(8, course["units"])
+        self.assertEqual({"html": 10, "problem": 3, "video": 0}, course["components"])
+
+    def test_pre_computed_values(self):
+        """Test that the pre-computed values are used instead of querying by course.
+
+        Expected behavior:
+            - CourseEnrollment and CourseAccessRole were not queried.
+            - Learners and instructors are the given values.
+        """
+        course = get_course_metrics(self.course_key, learners=12, instructors=3, certificates={})
+
+        CourseEnrollment.objects.filter.assert_not_called()
+        CourseAccessRole.objects.filter.assert_not_called()
+        self.assertEqual(12, course["learners"])
+        self.assertEqual(3, course["instructors"])
+
+
+class TestGetCoursesCertificatesMetric(unittest.TestCase):
+    """Tests cases for get_courses_certificates_metric function."""
+
+    def setUp(self):
+        """Create certificates for two different courses."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx106+2022_T4")
+        self.course_key_2 = CourseKey.from_string("course-v1:test2+Cx106+2022_T4")
+        self.empty_course_key = CourseKey.from_string("course-v1:test3+Cx106+2022_T4")
+        user, _ = User.objects.get_or_create(username="luke")
+        user2, _ = User.objects.get_or_create(username="leia")
+        self.certificates = [
+            GeneratedCertificate.objects.create(
+                user=user, course_id=self.course_key, status="downloadable", mode="honor",
+            ),
+            GeneratedCertificate.objects.create(
+                user=user2, course_id=self.course_key, status="notpassing", mode="verified",
+            ),
+            GeneratedCertificate.objects.create(
+                user=user, course_id=self.course_key_2, status="downloadable", mode="audit",
+            ),
+        ]
+
+    def tearDown(self):
+        """Remove the created certificates."""
+        for certificate in self.certificates:
+            certificate.delete()
+
+    def test_single_query(self):
+        """Test that the metrics of all the courses are calculated by a single query.
+
+        Expected behavior:
+            - Only one query was executed.
+            - All the requested courses are in the result.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            result = get_courses_certificates_metric([self.course_key, self.course_key_2, self.empty_course_key])
+
+        self.assertEqual(1, len(queries))
+        self.assertEqual(
+            {str(self.course_key), str(self.course_key_2), str(self.empty_course_key)},
+            set(result.keys()),
+        )
+
+    def test_courses_breakdown(self):
+        """Test that every course has its own breakdown by mode and status.
+
+        Expected behavior:
+            - Course values are the expected.
+            - The total is the sum of all the modes.
+            - A course without certificates has empty status values.
+        """
+        result = get_courses_certificates_metric([self.course_key, self.course_key_2, self.empty_course_key])
+
+        course_metric = result[str(self.course_key)]
+        self.assertEqual({"downloadable": 1, "notpassing": 0}, course_metric["honor"])
+        self.assertEqual({"downloadable": 0, "notpassing": 1}, course_metric["verified"])
+        self.assertEqual({"downloadable": 0, "notpassing": 0}, course_metric["paid-bootcamp"])
+        self.assertEqual({"downloadable": 1, "notpassing": 1}, course_metric["total"])
+        self.assertEqual({"downloadable": 1}, result[str(self.course_key_2)]["audit"])
+        self.assertEqual({"downloadable": 1}, result[str(self.course_key_2)]["total"])
+        self.assertEqual({}, result[str(self.empty_course_key)]["total"])
+        self.assertEqual({}, result[str(self.empty_course_key)]["honor"])
+
+
+class TestGetCoursesGroupedMetrics(unittest.TestCase):
+    """Tests cases for get_courses_learners_metric and get_courses_instructors_metric functions."""
+
+    def setUp(self):
+        """Set base course keys."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx114+2022_T4")
+        self.course_key_2 = CourseKey.from_string("course-v1:test+Cx115+2022_T4")
+
+    def tearDown(self):
+        """Restart mocks."""
+        CourseAccessRole.reset_mock()
+        CourseEnrollment.reset_mock()
+
+    def test_courses_learners(self):
+        """Test that the learners of all the courses are grouped by a single query.
+
+        Expected behavior:
+            - The filter method was called once with the right parameters.
+            - The values are grouped by course and counted by distinct user.
+            - Result contains the count of every course.
+        """
+        filter_result = CourseEnrollment.objects.filter.return_value
+        annotate_result = filter_result.values.return_value.annotate.return_value
+        annotate_result.order_by.return_value = [
+            {"course": self.course_key, "count": 20},
+            {"course": self.course_key_2, "count": 7},
+        ]
+
+        result = get_courses_learners_metric([self.course_key, self.course_key_2])
+
+        self.assertEqual({str(self.course_key): 20, str(self.course_key_2): 7}, result)
+        CourseEnrollment.objects.filter.assert_called_once_with(
+            course__in=[self.course_key, self.course_key_2],
+            user__is_staff=False,
+            user__is_superuser=False,
+        )
+        filter_result.values.assert_called_once_with("course")
+
+    def test_courses_instructors(self):
+        """Test that the instructors of all the courses are grouped by a single query.
+
+        Expected behavior:
+            - The filter method was called once with the right parameters.
+            - The values are grouped by course.
+            - Result contains the count of every course with instructors.
+        """
+        filter_result = CourseAccessRole.objects.filter.return_value
+        annotate_result = filter_result.values.return_value.annotate.return_value
+        annotate_result.order_by.return_value = [
+            {"course_id": self.course_key, "count": 2},
+        ]
+
+        result = get_courses_instructors_metric([self.course_key, self.course_key_2])
+
+        self.assertEqual({str(self.course_key): 2}, result)
+        CourseAccessRole.objects.filter.assert_called_once_with(course_id__in=[self.course_key, self.course_key_2])
+        filter_result.values.assert_called_once_with("course_id")
+
+
+@patch("eox_nelp.stats.metrics.get_courses_certificates_metric")
+@patch("eox_nelp.stats.metrics.get_courses_instructors_metric")
+@patch("eox_nelp.stats.metrics.get_courses_learners_metric")
+class TestBuildCoursesMetrics(unittest.TestCase):
+    """Tests cases for build_courses_metrics function."""
+
+    def setUp(self):
+        """Create the structure summary of a course."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx116+2022_T4")
+        CourseStructureSummary.objects.create(  # pylint: disable=no-member
+            course_id=self.course_key,
+            display_name="Build course",
+            sections=1,
+            sub_sections=2,
+            units=3,
+            block_types={"html": 4},
+        )
+
+    def tearDown(self):
+        """Clean summaries."""
+        CourseStructureSummary.objects.all().delete()  # pylint: disable=no-member
+
+    @override_settings(STATS_SETTINGS={"API_XBLOCK_TYPES": ["html"]})
+    def test_all_fields(self, learners_mock, instructors_mock, certificates_mock):
+        """Test that all the metrics are built when fields is not provided.
+
+        Expected behavior:
+            - The result is the expected.
+            - Every grouped metric was calculated once.
+        """
+        course_id = str(self.course_key)
+        learners_mock.return_value = {course_id: 8}
+        instructors_mock.return_value = {}
+        certificates_mock.return_value = {course_id: {"total": {}}}
+
+        result = build_courses_metrics([self.course_key])
+
+        self.assertEqual([{
+            "id": course_id,
+            "name": "Build course",
+            "learners": 8,
+            "instructors": 0,
+            "sections": 1,
+            "sub_sections": 2,
+            "units": 3,
+            "components": {"html": 4},
+            "certificates": {"total": {}},
+        }], result)
+        learners_mock.assert_called_once_with([self.course_key])
+        instructors_mock.assert_called_once_with([self.course_key])
+        certificates_mock.assert_called_once_with([self.course_key])
+
+    def test_selected_fields(self, learners_mock, instructors_mock, certificates_mock):
+        """Test that the metrics out of fields are not calculated.
+
+        Expected behavior:
+            - The result only contains the requested fields.
+            - Instructors and certificates were not calculated.
+        """
+        learners_mock.return_value = {str(self.course_key): 8}
+
+        result = build_courses_metrics([self.course_key], ["id", "name", "learners"])
+
+        self.assertEqual([{"id": str(self.course_key), "name": "Build course", "learners": 8}], result)
+        instructors_mock.assert_not_called()
+        certificates_mock.assert_not_called()
+
+
+@patch("eox_nelp.stats.metrics.get_courses_learners_metric")
+class TestGetCourseCompletionMetric(unittest.TestCase):
+    """Tests cases for get_course_completion_metric function."""
+
+    def setUp(self):
+        """Set a course outline with one section, two subsections and four components."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx112+2022_T4")
+        self.blocks = [self.course_key.make_usage_key("problem", f"problem{index}") for index in range(4)]
+        sequentials = [
+            Mock(
+                location=self.course_key.make_usage_key("sequential", f"sequential{index}"),
+                display_name=f"Subsection {index}",
+            )
+            for index in range(2)
+        ]
+        sequentials[0].get_children.return_value = [Mock(children=self.blocks[:1]), Mock(children=self.blocks[1:2])]
+        sequentials[1].get_children.return_value = [Mock(children=self.blocks[2:])]
+        chapter = Mock(location=self.course_key.make_usage_key("chapter", "chapter0"), display_name="Section 0")
+        chapter.get_children.return_value = sequentials
+        modulestore.return_value.get_course.return_value.get_children.return_value = [chapter]
+        # Learners 1 and 2 completed the first subsection, learners 3 and 4 completed half of it.
+        completed_blocks = {1: self.blocks[:3], 2: self.blocks[:2], 3: self.blocks[:1], 4: self.blocks[:1]}
+        BlockCompletion.objects.filter.return_value.values_list.return_value.iterator.return_value = [
+            (user_id, block) for user_id, blocks in completed_blocks.items() for block in blocks
+        ]
+
+    def tearDown(self):
+        """Clean cache and restarts the modulestore and BlockCompletion mocks."""
+        modulestore.reset_mock()
+        BlockCompletion.reset_mock()
+        cache.clear()
+
+    def test_completion_rates(self, learners_mock):
+        """Test that the completed learners and rates are calculated from a single query.
+
+        Expected behavior:
+            - The completed learners are the learners that completed all the components.
+            - The subsection rate is the average rate of its components.
+            - The section rate is the average rate of all its components.
+            - BlockCompletion is filtered by the course and the completed non staff records.
+            - The course is loaded once from the modulestore.
+        """
+        learners_mock.return_value = {str(self.course_key): 4}
+
+        result = get_course_completion_metric(self.course_key)
+
+        self.assertEqual({
+            "id": str(self.course_key),
+            "learners": 4,
+            "sections": [{
+                "id": str(self.course_key.make_usage_key("chapter", "chapter0")),
+                "display_name": "Section 0",
+                "components": 4,
+                "completed_learners": 0,
+                "completion_rate": 0.4375,
+                "sub_sections": [
+                    {
+                        "id": str(self.course_key.make_usage_key("sequential", "sequential0")),
+                        "display_name": "Subsection 0",
+                        "components": 2,
+                        "completed_learners": 2,
+                        "completion_rate": 0.75,
+                    },
+                    {
+                        "id": str(self.course_key.make_usage_key("sequential", "sequential1")),
+                        "display_name": "Subsection 1",
+                        "components": 2,
+                        "completed_learners": 0,
+                        "completion_rate": 0.125,
+                    },
+                ],
+            }],
+        }, result)
+        BlockCompletion.objects.filter.assert_called_once_with(
+            context_key=self.course_key,
+            completion__gte=1.0,
+            user__is_staff=False,
+            user__is_superuser=False,
+        )
+        modulestore.return_value.get_course.assert_called_once_with(self.course_key)
+
+    def test_without_learners(self, learners_mock):
+        """Test that the rates are zero when the course has no learners.
+
+        Expected behavior:
+            - Every completion rate is 0.
+        """
+        learners_mock.return_value = {}
+
+        result = get_course_completion_metric(self.course_key)
+
+        self.assertEqual(0, result["learners"])
+        self.assertEqual(0.0, result["sections"][0]["completion_rate"])
+        self.assertEqual([0.0, 0.0], [item["completion_rate"] for item in result["sections"][0]["sub_sections"]])
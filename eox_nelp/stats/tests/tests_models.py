@@ -0,0 +1,113 @@
+"""This file contains all the test for the stats models.py file.
+
+Classes:
+    CourseStructureSummaryTestCase: Tests cases for CourseStructureSummary model.
+"""
+import unittest
+
+from mock import Mock
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.edxapp_wrapper.modulestore import modulestore
+from eox_nelp.stats.models import CourseStructureSummary
+from eox_nelp.tests.utils import generate_list_mock_data
+
+
+class CourseStructureSummaryTestCase(unittest.TestCase):
+    """Tests cases for CourseStructureSummary model."""
+
+    def setUp(self):
+        """Set a course with two chapters, three sequentials by chapter and two verticals by sequential."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx108+2022_T4")
+        verticals = generate_list_mock_data([
+            {
+                "children": [
+                    {"block_type": "problem"},
+                    {"block_type": "html"},
+                ]
+            },
+            {
+                "children": [
+                    {"block_type": "html"},
+                    {"block_type": "lti"},
+                ]
+            },
+        ])
+        sequential = Mock()
+        sequential.get_children.return_value = verticals
+        chapter = Mock()
+        chapter.get_children.return_value = [sequential, sequential, sequential]
+        course = Mock()
+        course.display_name = "Structure course"
+        course.get_children.return_value = [chapter, chapter]
+        modulestore.return_value.get_course.return_value = course
+
+    def tearDown(self):
+        """Remove summaries and restarts mocks."""
+        CourseStructureSummary.objects.all().delete()  # pylint: disable=no-member
+        modulestore.reset_mock()
+
+    def test_update_from_modulestore(self):
+        """Test that the summary is created based on the course tree.
+
+        Expected behavior:
+            - The course was loaded from the modulestore.
+            - The counts by level are the expected.
+            - The block types histogram includes all the block types.
+        """
+        summary = CourseStructureSummary.update_from_modulestore(self.course_key)
+
+        modulestore.return_value.get_course.assert_called_once_with(self.course_key)
+        self.assertEqual("Structure course", summary.display_name)
+        self.assertEqual(2, summary.sections)
+        self.assertEqual(6, summary.sub_sections)
+        self.assertEqual(12, summary.units)
+        self.assertEqual({"problem": 6, "html": 12, "lti": 6}, summary.block_types)
+
+    def test_update_existing_summary(self):
+        """Test that a second update modifies the existing record.
+
+        Expected behavior:
+            - There is just one record for the course.
+            - The record has the new values.
+        """
+        CourseStructureSummary.objects.create(  # pylint: disable=no-member
+            course_id=self.course_key,
+            sections=100,
+        )
+
+        CourseStructureSummary.update_from_modulestore(self.course_key)
+
+        summaries = CourseStructureSummary.objects.filter(course_id=self.course_key)  # pylint: disable=no-member
+        self.assertEqual(1, summaries.count())
+        self.assertEqual(2, summaries.first().sections)
+
+    def test_get_components(self):
+        """Test that get_components returns only the allowed block types.
+
+        Expected behavior:
+            - Missing block types are set to 0.
+            - Not allowed block types are excluded.
+        """
+        summary = CourseStructureSummary(block_types={"html": 3, "lti": 1})
+
+        self.assertEqual({"html": 3, "video": 0}, summary.get_components(["html", "video"]))
+
+    def test_get_metrics(self):
+        """Test that get_metrics returns the structure values with the course stats keys.
+
+        Expected behavior:
+            - The result is the expected.
+        """
+        summary = CourseStructureSummary(
+            display_name="Summary",
+            sections=1,
+            sub_sections=2,
+            units=3,
+            block_types={"html": 3},
+        )
+
+        self.assertEqual(
+            {"name": "Summary", "sections": 1, "sub_sections": 2, "units": 3, "components": {"html": 3}},
+            summary.get_metrics(["html"]),
+        )
@@ -0,0 +1,204 @@
+"""This file contains all the test for the stats rollups.py file.
+
+Classes:
+    BuildDailyStatsRollupsTestCase: Tests cases for build_daily_stats_rollups function.
+    GetDailyStatsTestCase: Tests cases for get_daily_stats function.
+"""
+import unittest
+from datetime import date, datetime, timezone
+
+from mock import ANY, patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.edxapp_wrapper.student import CourseEnrollment
+from eox_nelp.stats import rollups
+from eox_nelp.stats.activity import ActivityBitmap
+from eox_nelp.stats.models import DailyActiveLearners, DailyStatsRollup
+
+
+class BuildDailyStatsRollupsTestCase(unittest.TestCase):
+    """Tests cases for build_daily_stats_rollups function."""
+
+    def setUp(self):
+        """Set the grouped values of the day for the CourseEnrollment mock and the active learners bitmaps."""
+        self.day = date(2023, 5, 28)
+        self.course_key = CourseKey.from_string("course-v1:org1+Cx120+2023_T1")
+        self.course_key_2 = CourseKey.from_string("course-v1:org1+Cx121+2023_T1")
+        self.other_course_key = CourseKey.from_string("course-v1:other+Cx122+2023_T1")
+        CourseEnrollment.objects.filter.return_value.values.return_value.annotate.return_value.order_by.return_value = [
+            {"course": self.course_key, "count": 4},
+            {"course": self.course_key_2, "count": 1},
+            {"course": self.other_course_key, "count": 9},
+        ]
+        for course_key, users, day in (
+            (self.course_key, [1, 2], self.day),
+            (self.course_key_2, [2], self.day),
+            (self.other_course_key, [3], self.day),
+            (self.course_key_2, [4, 5], date(2023, 5, 27)),
+        ):
+            DailyActiveLearners.objects.create(  # pylint: disable=no-member
+                course_id=course_key,
+                date=day,
+                users=ActivityBitmap({0: sum(1 << user_id for user_id in users)}).to_bytes(),
+            )
+        patcher = patch("eox_nelp.stats.rollups.get_tenants_orgs")
+        self.get_tenants_orgs_mock = patcher.start()
+        self.get_tenants_orgs_mock.return_value = {"tenant.com": ["org1"], "empty.com": ["org2"]}
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean records and restart mocks."""
+        DailyStatsRollup.objects.all().delete()  # pylint: disable=no-member
+        DailyActiveLearners.objects.all().delete()  # pylint: disable=no-member
+        CourseEnrollment.reset_mock()
+
+    def get_rollup(self, tenant, course_id=""):
+        """Returns the stored rollup of the day for the given tenant and course."""
+        return DailyStatsRollup.objects.get(  # pylint: disable=no-member
+            tenant=tenant,
+            course_id=course_id,
+            date=self.day,
+        )
+
+    @patch("eox_nelp.stats.rollups.GeneratedCertificate")
+    def test_build(self, certificate_mock):
+        """Test that the course and tenant rollups are stored with the day values.
+
+        Expected behavior:
+            - The course rollups contain the values of the course.
+            - The tenant rollup contains the totals and the distinct active learners.
+            - The active learners of other days are not counted.
+            - A tenant without activity has an empty rollup.
+            - The courses of other organizations are not stored.
+        """
+        certificate_mock.objects.filter.return_value.values.return_value.annotate.return_value.order_by.return_value = [
+            {"course_id": self.course_key, "status": "downloadable", "count": 2},
+            {"course_id": self.course_key_2, "status": "downloadable", "count": 1},
+            {"course_id": self.course_key_2, "status": "notpassing", "count": 3},
+        ]
+
+        rollups.build_daily_stats_rollups(self.day)
+
+        course_rollup = self.get_rollup("tenant.com", str(self.course_key))
+        self.assertEqual(4, course_rollup.new_enrollments)
+        self.assertEqual(2, course_rollup.active_learners)
+        self.assertEqual({"downloadable": 2}, course_rollup.certificates)
+        tenant_rollup = self.get_rollup("tenant.com")
+        self.assertEqual(5, tenant_rollup.new_enrollments)
+        self.assertEqual(2, tenant_rollup.active_learners)
+        self.assertEqual({"downloadable": 3, "notpassing": 3}, tenant_rollup.certificates)
+        empty_rollup = self.get_rollup("empty.com")
+        self.assertEqual(0, empty_rollup.new_enrollments)
+        self.assertEqual({}, empty_rollup.certificates)
+        self.assertFalse(
+            DailyStatsRollup.objects.filter(course_id=str(self.other_course_key)).exists()  # pylint: disable=no-member
+        )
+
+    @patch("eox_nelp.stats.rollups.GeneratedCertificate")
+    def test_day_range(self, certificate_mock):
+        """Test that the LMS sources are filtered by the range of the day.
+
+        Expected behavior:
+            - The enrollments are filtered from the start of the day to the start of the next day.
+            - The certificates are filtered by the tenants courses and the range of the day.
+        """
+        start = datetime(2023, 5, 28, tzinfo=timezone.utc)
+        end = datetime(2023, 5, 29, tzinfo=timezone.utc)
+
+        rollups.build_daily_stats_rollups(self.day)
+
+        CourseEnrollment.objects.filter.assert_called_once_with(
+            created__gte=start,
+            created__lt=end,
+            user__is_staff=False,
+            user__is_superuser=False,
+        )
+        certificate_mock.objects.filter.assert_called_once_with(
+            course_id__in=ANY,
+            created_date__gte=start,
+            created_date__lt=end,
+        )
+
+    @patch("eox_nelp.stats.rollups.GeneratedCertificate")
+    def test_rebuild(self, _):
+        """Test that the rollups of the day are replaced when the day is processed again.
+
+        Expected behavior:
+            - The previous record of the day was replaced.
+            - The records of other days are kept.
+        """
+        DailyStatsRollup.objects.create(  # pylint: disable=no-member
+            tenant="tenant.com",
+            date=self.day,
+            new_enrollments=50,
+        )
+        DailyStatsRollup.objects.create(tenant="tenant.com", date=date(2023, 5, 27))  # pylint: disable=no-member
+
+        rollups.build_daily_stats_rollups(self.day)
+
+        self.assertEqual(5, self.get_rollup("tenant.com").new_enrollments)
+        self.assertTrue(
+            DailyStatsRollup.objects.filter(date=date(2023, 5, 27)).exists()  # pylint: disable=no-member
+        )
+
+
+class GetDailyStatsTestCase(unittest.TestCase):
+    """Tests cases for get_daily_stats function."""
+
+    def setUp(self):
+        """Create rollups of multiple days."""
+        for day in range(1, 5):
+            DailyStatsRollup.objects.create(  # pylint: disable=no-member
+                tenant="tenant.com",
+                date=date(2023, 5, day),
+                new_enrollments=day,
+                active_learners=day * 2,
+                certificates={"downloadable": day},
+            )
+
+        DailyStatsRollup.objects.create(  # pylint: disable=no-member
+            tenant="tenant.com",
+            course_id="course-v1:org1+Cx123+2023_T1",
+            date=date(2023, 5, 2),
+            new_enrollments=1,
+        )
+        DailyStatsRollup.objects.create(tenant="other.com", date=date(2023, 5, 2))  # pylint: disable=no-member
+
+    def tearDown(self):
+        """Clean records."""
+        DailyStatsRollup.objects.all().delete()  # pylint: disable=no-member
+
+    def test_tenant_range(self):
+        """Test that the tenant totals of the range are returned sorted by date.
+
+        Expected behavior:
+            - Only the days of the range are returned.
+            - The values are the expected.
+        """
+        result = rollups.get_daily_stats("tenant.com", date(2023, 5, 2), date(2023, 5, 3))
+
+        self.assertEqual(
+            [
+                {"date": "2023-05-02", "new_enrollments": 2, "active_learners": 4, "certificates": {"downloadable": 2}},
+                {"date": "2023-05-03", "new_enrollments": 3, "active_learners": 6, "certificates": {"downloadable": 3}},
+            ],
+            result,
+        )
+
+    def test_course(self):
+        """Test that the course values are returned when the course id is provided.
+
+        Expected behavior:
+            - Only the course rollup is returned.
+        """
+        result = rollups.get_daily_stats(
+            "tenant.com",
+            date(2023, 5, 1),
+            date(2023, 5, 31),
+            "course-v1:org1+Cx123+2023_T1",
+        )
+
+        self.assertEqual(
+            [{"date": "2023-05-02", "new_enrollments": 1, "active_learners": 0, "certificates": {}}],
+            result,
+        )
@@ -0,0 +1,268 @@
+"""This file contains all the test for the stats sketches.py file.
+
+Classes:
+    HyperLogLogTestCase: Tests cases for the HyperLogLog class.
+    EstimateLearnersTestCase: Tests cases for estimate_learners function.
+    AddLearnerTestCase: Tests cases for add_course_learner, add_site_learner and add_learner functions.
+"""
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from eox_core.edxapp_wrapper.users import get_user_signup_source
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.edxapp_wrapper.student import CourseEnrollment
+from eox_nelp.stats import sketches
+from eox_nelp.stats.models import LearnersSketch
+from eox_nelp.stats.sketches import HyperLogLog
+
+User = get_user_model()
+UserSignupSource = get_user_signup_source()
+
+
+class HyperLogLogTestCase(unittest.TestCase):
+    """Tests cases for the HyperLogLog class."""
+
+    def test_small_cardinality(self):
+        """Test that small cardinalities are counted almost exactly by linear counting.
+
+        Expected behavior:
+            - The estimation is the number of distinct values with a 2% error.
+            - The repeated values are not counted.
+        """
+        hyperloglog = HyperLogLog()
+
+        for value in list(range(500)) * 3:
+            hyperloglog.add(value)
+
+        self.assertAlmostEqual(500, hyperloglog.count(), delta=10)
+
+    def test_large_cardinality(self):
+        """Test the estimation of a cardinality bigger than the number of registers.
+
+        Expected behavior:
+            - The estimation is the number of distinct values with a 5% error.
+        """
+        hyperloglog = HyperLogLog()
+
+        for value in range(50000):
+            hyperloglog.add(value)
+
+        self.assertAlmostEqual(50000, hyperloglog.count(), delta=2500)
+
+    def test_add_repeated_value(self):
+        """Test that adding a value twice doesn't change the registers.
+
+        Expected behavior:
+            - The second add returns False.
+            - The registers are not changed.
+        """
+        hyperloglog = HyperLogLog()
+        hyperloglog.add(7)
+        registers = bytes(hyperloglog.registers)
+
+        self.assertFalse(hyperloglog.add(7))
+        self.assertEqual(registers, bytes(hyperloglog.registers))
+
+    def test_merge(self):
+        """Test that merging two sketches is equivalent to add all the values to a single one.
+
+        Expected behavior:
+            - The merged registers are the registers of the union.
+            - The overlapped values are counted once.
+        """
+        first, second, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+
+        for value in range(3000):
+            first.add(value)
+            union.add(value)
+
+        for value in range(2000, 6000):
+            second.add(value)
+            union.add(value)
+
+        first.merge(second)
+
+        self.assertEqual(union.registers, first.registers)
+        self.assertAlmostEqual(6000, first.count(), delta=300)
+
+    def test_empty(self):
+        """Test the estimation of an empty sketch.
+
+        Expected behavior:
+            - The result is 0.
+        """
+        self.assertEqual(0, HyperLogLog().count())
+
+
+class EstimateLearnersTestCase(unittest.TestCase):
+    """Tests cases for estimate_learners function."""
+
+    def setUp(self):
+        """Create signup source users and set the enrollments of the CourseEnrollment mock."""
+        self.site = "lms.example.com"
+        self.course_key = "course-v1:test+Cx105+2022_T4"
+        users = [User.objects.create(username=f"sketch-learner-{index}") for index in range(3)]
+
+        for user in users:
+            UserSignupSource.objects.create(user=user, site=self.site)
+
+        enrollments = CourseEnrollment.objects.filter.return_value.filter.return_value
+        enrollments.values_list.return_value.distinct.return_value.iterator.return_value = [
+            users[0].id,
+            users[0].id + 1000,
+            users[0].id + 1001,
+        ]
+
+    def tearDown(self):
+        """Remove the created records, clean cache and restarts CourseEnrollment mock."""
+        cache.clear()
+        CourseEnrollment.reset_mock()
+        LearnersSketch.objects.all().delete()  # pylint: disable=no-member
+        UserSignupSource.objects.all().delete()
+        User.objects.filter(username__startswith="sketch-learner-").delete()
+
+    @patch("eox_nelp.stats.tasks.build_learners_sketch")
+    def test_enqueue_missing_sketches(self, build_task_mock):
+        """Test that the missing sketches are enqueued once instead of built in the request.
+
+        Expected behavior:
+            - The result only merges the stored site sketch.
+            - build_learners_sketch is enqueued once for the course sketch.
+            - The course sketch is not built.
+        """
+        site_sketch = HyperLogLog()
+
+        for value in range(100):
+            site_sketch.add(value)
+
+        LearnersSketch.objects.create(  # pylint: disable=no-member
+            key=f"site:{self.site}",
+            registers=bytes(site_sketch.registers),
+        )
+
+        learners = sketches.estimate_learners(self.site, [self.course_key])
+        sketches.estimate_learners(self.site, [self.course_key])
+
+        self.assertAlmostEqual(100, learners, delta=2)
+        build_task_mock.delay.assert_called_once_with(f"course:{self.course_key}")
+        CourseEnrollment.objects.filter.assert_not_called()
+
+    @patch("eox_nelp.stats.sketches.invalidate_course_stats")
+    @patch("eox_nelp.stats.sketches.bump_generation")
+    def test_build_sketches(self, bump_generation_mock, invalidate_course_stats_mock):
+        """Test that the built sketches are stored and the stats estimated without them are invalidated.
+
+        Expected behavior:
+            - The sketches count the distinct users of every source.
+            - The site and course sketches are stored.
+            - The enrollments are filtered by the course.
+            - The tenant and course stats are invalidated.
+        """
+        site_sketch = sketches.build_sketch(f"site:{self.site}")
+        course_sketch = sketches.build_sketch(f"course:{self.course_key}")
+
+        self.assertEqual(5, HyperLogLog().merge(site_sketch).merge(course_sketch).count())
+        self.assertEqual(
+            {f"site:{self.site}", f"course:{self.course_key}"},
+            set(LearnersSketch.objects.values_list("key", flat=True)),  # pylint: disable=no-member
+        )
+        CourseEnrollment.objects.filter.assert_called_once_with(course=self.course_key)
+        bump_generation_mock.assert_called_once_with("tenant", self.site)
+        invalidate_course_stats_mock.assert_called_once_with(CourseKey.from_string(self.course_key))
+
+    @patch("eox_nelp.stats.sketches.build_sketch")
+    def test_stored_sketches(self, build_sketch_mock):
+        """Test that the stored sketches are merged without reading the LMS tables.
+
+        Expected behavior:
+            - The result is the estimation of the merged sketches.
+            - build_sketch is not called.
+        """
+        site_sketch, course_sketch = HyperLogLog(), HyperLogLog()
+
+        for value in range(100):
+            site_sketch.add(value)
+            course_sketch.add(value + 50)
+
+        LearnersSketch.objects.create(  # pylint: disable=no-member
+            key=f"site:{self.site}",
+            registers=bytes(site_sketch.registers),
+        )
+        LearnersSketch.objects.create(  # pylint: disable=no-member
+            key=f"course:{self.course_key}",
+            registers=bytes(course_sketch.registers),
+        )
+
+        learners = sketches.estimate_learners(self.site, [self.course_key])
+
+        self.assertAlmostEqual(150, learners, delta=3)
+        build_sketch_mock.assert_not_called()
+
+
+class AddLearnerTestCase(unittest.TestCase):
+    """Tests cases for add_course_learner, add_site_learner and add_learner functions."""
+
+    def tearDown(self):
+        """Remove the created sketches and restarts CourseEnrollment mock."""
+        CourseEnrollment.reset_mock()
+        LearnersSketch.objects.all().delete()  # pylint: disable=no-member
+
+    @patch("eox_nelp.stats.tasks.update_learners_sketch")
+    def test_enqueue_learner(self, update_task_mock):
+        """Test that the sketches are updated by a task instead of the current transaction.
+
+        Expected behavior:
+            - update_learners_sketch is enqueued with the course and site sketch keys.
+            - No sketch is stored.
+        """
+        sketches.add_course_learner("course-v1:test+Cx105+2022_T4", 7)
+        sketches.add_site_learner("lms.example.com", 7)
+
+        self.assertEqual(
+            [(("course:course-v1:test+Cx105+2022_T4", 7),), (("site:lms.example.com", 7),)],
+            [(call.args,) for call in update_task_mock.delay.call_args_list],
+        )
+        self.assertFalse(LearnersSketch.objects.exists())  # pylint: disable=no-member
+
+    def test_add_to_stored_sketch(self):
+        """Test that the learner is added to the stored sketch.
+
+        Expected behavior:
+            - The stored registers contain the learner.
+        """
+        LearnersSketch.objects.create(  # pylint: disable=no-member
+            key="site:lms.example.com",
+            registers=bytes(HyperLogLog().registers),
+        )
+
+        sketches.add_learner("site:lms.example.com", 7)
+
+        sketch = LearnersSketch.objects.get(key="site:lms.example.com")  # pylint: disable=no-member
+        self.assertEqual(1, HyperLogLog(sketch.registers).count())
+
+    @patch("eox_nelp.stats.sketches.build_sketch")
+    def test_add_to_missing_sketch(self, build_sketch_mock):
+        """Test that a missing sketch is built from the LMS tables, that include the new learner.
+
+        Expected behavior:
+            - build_sketch is called with the course sketch key.
+        """
+        sketches.add_learner("course:course-v1:test+Cx105+2022_T4", 7)
+
+        build_sketch_mock.assert_called_once_with("course:course-v1:test+Cx105+2022_T4")
+
+    def test_is_enabled(self):
+        """Test that the sketches are enabled by the approximate learners mode.
+
+        Expected behavior:
+            - is_enabled returns True only for the approximate mode.
+        """
+        with override_settings(STATS_SETTINGS={"STATS_LEARNERS_MODE": "approximate"}):
+            self.assertTrue(sketches.is_enabled())
+
+        with override_settings(STATS_SETTINGS={"STATS_LEARNERS_MODE": "exact"}):
+            self.assertFalse(sketches.is_enabled())
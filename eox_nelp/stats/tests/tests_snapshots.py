@@ -0,0 +1,281 @@
+"""This file contains all the test for the stats snapshots.py file.
+
+Classes:
+    RefreshCourseStatsSnapshotsTestCase: Tests cases for refresh_course_stats_snapshots function.
+    IncrementCourseLearnersTestCase: Tests cases for increment_course_learners function.
+    ScheduleTenantSnapshotRefreshTestCase: Tests cases for schedule_tenant_snapshot_refresh function.
+    GetCoursesMetricsTestCase: Tests cases for get_courses_metrics and get_course_metrics functions.
+    TenantMetricsTestCase: Tests cases for get_learners_metric and get_instructors_metric functions.
+"""
+import unittest
+
+from django.core.cache import cache
+from django.test import override_settings
+from mock import Mock, patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.edxapp_wrapper.modulestore import modulestore
+from eox_nelp.edxapp_wrapper.site_configuration import configuration_helpers
+from eox_nelp.edxapp_wrapper.student import CourseAccessRole, CourseEnrollment
+from eox_nelp.stats import snapshots
+from eox_nelp.stats.models import CourseStatsSnapshot, CourseStructureSummary, TenantStatsSnapshot
+
+
+def clean_snapshots():
+    """Remove all the stats records."""
+    CourseStatsSnapshot.objects.all().delete()  # pylint: disable=no-member
+    CourseStructureSummary.objects.all().delete()  # pylint: disable=no-member
+    TenantStatsSnapshot.objects.all().delete()  # pylint: disable=no-member
+
+
+class RefreshCourseStatsSnapshotsTestCase(unittest.TestCase):
+    """Tests cases for refresh_course_stats_snapshots function."""
+
+    def setUp(self):
+        """Set grouped values for the CourseEnrollment and CourseAccessRole mocks."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx109+2022_T4")
+        self.course_key_2 = CourseKey.from_string("course-v1:test+Cx110+2022_T4")
+        CourseEnrollment.objects.filter.return_value.values.return_value.annotate.return_value.order_by.return_value = [
+            {"course": self.course_key, "count": 20},
+            {"course": self.course_key_2, "count": 7},
+        ]
+        CourseAccessRole.objects.filter.return_value.values.return_value.annotate.return_value.order_by.return_value = [
+            {"course_id": self.course_key, "count": 2},
+        ]
+
+    def tearDown(self):
+        """Clean records and restart mocks."""
+        clean_snapshots()
+        CourseEnrollment.reset_mock()
+        CourseAccessRole.reset_mock()
+
+    @patch("eox_nelp.stats.snapshots.get_courses_certificates_metric")
+    def test_refresh(self, certificates_mock):
+        """Test that the snapshots are created with the grouped values.
+
+        Expected behavior:
+            - Every course has a snapshot.
+            - Learners, instructors and certificates are the expected.
+            - The certificates were calculated once for all the courses.
+        """
+        course_keys = [self.course_key, self.course_key_2]
+        certificates_mock.return_value = {str(self.course_key): {"total": {"downloadable": 1}}}
+
+        result = snapshots.refresh_course_stats_snapshots(course_keys)
+
+        certificates_mock.assert_called_once_with(course_keys)
+        self.assertEqual(20, result[str(self.course_key)].learners)
+        self.assertEqual(2, result[str(self.course_key)].instructors)
+        self.assertEqual({"total": {"downloadable": 1}}, result[str(self.course_key)].certificates)
+        self.assertEqual(7, result[str(self.course_key_2)].learners)
+        self.assertEqual(0, result[str(self.course_key_2)].instructors)
+        self.assertEqual({}, result[str(self.course_key_2)].certificates)
+        self.assertEqual(2, CourseStatsSnapshot.objects.count())  # pylint: disable=no-member
+
+
+class IncrementCourseLearnersTestCase(unittest.TestCase):
+    """Tests cases for increment_course_learners function."""
+
+    def tearDown(self):
+        """Clean records."""
+        clean_snapshots()
+
+    def test_increment(self):
+        """Test that an existing snapshot is incremented.
+
+        Expected behavior:
+            - learners value has been incremented by one.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx111+2022_T4")
+        snapshot = CourseStatsSnapshot.objects.create(course_id=course_key, learners=4)  # pylint: disable=no-member
+
+        snapshots.increment_course_learners(course_key)
+
+        snapshot.refresh_from_db()
+        self.assertEqual(5, snapshot.learners)
+
+    def test_missing_snapshot(self):
+        """Test that nothing happens when the snapshot doesn't exist.
+
+        Expected behavior:
+            - No snapshot was created.
+        """
+        snapshots.increment_course_learners(CourseKey.from_string("course-v1:test+Cx112+2022_T4"))
+
+        self.assertFalse(CourseStatsSnapshot.objects.exists())  # pylint: disable=no-member
+
+
+class ScheduleTenantSnapshotRefreshTestCase(unittest.TestCase):
+    """Tests cases for schedule_tenant_snapshot_refresh function."""
+
+    def tearDown(self):
+        """Clean cache."""
+        cache.clear()
+
+    @override_settings(STATS_SETTINGS={"STATS_TENANT_SNAPSHOT_DELAY": 30})
+    @patch("eox_nelp.stats.tasks.refresh_org_tenant_stats_snapshot")
+    def test_debounced_refresh(self, refresh_task_mock):
+        """Test that the refresh is enqueued once by org with the configured delay.
+
+        Expected behavior:
+            - refresh_org_tenant_stats_snapshot is enqueued once for the test org.
+            - Other org is enqueued too.
+        """
+        snapshots.schedule_tenant_snapshot_refresh(CourseKey.from_string("course-v1:test+Cx111+2022_T4"))
+        snapshots.schedule_tenant_snapshot_refresh(CourseKey.from_string("course-v1:test+Cx112+2022_T4"))
+        snapshots.schedule_tenant_snapshot_refresh(CourseKey.from_string("course-v1:other+Cx112+2022_T4"))
+
+        self.assertEqual(
+            [{"args": ["test"], "countdown": 30}, {"args": ["other"], "countdown": 30}],
+            [call.kwargs for call in refresh_task_mock.apply_async.call_args_list],
+        )
+
+
+class GetCoursesMetricsTestCase(unittest.TestCase):
+    """Tests cases for get_courses_metrics and get_course_metrics functions."""
+
+    def setUp(self):
+        """Create the snapshot and summary of a course."""
+        self.course_key = CourseKey.from_string("course-v1:test+Cx113+2022_T4")
+        CourseStatsSnapshot.objects.create(  # pylint: disable=no-member
+            course_id=self.course_key,
+            learners=15,
+            instructors=3,
+            certificates={"total": {"downloadable": 4}},
+        )
+        CourseStructureSummary.objects.create(  # pylint: disable=no-member
+            course_id=self.course_key,
+            display_name="Snapshot course",
+            sections=1,
+            sub_sections=2,
+            units=3,
+            block_types={"html": 5, "video": 1},
+        )
+        self.expected_metric = {
+            "id": str(self.course_key),
+            "name": "Snapshot course",
+            "learners": 15,
+            "instructors": 3,
+            "sections": 1,
+            "sub_sections": 2,
+            "units": 3,
+            "components": {"html": 5, "problem": 0},
+            "certificates": {"total": {"downloadable": 4}},
+        }
+
+    def tearDown(self):
+        """Clean records and restart mocks."""
+        clean_snapshots()
+        CourseEnrollment.reset_mock()
+        modulestore.reset_mock()
+
+    @override_settings(STATS_SETTINGS={"API_XBLOCK_TYPES": ["html", "problem"]})
+    def test_get_course_metrics(self):
+        """Test that the course metrics are built from the stored records.
+
+        Expected behavior:
+            - The result is the expected.
+            - The LMS tables and modulestore were not used.
+        """
+        result = snapshots.get_course_metrics(self.course_key)
+
+        self.assertEqual(self.expected_metric, result)
+        CourseEnrollment.objects.filter.assert_not_called()
+        modulestore.return_value.get_course.assert_not_called()
+
+    @override_settings(STATS_SETTINGS={"API_XBLOCK_TYPES": ["html", "problem"]})
+    @patch("eox_nelp.stats.snapshots.get_cached_courses")
+    def test_get_courses_metrics(self, get_cached_courses_mock):
+        """Test that the courses metrics are built from the stored records.
+
+        Expected behavior:
+            - get_cached_courses was called with the tenant.
+            - The result is the expected.
+        """
+        tenant = "http://test.com"
+        get_cached_courses_mock.return_value = [Mock(id=self.course_key)]
+
+        result = snapshots.get_courses_metrics(tenant)
+
+        get_cached_courses_mock.assert_called_once_with(tenant)
+        self.assertEqual({"total_courses": 1, "metrics": [self.expected_metric]}, result)
+
+    @patch("eox_nelp.stats.snapshots.refresh_course_stats_snapshots")
+    def test_missing_snapshot(self, refresh_mock):
+        """Test that a missing snapshot is calculated.
+
+        Expected behavior:
+            - refresh_course_stats_snapshots was called with the missing course.
+            - The result contains the refreshed values.
+        """
+        course_key = CourseKey.from_string("course-v1:test+Cx114+2022_T4")
+        CourseStructureSummary.objects.create(course_id=course_key)  # pylint: disable=no-member
+        refresh_mock.return_value = {
+            str(course_key): CourseStatsSnapshot(course_id=course_key, learners=9),
+        }
+
+        result = snapshots.get_course_metrics(course_key)
+
+        refresh_mock.assert_called_once_with([course_key])
+        self.assertEqual(9, result["learners"])
+
+    def test_build_with_fields(self):
+        """Test that just the requested fields are returned.
+
+        Expected behavior:
+            - The result only contains the requested fields.
+            - The modulestore was not used.
+        """
+        result = snapshots.build_courses_metrics([self.course_key], ["id", "learners"])
+
+        self.assertEqual([{"id": str(self.course_key), "learners": 15}], result)
+        modulestore.return_value.get_course.assert_not_called()
+
+
+class TenantMetricsTestCase(unittest.TestCase):
+    """Tests cases for get_learners_metric and get_instructors_metric functions."""
+
+    def setUp(self):
+        """Restart the configuration_helpers mock, since other test modules use it."""
+        configuration_helpers.reset_mock()
+
+    def tearDown(self):
+        """Clean records and restart mocks."""
+        clean_snapshots()
+        configuration_helpers.reset_mock()
+
+    def test_existing_snapshot(self):
+        """Test that the values are read from the tenant snapshot.
+
+        Expected behavior:
+            - Learners and instructors are the expected.
+            - The site orgs were not required.
+        """
+        tenant = "tenant.com"
+        TenantStatsSnapshot.objects.create(tenant=tenant, learners=50, instructors=6)  # pylint: disable=no-member
+
+        self.assertEqual(50, snapshots.get_learners_metric(tenant))
+        self.assertEqual(6, snapshots.get_instructors_metric(tenant))
+        configuration_helpers.get_current_site_orgs.assert_not_called()
+
+    @patch("eox_nelp.stats.snapshots.count_instructors")
+    @patch("eox_nelp.stats.snapshots.count_learners")
+    def test_missing_snapshot(self, count_learners_mock, count_instructors_mock):
+        """Test that the tenant snapshot is created with the current site orgs.
+
+        Expected behavior:
+            - The snapshot was created with the expected values.
+            - count_instructors was called with the site orgs.
+        """
+        tenant = "new-tenant.com"
+        configuration_helpers.get_current_site_orgs.return_value = ["org1", "org2"]
+        count_learners_mock.return_value = 30
+        count_instructors_mock.return_value = 2
+
+        learners = snapshots.get_learners_metric(tenant)
+
+        self.assertEqual(30, learners)
+        count_instructors_mock.assert_called_once_with(["org1", "org2"])
+        snapshot = TenantStatsSnapshot.objects.get(tenant=tenant)  # pylint: disable=no-member
+        self.assertEqual(["org1", "org2"], snapshot.orgs)
+        self.assertEqual(2, snapshot.instructors)
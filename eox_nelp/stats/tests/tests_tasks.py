@@ -0,0 +1,329 @@
+"""This file contains all the test for the stats tasks.py file.
+
+Classes:
+    UpdateCourseStructureSummaryTestCase: Tests cases for update_course_structure_summary task.
+    RefreshOrgTenantStatsSnapshotTestCase: Tests cases for refresh_org_tenant_stats_snapshot task.
+    ReconcileStatsSnapshotsTestCase: Tests cases for reconcile_stats_snapshots task.
+    UpdateDailyStatsRollupsTestCase: Tests cases for update_daily_stats_rollups task.
+    UpdateActiveLearnersTestCase: Tests cases for update_active_learners task.
+    LearnersSketchTasksTestCase: Tests cases for update_learners_sketch and build_learners_sketch tasks.
+    ExportCoursesStatsTestCase: Tests cases for export_courses_stats task.
+    WarmTenantStatsCacheTestCase: Tests cases for warm_tenant_stats_cache task.
+    WarmStatsCachesTestCase: Tests cases for warm_stats_caches task.
+"""
+import unittest
+from datetime import date, datetime, timezone
+
+from ddt import data, ddt
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from mock import Mock, patch
+from opaque_keys.edx.keys import CourseKey
+
+from eox_nelp.stats import tasks
+from eox_nelp.stats.models import CourseStatsSnapshot, TenantStatsSnapshot
+
+User = get_user_model()
+
+
+class UpdateCourseStructureSummaryTestCase(unittest.TestCase):
+    """Tests cases for update_course_structure_summary task."""
+
+    @patch("eox_nelp.stats.tasks.CourseStructureSummary")
+    def test_update_summary(self, summary_mock):
+        """Test that the summary is updated with the course key.
+
+        Expected behavior:
+            - update_from_modulestore is called with the right course key.
+        """
+        course_id = "course-v1:test+Cx105+2022_T4"
+
+        tasks.update_course_structure_summary(course_id)
+
+        summary_mock.update_from_modulestore.assert_called_once_with(CourseKey.from_string(course_id))
+
+
+class RefreshOrgTenantStatsSnapshotTestCase(unittest.TestCase):
+    """Tests cases for refresh_org_tenant_stats_snapshot task."""
+
+    def tearDown(self):
+        """Clean records."""
+        TenantStatsSnapshot.objects.all().delete()  # pylint: disable=no-member
+
+    @patch("eox_nelp.stats.tasks.refresh_tenant_stats_snapshot")
+    @patch("eox_nelp.stats.tasks.TenantSiteConfigProxy")
+    def test_refresh(self, proxy_mock, refresh_mock):
+        """Test that the snapshot of the org tenant is refreshed with its stored orgs.
+
+        Expected behavior:
+            - The tenant is found by the org SITE_NAME.
+            - refresh_tenant_stats_snapshot is called with the tenant and its orgs.
+        """
+        proxy_mock.get_value_for_org.return_value = "tenant.com"
+        TenantStatsSnapshot.objects.create(tenant="tenant.com", orgs=["org1", "org2"])  # pylint: disable=no-member
+
+        tasks.refresh_org_tenant_stats_snapshot("org2")
+
+        proxy_mock.get_value_for_org.assert_called_once_with("org2", "SITE_NAME")
+        refresh_mock.assert_called_once_with("tenant.com", ["org1", "org2"])
+
+    @patch("eox_nelp.stats.tasks.refresh_tenant_stats_snapshot")
+    @patch("eox_nelp.stats.tasks.TenantSiteConfigProxy")
+    def test_missing_snapshot(self, proxy_mock, refresh_mock):
+        """Test that a missing tenant snapshot is not created.
+
+        Expected behavior:
+            - refresh_tenant_stats_snapshot is not called.
+        """
+        proxy_mock.get_value_for_org.return_value = "tenant.com"
+
+        tasks.refresh_org_tenant_stats_snapshot("org1")
+
+        refresh_mock.assert_not_called()
+
+
+class ReconcileStatsSnapshotsTestCase(unittest.TestCase):
+    """Tests cases for reconcile_stats_snapshots task."""
+
+    def tearDown(self):
+        """Clean records."""
+        CourseStatsSnapshot.objects.all().delete()  # pylint: disable=no-member
+        TenantStatsSnapshot.objects.all().delete()  # pylint: disable=no-member
+
+    @patch("eox_nelp.stats.tasks.refresh_tenant_stats_snapshot")
+    @patch("eox_nelp.stats.tasks.refresh_course_stats_snapshots")
+    def test_reconcile(self, refresh_courses_mock, refresh_tenant_mock):
+        """Test that all the existing snapshots are recalculated.
+
+        Expected behavior:
+            - Courses are refreshed in batches.
+            - Every tenant is refreshed with its stored orgs.
+        """
+        course_keys = [CourseKey.from_string(f"course-v1:test+Cx{index}+2022_T4") for index in range(3)]
+
+        for course_key in course_keys:
+            CourseStatsSnapshot.objects.create(course_id=course_key)  # pylint: disable=no-member
+
+        TenantStatsSnapshot.objects.create(tenant="tenant.com", orgs=["org1"])  # pylint: disable=no-member
+
+        with patch("eox_nelp.stats.tasks.RECONCILE_BATCH_SIZE", 2):
+            tasks.reconcile_stats_snapshots()
+
+        self.assertEqual(2, refresh_courses_mock.call_count)
+        self.assertEqual(
+            set(course_keys),
+            {key for call in refresh_courses_mock.call_args_list for key in call.args[0]},
+        )
+        refresh_tenant_mock.assert_called_once_with("tenant.com", ["org1"])
+
+
+class UpdateDailyStatsRollupsTestCase(unittest.TestCase):
+    """Tests cases for update_daily_stats_rollups task."""
+
+    @patch("eox_nelp.stats.tasks.timezone")
+    @patch("eox_nelp.stats.tasks.build_daily_stats_rollups")
+    def test_previous_day(self, build_mock, timezone_mock):
+        """Test that the previous day is processed by default.
+
+        Expected behavior:
+            - build_daily_stats_rollups is called with yesterday.
+        """
+        timezone_mock.now.return_value = datetime(2023, 5, 29, 1, 30, tzinfo=timezone.utc)
+
+        tasks.update_daily_stats_rollups()
+
+        build_mock.assert_called_once_with(date(2023, 5, 28))
+
+    @patch("eox_nelp.stats.tasks.build_daily_stats_rollups")
+    def test_given_day(self, build_mock):
+        """Test that the given day is processed.
+
+        Expected behavior:
+            - build_daily_stats_rollups is called with the given day.
+        """
+        tasks.update_daily_stats_rollups("2023-05-01")
+
+        build_mock.assert_called_once_with(date(2023, 5, 1))
+
+
+@ddt
+class UpdateActiveLearnersTestCase(unittest.TestCase):
+    """Tests cases for update_active_learners task."""
+
+    course_id = "course-v1:test+Cx105+2022_T4"
+
+    def tearDown(self):
+        """Remove the created users."""
+        User.objects.filter(username__startswith="active-learner").delete()
+
+    @patch("eox_nelp.stats.tasks.mark_active_learner")
+    @patch("eox_nelp.stats.tasks.record_active_learner")
+    def test_record_learner(self, record_mock, mark_mock):
+        """Test that the task arguments are parsed and the learner is recorded and marked.
+
+        Expected behavior:
+            - record_active_learner is called with the course key, user id and day.
+            - mark_active_learner is called with the course key, user id and day.
+        """
+        user = User.objects.create(username="active-learner")
+        expected_args = (CourseKey.from_string(self.course_id), user.id, date(2023, 5, 28))
+
+        tasks.update_active_learners(self.course_id, user.id, "2023-05-28")
+
+        record_mock.assert_called_once_with(*expected_args)
+        mark_mock.assert_called_once_with(*expected_args)
+
+    @patch("eox_nelp.stats.tasks.mark_active_learner")
+    @patch("eox_nelp.stats.tasks.record_active_learner")
+    @data({"is_staff": True}, {"is_superuser": True})
+    def test_skip_staff(self, user_fields, record_mock, mark_mock):
+        """Test that staff users are marked but not recorded.
+
+        Expected behavior:
+            - record_active_learner is not called.
+            - mark_active_learner is called, so the receiver skips the user for the rest of the day.
+        """
+        user = User.objects.create(username="active-learner-staff", **user_fields)
+
+        tasks.update_active_learners(self.course_id, user.id, "2023-05-28")
+
+        record_mock.assert_not_called()
+        mark_mock.assert_called_once()
+
+    @patch("eox_nelp.stats.tasks.mark_active_learner")
+    @patch("eox_nelp.stats.tasks.record_active_learner")
+    def test_record_failure(self, record_mock, mark_mock):
+        """Test that the learner is not marked when the bitmap update fails.
+
+        Expected behavior:
+            - The exception is raised.
+            - mark_active_learner is not called.
+        """
+        user = User.objects.create(username="active-learner-failure")
+        record_mock.side_effect = Exception("Error")
+
+        self.assertRaises(Exception, tasks.update_active_learners, self.course_id, user.id, "2023-05-28")
+
+        mark_mock.assert_not_called()
+
+
+class LearnersSketchTasksTestCase(unittest.TestCase):
+    """Tests cases for update_learners_sketch and build_learners_sketch tasks."""
+
+    @patch("eox_nelp.stats.tasks.sketches")
+    def test_update_sketch(self, sketches_mock):
+        """Test that the learner is added to the sketch.
+
+        Expected behavior:
+            - add_learner is called with the sketch key and the user id.
+        """
+        tasks.update_learners_sketch("site:lms.example.com", 7)
+
+        sketches_mock.add_learner.assert_called_once_with("site:lms.example.com", 7)
+
+    @patch("eox_nelp.stats.tasks.sketches")
+    def test_build_sketch(self, sketches_mock):
+        """Test that the sketch is built.
+
+        Expected behavior:
+            - build_sketch is called with the sketch key.
+        """
+        tasks.build_learners_sketch("site:lms.example.com")
+
+        sketches_mock.build_sketch.assert_called_once_with("site:lms.example.com")
+
+
+class ExportCoursesStatsTestCase(unittest.TestCase):
+    """Tests cases for export_courses_stats task."""
+
+    @patch("eox_nelp.stats.tasks.tenant_context")
+    @patch("eox_nelp.stats.tasks.export_courses_metrics")
+    def test_export(self, export_mock, tenant_context_mock):
+        """Test that the export runs in the tenant context.
+
+        Expected behavior:
+            - tenant_context is called with the tenant.
+            - export_courses_metrics is called with the tenant and format.
+            - The export result is returned.
+        """
+        export_mock.return_value = {"path": "stats_exports/tenant.com/file.csv"}
+
+        result = tasks.export_courses_stats("tenant.com", "parquet")
+
+        tenant_context_mock.assert_called_once_with("tenant.com")
+        export_mock.assert_called_once_with("tenant.com", "parquet")
+        self.assertEqual(export_mock.return_value, result)
+
+
+class WarmTenantStatsCacheTestCase(unittest.TestCase):
+    """Tests cases for warm_tenant_stats_cache task."""
+
+    def tearDown(self):
+        """Clean cache."""
+        cache.clear()
+
+    @patch("eox_nelp.stats.tasks.store_tenant_stats")
+    @patch("eox_nelp.stats.tasks.tenant_context")
+    def test_warm(self, tenant_context_mock, store_tenant_stats_mock):
+        """Test that every cached function is refreshed in the tenant context.
+
+        Expected behavior:
+            - tenant_context is called with the tenant.
+            - Every function is refreshed with the tenant in order.
+            - The general stats of the tenant are stored.
+            - The lock is released.
+        """
+        manager = Mock()
+        functions = (manager.get_cached_courses, manager.get_courses_metrics)
+
+        with patch("eox_nelp.stats.tasks.WARMED_STATS_FUNCTIONS", functions):
+            result = tasks.warm_tenant_stats_cache("tenant.com")
+
+        self.assertTrue(result)
+        tenant_context_mock.assert_called_once_with("tenant.com")
+        self.assertEqual(
+            ["get_cached_courses.refresh", "get_courses_metrics.refresh"],
+            [name for name, _, _ in manager.mock_calls],
+        )
+        manager.get_courses_metrics.refresh.assert_called_once_with("tenant.com")
+        store_tenant_stats_mock.assert_called_once_with("tenant.com")
+        self.assertIsNone(cache.get("eox_nelp.stats.warmup.tenant.com.LOCK"))
+
+    @patch("eox_nelp.stats.tasks.tenant_context")
+    def test_locked_tenant(self, tenant_context_mock):
+        """Test that the tenant is skipped if another process is warming it.
+
+        Expected behavior:
+            - The result is False.
+            - No function was refreshed.
+        """
+        function_mock = Mock()
+        cache.set("eox_nelp.stats.warmup.tenant.com.LOCK", True)
+
+        with patch("eox_nelp.stats.tasks.WARMED_STATS_FUNCTIONS", (function_mock,)):
+            result = tasks.warm_tenant_stats_cache("tenant.com")
+
+        self.assertFalse(result)
+        tenant_context_mock.assert_not_called()
+        function_mock.refresh.assert_not_called()
+
+
+class WarmStatsCachesTestCase(unittest.TestCase):
+    """Tests cases for warm_stats_caches task."""
+
+    @patch("eox_nelp.stats.tasks.warm_tenant_stats_cache")
+    @patch("eox_nelp.stats.tasks.get_tenants_orgs")
+    def test_enqueue_tenants(self, get_tenants_orgs_mock, warm_mock):
+        """Test that a task is enqueued for every tenant.
+
+        Expected behavior:
+            - warm_tenant_stats_cache.delay is called with every tenant.
+        """
+        get_tenants_orgs_mock.return_value = {"tenant.com": ["org1"], "other.com": []}
+
+        tasks.warm_stats_caches()
+
+        self.assertEqual(
+            ["tenant.com", "other.com"],
+            [call.args[0] for call in warm_mock.delay.call_args_list],
+        )
@@ -0,0 +1,161 @@
+"""This file contains all the test for the stats utils.py file.
+
+Classes:
+    TenantContextTestCase: Tests cases for tenant_context context manager.
+    RunInThreadPoolTestCase: Tests cases for run_in_thread_pool function.
+    RunInProcessPoolTestCase: Tests cases for run_in_process_pool function.
+    GetTenantsOrgsTestCase: Tests cases for get_tenants_orgs function.
+"""
+import threading
+import time
+import unittest
+
+from crum import get_current_request, set_current_request
+from mock import Mock, patch
+
+from eox_nelp.stats.utils import get_tenants_orgs, run_in_process_pool, run_in_thread_pool, tenant_context
+
+
+class TenantContextTestCase(unittest.TestCase):
+    """Tests cases for tenant_context context manager."""
+
+    @patch("eox_nelp.stats.utils.can_keep_settings")
+    @patch("eox_nelp.stats.utils._update_settings")
+    def test_tenant_request(self, update_settings_mock, can_keep_settings_mock):
+        """Test that a request with the tenant site is set inside the context.
+
+        Expected behavior:
+            - The tenant settings are loaded.
+            - The current request has the tenant site.
+            - The previous request is restored.
+        """
+        domain = "tenant.example.com"
+        previous_request = Mock()
+        set_current_request(previous_request)
+        can_keep_settings_mock.return_value = False
+
+        with tenant_context(domain) as request:
+            self.assertEqual(request, get_current_request())
+            self.assertEqual(domain, get_current_request().site.domain)
+
+        update_settings_mock.assert_called_once_with(domain, "lms_configs")
+        self.assertEqual(previous_request, get_current_request())
+        set_current_request(None)
+
+
+class RunInThreadPoolTestCase(unittest.TestCase):
+    """Tests cases for run_in_thread_pool function."""
+
+    def test_results_order(self):
+        """Test that the results keep the items order and run in the pool threads.
+
+        Expected behavior:
+            - Results are in the same order of the items.
+            - The function didn't run in the current thread.
+        """
+        threads = set()
+
+        def double(item):
+            threads.add(threading.current_thread().name)
+            return item * 2
+
+        result = run_in_thread_pool(double, [1, 2, 3, 4], max_workers=2)
+
+        self.assertEqual([2, 4, 6, 8], result)
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    @patch("eox_nelp.stats.utils.connections")
+    def test_close_connections(self, connections_mock):
+        """Test that the worker connections are closed once by worker.
+
+        Expected behavior:
+            - close_all was called once by worker, not by item.
+        """
+        run_in_thread_pool(str, [1, 2, 3, 4, 5], max_workers=2)
+
+        self.assertEqual(2, connections_mock.close_all.call_count)
+
+    def test_deadline_exceeded(self):
+        """Test that the pending items are cancelled when the deadline is exceeded.
+
+        Expected behavior:
+            - TimeoutError is raised.
+            - The pending item is not processed after the running one finishes.
+        """
+        release = threading.Event()
+        processed = []
+
+        def process(item):
+            if item == "blocked":
+                release.wait(5)
+
+            processed.append(item)
+
+            return item
+
+        with self.assertRaises(TimeoutError):
+            run_in_thread_pool(process, ["blocked", "pending"], max_workers=1, deadline=0.1)
+
+        release.set()
+        time.sleep(0.2)
+
+        self.assertEqual(["blocked"], processed)
+
+    def test_error(self):
+        """Test that an error of a worker is raised.
+
+        Expected behavior:
+            - The function error is raised.
+        """
+        with self.assertRaises(ZeroDivisionError):
+            run_in_thread_pool(lambda item: 1 / item, [1, 0, 2], max_workers=2)
+
+
+class RunInProcessPoolTestCase(unittest.TestCase):
+    """Tests cases for run_in_process_pool function."""
+
+    def test_results_order(self):
+        """Test that the results are returned in the order of the items.
+
+        Expected behavior:
+            - Every item has been processed.
+            - Results keep the items order.
+        """
+        result = run_in_process_pool(abs, [-3, 1, -2, 4], max_workers=2)
+
+        self.assertEqual([3, 1, 2, 4], result)
+
+    @patch("eox_nelp.stats.utils.close_caches")
+    @patch("eox_nelp.stats.utils.connections")
+    def test_close_connections(self, connections_mock, close_caches_mock):
+        """Test that the connections are closed before forking.
+
+        Expected behavior:
+            - The database and cache connections are closed.
+        """
+        run_in_process_pool(abs, [-1], max_workers=1)
+
+        connections_mock.close_all.assert_called_once()
+        close_caches_mock.assert_called_once()
+
+
+class GetTenantsOrgsTestCase(unittest.TestCase):
+    """Tests cases for get_tenants_orgs function."""
+
+    @patch("eox_nelp.stats.utils.Route")
+    def test_routes_orgs(self, route_mock):
+        """Test that the organizations of every route are returned by domain.
+
+        Expected behavior:
+            - Every route domain has its organizations.
+            - A route without course_org_filter has an empty list.
+        """
+        route_mock.objects.select_related.return_value = [
+            Mock(domain="tenant.com", config=Mock(get_organizations=Mock(return_value=["org1", "org2"]))),
+            Mock(domain="empty.com", config=Mock(get_organizations=Mock(return_value=None))),
+        ]
+
+        result = get_tenants_orgs()
+
+        route_mock.objects.select_related.assert_called_once_with("config")
+        self.assertEqual({"tenant.com": ["org1", "org2"], "empty.com": []}, result)
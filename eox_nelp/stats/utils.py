@@ -0,0 +1,156 @@
+"""Utilities for the stats module.
+
+functions:
+    tenant_context: Context manager that emulates a tenant request outside the request-response cycle.
+    run_in_thread_pool: Call a function for multiple items in a bounded thread pool.
+    run_in_process_pool: Call a function for multiple items in a bounded pool of forked processes.
+    get_tenants_orgs: Return the organizations of every eox-tenant route.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing import get_context
+
+from crum import get_current_request, set_current_request
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sites.models import Site
+from django.core.cache import close_caches
+from django.db import connections
+from django.http import HttpRequest
+from eox_tenant.constants import LMS_CONFIG_COLUMN
+from eox_tenant.models import Route
+from eox_tenant.signals import _update_settings, can_keep_settings
+from eox_tenant.tenant_wise.proxies import TenantSiteConfigProxy
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def tenant_context(domain):
+    """
+    Loads the tenant settings and sets a current request for the given domain, this allows to
+    calculate tenant metrics, that depend on request.site and the site configuration, in async
+    tasks or management commands. The previous current request is restored at the end.
+
+    Args:
+        domain<str>: Tenant domain, e.g lms.example.com.
+    """
+    if not can_keep_settings(domain):
+        _update_settings(domain, LMS_CONFIG_COLUMN)
+
+    site = Site.objects.filter(domain=domain).first() or Site(domain=domain, name=domain)
+    site.configuration = TenantSiteConfigProxy()
+    request = HttpRequest()
+    request.method = "GET"
+    request.META["HTTP_HOST"] = domain
+    request.site = site
+    request.user = AnonymousUser()
+    previous_request = get_current_request()
+    set_current_request(request)
+
+    try:
+        yield request
+    finally:
+        set_current_request(previous_request)
+
+
+def run_in_thread_pool(func, items, max_workers, deadline=None):
+    """
+    Calls func for every item in a thread pool of max_workers threads, and returns the results
+    in the same order of the items. Every worker takes items from a shared queue until it's empty
+    and closes its database connections once when it exits, since Django opens a connection by
+    thread, so the number of connections is bounded by max_workers.
+
+    The deadline bounds the time that the calling thread waits. If it's exceeded the pending items
+    are cancelled and TimeoutError is raised, partial results are not returned. The calls that are
+    already running finish in their threads and their results are discarded.
+
+    Args:
+        func<function>: Function that receives a single item.
+        items<list>: Items to process.
+        max_workers<int>: Max number of threads.
+        deadline<float>: Max time in seconds that the pool is awaited, default None(no limit).
+
+    Return:
+        list: The func result of every item.
+
+    Raise:
+        TimeoutError: The deadline was exceeded.
+    """
+    pending = queue.SimpleQueue()
+    results = [None] * len(items)
+    cancelled = threading.Event()
+
+    for position, item in enumerate(items):
+        pending.put((position, item))
+
+    def work():
+        try:
+            while not cancelled.is_set():
+                try:
+                    position, item = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                results[position] = func(item)
+        finally:
+            connections.close_all()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eox-nelp-stats")
+
+    try:
+        workers = [executor.submit(work) for _ in range(min(max_workers, len(items)))]
+        done, not_done = wait(workers, timeout=deadline, return_when=FIRST_EXCEPTION)
+
+        for worker in done:
+            worker.result()
+
+        if not_done:
+            logger.warning(
+                "The thread pool deadline of %s seconds was exceeded, the pending items were cancelled.",
+                deadline,
+            )
+            raise TimeoutError(f"The thread pool deadline of {deadline} seconds was exceeded.")
+
+        return results
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False)
+
+
+def run_in_process_pool(func, items, max_workers):
+    """
+    Calls func for every item in a pool of max_workers forked processes, and returns the results
+    in the same order of the items. Unlike run_in_thread_pool, every call has its own process, so
+    this is safe for functions that change process wide state like the tenant settings. The database
+    and cache connections are closed before forking, so the processes don't share sockets.
+
+    Args:
+        func<function>: Module level function that receives a single item.
+        items<list>: Items to process.
+        max_workers<int>: Max number of processes.
+
+    Return:
+        list: The func result of every item.
+    """
+    connections.close_all()
+    close_caches()
+
+    with get_context("fork").Pool(processes=max_workers, maxtasksperchild=1) as pool:
+        return pool.map(func, items, chunksize=1)
+
+
+def get_tenants_orgs():
+    """
+    Returns the organizations of every tenant, based on the course_org_filter value of the
+    eox-tenant routes. This doesn't depend on the current request, so it can be used by async tasks.
+
+    Return:
+        <Dictionary>: List of organizations by tenant domain.
+    """
+    return {
+        route.domain: route.config.get_organizations() or []
+        for route in Route.objects.select_related("config")  # pylint: disable=no-member
+    }
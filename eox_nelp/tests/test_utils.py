@@ -3,6 +3,7 @@
 Classes:
     ExtractCourseIdFromStringTestCase: Tests cases for the extract_course_id_from_string method.
     GetCourseFromIdTestCase: Tests cases for the get_course_from_id method.
+    MapInstanceAttributesToDictTestCase: Tests cases for the map_instance_attributes_to_dict method.
 """
 from ddt import data, ddt
 from django.contrib.auth import get_user_model
@@ -17,6 +18,7 @@ from eox_nelp.utils import (
     extract_course_id_from_string,
     get_course_from_id,
     get_item_label,
+    map_instance_attributes_to_dict,
     save_extrainfo,
 )
 
@@ -235,6 +237,36 @@ class CamelToSnakeTestCase(TestCase):
         self.assertRaises(TypeError, camel_to_snake, input_value)
 
 
+class MapInstanceAttributesToDictTestCase(TestCase):
+    """Test class for the map_instance_attributes_to_dict method."""
+
+    def test_nested_attributes(self):
+        """ Test that the direct and nested attributes are mapped.
+
+        Expected behavior:
+            - Returned value contains the direct and nested attribute values.
+        """
+        instance = Mock(username="vader", profile=Mock(country="TT"))
+        attributes_mapping = {"username": "username", "country": "profile__country"}
+
+        self.assertEqual(
+            {"username": "vader", "country": "TT"},
+            map_instance_attributes_to_dict(instance, attributes_mapping),
+        )
+
+    def test_missing_nested_attribute(self):
+        """ Test that a missing attribute in a nested path is skipped.
+
+        Expected behavior:
+            - Returned value is the last found attribute of the path.
+        """
+        instance = Mock(spec=["username"], username="vader")
+
+        result = map_instance_attributes_to_dict(instance, {"name": "username__first_name"})
+
+        self.assertEqual({"name": "vader"}, result)
+
+
 class SaveExtraInfoTestCase(TestCase):
     """Test class for the save_extrainfo method."""
 
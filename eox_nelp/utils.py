@@ -1,6 +1,6 @@
 """Utils that can be used for the plugin project"""
 import re
-from copy import copy
+from functools import lru_cache
 
 from custom_reg_form.forms import ExtraInfoForm
 from custom_reg_form.models import ExtraInfo
@@ -12,6 +12,7 @@ from eox_nelp.edxapp_wrapper.user_api import errors
 
 NATIONAL_ID_REGEX = r"^[1-2]\d{9}$"
 COURSE_ID_REGEX = r'(course-v1:[^/+]+(/|\+)[^/+]+(/|\+)[^/?]+)'
+MISSING_ATTRIBUTE = object()
 
 
 def map_instance_attributes_to_dict(instance, attributes_mapping):
@@ -38,18 +39,45 @@ def map_instance_attributes_to_dict(instance, attributes_mapping):
     Returns:
         instance_dict: dict representing the instance
     """
-    instance_dict = {}
-    for extra_field, instance_field in attributes_mapping.items():
-        extra_value = None
-        instance_level = copy(instance)
-        for instance_field in instance_field.split("__"):
-            if hasattr(instance_level, instance_field):
-                instance_level = getattr(instance_level, instance_field)
-                extra_value = instance_level
-
-        instance_dict[extra_field] = extra_value
-
-    return instance_dict
+    return {
+        extra_field: get_value(instance)
+        for extra_field, get_value in compile_attributes_mapping(tuple(attributes_mapping.items()))
+    }
+
+
+@lru_cache(maxsize=None)
+def compile_attributes_mapping(attributes_mapping_items):
+    """Returns an attribute getter for every item of an attributes mapping, the `__` separated paths
+    are split once by mapping instead of once by instance.
+
+    Args:
+        attributes_mapping_items (tuple): Items of the attributes mapping, e.g (("key_name", "field_name"),).
+
+    Returns:
+        tuple: Output key name and getter of the instance value for every item.
+    """
+    return tuple(
+        (extra_field, _get_nested_attribute_getter(tuple(instance_field.split("__"))))
+        for extra_field, instance_field in attributes_mapping_items
+    )
+
+
+def _get_nested_attribute_getter(attribute_path):
+    """Returns a function that walks the attribute path of an instance, the missing attributes
+    are skipped and the last found value is returned, None if no attribute was found.
+    """
+    def get_value(instance):
+        value = None
+
+        for attribute in attribute_path:
+            attribute_value = getattr(instance, attribute, MISSING_ATTRIBUTE)
+
+            if attribute_value is not MISSING_ATTRIBUTE:
+                instance = value = attribute_value
+
+        return value
+
+    return get_value
 
 
 def check_regex(string, regex):
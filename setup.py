@@ -91,6 +91,7 @@ setup(
     install_requires=load_requirements('requirements/base.in'),
     extras_require={
         "eox-audit": load_requirements('requirements/eox-audit-model.in'),
+        "parquet": load_requirements('requirements/parquet.in'),
     },
     zip_safe=False,
     entry_points={